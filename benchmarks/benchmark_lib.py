@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""Shared functionality for the data format benchmarks."""
+
+import os
+import struct
+import sys
+import time
+
+try:
+  import resource
+except ImportError:
+  resource = None
+
+from dtformats import carver
+from dtformats import data_format
+from dtformats import output_writers
+from dtformats import profiler
+from dtformats import synthetic
+from dtformats import systemd
+
+
+class CountingRecordOutputWriter(output_writers.RecordOutputWriter):
+  """Record output writer that only counts the records.
+
+  Attributes:
+    number_of_records (int): number of records written.
+  """
+
+  def __init__(self):
+    """Initializes a counting record output writer."""
+    super(CountingRecordOutputWriter, self).__init__()
+    self.number_of_records = 0
+
+  def Close(self):
+    """Closes the output writer object."""
+    return
+
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+    """
+    self.number_of_records += 1
+
+
+class CarverBenchmark(object):
+  """Carver benchmark.
+
+  The records are carved from the input in a single process, which measures
+  the throughput of the carving of a worker process.
+
+  Attributes:
+    format_classes (list[type]): data format classes to carve records of.
+    name (str): name of the benchmark.
+    synthetic_filename (str): name of the file to carve within a synthetic
+        directory, or None if the synthetic input is a file.
+    synthetic_generator (SyntheticDataGenerator): generator of synthetic
+        inputs or None if the benchmark has no synthetic inputs.
+    test_data_path (str): path of the input in the test data or None if
+        there is no such input.
+  """
+
+  def __init__(
+      self, name, format_classes, synthetic_filename=None,
+      synthetic_generator=None, test_data_path=None):
+    """Initializes a carver benchmark.
+
+    Args:
+      name (str): name of the benchmark.
+      format_classes (list[type]): data format classes to carve records of.
+      synthetic_filename (Optional[str]): name of the file to carve within
+          a synthetic directory, where None represents the synthetic input is
+          a file.
+      synthetic_generator (Optional[SyntheticDataGenerator]): generator of
+          synthetic inputs.
+      test_data_path (Optional[str]): path of the input in the test data.
+    """
+    super(CarverBenchmark, self).__init__()
+    self.format_classes = format_classes
+    self.name = name
+    self.synthetic_filename = synthetic_filename
+    self.synthetic_generator = synthetic_generator
+    self.test_data_path = test_data_path
+
+  def Run(self, path):
+    """Runs the benchmark.
+
+    Args:
+      path (str): path of the input.
+
+    Returns:
+      dict[str, object]: measurements of the benchmark.
+    """
+    # Accessing the data type fabric reads the dtFabric definition file.
+    for format_class in self.format_classes:
+      _ = format_class._FABRIC  # pylint: disable=protected-access
+
+    input_size = os.path.getsize(path)
+
+    start_time = time.perf_counter()
+
+    records = carver.CarveWindow(
+        path, 0, input_size, format_classes=self.format_classes)
+
+    time_elapsed = max(time.perf_counter() - start_time, 1e-9)
+
+    return {
+        'megabytes_per_second': input_size / time_elapsed / (1024 * 1024),
+        'number_of_records': len(records),
+        'peak_rss': GetPeakRSS(),
+        'records_per_second': len(records) / time_elapsed,
+        'size': input_size,
+        'time': time_elapsed}
+
+
+class CarvingCandidatesGenerator(synthetic.SyntheticDataGenerator):
+  """Generator of raw data with candidate records that are not valid.
+
+  Every block of random data contains a systemd journal entry object header
+  with a plausible size, which is the most expensive kind of candidate to
+  reject, since the size of an entry object is only bounded by the number of
+  entry items.
+  """
+
+  _BLOCK_SIZE = 4096
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data.
+    """
+    data = self._random.getrandbits(self._BLOCK_SIZE * 8).to_bytes(
+        self._BLOCK_SIZE, 'little')
+
+    candidate_offset = self._random.randrange(0, self._BLOCK_SIZE - 16, 8)
+    candidate_data = b''.join([
+        systemd.SystemdJournalFile.CARVING_SIGNATURE,
+        struct.pack('<Q', 64 + (16 * self._random.randint(1, 1024)))])
+
+    return b''.join([
+        data[:candidate_offset], candidate_data,
+        data[candidate_offset + len(candidate_data):]])
+
+
+class OutputWriterBenchmark(object):
+  """Output writer benchmark.
+
+  The input is parsed with debug information, which is written by the output
+  writer to a throttled output stream. The output stream simulates a pipe
+  to a consumer that is slower than the parsing.
+
+  Attributes:
+    name (str): name of the benchmark.
+    output_throughput (int): number of characters per second the output
+        stream accepts.
+    output_writer_class (type): output writer class, which must support
+        an output stream.
+    parser_class (type): data format class, which must support Open and Close.
+    synthetic_filename (str): name of the file to parse within a synthetic
+        directory, or None if the synthetic input is a file.
+    synthetic_generator (SyntheticDataGenerator): generator of synthetic
+        inputs or None if the benchmark has no synthetic inputs.
+    test_data_path (str): path of the input in the test data or None if
+        there is no such input.
+  """
+
+  def __init__(
+      self, name, output_writer_class, parser_class,
+      output_throughput=8 * 1024 * 1024, synthetic_generator=None,
+      test_data_path=None):
+    """Initializes an output writer benchmark.
+
+    Args:
+      name (str): name of the benchmark.
+      output_writer_class (type): output writer class, which must support
+          an output stream.
+      parser_class (type): data format class, which must support Open and
+          Close.
+      output_throughput (Optional[int]): number of characters per second
+          the output stream accepts.
+      synthetic_generator (Optional[SyntheticDataGenerator]): generator of
+          synthetic inputs.
+      test_data_path (Optional[str]): path of the input in the test data.
+    """
+    super(OutputWriterBenchmark, self).__init__()
+    self.name = name
+    self.output_throughput = output_throughput
+    self.output_writer_class = output_writer_class
+    self.parser_class = parser_class
+    self.synthetic_filename = None
+    self.synthetic_generator = synthetic_generator
+    self.test_data_path = test_data_path
+
+  def Run(self, path):
+    """Runs the benchmark.
+
+    Args:
+      path (str): path of the input.
+
+    Returns:
+      dict[str, object]: measurements of the benchmark.
+    """
+    # Accessing the data type fabric reads the dtFabric definition file.
+    _ = self.parser_class._FABRIC  # pylint: disable=protected-access
+
+    output_stream = ThrottledOutputStream(self.output_throughput)
+    output_writer = self.output_writer_class(output_stream=output_stream)
+    parser_object = self.parser_class(debug=True, output_writer=output_writer)
+
+    start_time = time.perf_counter()
+
+    output_writer.Open()
+    try:
+      parser_object.Open(path)
+      parser_object.Close()
+
+    finally:
+      output_writer.Close()
+
+    time_elapsed = max(time.perf_counter() - start_time, 1e-9)
+
+    input_size = os.path.getsize(path)
+
+    return {
+        'megabytes_per_second': input_size / time_elapsed / (1024 * 1024),
+        'output_size': output_stream.size,
+        'peak_rss': GetPeakRSS(),
+        'size': input_size,
+        'time': time_elapsed}
+
+
+class ParserBenchmark(object):
+  """Parser benchmark.
+
+  Attributes:
+    name (str): name of the benchmark.
+    parser_class (type): data format class, which must support Open and Close.
+    read_method_name (str): name of the method of the data format that reads
+        the records, or None if the records are read by Open.
+    synthetic_filename (str): name of the file to parse within a synthetic
+        directory, or None if the synthetic input is a file.
+    synthetic_generator (SyntheticDataGenerator): generator of synthetic
+        inputs or None if the benchmark has no synthetic inputs.
+    test_data_path (str): path of the input in the test data or None if
+        there is no such input.
+  """
+
+  def __init__(
+      self, name, parser_class, read_method_name=None, synthetic_filename=None,
+      synthetic_generator=None, test_data_path=None):
+    """Initializes a parser benchmark.
+
+    Args:
+      name (str): name of the benchmark.
+      parser_class (type): data format class, which must support Open and
+          Close.
+      read_method_name (Optional[str]): name of the method of the data format
+          that reads the records, where None represents the records are read
+          by Open.
+      synthetic_filename (Optional[str]): name of the file to parse within
+          a synthetic directory, where None represents the synthetic input is
+          a file.
+      synthetic_generator (Optional[SyntheticDataGenerator]): generator of
+          synthetic inputs.
+      test_data_path (Optional[str]): path of the input in the test data.
+    """
+    super(ParserBenchmark, self).__init__()
+    self.name = name
+    self.parser_class = parser_class
+    self.read_method_name = read_method_name
+    self.synthetic_filename = synthetic_filename
+    self.synthetic_generator = synthetic_generator
+    self.test_data_path = test_data_path
+
+  def _ParseFile(self, path):
+    """Parses a file.
+
+    Args:
+      path (str): path of the input.
+
+    Returns:
+      tuple[int, int]: number of structured records written and number of
+          records read by the read method.
+    """
+    output_writer = CountingRecordOutputWriter()
+    parser_object = self.parser_class(output_writer=output_writer)
+
+    number_of_records_read = 0
+
+    parser_object.Open(path)
+
+    if self.read_method_name:
+      read_method = getattr(parser_object, self.read_method_name)
+      for _ in read_method():
+        number_of_records_read += 1
+
+    parser_object.Close()
+
+    return output_writer.number_of_records, number_of_records_read
+
+  def Run(self, path):
+    """Runs the benchmark.
+
+    The input is parsed twice, where the first parse is timed without
+    profiler and the second parse is profiled to count the mapped structures.
+    The dtFabric definition file is read before the first parse.
+
+    The number of records is the number of structured records written by
+    the data format, or the number of records read by the read method, or
+    otherwise the number of mapped structures.
+
+    Args:
+      path (str): path of the input.
+
+    Returns:
+      dict[str, object]: measurements of the benchmark.
+    """
+    # Accessing the data type fabric reads the dtFabric definition file.
+    _ = self.parser_class._FABRIC  # pylint: disable=protected-access
+
+    start_time = time.perf_counter()
+
+    number_of_records_written, number_of_records_read = self._ParseFile(path)
+
+    time_elapsed = max(time.perf_counter() - start_time, 1e-9)
+
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
+    try:
+      self._ParseFile(path)
+    finally:
+      data_format.BinaryDataFormat.SetProfiler(None)
+
+    number_of_structures = sum(
+        profile['map_byte_stream_calls']
+        for profile in data_format_profiler.GetProfiles().values())
+
+    number_of_records = (
+        number_of_records_written or number_of_records_read or
+        number_of_structures)
+
+    input_size = os.path.getsize(path)
+
+    return {
+        'megabytes_per_second': input_size / time_elapsed / (1024 * 1024),
+        'number_of_records': number_of_records,
+        'number_of_structures': number_of_structures,
+        'peak_rss': GetPeakRSS(),
+        'records_per_second': number_of_records / time_elapsed,
+        'size': input_size,
+        'time': time_elapsed}
+
+
+class ThrottledOutputStream(object):
+  """Output stream that accepts a limited number of characters per second.
+
+  Writing blocks the writing thread, without holding the global interpreter
+  lock, for the time the characters take at the throughput.
+
+  Attributes:
+    size (int): number of characters written.
+  """
+
+  def __init__(self, throughput):
+    """Initializes a throttled output stream.
+
+    Args:
+      throughput (int): number of characters per second the stream accepts.
+    """
+    super(ThrottledOutputStream, self).__init__()
+    self._throughput = throughput
+    self.size = 0
+
+  def flush(self):
+    """Flushes the output stream."""
+    return
+
+  def write(self, text):
+    """Writes text to the output stream.
+
+    Args:
+      text (str): text to write.
+
+    Returns:
+      int: number of characters written.
+    """
+    time.sleep(len(text) / self._throughput)
+    self.size += len(text)
+    return len(text)
+
+
+def GetPeakRSS():
+  """Retrieves the peak resident set size (RSS) of the current process.
+
+  Returns:
+    int: peak resident set size in bytes or None if not available.
+  """
+  if not resource:
+    return None
+
+  maximum_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+  # On Mac OS the maximum resident set size is in bytes, on other platforms
+  # in kilobytes.
+  if sys.platform != 'darwin':
+    maximum_rss *= 1024
+
+  return maximum_rss
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Definitions of the data format benchmarks."""
+
+import os
+
+from benchmarks import benchmark_lib
+
+from dtformats import asl
+from dtformats import bsm
+from dtformats import carver
+from dtformats import chrome_cache
+from dtformats import cpio
+from dtformats import cups_ipp
+from dtformats import firefox_cache1
+from dtformats import gzipfile
+from dtformats import job
+from dtformats import keychain
+from dtformats import output_writers
+from dtformats import recycler
+from dtformats import rp_log
+from dtformats import safari_cookies
+from dtformats import spotlight_storedb
+from dtformats import synthetic
+from dtformats import systemd
+from dtformats import tzif
+from dtformats import unified_logging
+from dtformats import usn_journal
+from dtformats import utmp
+from dtformats import wemf
+from dtformats import wmi_repository
+
+
+TEST_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_data')
+
+
+def _GetTestDataPath(*path_segments):
+  """Retrieves the path of a test data file.
+
+  Args:
+    path_segments (list[str]): path segments inside the test data directory.
+
+  Returns:
+    str: path of the test data file.
+  """
+  return os.path.join(TEST_DATA_PATH, *path_segments)
+
+
+BENCHMARKS = [
+    benchmark_lib.ParserBenchmark(
+        'asl', asl.AppleSystemLogFile,
+        test_data_path=_GetTestDataPath('applesystemlog.asl')),
+    benchmark_lib.ParserBenchmark(
+        'bsm', bsm.BSMEventAuditingFile,
+        synthetic_generator=synthetic.BSMEventAuditingGenerator(),
+        test_data_path=_GetTestDataPath('apple.bsm')),
+    benchmark_lib.OutputWriterBenchmark(
+        'buffered_output_writer', output_writers.BufferedStdoutWriter,
+        systemd.SystemdJournalFile,
+        synthetic_generator=synthetic.SystemdJournalGenerator()),
+    benchmark_lib.CarverBenchmark(
+        'carver', carver.FORMAT_CLASSES,
+        synthetic_generator=benchmark_lib.CarvingCandidatesGenerator()),
+    benchmark_lib.CarverBenchmark(
+        'carver_systemd', [systemd.SystemdJournalFile],
+        synthetic_generator=benchmark_lib.CarvingCandidatesGenerator()),
+    benchmark_lib.ParserBenchmark(
+        'chrome_cache_data_block', chrome_cache.DataBlockFile,
+        synthetic_filename='data_1',
+        synthetic_generator=synthetic.ChromeCacheGenerator(),
+        test_data_path=_GetTestDataPath('chrome_cache', 'data_1')),
+    benchmark_lib.ParserBenchmark(
+        'chrome_cache_index', chrome_cache.IndexFile,
+        synthetic_filename='index',
+        synthetic_generator=synthetic.ChromeCacheGenerator(),
+        test_data_path=_GetTestDataPath('chrome_cache', 'index')),
+    benchmark_lib.ParserBenchmark(
+        'cpio_newc', cpio.CPIOArchiveFile,
+        synthetic_generator=synthetic.CPIOArchiveGenerator(file_format='newc'),
+        test_data_path=_GetTestDataPath('cpio', 'syslog.newc.cpio')),
+    benchmark_lib.ParserBenchmark(
+        'cpio_odc', cpio.CPIOArchiveFile,
+        synthetic_generator=synthetic.CPIOArchiveGenerator(file_format='odc'),
+        test_data_path=_GetTestDataPath('cpio', 'syslog.odc.cpio')),
+    benchmark_lib.ParserBenchmark(
+        'cups_ipp', cups_ipp.CupsIppFile,
+        test_data_path=_GetTestDataPath('cups_ipp_2.0')),
+    benchmark_lib.ParserBenchmark(
+        'emf', wemf.EMFFile,
+        test_data_path=_GetTestDataPath('Memo.emf')),
+    benchmark_lib.ParserBenchmark(
+        'firefox_cache1_map', firefox_cache1.CacheMapFile,
+        synthetic_generator=synthetic.FirefoxCache1MapGenerator(),
+        test_data_path=_GetTestDataPath('firefox_cache1', '_CACHE_MAP_')),
+    benchmark_lib.ParserBenchmark(
+        'gzipfile', gzipfile.GZipFile,
+        synthetic_generator=synthetic.GZipGenerator(),
+        test_data_path=_GetTestDataPath('syslog.gz')),
+    benchmark_lib.ParserBenchmark(
+        'job', job.WindowsTaskSchedulerJobFile,
+        test_data_path=_GetTestDataPath('wintask.job')),
+    benchmark_lib.ParserBenchmark(
+        'keychain', keychain.KeychainDatabaseFile,
+        test_data_path=_GetTestDataPath('login.keychain')),
+    benchmark_lib.ParserBenchmark(
+        'recycler', recycler.RecyclerInfo2File,
+        test_data_path=_GetTestDataPath('INFO2')),
+    benchmark_lib.ParserBenchmark(
+        'rp_log', rp_log.RestorePointLogFile,
+        test_data_path=_GetTestDataPath('rp.log')),
+    benchmark_lib.ParserBenchmark(
+        'safari_cookies', safari_cookies.BinaryCookiesFile,
+        test_data_path=_GetTestDataPath('Cookies.binarycookies')),
+    benchmark_lib.ParserBenchmark(
+        'spotlight_storedb', spotlight_storedb.AppleSpotlightStoreDatabaseFile),
+    benchmark_lib.ParserBenchmark(
+        'systemd', systemd.SystemdJournalFile,
+        synthetic_generator=synthetic.SystemdJournalGenerator()),
+    benchmark_lib.OutputWriterBenchmark(
+        'threaded_output_writer', output_writers.ThreadedStdoutWriter,
+        systemd.SystemdJournalFile,
+        synthetic_generator=synthetic.SystemdJournalGenerator()),
+    benchmark_lib.ParserBenchmark(
+        'tzif', tzif.TimeZoneInformationFile,
+        test_data_path=_GetTestDataPath('localtime.tzif')),
+    benchmark_lib.ParserBenchmark(
+        'unified_logging_dsc', unified_logging.DSCFile,
+        test_data_path=_GetTestDataPath('uuidtext', 'dsc', 'dsc-version2')),
+    benchmark_lib.ParserBenchmark(
+        'unified_logging_tracev3', unified_logging.TraceV3File,
+        test_data_path=_GetTestDataPath('0000000000000030.tracev3')),
+    benchmark_lib.ParserBenchmark(
+        'usn_journal', usn_journal.USNRecords, read_method_name='ReadRecords',
+        synthetic_generator=synthetic.USNRecordsGenerator()),
+    benchmark_lib.ParserBenchmark(
+        'utmp_linux_libc6', utmp.LinuxLibc6UtmpFile,
+        synthetic_generator=synthetic.LinuxLibc6UtmpGenerator(),
+        test_data_path=_GetTestDataPath('utmp-linux_libc6')),
+    benchmark_lib.ParserBenchmark(
+        'utmpx_macosx', utmp.MacOSXUtmpxFile,
+        synthetic_generator=synthetic.MacOSXUtmpxGenerator(),
+        test_data_path=_GetTestDataPath('utmpx-macosx10.5')),
+    benchmark_lib.ParserBenchmark(
+        'wmf', wemf.WMFFile,
+        test_data_path=_GetTestDataPath('grid.wmf')),
+    benchmark_lib.ParserBenchmark(
+        'wmi_repository', wmi_repository.CIMRepository,
+        test_data_path=_GetTestDataPath('cim', 'INDEX.BTR'))]
+
+
+def RunBenchmark(name, path):
+  """Runs a benchmark.
+
+  This function is defined at module level so that it can be run in a child
+  process, which isolates the peak resident set size (RSS) per benchmark.
+
+  Args:
+    name (str): name of the benchmark.
+    path (str): path of the input.
+
+  Returns:
+    dict[str, object]: measurements of the benchmark.
+
+  Raises:
+    KeyError: if there is no benchmark with the name.
+  """
+  benchmarks_per_name = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+  return benchmarks_per_name[name].Run(path)
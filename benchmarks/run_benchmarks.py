@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the data format parsers."""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+# Change PYTHONPATH to include dtformats and the benchmarks.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from benchmarks import definitions
+
+from dtformats import errors
+
+
+_SIZE_SUFFIXES = {
+    'B': 1,
+    'KB': 1024,
+    'MB': 1024 * 1024,
+    'GB': 1024 * 1024 * 1024}
+
+
+def _GetGitCommit():
+  """Retrieves the git commit of the source tree.
+
+  Returns:
+    str: git commit or None if not available.
+  """
+  try:
+    output = subprocess.check_output(
+        ['git', 'rev-parse', 'HEAD'], cwd=definitions.TEST_DATA_PATH,
+        stderr=subprocess.DEVNULL)
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+  return output.decode('ascii').strip()
+
+
+def _ParseSize(size_string):
+  """Parses a size.
+
+  Args:
+    size_string (str): size with an optional suffix, such as "10MB".
+
+  Returns:
+    int: size in bytes.
+
+  Raises:
+    ValueError: if the size is not supported.
+  """
+  size_string = size_string.strip().upper()
+  for suffix, multiplier in sorted(
+      _SIZE_SUFFIXES.items(), key=lambda item: len(item[0]), reverse=True):
+    if size_string.endswith(suffix):
+      return int(size_string[:-len(suffix)]) * multiplier
+
+  return int(size_string, 10)
+
+
+def _RunBenchmark(context, name, path):
+  """Runs a benchmark in a child process.
+
+  Args:
+    context (multiprocessing.context.BaseContext): multiprocessing context.
+    name (str): name of the benchmark.
+    path (str): path of the input.
+
+  Returns:
+    dict[str, object]: measurements of the benchmark.
+  """
+  with context.Pool(processes=1) as pool:
+    try:
+      return pool.apply(definitions.RunBenchmark, (name, path))
+
+    except (errors.ParseError, IOError, OSError, ValueError) as exception:
+      return {'error': '{0!s}'.format(exception)}
+
+
+def _WriteComparison(results, baseline_results):
+  """Writes a comparison of the throughput with that of a baseline.
+
+  Args:
+    results (list[dict[str, object]]): results of the benchmarks.
+    baseline_results (list[dict[str, object]]): results of the baseline.
+  """
+  baseline_per_key = {
+      (result['name'], result['input']): result for result in baseline_results}
+
+  print('{0:<40s} {1:>14s} {2:>14s} {3:>8s}'.format(
+      'Benchmark', 'Baseline MB/s', 'MB/s', 'Change'))
+
+  for result in results:
+    key = (result['name'], result['input'])
+    baseline_result = baseline_per_key.get(key, None)
+    if (not baseline_result or 'error' in result or
+        'error' in baseline_result):
+      continue
+
+    baseline_throughput = baseline_result['megabytes_per_second']
+    throughput = result['megabytes_per_second']
+    change = (throughput - baseline_throughput) / baseline_throughput
+
+    print('{0:<40s} {1:>14.3f} {2:>14.3f} {3:>+8.1%}'.format(
+        '{0:s} ({1:s})'.format(*key), baseline_throughput, throughput, change))
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks the data format parsers on the test data and synthetic '
+      'inputs.'))
+
+  argument_parser.add_argument(
+      '--baseline', dest='baseline', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the JSON results of a previous run to compare the '
+          'throughput with.'))
+
+  argument_parser.add_argument(
+      '--no_synthetic', '--no-synthetic', dest='no_synthetic',
+      action='store_true', default=False, help=(
+          'only benchmark the test data and not the synthetic inputs.'))
+
+  argument_parser.add_argument(
+      '--output', dest='output', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the JSON results file, where the results are written to '
+          'stdout if not set.'))
+
+  argument_parser.add_argument(
+      '--sizes', dest='sizes', action='store', default='10MB,100MB,1GB',
+      help='comma separated sizes of the synthetic inputs.')
+
+  argument_parser.add_argument(
+      '--temporary_directory', '--temporary-directory',
+      dest='temporary_directory', action='store', metavar='PATH',
+      default=None, help='directory to create the synthetic inputs in.')
+
+  argument_parser.add_argument(
+      'names', nargs='*', action='store', metavar='NAME', default=None,
+      help='names of the benchmarks to run, where all are run if not set.')
+
+  options = argument_parser.parse_args()
+
+  try:
+    sizes = [_ParseSize(size_string) for size_string in options.sizes.split(
+        ',') if size_string.strip()]
+  except ValueError:
+    print('Unsupported sizes: {0:s}'.format(options.sizes))
+    print('')
+    return False
+
+  benchmark_names = [benchmark.name for benchmark in definitions.BENCHMARKS]
+  if options.names:
+    unsupported_names = set(options.names).difference(benchmark_names)
+    if unsupported_names:
+      print('Unsupported benchmarks: {0:s}'.format(
+          ', '.join(sorted(unsupported_names))))
+      print('')
+      return False
+
+  # A child process per benchmark isolates the peak resident set size (RSS)
+  # and the state of the data format classes.
+  context = multiprocessing.get_context('spawn')
+
+  results = []
+  for benchmark in definitions.BENCHMARKS:
+    if options.names and benchmark.name not in options.names:
+      continue
+
+    inputs = []
+    if benchmark.test_data_path:
+      inputs.append(None)
+
+    if benchmark.synthetic_generator and not options.no_synthetic:
+      inputs.extend(sizes)
+
+    if not inputs:
+      print('Skipping: {0:s} no input available.'.format(benchmark.name),
+            file=sys.stderr)
+
+    for size in inputs:
+      if size is None:
+        input_description = 'test_data'
+      else:
+        input_description = 'synthetic_{0:d}'.format(size)
+
+      print('Running: {0:s} ({1:s})'.format(
+          benchmark.name, input_description), file=sys.stderr)
+
+      if size is None:
+        result = _RunBenchmark(
+            context, benchmark.name, benchmark.test_data_path)
+
+      else:
+        with tempfile.TemporaryDirectory(
+            dir=options.temporary_directory) as temporary_directory:
+          path = os.path.join(temporary_directory, benchmark.name)
+          benchmark.synthetic_generator.Generate(path, size)
+          if benchmark.synthetic_filename:
+            path = os.path.join(path, benchmark.synthetic_filename)
+
+          result = _RunBenchmark(context, benchmark.name, path)
+
+      result['input'] = input_description
+      result['name'] = benchmark.name
+
+      results.append(result)
+
+  output = {
+      'git_commit': _GetGitCommit(),
+      'platform': platform.platform(),
+      'python_version': platform.python_version(),
+      'results': results,
+      'timestamp': datetime.datetime.utcnow().isoformat()}
+
+  if options.output:
+    with open(options.output, 'w', encoding='utf-8') as file_object:
+      json.dump(output, file_object, indent=2, sort_keys=True)
+  else:
+    json.dump(output, sys.stdout, indent=2, sort_keys=True)
+    print('')
+
+  if options.baseline:
+    with open(options.baseline, 'r', encoding='utf-8') as file_object:
+      baseline_output = json.load(file_object)
+
+    _WriteComparison(results, baseline_output.get('results', []))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
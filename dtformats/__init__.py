@@ -2,3 +2,14 @@
 """Data formats."""
 
 __version__ = '20220806'
+
+
+def aparse(path, format_class=None, executor=None, maximum_queue_size=1024):
+  """Parses a file asynchronously, see dtformats.async_parser.aparse."""
+  # The asynchronous parser imports all the data formats, which is deferred
+  # until it is used.
+  from dtformats import async_parser  # pylint: disable=import-outside-toplevel
+
+  return async_parser.aparse(
+      path, format_class=format_class, executor=executor,
+      maximum_queue_size=maximum_queue_size)
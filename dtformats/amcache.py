@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 """Windows AMCache (AMCache.hve) files."""
 
-import pyregf
-
 from dtformats import data_format
 from dtformats import errors
 
@@ -230,6 +228,8 @@ class WindowsAMCacheFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
+    import pyregf  # pylint: disable=import-outside-toplevel
+
     regf_file = pyregf.file()
     regf_file.open_file_object(file_object)
 
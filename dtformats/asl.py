@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """Apple System Log (ASL) files."""
 
+import os
+import re
+
 from dtformats import data_format
 from dtformats import errors
 
@@ -10,7 +13,22 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('asl.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('asl.yaml')
+
+  # Records are carved by a written time between 1999 and 2038, nanoseconds
+  # of less than 1000000000 and an alert level of 0 to 7, which start at
+  # offset 22 of a record.
+  CARVING_OFFSET = 22
+
+  CARVING_PATTERN = re.compile(
+      rb'\x00\x00\x00\x00[\x38-\x7f].{3}[\x00-\x3b].{3}\x00[\x00-\x07]',
+      re.DOTALL)
+
+  SIGNATURES = [(0, b'ASL DB\x00\x00\x00\x00\x00\x00')]
+
+  SUPPORTS_CHECKPOINTS = True
+
+  _MAXIMUM_CARVED_RECORD_SIZE = 64 * 1024
 
   # Most significant bit of a 64-bit string offset.
   _STRING_OFFSET_MSB = 1 << 63
@@ -92,6 +110,64 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
     """
     return stream.decode('ascii').replace('\x00', '\\x00')
 
+  def _GetResumeOffset(self, file_object, checkpoint, file_identity):
+    """Retrieves the offset to resume reading records from a checkpoint.
+
+    Args:
+      file_object (file): file-like object.
+      checkpoint (Checkpoint): checkpoint.
+      file_identity (str): identity of the file.
+
+    Returns:
+      int: offset of the first record to read, 0 if there is no record after
+          the last record read or None if reading cannot be resumed from
+          the checkpoint.
+    """
+    if checkpoint.file_identity != file_identity or checkpoint.offset <= 0:
+      return None
+
+    if checkpoint.offset >= self._file_size:
+      return None
+
+    data_type_map = self._GetDataTypeMap('asl_record')
+
+    try:
+      record, _ = self._ReadStructureFromFileObject(
+          file_object, checkpoint.offset, data_type_map, 'record')
+    except errors.ParseError:
+      return None
+
+    if record.message_identifier != checkpoint.sequence_number:
+      return None
+
+    # The strings of the next record are stored after the last record read.
+    file_object.seek(checkpoint.offset + record.data_size + 6, os.SEEK_SET)
+
+    return record.next_record_offset
+
+  def _ReadCarvedRecordString(self, file_object, string_offset):
+    """Reads a record string of a carved record.
+
+    A string that is not stored inline is stored at an offset relative to
+    the start of the file, which is not known for a carved record.
+
+    Args:
+      file_object (file): file-like object.
+      string_offset (int): offset of the string relative to the start of
+          the file.
+
+    Returns:
+      str: record string or None if string offset is 0 or the string is not
+          stored inline.
+
+    Raises:
+      ParseError: if the record string cannot be read.
+    """
+    if not string_offset & self._STRING_OFFSET_MSB:
+      return None
+
+    return self._ReadRecordString(file_object, string_offset)
+
   def _ReadFileHeader(self, file_object):
     """Reads the file header.
 
@@ -114,28 +190,34 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
     return file_header
 
-  def _ReadRecord(self, file_object, file_offset):
+  def _ReadRecord(self, file_object, file_offset, carved=False):
     """Reads a record.
 
     Args:
       file_object (file): file-like object.
       file_offset (int): offset of the record relative to the start of the file.
+      carved (Optional[bool]): True if the record is carved from raw data,
+          in which case the record is validated and only strings that are
+          stored inline are read.
 
     Returns:
-      int: next record offset.
+      asl_record: record.
 
     Raises:
       ParseError: if the record cannot be read.
     """
-    record_strings_data_offset = file_object.tell()
-    record_strings_data_size = file_offset - record_strings_data_offset
+    record_offset = file_offset
 
-    record_strings_data = self._ReadData(
-        file_object, record_strings_data_offset, record_strings_data_size,
-        'record strings data')
+    if not carved:
+      record_strings_data_offset = file_object.tell()
+      record_strings_data_size = file_offset - record_strings_data_offset
 
-    if self._debug:
-      self._DebugPrintData('Record strings data', record_strings_data)
+      record_strings_data = self._ReadData(
+          file_object, record_strings_data_offset, record_strings_data_size,
+          'record strings data')
+
+      if self._debug:
+        self._DebugPrintData('Record strings data', record_strings_data)
 
     data_type_map = self._GetDataTypeMap('asl_record')
 
@@ -145,20 +227,28 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintStructureObject(record, self._DEBUG_INFO_RECORD)
 
-    hostname = self._ReadRecordString(
-        file_object, record.hostname_string_offset)
+    additional_data_size = record.data_size + 6 - record_data_size
+
+    if carved:
+      if (record.unknown1 != 0 or record.written_time > 0x7fffffff or
+          record.written_time_nanoseconds >= 1000000000 or
+          record.alert_level > 7):
+        raise errors.ParseError('Invalid record values.')
 
-    sender = self._ReadRecordString(
-        file_object, record.sender_string_offset)
+      if (additional_data_size < 8 or
+          record.data_size > self._MAXIMUM_CARVED_RECORD_SIZE):
+        raise errors.ParseError('Invalid record data size.')
 
-    facility = self._ReadRecordString(
-        file_object, record.facility_string_offset)
+      read_string = self._ReadCarvedRecordString
+    else:
+      read_string = self._ReadRecordString
 
-    message = self._ReadRecordString(
-        file_object, record.message_string_offset)
+    hostname = read_string(file_object, record.hostname_string_offset)
+    sender = read_string(file_object, record.sender_string_offset)
+    facility = read_string(file_object, record.facility_string_offset)
+    message = read_string(file_object, record.message_string_offset)
 
     file_offset += record_data_size
-    additional_data_size = record.data_size + 6 - record_data_size
 
     if additional_data_size % 8 != 0:
       raise errors.ParseError('Invalid record additional data size.')
@@ -177,11 +267,8 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
       file_offset += 16
 
-      name = self._ReadRecordString(
-          file_object, record_extra_field.name_string_offset)
-
-      value = self._ReadRecordString(
-          file_object, record_extra_field.value_string_offset)
+      name = read_string(file_object, record_extra_field.name_string_offset)
+      value = read_string(file_object, record_extra_field.value_string_offset)
 
       if name is not None:
         extra_fields[name] = value
@@ -199,7 +286,27 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
     # TODO: implement print previous record offset
 
-    return record.next_record_offset
+    if self._record_output_writer:
+      self._WriteRecord('asl_record', {
+          'alert_level': record.alert_level,
+          'extra_fields': extra_fields,
+          'facility': facility,
+          'flags': record.flags,
+          'group_identifier': record.group_identifier,
+          'hostname': hostname,
+          'message': message,
+          'message_identifier': record.message_identifier,
+          'offset': record_offset,
+          'process_identifier': record.process_identifier,
+          'real_group_identifier': record.real_group_identifier,
+          'real_user_identifier': record.real_user_identifier,
+          'reference_process_identifier': record.reference_process_identifier,
+          'sender': sender,
+          'user_identifier': record.user_identifier,
+          'written_time': record.written_time,
+          'written_time_nanoseconds': record.written_time_nanoseconds})
+
+    return record
 
   def _ReadRecordExtraField(self, byte_stream, file_offset):
     """Reads a record extra field.
@@ -296,20 +403,70 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
     return record_string.string.rstrip('\x00')
 
-  def ReadFileObject(self, file_object):
+  def CarveRecord(self, file_object, file_offset):
+    """Carves a record from raw data, such as unallocated space.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the candidate record relative to the start
+          of the file-like object.
+
+    Returns:
+      int: size of the record.
+
+    Raises:
+      ParseError: if no valid record was found at the offset.
+    """
+    record = self._ReadRecord(file_object, file_offset, carved=True)
+
+    return record.data_size + 6
+
+  def ReadFileObject(self, file_object, checkpoint=None):
     """Reads an Apple System Log file-like object.
 
+    Since an Apple System Log file is appended to, reading can be resumed
+    after the last record read by a previous read, where the sequence number
+    of the checkpoint is the message identifier of the record.
+
     Args:
       file_object (file): file-like object.
+      checkpoint (Optional[Checkpoint]): checkpoint to resume reading from,
+          where None represents the file should be read from the start. If
+          the file was replaced it is read from the start.
 
     Raises:
       ParseError: if the file cannot be read.
     """
     file_header = self._ReadFileHeader(file_object)
 
-    if file_header.first_log_entry_offset > 0:
+    # The first log entry offset and the last log entry offset of the file
+    # header change when records are added.
+    identity_string = '{0:d}:{1:d}'.format(
+        file_header.format_version, file_header.creation_time)
+    file_identity = self._GetFileIdentity(
+        file_header.signature + identity_string.encode('ascii'))
+
+    file_offset = None
+    if checkpoint:
+      file_offset = self._GetResumeOffset(
+          file_object, checkpoint, file_identity)
+
+    if file_offset is None:
+      self._checkpoint = None
       file_offset = file_header.first_log_entry_offset
-      while file_offset < self._file_size:
-        file_offset = self._ReadRecord(file_object, file_offset)
-        if file_offset == 0:
-          break
+    else:
+      self._checkpoint = checkpoint
+
+    record = None
+    try:
+      while 0 < file_offset < self._file_size:
+        record = self._ReadRecord(file_object, file_offset)
+        record_offset = file_offset
+        file_offset = record.next_record_offset
+
+    finally:
+      # The checkpoint is set to the last record that was read completely.
+      if record:
+        self._checkpoint = data_format.Checkpoint(
+            file_identity=file_identity, offset=record_offset,
+            sequence_number=record.message_identifier)
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""Asynchronous (asyncio) parsing of files."""
+
+import asyncio
+import concurrent.futures
+import threading
+import weakref
+
+from dtformats import batch
+from dtformats import errors
+from dtformats import output_writers
+
+
+# Item that marks the end of the records on a queue.
+_END_OF_RECORDS = object()
+
+# Maximum number of files that are parsed concurrently by aparse.
+_APARSE_MAXIMUM_NUMBER_OF_CONCURRENT_PARSES = 4
+
+# Interval, in seconds, at which a worker thread that waits for room on
+# a queue checks if the parse was cancelled or the event loop was closed.
+_PUT_ITEM_POLL_INTERVAL = 0.1
+
+
+class _ParseCancelledError(Exception):
+  """Error raised in a worker thread to stop a cancelled parse."""
+
+
+class _QueueOutputWriter(output_writers.RecordOutputWriter):
+  """Record output writer that passes records to an asyncio queue.
+
+  The output writer is used from a worker thread. Writing a record blocks
+  the worker thread while the queue is full, which applies backpressure on
+  the parser.
+  """
+
+  def __init__(self, event_loop, queue):
+    """Initializes a queue output writer.
+
+    Args:
+      event_loop (asyncio.AbstractEventLoop): event loop of the queue.
+      queue (asyncio.Queue): queue to pass the records to.
+    """
+    super(_QueueOutputWriter, self).__init__()
+    self._event_loop = event_loop
+    self._queue = queue
+    self.cancelled = threading.Event()
+
+  def _PutItem(self, item):
+    """Puts an item on the queue and waits until there is room for it.
+
+    Args:
+      item (object): item.
+
+    Raises:
+      _ParseCancelledError: if the parse was cancelled or the event loop was
+          closed.
+    """
+    if self.cancelled.is_set() or self._event_loop.is_closed():
+      raise _ParseCancelledError()
+
+    coroutine = self._queue.put(item)
+    try:
+      future = asyncio.run_coroutine_threadsafe(coroutine, self._event_loop)
+    except RuntimeError:
+      # The event loop was closed after it was checked.
+      coroutine.close()
+      raise _ParseCancelledError()
+
+    # The event loop can be closed without stopping the parse, for example
+    # when an iteration that was not closed is never finalized, in which case
+    # the item would never be put on the queue.
+    while True:
+      try:
+        future.result(timeout=_PUT_ITEM_POLL_INTERVAL)
+        return
+
+      except concurrent.futures.TimeoutError:
+        if self.cancelled.is_set() or self._event_loop.is_closed():
+          future.cancel()
+          raise _ParseCancelledError()
+
+  def Close(self):
+    """Closes the output writer object."""
+    return
+
+  def WriteEndOfRecords(self):
+    """Writes the end of the records to the queue.
+
+    Raises:
+      _ParseCancelledError: if the parse was cancelled.
+    """
+    self._PutItem(_END_OF_RECORDS)
+
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+
+    Raises:
+      _ParseCancelledError: if the parse was cancelled.
+    """
+    self._PutItem((record_type, values))
+
+
+def _RetrieveException(future):
+  """Retrieves the exception of a done future, so that it is not logged.
+
+  Args:
+    future (asyncio.Future): future.
+  """
+  if not future.cancelled():
+    future.exception()
+
+
+def _ParseFileWithOutputWriter(path, format_class, output_writer):
+  """Parses a file in a worker thread.
+
+  Args:
+    path (str): path of the file.
+    format_class (type): data format class.
+    output_writer (_QueueOutputWriter): output writer to write the records
+        to.
+  """
+  try:
+    parser_object = format_class(output_writer=output_writer)
+    parser_object.Open(path)
+    parser_object.Close()
+
+  finally:
+    try:
+      output_writer.WriteEndOfRecords()
+    except _ParseCancelledError:
+      pass
+
+
+class AsyncParser(object):
+  """Parses files from asyncio code without blocking the event loop.
+
+  The data formats are run in an executor and their records are passed to
+  the event loop as they are read. The number of files that are parsed
+  concurrently is limited, where a parse holds its slot until all its
+  records have been consumed or the iteration is stopped.
+
+  Example:
+    async_parser = AsyncParser(maximum_number_of_concurrent_parses=8)
+
+    async for record_type, values in async_parser.Parse(path):
+      ...
+  """
+
+  def __init__(
+      self, executor=None, maximum_number_of_concurrent_parses=4,
+      maximum_queue_size=1024):
+    """Initializes an asynchronous parser.
+
+    Args:
+      executor (Optional[concurrent.futures.Executor]): executor to run the
+          data formats in, where None represents the default executor of the
+          event loop. With a concurrent.futures.ProcessPoolExecutor the
+          records of a file are passed to the event loop after the file has
+          been parsed, instead of as they are read.
+      maximum_number_of_concurrent_parses (Optional[int]): maximum number of
+          files that are parsed concurrently.
+      maximum_queue_size (Optional[int]): maximum number of records that are
+          queued per file before the data format waits for the records to be
+          consumed.
+
+    Raises:
+      ValueError: if the maximum number of concurrent parses or the maximum
+          queue size is not supported.
+    """
+    if maximum_number_of_concurrent_parses < 1:
+      raise ValueError(
+          'Unsupported maximum number of concurrent parses: {0:d}'.format(
+              maximum_number_of_concurrent_parses))
+
+    if maximum_queue_size < 1:
+      raise ValueError('Unsupported maximum queue size: {0:d}'.format(
+          maximum_queue_size))
+
+    super(AsyncParser, self).__init__()
+    self._executor = executor
+    self._maximum_number_of_concurrent_parses = (
+        maximum_number_of_concurrent_parses)
+    self._maximum_queue_size = maximum_queue_size
+    # The semaphores are removed when their event loop is garbage collected.
+    self._semaphores_per_event_loop = weakref.WeakKeyDictionary()
+
+  def _GetSemaphore(self, event_loop):
+    """Retrieves the semaphore that limits the concurrent parses.
+
+    The semaphore is created per event loop, since an asyncio semaphore can
+    only be used by the event loop it was created for.
+
+    Args:
+      event_loop (asyncio.AbstractEventLoop): event loop.
+
+    Returns:
+      asyncio.Semaphore: semaphore.
+    """
+    semaphore = self._semaphores_per_event_loop.get(event_loop, None)
+    if not semaphore:
+      semaphore = asyncio.Semaphore(self._maximum_number_of_concurrent_parses)
+      self._semaphores_per_event_loop[event_loop] = semaphore
+
+    return semaphore
+
+  async def _ParseInProcess(self, event_loop, path, format_class):
+    """Parses a file in a worker process.
+
+    Args:
+      event_loop (asyncio.AbstractEventLoop): event loop.
+      path (str): path of the file.
+      format_class (type): data format class.
+
+    Returns:
+      list[tuple[str, dict[str, object]]]: record types and values of
+          the records.
+
+    Raises:
+      ParseError: if the file cannot be parsed.
+    """
+    result = await event_loop.run_in_executor(
+        self._executor, batch.ParseFile, path, format_class)
+    if result.error:
+      raise errors.ParseError(result.error)
+
+    return result.records
+
+  async def _StopParseInThread(self, future, queue, output_writer):
+    """Stops a parse in a worker thread whose records are no longer consumed.
+
+    Args:
+      future (asyncio.Future): future of the worker thread.
+      queue (asyncio.Queue): queue of the records.
+      output_writer (_QueueOutputWriter): output writer of the worker thread.
+    """
+    # Retrieve the exception of the worker thread, if any, when it is done,
+    # since it is superseded by stopping the parse. A callback is used since
+    # this coroutine is cancelled when it runs in the finalizer of an
+    # iteration that was stopped with break and the event loop is shut down,
+    # for example by asyncio.run().
+    future.add_done_callback(_RetrieveException)
+
+    # Stop the worker thread on its next record and drain the queue so that
+    # a worker thread waiting for room on the queue is released.
+    output_writer.cancelled.set()
+    while not future.done():
+      while not queue.empty():
+        queue.get_nowait()
+
+      await asyncio.wait([future], timeout=0.01)
+
+  async def Parse(self, path, format_class=None):
+    """Parses a file.
+
+    An iteration that is stopped before all the records are consumed should
+    be closed with aclose(), which stops the data format.
+
+    Args:
+      path (str): path of the file.
+      format_class (Optional[type]): data format class, where None represents
+          the format should be detected by signature or filename.
+
+    Yields:
+      tuple[str, dict[str, object]]: record type and values of a record.
+
+    Raises:
+      ParseError: if the format is not supported or the file cannot be
+          parsed.
+    """
+    event_loop = asyncio.get_running_loop()
+    semaphore = self._GetSemaphore(event_loop)
+
+    async with semaphore:
+      if not format_class:
+        format_class = await event_loop.run_in_executor(
+            None, batch.GetFormatClass, path)
+
+      if not format_class:
+        raise errors.ParseError('Unsupported format.')
+
+      if isinstance(self._executor, concurrent.futures.ProcessPoolExecutor):
+        records = await self._ParseInProcess(event_loop, path, format_class)
+        for record in records:
+          yield record
+
+        return
+
+      queue = asyncio.Queue(maxsize=self._maximum_queue_size)
+      output_writer = _QueueOutputWriter(event_loop, queue)
+
+      future = event_loop.run_in_executor(
+          self._executor, _ParseFileWithOutputWriter, path, format_class,
+          output_writer)
+
+      try:
+        while True:
+          record = await queue.get()
+          if record is _END_OF_RECORDS:
+            break
+
+          yield record
+
+        await future
+
+      finally:
+        if not future.done():
+          await self._StopParseInThread(future, queue, output_writer)
+
+  def ShareConcurrencyLimit(self, async_parser):
+    """Shares the limit of concurrent parses with another asynchronous parser.
+
+    The files parsed by both asynchronous parsers count towards the maximum
+    number of concurrent parses of the other asynchronous parser.
+
+    Args:
+      async_parser (AsyncParser): asynchronous parser to share the limit of.
+    """
+    # pylint: disable=protected-access
+    self._maximum_number_of_concurrent_parses = (
+        async_parser._maximum_number_of_concurrent_parses)
+    self._semaphores_per_event_loop = async_parser._semaphores_per_event_loop
+
+
+# The asynchronous parser of aparse, which is shared by all calls so that
+# the number of files that are parsed concurrently is limited.
+_aparse_async_parser = None
+
+
+# The lower case name follows the naming of asynchronous functions in
+# the Python standard library, such as anext.
+def aparse(  # pylint: disable=invalid-name
+    path, format_class=None, executor=None, maximum_queue_size=1024):
+  """Parses a file asynchronously.
+
+  All calls share an asynchronous parser, where at most 4 files are parsed
+  concurrently per event loop. A call with an executor or maximum queue size
+  other than the defaults uses a separate asynchronous parser that shares
+  this limit.
+
+  Example:
+    async for record_type, values in aparse(path):
+      ...
+
+  Args:
+    path (str): path of the file.
+    format_class (Optional[type]): data format class, where None represents
+        the format should be detected by signature or filename.
+    executor (Optional[concurrent.futures.Executor]): executor to run the
+        data format in, where None represents the default executor of the
+        event loop.
+    maximum_queue_size (Optional[int]): maximum number of records that are
+        queued before the data format waits for the records to be consumed.
+
+  Returns:
+    AsyncGenerator[tuple[str, dict[str, object]]]: record types and values
+        of the records.
+  """
+  global _aparse_async_parser  # pylint: disable=global-statement
+
+  if not _aparse_async_parser:
+    _aparse_async_parser = AsyncParser(
+        maximum_number_of_concurrent_parses=(
+            _APARSE_MAXIMUM_NUMBER_OF_CONCURRENT_PARSES))
+
+  async_parser = _aparse_async_parser
+  if executor is not None or maximum_queue_size != 1024:
+    async_parser = AsyncParser(
+        executor=executor, maximum_number_of_concurrent_parses=(
+            _APARSE_MAXIMUM_NUMBER_OF_CONCURRENT_PARSES),
+        maximum_queue_size=maximum_queue_size)
+    async_parser.ShareConcurrencyLimit(_aparse_async_parser)
+
+  return async_parser.Parse(path, format_class=format_class)
@@ -0,0 +1,583 @@
+# -*- coding: utf-8 -*-
+"""Batch parsing of many files with a pool of worker processes."""
+
+import collections
+import concurrent.futures
+import fnmatch
+import os
+
+from dtformats import asl
+from dtformats import chrome_cache
+from dtformats import cpio
+from dtformats import data_format
+from dtformats import format_detector
+from dtformats import gzipfile
+from dtformats import job
+from dtformats import jump_list
+from dtformats import keychain
+from dtformats import output_writers
+from dtformats import profiler
+from dtformats import recycle_bin
+from dtformats import recycler
+from dtformats import rp_change_log
+from dtformats import safari_cookies
+from dtformats import spotlight_storedb
+from dtformats import systemd
+from dtformats import tzif
+from dtformats import unified_logging
+from dtformats import utmp
+from dtformats import wemf
+
+
+# Data formats that can be identified by a signature. Formats without
+# a distinctive signature, such as BSM, Linux utmp and Windows Recycle Bin
+# metadata files, are not detected by signature.
+FORMAT_CLASSES = [
+    asl.AppleSystemLogFile,
+    chrome_cache.DataBlockFile,
+    chrome_cache.IndexFile,
+    cpio.CPIOArchiveFile,
+    gzipfile.GZipFile,
+    keychain.KeychainDatabaseFile,
+    rp_change_log.RestorePointChangeLogFile,
+    safari_cookies.BinaryCookiesFile,
+    spotlight_storedb.AppleSpotlightStoreDatabaseFile,
+    systemd.SystemdJournalFile,
+    tzif.TimeZoneInformationFile,
+    unified_logging.DSCFile,
+    unified_logging.TraceV3File,
+    unified_logging.UUIDTextFile,
+    utmp.MacOSXUtmpxFile,
+    wemf.EMFFile,
+    wemf.WMFFile]
+
+# Data formats that are identified by their filename when no signature
+# matches, where the patterns are matched case-insensitively.
+FORMAT_CLASSES_PER_FILENAME_PATTERN = [
+    ('$i*', recycle_bin.RecycleBinMetadataFile),
+    ('*.automaticdestinations-ms', jump_list.AutomaticDestinationsFile),
+    ('*.customdestinations-ms', jump_list.CustomDestinationsFile),
+    ('*.job', job.WindowsTaskSchedulerJobFile),
+    ('btmp*', utmp.LinuxLibc6UtmpFile),
+    ('info2', recycler.RecyclerInfo2File),
+    ('utmp*', utmp.LinuxLibc6UtmpFile),
+    ('wtmp*', utmp.LinuxLibc6UtmpFile)]
+
+
+class BatchResult(object):
+  """Result of parsing a file in a batch.
+
+  Attributes:
+    error (str): error message or None if the file was parsed successfully.
+    format_name (str): name of the data format class or None if the format
+        was not detected.
+    path (str): path of the file.
+    records (Iterable[tuple[str, dict[str, object]]]): record types and
+        values of the records written by the data format, which is a list
+        when the file was parsed in a worker process or a generator when
+        the records are streamed from a large file.
+  """
+
+  def __init__(self, path):
+    """Initializes a batch result.
+
+    Args:
+      path (str): path of the file.
+    """
+    super(BatchResult, self).__init__()
+    self.error = None
+    self.format_name = None
+    self.path = path
+    self.records = []
+
+
+class RecordCollector(output_writers.RecordOutputWriter):
+  """Record output writer that collects the records of a worker process.
+
+  The values of the records are reduced to built-in types, so that they can
+  be passed to the parent process.
+
+  Attributes:
+    records (list[tuple[str, dict[str, object]]]): record types and values
+        of the collected records.
+  """
+
+  def __init__(self):
+    """Initializes a record collector."""
+    super(RecordCollector, self).__init__()
+    self.records = []
+
+  def _GetBuiltInValue(self, value):
+    """Retrieves a representation of a value with built-in types.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: value or its string representation.
+    """
+    if value is None or isinstance(value, (bool, bytes, float, int, str)):
+      return value
+
+    if isinstance(value, bytearray):
+      return bytes(value)
+
+    if isinstance(value, dict):
+      return {
+          key: self._GetBuiltInValue(element)
+          for key, element in value.items()}
+
+    if isinstance(value, (list, tuple)):
+      return [self._GetBuiltInValue(element) for element in value]
+
+    return '{0!s}'.format(value)
+
+  def Close(self):
+    """Closes the output writer object."""
+    return
+
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+    """
+    self.records.append((record_type, self._GetBuiltInValue(values)))
+
+
+# Per worker process state, where the detector is created on first use and
+# reused for every following file.
+_format_detector = None
+
+
+def GetFormatClass(path):
+  """Determines the data format of a file.
+
+  Args:
+    path (str): path of the file.
+
+  Returns:
+    type: data format class or None if the format was not detected.
+
+  Raises:
+    IOError: if the file cannot be read.
+    OSError: if the file cannot be read.
+  """
+  global _format_detector  # pylint: disable=global-statement
+
+  if not _format_detector:
+    _format_detector = format_detector.FormatDetector(
+        format_classes=FORMAT_CLASSES)
+
+  format_classes = _format_detector.DetectPath(path)
+  if format_classes:
+    return format_classes[0]
+
+  filename = os.path.basename(path).lower()
+  for filename_pattern, format_class in FORMAT_CLASSES_PER_FILENAME_PATTERN:
+    if fnmatch.fnmatchcase(filename, filename_pattern):
+      return format_class
+
+  return None
+
+
+def ParseFile(path, format_class=None):
+  """Parses a file in a worker process.
+
+  Args:
+    path (str): path of the file.
+    format_class (Optional[type]): data format class, where None represents
+        the format should be detected.
+
+  Returns:
+    BatchResult: result of parsing the file.
+  """
+  result = BatchResult(path)
+
+  try:
+    if not format_class:
+      format_class = GetFormatClass(path)
+
+    if not format_class:
+      result.error = 'Unsupported format.'
+      return result
+
+    result.format_name = format_class.__name__
+
+    # A parser is created per file, since parsers keep the values read from
+    # a file, such as the entries of a jump list, until the next file is
+    # read. The dtFabric definitions are shared by the parsers of a format.
+    record_collector = RecordCollector()
+    parser_object = format_class(output_writer=record_collector)
+
+    try:
+      parser_object.Open(path)
+      parser_object.Close()
+    finally:
+      result.records = record_collector.records
+
+  # A single malformed file should not stop the batch.
+  except Exception as exception:  # pylint: disable=broad-except
+    result.error = '{0!s}'.format(exception)
+
+  return result
+
+
+def _GetStreamedRecords(result, format_class):
+  """Retrieves the records of a large file as they are read.
+
+  Args:
+    result (BatchResult): result of parsing the file, of which the error is
+        set if the file cannot be parsed.
+    format_class (type): data format class.
+
+  Yields:
+    tuple[str, dict[str, object]]: record type and values of a record.
+  """
+  # The timeline module imports this module, hence it is imported on use.
+  from dtformats import timeline  # pylint: disable=import-outside-toplevel
+
+  try:
+    for record in timeline.GetFileRecords(
+        result.path, format_class=format_class):
+      yield record
+
+  # A single malformed file should not stop the batch.
+  except Exception as exception:  # pylint: disable=broad-except
+    result.error = '{0!s}'.format(exception)
+
+
+def _ParseFiles(paths, format_class=None):
+  """Parses files in a worker process.
+
+  Args:
+    paths (list[str]): paths of the files.
+    format_class (Optional[type]): data format class, where None represents
+        the format should be detected.
+
+  Returns:
+    list[BatchResult]: results of parsing the files, in the order of the paths.
+  """
+  return [ParseFile(path, format_class=format_class) for path in paths]
+
+
+def _ParseFilesWithProfiler(paths, format_class=None):
+  """Parses files in a worker process with profiling.
+
+  Args:
+    paths (list[str]): paths of the files.
+    format_class (Optional[type]): data format class, where None represents
+        the format should be detected.
+
+  Returns:
+    tuple[list[BatchResult], dict[str, dict[str, object]]]: results of
+        parsing the files, in the order of the paths, and the profiles of
+        reading and mapping the files.
+  """
+  data_format_profiler = profiler.DataFormatProfiler()
+  data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
+  try:
+    results = _ParseFiles(paths, format_class=format_class)
+  finally:
+    data_format.BinaryDataFormat.SetProfiler(None)
+
+  return results, data_format_profiler.GetProfiles()
+
+
+class BatchParser(object):
+  """Parses many files with a pool of worker processes.
+
+  Every worker process reuses the format detector and creates a parser per
+  file. The files are submitted to the workers in tasks of several files,
+  where the number of tasks in flight is bounded, so that the paths are
+  consumed lazily and the memory used by pending results is limited.
+
+  A worker process passes all the records of a file to the parent process
+  at once, hence batch parsing is meant for many small files. A file that
+  is larger than the maximum file size is not parsed by a worker process,
+  but by the parent process, where its records are streamed as they are
+  read, like a single file is parsed.
+  """
+
+  def __init__(
+      self, data_format_profiler=None, format_class=None,
+      maximum_file_size=64 * 1024 * 1024, maximum_number_of_tasks=None,
+      maximum_number_of_workers=None, number_of_files_per_task=16,
+      ordered=True):
+    """Initializes a batch parser.
+
+    Args:
+      data_format_profiler (Optional[DataFormatProfiler]): profiler to which
+          the profiles of the worker processes are added, where None
+          represents no profiling.
+      format_class (Optional[type]): data format class to parse all files
+          with, where None represents the format of every file should be
+          detected by signature or filename.
+      maximum_file_size (Optional[int]): maximum size of a file that is
+          parsed by a worker process, where the records of a larger file are
+          streamed from the parent process.
+      maximum_number_of_tasks (Optional[int]): maximum number of tasks in
+          flight, where None represents 4 times the number of workers.
+      maximum_number_of_workers (Optional[int]): maximum number of worker
+          processes, where None represents the number of CPUs.
+      number_of_files_per_task (Optional[int]): number of files per task,
+          where more files per task reduce the overhead per file.
+      ordered (Optional[bool]): True if the results should be returned in
+          the order of the paths, False if in the order they are completed.
+
+    Raises:
+      ValueError: if the maximum file size, the maximum number of tasks or
+          workers or the number of files per task is not supported.
+    """
+    if maximum_number_of_workers is None:
+      maximum_number_of_workers = os.cpu_count() or 1
+
+    if maximum_number_of_tasks is None:
+      maximum_number_of_tasks = 4 * maximum_number_of_workers
+
+    if maximum_file_size < 1:
+      raise ValueError('Unsupported maximum file size: {0:d}'.format(
+          maximum_file_size))
+
+    if maximum_number_of_workers < 1:
+      raise ValueError('Unsupported maximum number of workers: {0:d}'.format(
+          maximum_number_of_workers))
+
+    if maximum_number_of_tasks < 1:
+      raise ValueError('Unsupported maximum number of tasks: {0:d}'.format(
+          maximum_number_of_tasks))
+
+    if number_of_files_per_task < 1:
+      raise ValueError('Unsupported number of files per task: {0:d}'.format(
+          number_of_files_per_task))
+
+    super(BatchParser, self).__init__()
+    self._data_format_profiler = data_format_profiler
+    self._format_class = format_class
+    self._maximum_file_size = maximum_file_size
+    self._maximum_number_of_tasks = maximum_number_of_tasks
+    self._maximum_number_of_workers = maximum_number_of_workers
+    self._number_of_files_per_task = number_of_files_per_task
+    self._ordered = ordered
+
+  def _GetStreamedResult(self, path):
+    """Retrieves the result of a large file of which records are streamed.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      BatchResult: result of parsing the file, where the records are read
+          when they are iterated.
+    """
+    result = BatchResult(path)
+
+    format_class = self._format_class
+    try:
+      if not format_class:
+        format_class = GetFormatClass(path)
+
+    except (IOError, OSError) as exception:
+      result.error = '{0!s}'.format(exception)
+      return result
+
+    if not format_class:
+      result.error = 'Unsupported format.'
+      return result
+
+    result.format_name = format_class.__name__
+    result.records = _GetStreamedRecords(result, format_class)
+
+    return result
+
+  def _GetTaskResults(self, future):
+    """Retrieves the results of a completed task.
+
+    Args:
+      future (concurrent.futures.Future): future of the task.
+
+    Returns:
+      list[BatchResult]: results of the task.
+    """
+    if not self._data_format_profiler:
+      return future.result()
+
+    results, profiles = future.result()
+    self._data_format_profiler.AddProfiles(profiles)
+
+    return results
+
+  def _GetTasks(self, paths):
+    """Groups paths into tasks.
+
+    A large file is a task of its own, which is preceded by the task of
+    the files before it, so that the order of the paths is kept.
+
+    Args:
+      paths (iterable[str]): paths of the files.
+
+    Yields:
+      tuple[list[str], bool]: paths of the files of a task and True if
+          the task is a large file of which the records are streamed.
+    """
+    task_paths = []
+    for path in paths:
+      if self._IsLargeFile(path):
+        if task_paths:
+          yield task_paths, False
+          task_paths = []
+
+        yield [path], True
+        continue
+
+      task_paths.append(path)
+      if len(task_paths) >= self._number_of_files_per_task:
+        yield task_paths, False
+        task_paths = []
+
+    if task_paths:
+      yield task_paths, False
+
+  def _IsLargeFile(self, path):
+    """Determines if a file is larger than the maximum file size.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      bool: True if the file is larger than the maximum file size, False if
+          not or if its size cannot be determined, in which case a worker
+          process reports the error.
+    """
+    try:
+      return os.path.getsize(path) > self._maximum_file_size
+    except OSError:
+      return False
+
+  def _WaitForResults(self, futures):
+    """Waits for the results of tasks in flight.
+
+    Args:
+      futures (collections.deque[concurrent.futures.Future]): futures of
+          the tasks in flight, in the order of submission, from which the
+          completed futures are removed.
+
+    Returns:
+      list[BatchResult]: results of the completed tasks.
+    """
+    if self._ordered:
+      return self._GetTaskResults(futures.popleft())
+
+    done_futures, _ = concurrent.futures.wait(
+        futures, return_when=concurrent.futures.FIRST_COMPLETED)
+
+    results = []
+    for future in done_futures:
+      futures.remove(future)
+      results.extend(self._GetTaskResults(future))
+
+    return results
+
+  def ParsePaths(self, paths):
+    """Parses files.
+
+    Args:
+      paths (iterable[str]): paths of the files.
+
+    Yields:
+      BatchResult: result of parsing a file.
+    """
+    futures = collections.deque()
+
+    parse_function = _ParseFiles
+    if self._data_format_profiler:
+      parse_function = _ParseFilesWithProfiler
+
+      # Large files are parsed by the parent process.
+      data_format.BinaryDataFormat.SetProfiler(self._data_format_profiler)
+
+    try:
+      with concurrent.futures.ProcessPoolExecutor(
+          max_workers=self._maximum_number_of_workers) as executor:
+        for task_paths, is_streamed in self._GetTasks(paths):
+          if is_streamed:
+            # The results of the files before the large file are returned
+            # first if the results are ordered.
+            while self._ordered and futures:
+              for result in self._WaitForResults(futures):
+                yield result
+
+            yield self._GetStreamedResult(task_paths[0])
+            continue
+
+          if len(futures) >= self._maximum_number_of_tasks:
+            for result in self._WaitForResults(futures):
+              yield result
+
+          futures.append(executor.submit(
+              parse_function, task_paths, format_class=self._format_class))
+
+        while futures:
+          for result in self._WaitForResults(futures):
+            yield result
+
+    finally:
+      if self._data_format_profiler:
+        data_format.BinaryDataFormat.SetProfiler(None)
+
+
+def GetFilePaths(paths):
+  """Retrieves the paths of files, where directories are recursed.
+
+  Args:
+    paths (iterable[str]): paths of files and directories.
+
+  Yields:
+    str: path of a file.
+  """
+  for path in paths:
+    if not os.path.isdir(path):
+      yield path
+      continue
+
+    for directory_path, directory_names, filenames in os.walk(path):
+      directory_names.sort()
+      for filename in sorted(filenames):
+        yield os.path.join(directory_path, filename)
+
+
+def WriteResults(results, output_writer):
+  """Writes batch results to a structured record output writer.
+
+  The path of the file is added to the values of every record. After the
+  records of a file a "batch_file" record is written with the format, the
+  number of records and the error, if any, of the file.
+
+  Args:
+    results (iterable[BatchResult]): results of parsing files.
+    output_writer (RecordOutputWriter): structured record output writer.
+
+  Returns:
+    int: number of files that could not be parsed.
+  """
+  number_of_errors = 0
+  for result in results:
+    number_of_records = 0
+    for record_type, values in result.records:
+      record_values = {'path': result.path}
+      record_values.update(values)
+      output_writer.WriteRecord(record_type, record_values)
+      number_of_records += 1
+
+    output_writer.WriteRecord('batch_file', {
+        'path': result.path,
+        'format': result.format_name,
+        'number_of_records': number_of_records,
+        'error': result.error})
+
+    if result.error:
+      number_of_errors += 1
+
+  return number_of_errors
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Basic Security Module (BSM) event auditing files."""
 
+import re
+
 from dtformats import data_format
 from dtformats import errors
 
@@ -10,7 +12,17 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('bsm.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('bsm.yaml')
+
+  # Event records are carved by a header token with format version 11 and
+  # a record size of less than 16 MiB. The pattern starts with the format
+  # version, which is searched for fastest.
+  CARVING_OFFSET = 5
+
+  CARVING_PATTERN = re.compile(
+      rb'\x0b(?<=[\x14\x15\x74\x79]\x00.{3}\x0b)', re.DOTALL)
+
+  SUPPORTS_CHECKPOINTS = True
 
   _EVENT_TYPES = {
       0: 'indir system call',
@@ -791,6 +803,8 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
 
   _HEADER_TOKEN_TYPES = frozenset([0x14, 0x15, 0x74, 0x79])
 
+  _MAXIMUM_CARVED_RECORD_SIZE = 1024 * 1024
+
   _TRAILER_TOKEN_TYPE = 0x13
 
   # AUT_ARG32 or AUT_ARG64 token debug information.
@@ -1091,6 +1105,98 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
     # TODO: print net type as descriptive string.
     return self._FormatIntegerAsDecimal(integer)
 
+  def _GetTokenValues(self, token):
+    """Retrieves the values of a token.
+
+    Args:
+      token (object): token.
+
+    Returns:
+      dict[str, object]: values of the token per attribute name.
+    """
+    debug_information = self._DEBUG_INFO_TOKEN.get(token.token_type, [])
+
+    values = self._GetStructureObjectValues(token, debug_information)
+    values['token_type'] = token.token_type
+
+    return values
+
+  def _GetResumeOffset(self, file_object, checkpoint, file_identity):
+    """Retrieves the offset to resume reading records from a checkpoint.
+
+    Args:
+      file_object (file): file-like object.
+      checkpoint (Checkpoint): checkpoint.
+      file_identity (str): identity of the file.
+
+    Returns:
+      int: offset of the first record to read or None if reading cannot be
+          resumed from the checkpoint.
+    """
+    if checkpoint.file_identity != file_identity or checkpoint.offset < 0:
+      return None
+
+    if checkpoint.offset >= self._file_size:
+      return None
+
+    try:
+      header_token = self._ReadHeaderToken(file_object, checkpoint.offset)
+    except errors.ParseError:
+      return None
+
+    file_offset = checkpoint.offset + header_token.record_size
+    if file_offset > self._file_size:
+      return None
+
+    return file_offset
+
+  def _ReadFileIdentity(self, file_object):
+    """Reads the identity of the file, which is the hash of the first record.
+
+    Args:
+      file_object (file): file-like object.
+
+    Returns:
+      str: file identity or None if the file is empty.
+
+    Raises:
+      ParseError: if the identity cannot be read.
+    """
+    if not self._file_size:
+      return None
+
+    header_token = self._ReadHeaderToken(file_object, 0)
+
+    data_size = min(header_token.record_size, self._file_size)
+    data = self._ReadData(file_object, 0, data_size, 'first record')
+
+    return self._GetFileIdentity(data)
+
+  def _ReadHeaderToken(self, file_object, file_offset):
+    """Reads the header token of an event record.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the token relative to the start of
+          the file-like object.
+
+    Returns:
+      object: header token.
+
+    Raises:
+      ParseError: if the header token cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('bsm_token')
+
+    token, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'header token')
+
+    if not token or token.token_type not in self._HEADER_TOKEN_TYPES:
+      raise errors.ParseError(
+          'Unsupported header token at offset: {0:d}'.format(file_offset))
+
+    return token
+
   def _ReadRecord(self, file_object, file_offset):
     """Reads an event record.
 
@@ -1112,11 +1218,21 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
       raise errors.ParseError('Unsupported format version type: {0:d}'.format(
           token.format_version))
 
+    # Note that the header token is read again as the first token of
+    # the record.
+    tokens = None
+    if self._record_output_writer:
+      tokens = []
+
+    record_offset = file_offset
     header_record_size = token.record_size
     record_end_offset = file_offset + header_record_size
     while file_offset < record_end_offset:
       token = self._ReadToken(file_object, file_offset)
 
+      if tokens is not None:
+        tokens.append(self._GetTokenValues(token))
+
       # TODO: add callback for validation (trailer) and read of more complex
       # structures.
 
@@ -1125,10 +1241,17 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
       if token.token_type == self._TRAILER_TOKEN_TYPE:
         break
 
+    if token.token_type != self._TRAILER_TOKEN_TYPE:
+      raise errors.ParseError('Missing trailer token.')
+
     if token.record_size != header_record_size:
       raise errors.ParseError(
           'Mismatch of event record size between header and trailer token.')
 
+    if tokens is not None:
+      self._WriteRecord('bsm_event', {
+          'offset': record_offset, 'tokens': tokens})
+
   def _ReadToken(self, file_object, file_offset):
     """Reads a token.
 
@@ -1179,16 +1302,73 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
 
     return token_type
 
-  def ReadFileObject(self, file_object):
+  def CarveRecord(self, file_object, file_offset):
+    """Carves an event record from raw data, such as unallocated space.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the candidate event record relative to
+          the start of the file-like object.
+
+    Returns:
+      int: size of the event record.
+
+    Raises:
+      ParseError: if no valid event record was found at the offset.
+    """
+    header_token = self._ReadHeaderToken(file_object, file_offset)
+
+    if header_token.record_size > self._MAXIMUM_CARVED_RECORD_SIZE:
+      raise errors.ParseError('Unsupported record size: {0:d}.'.format(
+          header_token.record_size))
+
+    self._ReadRecord(file_object, file_offset)
+
+    return header_token.record_size
+
+  def ReadFileObject(self, file_object, checkpoint=None):
     """Reads a BSM event auditing file.
 
+    Since an audit trail file is appended to, reading can be resumed after
+    the last record read by a previous read.
+
     Args:
       file_object (file): file-like object.
+      checkpoint (Optional[Checkpoint]): checkpoint to resume reading from,
+          where None represents the file should be read from the start. If
+          the file was replaced it is read from the start.
 
     Raises:
       ParseError: if the file cannot be read.
     """
     file_offset = file_object.tell()
-    while file_offset < self._file_size:
-      self._ReadRecord(file_object, file_offset)
-      file_offset = file_object.tell()
+    file_identity = self._ReadFileIdentity(file_object)
+
+    resume_offset = None
+    if checkpoint:
+      resume_offset = self._GetResumeOffset(
+          file_object, checkpoint, file_identity)
+
+    if resume_offset is None:
+      self._checkpoint = None
+      number_of_records = 0
+    else:
+      self._checkpoint = checkpoint
+      file_offset = resume_offset
+      number_of_records = checkpoint.sequence_number
+
+    last_record_offset = None
+    try:
+      while file_offset < self._file_size:
+        self._ReadRecord(file_object, file_offset)
+
+        last_record_offset = file_offset
+        number_of_records += 1
+        file_offset = file_object.tell()
+
+    finally:
+      # The checkpoint is set to the last record that was read completely.
+      if last_record_offset is not None:
+        self._checkpoint = data_format.Checkpoint(
+            file_identity=file_identity, offset=last_record_offset,
+            sequence_number=number_of_records)
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""Carving of records from raw data with a pool of worker processes."""
+
+import collections
+import concurrent.futures
+import os
+
+from dtformats import asl
+from dtformats import batch
+from dtformats import bsm
+from dtformats import chrome_cache
+from dtformats import data_format
+from dtformats import errors
+from dtformats import memory_mapped_file
+from dtformats import profiler
+from dtformats import systemd
+from dtformats import utmp
+
+
+# Data formats of which records can be carved.
+FORMAT_CLASSES = [
+    asl.AppleSystemLogFile,
+    bsm.BSMEventAuditingFile,
+    chrome_cache.DataBlockFile,
+    systemd.SystemdJournalFile,
+    utmp.LinuxLibc6UtmpFile]
+
+# Maximum number of bytes matched by a carving signature or pattern,
+# including its carving offset, which is the number of bytes a search
+# continues after the end of a window or a range of data.
+_MAXIMUM_MATCH_SIZE = 1024
+
+# Blocks of which all bytes are 0 are not searched, since every carving
+# signature and pattern contains a byte other than 0. Unallocated space and
+# memory typically contain many such blocks, on which a search for a pattern
+# that starts with bytes of 0 is slow.
+_ZERO_BLOCK_SIZE = 4096
+
+_ZERO_BLOCK = bytes(_ZERO_BLOCK_SIZE)
+
+# Per worker process state, where the parsers are created on first use and
+# reused for every following window.
+_parsers_per_format_class = {}
+
+
+def _CarveRecords(
+    mapped_file, window_offset, window_size, search_ranges, format_class):
+  """Carves the records of a data format that start in a window.
+
+  Args:
+    mapped_file (MemoryMappedFile): memory-mapped raw data.
+    window_offset (int): offset of the window.
+    window_size (int): size of the window.
+    search_ranges (list[tuple[int, int]]): start and end offsets of
+        the ranges of the window to search.
+    format_class (type): data format class.
+
+  Yields:
+    tuple[int, str, dict[str, object]]: offset, record type and values of
+        a carved record.
+  """
+  parser_object, record_collector = _parsers_per_format_class.get(
+      format_class, (None, None))
+  if not parser_object:
+    record_collector = batch.RecordCollector()
+    parser_object = format_class(output_writer=record_collector)
+    _parsers_per_format_class[format_class] = (
+        parser_object, record_collector)
+
+  carving_offset = format_class.CARVING_OFFSET
+  signature = format_class.CARVING_SIGNATURE
+  pattern = format_class.CARVING_PATTERN
+
+  window_end_offset = window_offset + window_size
+
+  search_offset = window_offset + carving_offset
+  for range_start_offset, search_end_offset in search_ranges:
+    search_offset = max(search_offset, range_start_offset)
+    while search_offset < search_end_offset:
+      if signature:
+        match_offset = mapped_file.Find(
+            signature, search_offset, search_end_offset)
+      else:
+        match = mapped_file.Search(pattern, search_offset, search_end_offset)
+        match_offset = match.start() if match else -1
+
+      record_offset = match_offset - carving_offset
+      if match_offset < 0 or record_offset >= window_end_offset:
+        break
+
+      search_offset = match_offset + 1
+
+      record_collector.records = []
+      try:
+        record_size = parser_object.CarveRecord(mapped_file, record_offset)
+      except (IOError, OSError, ValueError, errors.ParseError):
+        continue
+
+      for record_type, values in record_collector.records:
+        yield record_offset, record_type, values
+
+      record_collector.records = []
+
+      # Records of the same format do not overlap.
+      search_offset = max(search_offset, match_offset + record_size)
+
+
+def _GetSearchRanges(mapped_file, window_offset, window_size):
+  """Retrieves the ranges of a window that contain other data than zero blocks.
+
+  Args:
+    mapped_file (MemoryMappedFile): memory-mapped raw data.
+    window_offset (int): offset of the window.
+    window_size (int): size of the window.
+
+  Returns:
+    list[tuple[int, int]]: start and end offsets of the ranges, which are
+        extended by the maximum match size into the surrounding zero blocks.
+  """
+  end_offset = min(
+      mapped_file.get_size(), window_offset + window_size + _MAXIMUM_MATCH_SIZE)
+
+  search_ranges = []
+  range_start_offset = None
+  for block_offset in range(window_offset, end_offset, _ZERO_BLOCK_SIZE):
+    block_data = mapped_file.ReadAt(block_offset, _ZERO_BLOCK_SIZE)
+    if block_data != _ZERO_BLOCK[:len(block_data)]:
+      if range_start_offset is None:
+        range_start_offset = max(
+            window_offset, block_offset - _MAXIMUM_MATCH_SIZE)
+
+    elif range_start_offset is not None:
+      search_ranges.append((range_start_offset, min(
+          end_offset, block_offset + _MAXIMUM_MATCH_SIZE)))
+      range_start_offset = None
+
+  if range_start_offset is not None:
+    search_ranges.append((range_start_offset, end_offset))
+
+  return search_ranges
+
+
+def CarveWindow(path, window_offset, window_size, format_classes=None):
+  """Carves the records that start in a window of raw data.
+
+  Args:
+    path (str): path of the file that contains the raw data.
+    window_offset (int): offset of the window.
+    window_size (int): size of the window.
+    format_classes (Optional[list[type]]): data format classes to carve
+        records of, where None represents FORMAT_CLASSES.
+
+  Returns:
+    list[tuple[str, dict[str, object]]]: record types and values of
+        the carved records, ordered by offset.
+  """
+  records = []
+  with open(path, 'rb') as file_object:
+    mapped_file = memory_mapped_file.MemoryMappedFile(file_object)
+    try:
+      search_ranges = _GetSearchRanges(mapped_file, window_offset, window_size)
+
+      for format_class in format_classes or FORMAT_CLASSES:
+        records.extend(_CarveRecords(
+            mapped_file, window_offset, window_size, search_ranges,
+            format_class))
+
+    finally:
+      mapped_file.close()
+
+  records.sort(key=lambda record: record[0])
+
+  return [(record_type, values) for _, record_type, values in records]
+
+
+def _CarveWindowWithProfiler(
+    path, window_offset, window_size, format_classes=None):
+  """Carves the records that start in a window of raw data with profiling.
+
+  Args:
+    path (str): path of the file that contains the raw data.
+    window_offset (int): offset of the window.
+    window_size (int): size of the window.
+    format_classes (Optional[list[type]]): data format classes to carve
+        records of, where None represents FORMAT_CLASSES.
+
+  Returns:
+    tuple[list[tuple[str, dict[str, object]]], dict[str, dict[str, object]]]:
+        record types and values of the carved records, ordered by offset,
+        and the profiles of reading and mapping the candidate records.
+  """
+  data_format_profiler = profiler.DataFormatProfiler()
+  data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
+  try:
+    records = CarveWindow(
+        path, window_offset, window_size, format_classes=format_classes)
+  finally:
+    data_format.BinaryDataFormat.SetProfiler(None)
+
+  return records, data_format_profiler.GetProfiles()
+
+
+class Carver(object):
+  """Carves records from raw data, such as unallocated space or memory.
+
+  The raw data is memory-mapped and divided into windows that are carved in
+  parallel by a pool of worker processes. The candidate records of a data
+  format are found by searching for its carving signature with bytes.find()
+  or its carving pattern with a regular expression, after which they are
+  validated with the data type maps of the data format.
+
+  A record is carved by the window in which it starts, where the search
+  continues past the end of the window, so that records that span windows
+  are carved once.
+  """
+
+  def __init__(
+      self, data_format_profiler=None, format_classes=None,
+      maximum_number_of_tasks=None, maximum_number_of_workers=None,
+      window_size=64 * 1024 * 1024):
+    """Initializes a carver.
+
+    Args:
+      data_format_profiler (Optional[DataFormatProfiler]): profiler to which
+          the profiles of the worker processes are added, where None
+          represents no profiling.
+      format_classes (Optional[list[type]]): data format classes to carve
+          records of, which must support carving, where None represents
+          FORMAT_CLASSES.
+      maximum_number_of_tasks (Optional[int]): maximum number of windows in
+          flight, where None represents 2 times the number of workers.
+      maximum_number_of_workers (Optional[int]): maximum number of worker
+          processes, where None represents the number of CPUs.
+      window_size (Optional[int]): size of a window.
+
+    Raises:
+      ValueError: if a data format does not support carving or the maximum
+          number of tasks or workers or the window size is not supported.
+    """
+    if maximum_number_of_workers is None:
+      maximum_number_of_workers = os.cpu_count() or 1
+
+    if maximum_number_of_tasks is None:
+      maximum_number_of_tasks = 2 * maximum_number_of_workers
+
+    for format_class in format_classes or []:
+      if not format_class.CARVING_PATTERN and not (
+          format_class.CARVING_SIGNATURE):
+        raise ValueError('Unsupported format class: {0:s}'.format(
+            format_class.__name__))
+
+    if maximum_number_of_workers < 1:
+      raise ValueError('Unsupported maximum number of workers: {0:d}'.format(
+          maximum_number_of_workers))
+
+    if maximum_number_of_tasks < 1:
+      raise ValueError('Unsupported maximum number of tasks: {0:d}'.format(
+          maximum_number_of_tasks))
+
+    if window_size < 1:
+      raise ValueError('Unsupported window size: {0:d}'.format(window_size))
+
+    super(Carver, self).__init__()
+    self._data_format_profiler = data_format_profiler
+    self._format_classes = format_classes or FORMAT_CLASSES
+    self._maximum_number_of_tasks = maximum_number_of_tasks
+    self._maximum_number_of_workers = maximum_number_of_workers
+    self._window_size = window_size
+
+  def _GetWindowRecords(self, future):
+    """Retrieves the records of a carved window.
+
+    Args:
+      future (concurrent.futures.Future): future of the window.
+
+    Returns:
+      list[tuple[str, dict[str, object]]]: record types and values of
+          the carved records, ordered by offset.
+    """
+    if not self._data_format_profiler:
+      return future.result()
+
+    records, profiles = future.result()
+    self._data_format_profiler.AddProfiles(profiles)
+
+    return records
+
+  def CarvePath(self, path):
+    """Carves records from a file.
+
+    Args:
+      path (str): path of the file that contains the raw data.
+
+    Yields:
+      tuple[str, dict[str, object]]: record type and values of a carved
+          record, ordered by offset, where the offset of the record in
+          the raw data is stored as "offset".
+
+    Raises:
+      IOError: if the file cannot be read.
+      OSError: if the file cannot be read.
+    """
+    file_size = os.stat(path).st_size
+    futures = collections.deque()
+
+    carve_function = CarveWindow
+    if self._data_format_profiler:
+      carve_function = _CarveWindowWithProfiler
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=self._maximum_number_of_workers) as executor:
+      for window_offset in range(0, file_size, self._window_size):
+        if len(futures) >= self._maximum_number_of_tasks:
+          for record in self._GetWindowRecords(futures.popleft()):
+            yield record
+
+        futures.append(executor.submit(
+            carve_function, path, window_offset, self._window_size,
+            format_classes=self._format_classes))
+
+      while futures:
+        for record in self._GetWindowRecords(futures.popleft()):
+          yield record
@@ -4,11 +4,12 @@
 import datetime
 import logging
 import os
-
-from dtfabric import errors as dtfabric_errors
+import re
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_detector
+from dtformats import output_writers
 
 
 def SuperFastHash(key):
@@ -198,12 +199,32 @@ class DataBlockFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('chrome_cache.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('chrome_cache.yaml')
 
   # TODO: update empty, hints, updating and user.
 
+  # Cache entries are carved by a state of 0 to 2, a creation time between
+  # 1611 and 2172 and a key size of 1 to 1023, where the pattern starts with
+  # the upper bytes of the state at offset 21 of a cache entry. Cache entries
+  # with a key that is stored in a separate long key block are not carved,
+  # since the hash of their key cannot be verified.
+  CARVING_OFFSET = 21
+
+  CARVING_PATTERN = re.compile((
+      rb'\x00\x00\x00(?<=[\x00-\x02]\x00\x00\x00).{6}[\x01-\xff]\x00'
+      rb'(?:[\x01-\xff][\x00-\x03]|\x00[\x01-\x03])\x00\x00'), re.DOTALL)
+
+  # Offset of the key relative to the start of a cache entry.
+  _CACHE_ENTRY_KEY_OFFSET = 96
+
+  # Maximum number of blocks of a cache entry, where a key that does not fit
+  # in the first block continues in the next blocks.
+  _MAXIMUM_NUMBER_OF_CACHE_ENTRY_BLOCKS = 4
+
   SIGNATURE = 0xc104cac3
 
+  SIGNATURES = [(0, b'\xc3\xca\x04\xc1')]
+
   _DEBUG_INFO_FILE_HEADER = [
       ('signature', 'Signature', '_FormatIntegerAsHexadecimal8'),
       ('minor_version', 'Minor version', '_FormatIntegerAsDecimal'),
@@ -387,6 +408,63 @@ class DataBlockFile(data_format.BinaryDataFile):
     self.block_size = file_header.block_size
     self.number_of_entries = file_header.number_of_entries
 
+  def CarveRecord(self, file_object, file_offset):
+    """Carves a cache entry from raw data, such as unallocated space.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the candidate cache entry relative to
+          the start of the file-like object.
+
+    Returns:
+      int: size of the cache entry.
+
+    Raises:
+      ParseError: if no valid cache entry was found at the offset.
+    """
+    data_type_map = self._GetDataTypeMap('chrome_cache_entry')
+
+    cache_entry, cache_entry_size = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'cache entry')
+
+    if cache_entry.long_key_address:
+      raise errors.ParseError('Unsupported cache entry with long key.')
+
+    key_end_offset = self._CACHE_ENTRY_KEY_OFFSET + cache_entry.key_size
+    if key_end_offset <= cache_entry_size:
+      key = bytes(cache_entry.key[:cache_entry.key_size])
+
+    else:
+      number_of_blocks, remainder = divmod(key_end_offset, cache_entry_size)
+      if remainder:
+        number_of_blocks += 1
+
+      if number_of_blocks > self._MAXIMUM_NUMBER_OF_CACHE_ENTRY_BLOCKS:
+        raise errors.ParseError('Unsupported cache entry key size.')
+
+      key = self._ReadData(
+          file_object, file_offset + self._CACHE_ENTRY_KEY_OFFSET,
+          cache_entry.key_size, 'cache entry key')
+      cache_entry_size *= number_of_blocks
+
+    if SuperFastHash(key) != cache_entry.hash:
+      raise errors.ParseError('Invalid cache entry key hash.')
+
+    try:
+      key = key.decode('ascii')
+    except UnicodeDecodeError:
+      raise errors.ParseError('Unsupported cache entry key.')
+
+    # The cache address of a carved cache entry is not known.
+    self._WriteRecord('chrome_cache_entry', {
+        'cache_address': None,
+        'creation_time': cache_entry.creation_time,
+        'hash': cache_entry.hash,
+        'key': key,
+        'offset': file_offset})
+
+    return cache_entry_size
+
   def ReadCacheEntry(self, block_offset):
     """Reads a cache entry.
 
@@ -457,7 +535,7 @@ class IndexFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('chrome_cache.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('chrome_cache.yaml')
 
   _DEBUG_INFO_FILE_HEADER = [
       ('signature', 'Signature', '_FormatIntegerAsHexadecimal8'),
@@ -476,6 +554,8 @@ class IndexFile(data_format.BinaryDataFile):
 
   SIGNATURE = 0xc103cac3
 
+  SIGNATURES = [(0, b'\xc3\xca\x03\xc1')]
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a Chrome Cache index file.
 
@@ -602,32 +682,37 @@ class IndexFile(data_format.BinaryDataFile):
     file_offset = file_object.tell()
     data_type_map = self._GetDataTypeMap('uint32le')
 
-    cache_address_index = 0
-    cache_address_data = file_object.read(4)
+    file_object.seek(0, os.SEEK_END)
+    file_size = file_object.tell()
+
+    # Note that trailing data smaller than a cache address is ignored.
+    index_table_size = file_size - file_offset
+    index_table_size -= index_table_size % 4
 
-    while len(cache_address_data) == 4:
-      try:
-        value = self._ReadStructureFromByteStream(
-            cache_address_data, file_offset, data_type_map, 'cache address')
-      except (ValueError, errors.ParseError) as exception:
-        raise errors.ParseError((
-            'Unable to parse index table entry: {0:d} with error: '
-            '{1:s}').format(cache_address_index, exception))
+    cache_addresses = self._ReadStructuresFromFileObject(
+        file_object, file_offset, index_table_size, data_type_map,
+        'cache address')
 
-      if value:
-        cache_address = CacheAddress(value)
+    cache_address_index = 0
+
+    try:
+      for value, _ in cache_addresses:
+        if value:
+          cache_address = CacheAddress(value)
 
-        if self._debug:
-          description = 'Cache address: {0:d}'.format(cache_address_index)
-          value_string = cache_address.GetDebugString()
-          self._DebugPrintValue(description, value_string)
+          if self._debug:
+            description = 'Cache address: {0:d}'.format(cache_address_index)
+            value_string = cache_address.GetDebugString()
+            self._DebugPrintValue(description, value_string)
 
-        self.index_table[cache_address_index] = cache_address
+          self.index_table[cache_address_index] = cache_address
 
-      file_offset = file_object.tell()
-      cache_address_data = file_object.read(4)
+        cache_address_index += 1
 
-      cache_address_index += 1
+    except (ValueError, errors.ParseError) as exception:
+      raise errors.ParseError((
+          'Unable to parse index table entry: {0:d} with error: '
+          '{1!s}').format(cache_address_index, exception))
 
     if self._debug:
       self._DebugPrintText('\n')
@@ -649,11 +734,8 @@ class IndexFile(data_format.BinaryDataFile):
 class ChromeCacheParser(object):
   """Chrome Cache parser."""
 
-  # Using a class constant significantly speeds up the time required to load
-  # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('chrome_cache.yaml')
-
-  _UINT32LE = _FABRIC.CreateDataTypeMap('uint32le')
+  _FORMAT_DETECTOR = format_detector.FormatDetector(
+      format_classes=[DataBlockFile, IndexFile])
 
   def __init__(self, debug=False, output_writer=None):
     """Initializes a Chrome Cache parser.
@@ -665,6 +747,10 @@ class ChromeCacheParser(object):
     super(ChromeCacheParser, self).__init__()
     self._debug = debug
     self._output_writer = output_writer
+    self._record_output_writer = None
+
+    if isinstance(output_writer, output_writers.RecordOutputWriter):
+      self._record_output_writer = output_writer
 
   def ParseDirectory(self, path):
     """Parses a Chrome Cache directory.
@@ -722,27 +808,20 @@ class ChromeCacheParser(object):
           #     cache_address.GetDebugString()))
           cache_entry = data_file.ReadCacheEntry(cache_address.block_offset)
 
-          try:
-            cache_entry_key = cache_entry.key.decode('ascii')
-          except UnicodeDecodeError:
-            logging.warning((
-                'Unable to decode cache entry key at cache address: '
-                '0x{0:08x}. Characters that cannot be decoded will be '
-                'replaced with "?" or "\\ufffd".').format(cache_address.value))
-            cache_entry_key = cache_entry.key.decode(
-                'ascii', errors='replace')
-
-          # TODO: print('Url\t\t: {0:s}'.format(cache_entry_key))
-          _ = cache_entry_key
+          if self._record_output_writer:
+            self._record_output_writer.WriteRecord('chrome_cache_entry', {
+                'cache_address': cache_address.value,
+                'creation_time': cache_entry.creation_time,
+                'hash': cache_entry.hash,
+                'key': cache_entry.key,
+                'offset': cache_address.block_offset})
 
-          date_string = (datetime.datetime(1601, 1, 1) + datetime.timedelta(
-              microseconds=cache_entry.creation_time))
+          else:
+            date_string = (
+                datetime.datetime(1601, 1, 1) + datetime.timedelta(
+                    microseconds=cache_entry.creation_time))
 
-          # print('Creation time\t: {0!s}'.format(date_string))
-
-          # print('')
-
-          print('{0!s}\t{1:s}'.format(date_string, cache_entry.key))
+            print('{0!s}\t{1:s}'.format(date_string, cache_entry.key))
 
           cache_address = cache_entry.next
           cache_address_chain_length += 1
@@ -765,24 +844,11 @@ class ChromeCacheParser(object):
       ParseError: if the file cannot be read.
     """
     with open(path, 'rb') as file_object:
-      signature_data = file_object.read(4)
-
-      try:
-        signature = self._UINT32LE.MapByteStream(signature_data)
-      except dtfabric_errors.MappingError as exception:
-        raise errors.ParseError(
-            'Unable to signature with error: {0!s}'.format(exception))
-
-      if signature not in (DataBlockFile.SIGNATURE, IndexFile.SIGNATURE):
-        raise errors.ParseError(
-            'Unsupported signature: 0x{0:08x}'.format(signature))
-
-      if signature == DataBlockFile.SIGNATURE:
-        chrome_cache_file = DataBlockFile(
-            debug=self._debug, output_writer=self._output_writer)
+      format_classes = self._FORMAT_DETECTOR.DetectFileObject(file_object)
+      if not format_classes:
+        raise errors.ParseError('Unsupported signature.')
 
-      elif signature == IndexFile.SIGNATURE:
-        chrome_cache_file = IndexFile(
-            debug=self._debug, output_writer=self._output_writer)
+      chrome_cache_file = format_classes[0](
+          debug=self._debug, output_writer=self._output_writer)
 
       chrome_cache_file.ReadFileObject(file_object)
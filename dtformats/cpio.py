@@ -53,7 +53,7 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('cpio.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('cpio.yaml')
 
   # TODO: move path into structure.
 
@@ -63,6 +63,13 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
   _CPIO_SIGNATURE_NEW_ASCII = b'070701'
   _CPIO_SIGNATURE_NEW_ASCII_WITH_CHECKSUM = b'070702'
 
+  SIGNATURES = [
+      (0, _CPIO_SIGNATURE_BINARY_BIG_ENDIAN),
+      (0, _CPIO_SIGNATURE_BINARY_LITTLE_ENDIAN),
+      (0, _CPIO_SIGNATURE_PORTABLE_ASCII),
+      (0, _CPIO_SIGNATURE_NEW_ASCII),
+      (0, _CPIO_SIGNATURE_NEW_ASCII_WITH_CHECKSUM)]
+
   _CPIO_ATTRIBUTE_NAMES_ODC = (
       'device_number', 'inode_number', 'mode', 'user_identifier',
       'group_identifier', 'number_of_links', 'special_device_number',
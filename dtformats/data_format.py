@@ -2,32 +2,550 @@
 """Binary data format."""
 
 import abc
+import base64
+import binascii
+import hashlib
+import json
 import os
+import pickle
+import struct
+import tempfile
+import time
 
 from dfdatetime import filetime as dfdatetime_filetime
 from dfdatetime import posix_time as dfdatetime_posix_time
 
+import dtfabric
+
+from dtfabric import data_types as dtfabric_data_types
+from dtfabric import definitions as dtfabric_definitions
 from dtfabric import errors as dtfabric_errors
 from dtfabric.runtime import data_maps as dtfabric_data_maps
 from dtfabric.runtime import fabric as dtfabric_fabric
+from dtfabric.runtime import runtime as dtfabric_runtime
 
 from dtformats import decorators
 from dtformats import errors
+from dtformats import memory_mapped_file
+from dtformats import output_writers
+from dtformats import page_cache
+
+
+class FixedLayoutStructureMap(object):
+  """Fixed-layout structure data type map.
+
+  A fixed-layout structure consists only of integers, floating-points,
+  fixed-size streams and strings, fixed-size sequences of integers or
+  floating-points and nested fixed-layout structures. Such a structure is
+  mapped with a single precompiled struct.Struct instead of mapping every
+  member with a separate dtFabric data type map.
+
+  The mapped values are of the same structure values class as produced by
+  the dtFabric data type map, so this data type map can be used in its place.
+  """
+
+  _BYTE_ORDER_STRINGS = {
+      dtfabric_definitions.BYTE_ORDER_BIG_ENDIAN: '>',
+      dtfabric_definitions.BYTE_ORDER_LITTLE_ENDIAN: '<',
+      dtfabric_definitions.BYTE_ORDER_NATIVE: '='}
+
+  _FLOATING_POINT_FORMAT_STRINGS = {
+      4: 'f',
+      8: 'd'}
+
+  _SIGNED_INTEGER_FORMAT_STRINGS = {
+      1: 'b',
+      2: 'h',
+      4: 'i',
+      8: 'q'}
+
+  _UNSIGNED_INTEGER_FORMAT_STRINGS = {
+      1: 'B',
+      2: 'H',
+      4: 'I',
+      8: 'Q'}
+
+  def __init__(self, data_type_map, data_type_definition):
+    """Initializes a fixed-layout structure data type map.
+
+    Args:
+      data_type_map (dtfabric.DataTypeMap): dtFabric data type map of
+          the structure.
+      data_type_definition (dtfabric.DataTypeDefinition): data type definition
+          of the structure.
+
+    Raises:
+      ValueError: if the structure does not have a fixed layout.
+    """
+    byte_order, format_strings, member_builders = self._CompileStructure(
+        data_type_definition, None)
+    if format_strings is None:
+      raise ValueError('Unsupported structure: {0:s}'.format(
+          data_type_definition.name))
+
+    super(FixedLayoutStructureMap, self).__init__()
+    self._data_type_definition = data_type_definition
+    self._data_type_map = data_type_map
+    self._format_string = '{0:s}{1:s}'.format(
+        self._BYTE_ORDER_STRINGS.get(byte_order, '<'), ''.join(format_strings))
+    self._member_builders = None
+    self._struct = struct.Struct(self._format_string)
+    self._structure_values_class = type(data_type_map.CreateStructureValues())
+
+    # The structure values object can be created directly from the unpacked
+    # values if every member maps onto exactly one unpacked value.
+    if any(member_builders):
+      self._member_builders = member_builders
+
+  @property
+  def name(self):
+    """str: name of the data type definition or None if not available."""
+    return self._data_type_map.name
+
+  @classmethod
+  def _CompileMember(cls, member_definition, byte_order):
+    """Compiles a structure member.
+
+    Args:
+      member_definition (dtfabric.DataTypeDefinition): data type definition
+          of the member.
+      byte_order (str): byte-order of the structure that contains the member.
+
+    Returns:
+      tuple[str, str, function]: byte-order, struct format string and value
+          builder of the member. The byte-order is None if the member does
+          not depend on byte-order. The format string is None if the member
+          is not supported. The value builder is None if the member maps
+          onto exactly one unpacked value.
+    """
+    values = getattr(member_definition, 'values', None)
+    if isinstance(
+        member_definition, dtfabric_data_types.MemberDataTypeDefinition):
+      if member_definition.condition:
+        return None, None, None
+
+      member_definition = member_definition.member_data_type_definition
+
+    byte_size = member_definition.GetByteSize()
+    if not byte_size:
+      return None, None, None
+
+    if member_definition.byte_order != dtfabric_definitions.BYTE_ORDER_NATIVE:
+      byte_order = member_definition.byte_order
+
+    format_string = None
+    member_builder = None
+    member_byte_order = None
+
+    if isinstance(member_definition, dtfabric_data_types.StructureDefinition):
+      member_byte_order, format_strings, member_builders = (
+          cls._CompileStructure(member_definition, byte_order))
+      if format_strings is None:
+        return None, None, None
+
+      format_string = ''.join(format_strings)
+      member_builder = cls._GetStructureBuilder(
+          member_definition, member_builders, len(format_strings))
+
+    elif isinstance(member_definition, (
+        dtfabric_data_types.StreamDefinition,
+        dtfabric_data_types.StringDefinition)):
+      format_string = '{0:d}s'.format(byte_size)
+
+      if isinstance(member_definition, dtfabric_data_types.StringDefinition):
+        member_builder = cls._GetStringBuilder(member_definition)
+
+    elif isinstance(member_definition, dtfabric_data_types.SequenceDefinition):
+      element_definition = member_definition.element_data_type_definition
+      member_byte_order, element_format_string, element_builder = (
+          cls._CompileMember(element_definition, byte_order))
+
+      element_byte_size = element_definition.GetByteSize()
+      if (element_format_string and len(element_format_string) == 1 and
+          not element_builder and byte_size % element_byte_size == 0):
+        number_of_elements = byte_size // element_byte_size
+        format_string = '{0:d}{1:s}'.format(
+            number_of_elements, element_format_string)
+        member_builder = cls._GetSequenceBuilder(number_of_elements)
+
+    elif isinstance(member_definition, dtfabric_data_types.IntegerDefinition):
+      if member_definition.format == dtfabric_definitions.FORMAT_UNSIGNED:
+        format_string = cls._UNSIGNED_INTEGER_FORMAT_STRINGS.get(byte_size)
+      else:
+        format_string = cls._SIGNED_INTEGER_FORMAT_STRINGS.get(byte_size)
+
+      if byte_size > 1:
+        member_byte_order = byte_order
+
+    elif isinstance(
+        member_definition, dtfabric_data_types.FloatingPointDefinition):
+      format_string = cls._FLOATING_POINT_FORMAT_STRINGS.get(byte_size)
+      member_byte_order = byte_order
+
+    if not format_string:
+      return None, None, None
+
+    if values:
+      member_builder = cls._GetSupportedValuesBuilder(member_builder, values)
+
+    return member_byte_order, format_string, member_builder
+
+  @classmethod
+  def _CompileStructure(cls, data_type_definition, byte_order):
+    """Compiles a structure.
+
+    Args:
+      data_type_definition (dtfabric.DataTypeDefinition): data type definition
+          of the structure.
+      byte_order (str): byte-order of the structure that contains
+          the structure or None if not contained in another structure.
+
+    Returns:
+      tuple[str, list[str], list[function]]: byte-order, struct format strings
+          and value builders of the members. The byte-order is None if
+          the structure does not depend on byte-order. The format strings are
+          None if the structure is not supported.
+    """
+    if (not isinstance(
+        data_type_definition, dtfabric_data_types.StructureDefinition) or
+        not data_type_definition.members or
+        not data_type_definition.GetByteSize()):
+      return None, None, None
+
+    if (not byte_order or data_type_definition.byte_order !=
+        dtfabric_definitions.BYTE_ORDER_NATIVE):
+      byte_order = data_type_definition.byte_order
+
+    structure_byte_order = None
+    format_strings = []
+    member_builders = []
+
+    for member_definition in data_type_definition.members:
+      member_byte_order, format_string, member_builder = cls._CompileMember(
+          member_definition, byte_order)
+      if not format_string:
+        return None, None, None
+
+      # A struct.Struct supports only a single byte-order.
+      if member_byte_order:
+        if structure_byte_order not in (None, member_byte_order):
+          return None, None, None
+
+        structure_byte_order = member_byte_order
+
+      format_strings.append(format_string)
+      member_builders.append(member_builder)
+
+    return structure_byte_order, format_strings, member_builders
+
+  @classmethod
+  def _GetSequenceBuilder(cls, number_of_elements):
+    """Retrieves a value builder for a sequence.
+
+    Args:
+      number_of_elements (int): number of elements in the sequence.
+
+    Returns:
+      function: value builder.
+    """
+    def _BuildSequence(unpacked_values, index):
+      next_index = index + number_of_elements
+      return tuple(unpacked_values[index:next_index]), next_index
+
+    return _BuildSequence
+
+  @classmethod
+  def _GetStringBuilder(cls, data_type_definition):
+    """Retrieves a value builder for a string.
+
+    Args:
+      data_type_definition (dtfabric.StringDefinition): data type definition
+          of the string.
+
+    Returns:
+      function: value builder.
+    """
+    encoding = data_type_definition.encoding
+    elements_terminator = data_type_definition.elements_terminator
+
+    def _BuildString(unpacked_values, index):
+      byte_stream = unpacked_values[index]
+
+      if elements_terminator:
+        # Remove the elements terminator and any trailing data, where only
+        # element-aligned terminators are considered, like dtFabric does.
+        elements_terminator_size = len(elements_terminator)
+        for byte_offset in range(
+            0, len(byte_stream), elements_terminator_size):
+          end_offset = byte_offset + elements_terminator_size
+          if byte_stream[byte_offset:end_offset] == elements_terminator:
+            byte_stream = byte_stream[:byte_offset]
+            break
+
+      return byte_stream.decode(encoding), index + 1
+
+    return _BuildString
+
+  @classmethod
+  def _GetStructureBuilder(
+      cls, data_type_definition, member_builders, number_of_members):
+    """Retrieves a value builder for a nested structure.
+
+    Args:
+      data_type_definition (dtfabric.StructureDefinition): data type
+          definition of the structure.
+      member_builders (list[function]): value builders of the members.
+      number_of_members (int): number of members.
+
+    Returns:
+      function: value builder.
+    """
+    structure_values_class = (
+        dtfabric_runtime.StructureValuesClassFactory.CreateClass(
+            data_type_definition))
+
+    if not any(member_builders):
+      def _BuildStructure(unpacked_values, index):
+        next_index = index + number_of_members
+        return structure_values_class(
+            *unpacked_values[index:next_index]), next_index
+
+    else:
+      def _BuildStructure(unpacked_values, index):
+        member_values, next_index = cls._BuildMemberValues(
+            member_builders, unpacked_values, index)
+        return structure_values_class(*member_values), next_index
+
+    return _BuildStructure
+
+  @classmethod
+  def _GetSupportedValuesBuilder(cls, member_builder, supported_values):
+    """Retrieves a value builder that checks for supported values.
+
+    Args:
+      member_builder (function): value builder of the member or None if
+          the member maps onto exactly one unpacked value.
+      supported_values (list[object]): supported values.
+
+    Returns:
+      function: value builder.
+    """
+    def _BuildSupportedValue(unpacked_values, index):
+      if member_builder:
+        value, next_index = member_builder(unpacked_values, index)
+      else:
+        value, next_index = unpacked_values[index], index + 1
+
+      if value not in supported_values:
+        supported_values_string = ', '.join([
+            '{0!s}'.format(supported_value)
+            for supported_value in supported_values])
+        raise dtfabric_errors.MappingError(
+            'Value: {0!s} not in supported values: {1:s}'.format(
+                value, supported_values_string))
+
+      return value, next_index
+
+    return _BuildSupportedValue
+
+  @classmethod
+  def _BuildMemberValues(cls, member_builders, unpacked_values, index):
+    """Builds member values from unpacked values.
+
+    Args:
+      member_builders (list[function]): value builders of the members.
+      unpacked_values (tuple[object, ...]): values unpacked by struct.
+      index (int): index of the first unpacked value of the members.
+
+    Returns:
+      tuple[list[object], int]: member values and index of the first unpacked
+          value after the members.
+    """
+    member_values = []
+    for member_builder in member_builders:
+      if member_builder:
+        value, index = member_builder(unpacked_values, index)
+      else:
+        value = unpacked_values[index]
+        index += 1
+
+      member_values.append(value)
+
+    return member_values, index
+
+  def CreateStructureValues(self, *args, **kwargs):
+    """Creates a structure values object.
+
+    Returns:
+      object: structure values.
+    """
+    return self._structure_values_class(*args, **kwargs)
+
+  def FoldByteStream(self, mapped_value, **kwargs):
+    """Folds the data type into a byte stream.
+
+    Args:
+      mapped_value (object): mapped value.
+
+    Returns:
+      bytes: byte stream.
+
+    Raises:
+      FoldingError: if the data type definition cannot be folded into
+          the byte stream.
+    """
+    return self._data_type_map.FoldByteStream(mapped_value, **kwargs)
+
+  def GetSizeHint(self, **unused_kwargs):
+    """Retrieves a hint about the size.
+
+    Returns:
+      int: hint of the number of bytes needed from the byte stream.
+    """
+    return self._struct.size
+
+  def GetStructFormatString(self):
+    """Retrieves the Python struct format string.
+
+    Returns:
+      str: format string as used by Python struct.
+    """
+    return self._format_string
+
+  def MapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
+    """Maps the data type on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      context (Optional[dtfabric.DataTypeMapContext]): data type map context.
+
+    Returns:
+      object: mapped value.
+
+    Raises:
+      ByteStreamTooSmallError: if the byte stream is too small.
+      MappingError: if the data type definition cannot be mapped on
+          the byte stream.
+    """
+    byte_size = self._struct.size
+
+    if context:
+      context.byte_size = None
+      context.requested_size = byte_size
+
+    try:
+      byte_stream_size = len(byte_stream)
+
+    except Exception as exception:
+      raise dtfabric_errors.MappingError(exception)
+
+    if byte_stream_size - byte_offset < byte_size:
+      raise dtfabric_errors.ByteStreamTooSmallError((
+          'Byte stream too small requested: {0:d} available: {1:d}').format(
+              byte_size, byte_stream_size))
+
+    try:
+      member_values = self._struct.unpack_from(byte_stream, byte_offset)
+
+      if self._member_builders:
+        member_values, _ = self._BuildMemberValues(
+            self._member_builders, member_values, 0)
+
+      mapped_value = self._structure_values_class(*member_values)
+
+    except Exception as exception:
+      raise dtfabric_errors.MappingError((
+          'Unable to read: {0:s} from byte stream at offset: {1:d} with '
+          'error: {2!s}').format(
+              self._data_type_definition.name, byte_offset, exception))
+
+    if context:
+      context.byte_size = byte_size
+      context.state = {}
+
+    return mapped_value
+
+
+class LazyDataTypeFabric(object):
+  """Lazily read dtFabric data type fabric.
+
+  This class-level descriptor defers reading the dtFabric definition file
+  until the data type fabric is first used, which keeps importing a data
+  format module cheap.
+  """
+
+  def __init__(self, filename):
+    """Initializes a lazily read data type fabric.
+
+    Args:
+      filename (str): name of the dtFabric definition file.
+    """
+    super(LazyDataTypeFabric, self).__init__()
+    self._fabric = None
+    self._filename = filename
+
+  def __get__(self, instance, owner):
+    """Retrieves the data type fabric.
+
+    Args:
+      instance (object): instance the descriptor is accessed through or None
+          if accessed through the class.
+      owner (type): class the descriptor is accessed through.
+
+    Returns:
+      dtfabric.DataTypeFabric: data type fabric.
+    """
+    if self._fabric is None:
+      if not issubclass(owner, BinaryDataFormat):
+        owner = BinaryDataFormat
+
+      self._fabric = owner.ReadDefinitionFile(self._filename)
+
+    return self._fabric
 
 
 class BinaryDataFormat(object):
   """Binary data format."""
 
-  # The dtFabric fabric, which must be set by a subclass using the
-  # ReadDefinitionFile class method.
+  # The dtFabric fabric, which must be set by a subclass using
+  # LazyDataTypeFabric or the ReadDefinitionFile class method.
   _FABRIC = None
 
   # Preserve the absolute path value of __file__ in case it is changed
   # at run-time.
   _DEFINITION_FILES_PATH = os.path.dirname(__file__)
 
-  _HEXDUMP_CHARACTER_MAP = [
-      '.' if byte < 0x20 or byte > 0x7e else chr(byte) for byte in range(256)]
+  # Environment variable that contains the path of a directory in which
+  # parsed dtFabric definition files are cached between runs.
+  _DEFINITIONS_CACHE_ENVIRONMENT_VARIABLE = 'DTFORMATS_DEFINITIONS_CACHE'
+
+  # dtFabric data type fabrics per definition file path, which are shared
+  # by all data formats in the process.
+  _FABRICS_PER_PATH = {}
+
+  # Translation table that replaces non-printable bytes by '.'.
+  _HEXDUMP_TRANSLATION_TABLE = bytes(bytearray([
+      0x2e if byte < 0x20 or byte > 0x7e else byte for byte in range(256)]))
+
+  # Format of the hexadecimal part of a hexdump line, which is applied to
+  # the 32 characters of the bytes.hex() of a 16-byte line.
+  _HEXDUMP_LINE_FORMAT = '  '.join([
+      ' '.join([
+          '{{{0:d}}}{{{1:d}}}'.format(index, index + 1)
+          for index in range(group_index, group_index + 16, 2)])
+      for group_index in (0, 16)])
+
+  # Number of hexdump lines written at once by _DebugPrintData.
+  _HEXDUMP_LINES_PER_WRITE = 4096
+
+  # Maximum number of bytes read at once by _ReadStructuresFromFileObject.
+  _MAXIMUM_READ_BUFFER_SIZE = 1024 * 1024
+
+  # The data format profiler, which is shared by all data formats in
+  # the process and set by the SetProfiler class method.
+  _profiler = None
 
   def __init__(self, debug=False, output_writer=None):
     """Initializes a binary data format.
@@ -38,8 +556,15 @@ class BinaryDataFormat(object):
     """
     super(BinaryDataFormat, self).__init__()
     self._data_type_maps = {}
+    self._fixed_data_type_map_sizes = {}
     self._debug = debug
     self._output_writer = output_writer
+    self._record_output_writer = None
+
+    # Records are only built when the output writer can write them, which
+    # allows the data formats to skip building records otherwise.
+    if isinstance(output_writer, output_writers.RecordOutputWriter):
+      self._record_output_writer = output_writer
 
   def _DebugPrintData(self, description, data):
     """Prints data for debugging.
@@ -50,7 +575,16 @@ class BinaryDataFormat(object):
     """
     if self._output_writer:
       self._output_writer.WriteText('{0:s}:\n'.format(description))
-      self._output_writer.WriteText(self._FormatDataInHexadecimal(data))
+
+      lines = []
+      for line in self._FormatDataInHexadecimalLines(data):
+        lines.append(line)
+        if len(lines) >= self._HEXDUMP_LINES_PER_WRITE:
+          self._output_writer.WriteText(''.join(lines))
+          lines = []
+
+      lines.append('\n')
+      self._output_writer.WriteText(''.join(lines))
 
   def _DebugPrintDecimalValue(self, description, value):
     """Prints a decimal value for debugging.
@@ -141,59 +675,54 @@ class BinaryDataFormat(object):
     Returns:
       str: hexadecimal representation of the data.
     """
-    in_group = False
-    previous_hexadecimal_string = None
+    lines = list(self._FormatDataInHexadecimalLines(data))
+    lines.append('\n')
+    return ''.join(lines)
 
-    lines = []
-    data_size = len(data)
-    for block_index in range(0, data_size, 16):
-      data_string = data[block_index:block_index + 16]
+  def _FormatDataInHexadecimalLines(self, data):
+    """Formats data in a hexadecimal representation line by line.
 
-      hexadecimal_byte_values = []
-      printable_values = []
-      for byte_value in data_string:
-        if isinstance(byte_value, str):
-          byte_value = ord(byte_value)
+    Consecutive lines with the same data, other than the last line, are
+    collapsed into a single "..." line.
 
-        hexadecimal_byte_value = '{0:02x}'.format(byte_value)
-        hexadecimal_byte_values.append(hexadecimal_byte_value)
+    Args:
+      data (bytes): data.
 
-        printable_value = self._HEXDUMP_CHARACTER_MAP[byte_value]
-        printable_values.append(printable_value)
+    Yields:
+      str: line of the hexadecimal representation of the data, including
+          the end-of-line character.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+      data = bytes(data)
 
-      remaining_size = 16 - len(data_string)
-      if remaining_size == 0:
-        whitespace = ''
-      elif remaining_size >= 8:
-        whitespace = ' ' * ((3 * remaining_size) - 1)
-      else:
-        whitespace = ' ' * (3 * remaining_size)
+    in_group = False
+    previous_data_string = None
 
-      hexadecimal_string_part1 = ' '.join(hexadecimal_byte_values[0:8])
-      hexadecimal_string_part2 = ' '.join(hexadecimal_byte_values[8:16])
-      hexadecimal_string = '{0:s}  {1:s}{2:s}'.format(
-          hexadecimal_string_part1, hexadecimal_string_part2, whitespace)
+    data_size = len(data)
+    for block_index in range(0, data_size, 16):
+      data_string = data[block_index:block_index + 16]
 
-      if (previous_hexadecimal_string is not None and
-          previous_hexadecimal_string == hexadecimal_string and
+      if (previous_data_string is not None and
+          previous_data_string == data_string and
           block_index + 16 < data_size):
 
         if not in_group:
           in_group = True
 
-          lines.append('...')
+          yield '...\n'
 
       else:
-        printable_string = ''.join(printable_values)
+        # Pad the hexadecimal values of the last line with whitespace.
+        hexadecimal_string = self._HEXDUMP_LINE_FORMAT.format(
+            *data_string.hex().ljust(32))
+        printable_string = data_string.translate(
+            self._HEXDUMP_TRANSLATION_TABLE).decode('ascii')
 
-        lines.append('0x{0:08x}  {1:s}  {2:s}'.format(
-            block_index, hexadecimal_string, printable_string))
+        yield '0x{0:08x}  {1:s}  {2:s}\n'.format(
+            block_index, hexadecimal_string, printable_string)
 
         in_group = False
-        previous_hexadecimal_string = hexadecimal_string
-
-    lines.extend(['', ''])
-    return '\n'.join(lines)
+        previous_data_string = data_string
 
   def _FormatArrayOfIntegersAsDecimals(self, array_of_integers):
     """Formats an array of integers as decimals.
@@ -488,7 +1017,8 @@ class BinaryDataFormat(object):
   def _GetDataTypeMap(self, name):
     """Retrieves a data type map defined by the definition file.
 
-    The data type maps are cached for reuse.
+    The data type maps are cached for reuse. Structures with a fixed layout
+    are mapped with a FixedLayoutStructureMap.
 
     Args:
       name (str): name of the data type as defined by the definition file.
@@ -506,13 +1036,83 @@ class BinaryDataFormat(object):
     data_type_map = self._data_type_maps.get(name, None)
     if not data_type_map:
       data_type_map = self._FABRIC.CreateDataTypeMap(name)
+
+      # Determine once if the data type has a fixed size, which allows
+      # _ReadStructureFromFileObject to use a single read and map.
+      data_type_definition = self._FABRIC.GetDataTypeDefinition(name)
+      byte_size = data_type_definition.GetByteSize()
+      if byte_size:
+        # Structures with a fixed layout are mapped with a precompiled
+        # struct.Struct instead of the dtFabric data type map.
+        try:
+          data_type_map = FixedLayoutStructureMap(
+              data_type_map, data_type_definition)
+        except ValueError:
+          pass
+
+        self._fixed_data_type_map_sizes[data_type_map] = byte_size
+
       self._data_type_maps[name] = data_type_map
 
     return data_type_map
 
+  def _GetStructureObjectValues(self, structure_object, debug_info):
+    """Retrieves the values of a structure object without formatting them.
+
+    Args:
+      structure_object (object): structure object.
+      debug_info (list[tuple[str, str, int]]): debug information, of which
+          the attribute names are used.
+
+    Returns:
+      dict[str, object]: values of the structure object per attribute name.
+    """
+    values = {}
+    for attribute_name, _, _ in debug_info:
+      attribute_value = getattr(structure_object, attribute_name, None)
+      if attribute_value is not None:
+        values[attribute_name] = attribute_value
+
+    return values
+
   def _ReadData(self, file_object, file_offset, data_size, description):
     """Reads data.
 
+    If profiling is enabled the read is recorded by its description.
+
+    Args:
+      file_object (file): a file-like object.
+      file_offset (int): offset of the data relative to the start of
+          the file-like object.
+      data_size (int): size of the data.
+      description (str): description of the data.
+
+    Returns:
+      bytes: byte stream containing the data.
+
+    Raises:
+      ParseError: if the data cannot be read.
+      ValueError: if the file-like object is missing.
+    """
+    profiler = self._profiler
+    if not profiler:
+      return self._ReadFileObjectData(
+          file_object, file_offset, data_size, description)
+
+    start_time = time.perf_counter()
+
+    data = self._ReadFileObjectData(
+        file_object, file_offset, data_size, description)
+
+    profiler.AddReadData(description, len(data))
+    profiler.AddTime(description, time.perf_counter() - start_time)
+
+    return data
+
+  def _ReadFileObjectData(
+      self, file_object, file_offset, data_size, description):
+    """Reads data from a file-like object.
+
     Args:
       file_object (file): a file-like object.
       file_offset (int): offset of the data relative to the start of
@@ -530,12 +1130,15 @@ class BinaryDataFormat(object):
     if not file_object:
       raise ValueError('Missing file-like object.')
 
-    file_object.seek(file_offset, os.SEEK_SET)
-
     read_error = ''
 
     try:
-      data = file_object.read(data_size)
+      if isinstance(file_object, memory_mapped_file.MemoryMappedFile):
+        data = file_object.ReadAt(file_offset, data_size)
+      else:
+        file_object.seek(file_offset, os.SEEK_SET)
+        data = file_object.read(data_size)
+
       read_count = len(data)
 
       if read_count != data_size:
@@ -613,14 +1216,25 @@ class BinaryDataFormat(object):
     if not data_type_map:
       raise ValueError('Missing data type map.')
 
+    profiler = self._profiler
+    if profiler:
+      start_time = time.perf_counter()
+      profiler.AddMapByteStream(data_type_map.name)
+
     try:
-      return data_type_map.MapByteStream(byte_stream, context=context)
+      structure_values_object = data_type_map.MapByteStream(
+          byte_stream, context=context)
     except (dtfabric_errors.ByteStreamTooSmallError,
             dtfabric_errors.MappingError) as exception:
       raise errors.ParseError((
           'Unable to map {0:s} data at offset: {1:d} (0x{1:08x}) with error: '
           '{2!s}').format(description, file_offset, exception))
 
+    if profiler:
+      profiler.AddTime(data_type_map.name, time.perf_counter() - start_time)
+
+    return structure_values_object
+
   def _ReadStructureFromFileObject(
       self, file_object, file_offset, data_type_map, description):
     """Reads a structure from a file-like object.
@@ -631,6 +1245,12 @@ class BinaryDataFormat(object):
     continue to read from the file-like object until the data type map can be
     successfully mapped onto the byte stream or until an error occurs.
 
+    Data type maps retrieved with _GetDataTypeMap that have a fixed size are
+    read with a single read and mapped without a data type map context.
+
+    If profiling is enabled the reads, maps, retries and time are recorded
+    by the name of the data type map.
+
     Args:
       file_object (file): a file-like object to parse.
       file_offset (int): offset of the structure data relative to the start
@@ -651,6 +1271,37 @@ class BinaryDataFormat(object):
           'Reading {0:s} at offset: {1:d} (0x{1:08x})\n'.format(
               description, file_offset))
 
+    profiler = self._profiler
+    if profiler:
+      start_time = time.perf_counter()
+
+    data_size = self._fixed_data_type_map_sizes.get(data_type_map, None)
+    if data_size:
+      data = self._ReadFileObjectData(
+          file_object, file_offset, data_size, description)
+
+      if profiler:
+        profiler.AddReadData(data_type_map.name, data_size)
+        profiler.AddMapByteStream(data_type_map.name)
+
+      try:
+        structure_values_object = data_type_map.MapByteStream(data)
+      except (dtfabric_errors.ByteStreamTooSmallError,
+              dtfabric_errors.MappingError) as exception:
+        raise errors.ParseError((
+            'Unable to map {0:s} data at offset: {1:d} (0x{1:08x}) with error: '
+            '{2!s}').format(description, file_offset, exception))
+
+      if self._debug:
+        data_description = '{0:s}{1:s} data'.format(
+            description[0].upper(), description[1:])
+        self._DebugPrintData(data_description, data)
+
+      if profiler:
+        profiler.AddTime(data_type_map.name, time.perf_counter() - start_time)
+
+      return structure_values_object, data_size
+
     context = None
     data = b''
     last_data_size = 0
@@ -659,11 +1310,14 @@ class BinaryDataFormat(object):
     while data_size != last_data_size:
       read_offset = file_offset + last_data_size
       read_size = data_size - last_data_size
-      data_segment = self._ReadData(
+      data_segment = self._ReadFileObjectData(
           file_object, read_offset, read_size, description)
 
       data = b''.join([data, data_segment])
 
+      if profiler:
+        profiler.AddReadData(data_type_map.name, read_size)
+
       try:
         context = dtfabric_data_maps.DataTypeMapContext()
         structure_values_object = data_type_map.MapByteStream(
@@ -674,10 +1328,16 @@ class BinaryDataFormat(object):
               description[0].upper(), description[1:])
           self._DebugPrintData(data_description, data)
 
+        if profiler:
+          profiler.AddMapByteStream(data_type_map.name)
+          profiler.AddTime(
+              data_type_map.name, time.perf_counter() - start_time)
+
         return structure_values_object, data_size
 
       except dtfabric_errors.ByteStreamTooSmallError:
-        pass
+        if profiler:
+          profiler.AddMapByteStream(data_type_map.name, retry=True)
 
       except dtfabric_errors.MappingError as exception:
         raise errors.ParseError((
@@ -691,6 +1351,104 @@ class BinaryDataFormat(object):
         'Unable to read {0:s} at offset: {1:d} (0x{1:08x})'.format(
             description, file_offset))
 
+  def _ReadStructuresFromFileObject(
+      self, file_object, file_offset, data_size, data_type_map, description):
+    """Reads a run of consecutive fixed-size structures from a file-like object.
+
+    The structures are read with a small number of large reads and mapped
+    lazily, so that the per-structure cost is only the mapping. If profiling
+    is enabled the time spent reading and mapping, but not the time spent by
+    the caller, is recorded.
+
+    Args:
+      file_object (file): a file-like object to parse.
+      file_offset (int): offset of the first structure relative to the start
+          of the file-like object.
+      data_size (int): data size of the run of structures.
+      data_type_map (dtfabric.DataTypeMap): data type map of the structure,
+          as retrieved by _GetDataTypeMap.
+      description (str): description of the structure.
+
+    Yields:
+      tuple[object, int]: structure values object and offset of the structure
+          relative to the start of the file-like object.
+
+    Raises:
+      ParseError: if a structure cannot be read or if the data size is not
+          a multiple of the structure size.
+      ValueError: if the file-like object is missing or if the data type map
+          does not have a fixed size.
+    """
+    structure_size = self._fixed_data_type_map_sizes.get(data_type_map, None)
+    if not structure_size:
+      raise ValueError('Unsupported data type map without a fixed size.')
+
+    read_buffer_size = max(
+        self._MAXIMUM_READ_BUFFER_SIZE - (
+            self._MAXIMUM_READ_BUFFER_SIZE % structure_size),
+        structure_size)
+
+    number_of_structures, trailing_data_size = divmod(data_size, structure_size)
+    data_end_offset = file_offset + (number_of_structures * structure_size)
+
+    if self._debug:
+      data_description = '{0:s}{1:s} data'.format(
+          description[0].upper(), description[1:])
+
+    profiler = self._profiler
+
+    while file_offset < data_end_offset:
+      if profiler:
+        start_time = time.perf_counter()
+
+      read_size = min(read_buffer_size, data_end_offset - file_offset)
+      data = self._ReadFileObjectData(
+          file_object, file_offset, read_size, description)
+
+      if profiler:
+        profiler.AddReadData(data_type_map.name, read_size)
+        profiler.AddTime(data_type_map.name, time.perf_counter() - start_time)
+
+      for data_offset in range(0, read_size, structure_size):
+        structure_data = data[data_offset:data_offset + structure_size]
+        structure_offset = file_offset + data_offset
+
+        if self._debug:
+          self._DebugPrintText(
+              'Reading {0:s} at offset: {1:d} (0x{1:08x})\n'.format(
+                  description, structure_offset))
+
+        if profiler:
+          start_time = time.perf_counter()
+
+        try:
+          structure_values_object = data_type_map.MapByteStream(
+              structure_data)
+        except (dtfabric_errors.ByteStreamTooSmallError,
+                dtfabric_errors.MappingError) as exception:
+          raise errors.ParseError((
+              'Unable to map {0:s} data at offset: {1:d} (0x{1:08x}) with '
+              'error: {2!s}').format(description, structure_offset, exception))
+
+        if profiler:
+          profiler.AddMapByteStream(data_type_map.name)
+          profiler.AddTime(
+              data_type_map.name, time.perf_counter() - start_time)
+
+        if self._debug:
+          self._DebugPrintData(data_description, structure_data)
+
+        yield structure_values_object, structure_offset
+
+      file_offset += read_size
+
+    if trailing_data_size:
+      raise errors.ParseError((
+          'Unable to read {0:s} at offset: {1:d} (0x{1:08x}) with error: '
+          'missing data (read: {2:d}, requested: {3:d})').format(
+              description, data_end_offset, trailing_data_size,
+              structure_size))
+
   def _ReadStructureObjectFromFileObject(
       self, file_object, file_offset, data_type_map_name, description,
       debug_info):
@@ -722,10 +1480,115 @@ class BinaryDataFormat(object):
 
     return structure_object
 
+  def _WriteRecord(self, record_type, values):
+    """Writes a structured record if the output writer supports records.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+    """
+    if self._record_output_writer:
+      self._record_output_writer.WriteRecord(record_type, values)
+
+  @classmethod
+  def _GetDefinitionsCacheFilePath(cls, path):
+    """Retrieves the path of the cache file of a dtFabric definition file.
+
+    Args:
+      path (str): path of the dtFabric definition file.
+
+    Returns:
+      str: path of the cache file or None if caching is not enabled.
+    """
+    cache_path = os.environ.get(cls._DEFINITIONS_CACHE_ENVIRONMENT_VARIABLE)
+    if not cache_path:
+      return None
+
+    try:
+      stat_object = os.stat(path)
+    except OSError:
+      return None
+
+    # The dtFabric version is part of the key since the cache file contains
+    # pickled dtFabric objects.
+    cache_key = '{0:s}:{1:d}:{2:d}:{3:s}'.format(
+        os.path.abspath(path), stat_object.st_mtime_ns, stat_object.st_size,
+        dtfabric.__version__)
+    cache_key = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
+
+    return os.path.join(cache_path, '{0:s}-{1:s}.pickle'.format(
+        os.path.basename(path), cache_key))
+
+  @classmethod
+  def _ReadDefinitionsCacheFile(cls, path):
+    """Reads a data type fabric from a cache file.
+
+    Args:
+      path (str): path of the cache file.
+
+    Returns:
+      dtfabric.DataTypeFabric: data type fabric or None if not available.
+    """
+    try:
+      with open(path, 'rb') as file_object:
+        fabric = pickle.load(file_object)
+
+    except Exception:  # pylint: disable=broad-except
+      return None
+
+    if not isinstance(fabric, dtfabric_fabric.DataTypeFabric):
+      return None
+
+    return fabric
+
+  @classmethod
+  def _WriteDefinitionsCacheFile(cls, path, fabric):
+    """Writes a data type fabric to a cache file.
+
+    Failing to write the cache file is not considered an error, since
+    the cache file only serves to speed up subsequent runs.
+
+    Args:
+      path (str): path of the cache file.
+      fabric (dtfabric.DataTypeFabric): data type fabric.
+    """
+    cache_path = os.path.dirname(path)
+    temporary_path = None
+
+    try:
+      if not os.path.isdir(cache_path):
+        os.makedirs(cache_path)
+
+      # Write to a temporary file first so that concurrent runs never read
+      # a partially written cache file.
+      file_descriptor, temporary_path = tempfile.mkstemp(
+          dir=cache_path, suffix='.tmp')
+      with os.fdopen(file_descriptor, 'wb') as file_object:
+        pickle.dump(fabric, file_object, protocol=pickle.HIGHEST_PROTOCOL)
+
+      os.replace(temporary_path, path)
+      temporary_path = None
+
+    except (IOError, OSError, pickle.PicklingError):
+      pass
+
+    finally:
+      if temporary_path:
+        try:
+          os.remove(temporary_path)
+        except OSError:
+          pass
+
   @classmethod
   def ReadDefinitionFile(cls, filename):
     """Reads a dtFabric definition file.
 
+    The data type fabric is shared by all data formats that read the same
+    definition file. If the DTFORMATS_DEFINITIONS_CACHE environment variable
+    contains the path of a directory, the parsed definition file is cached
+    in that directory and is reused by subsequent runs, for as long as
+    the modification time and size of the definition file do not change.
+
     Args:
       filename (str): name of the dtFabric definition file.
 
@@ -738,14 +1601,168 @@ class BinaryDataFormat(object):
       return None
 
     path = os.path.join(cls._DEFINITION_FILES_PATH, filename)
-    with open(path, 'rb') as file_object:
-      definition = file_object.read()
 
-    return dtfabric_fabric.DataTypeFabric(yaml_definition=definition)
+    fabric = cls._FABRICS_PER_PATH.get(path, None)
+    if fabric:
+      return fabric
+
+    cache_file_path = cls._GetDefinitionsCacheFilePath(path)
+    if cache_file_path:
+      fabric = cls._ReadDefinitionsCacheFile(cache_file_path)
+
+    if not fabric:
+      with open(path, 'rb') as file_object:
+        definition = file_object.read()
+
+      fabric = dtfabric_fabric.DataTypeFabric(yaml_definition=definition)
+
+      if cache_file_path:
+        cls._WriteDefinitionsCacheFile(cache_file_path, fabric)
+
+    cls._FABRICS_PER_PATH[path] = fabric
+
+    return fabric
+
+  @classmethod
+  def SetProfiler(cls, profiler):
+    """Sets the profiler shared by all data formats.
+
+    Args:
+      profiler (DataFormatProfiler): data format profiler or None to disable
+          profiling.
+    """
+    BinaryDataFormat._profiler = profiler
+
+
+class Checkpoint(object):
+  """Checkpoint to resume reading a file that is appended to.
+
+  A checkpoint is passed between runs as an opaque token string, as created
+  by CopyToString.
+
+  Attributes:
+    file_identity (str): hash of data that identifies the file, which is used
+        to detect that a file was replaced, for example by log rotation.
+    offset (int): offset of the last record read relative to the start of
+        the file.
+    sequence_number (int): sequence number of the last record read, as
+        defined by the data format.
+  """
+
+  def __init__(self, file_identity=None, offset=None, sequence_number=None):
+    """Initializes a checkpoint.
+
+    Args:
+      file_identity (Optional[str]): hash of data that identifies the file.
+      offset (Optional[int]): offset of the last record read relative to
+          the start of the file.
+      sequence_number (Optional[int]): sequence number of the last record
+          read.
+    """
+    super(Checkpoint, self).__init__()
+    self.file_identity = file_identity
+    self.offset = offset
+    self.sequence_number = sequence_number
+
+  def __eq__(self, other):
+    """Determines if the checkpoint is equal to another checkpoint.
+
+    Args:
+      other (object): other checkpoint.
+
+    Returns:
+      bool: True if the checkpoints are equal.
+    """
+    if not isinstance(other, Checkpoint):
+      return False
+
+    return (self.file_identity == other.file_identity and
+            self.offset == other.offset and
+            self.sequence_number == other.sequence_number)
+
+  def __ne__(self, other):
+    """Determines if the checkpoint is not equal to another checkpoint.
+
+    Args:
+      other (object): other checkpoint.
+
+    Returns:
+      bool: True if the checkpoints are not equal.
+    """
+    return not self.__eq__(other)
+
+  def CopyFromString(self, string):
+    """Copies the checkpoint from a token string.
+
+    Args:
+      string (str): token string, as created by CopyToString.
+
+    Raises:
+      ValueError: if the token string is not supported.
+    """
+    try:
+      json_string = base64.urlsafe_b64decode(string.encode('ascii'))
+      json_dict = json.loads(json_string.decode('utf-8'))
+    except (
+        AttributeError, UnicodeError, binascii.Error, ValueError) as exception:
+      raise ValueError('Unsupported checkpoint with error: {0!s}'.format(
+          exception))
+
+    if not isinstance(json_dict, dict):
+      raise ValueError('Unsupported checkpoint.')
+
+    file_identity = json_dict.get('file_identity', None)
+    offset = json_dict.get('offset', None)
+    sequence_number = json_dict.get('sequence_number', None)
+
+    if (not isinstance(file_identity, str) or not isinstance(offset, int) or
+        not isinstance(sequence_number, int)):
+      raise ValueError('Unsupported checkpoint.')
+
+    self.file_identity = file_identity
+    self.offset = offset
+    self.sequence_number = sequence_number
+
+  def CopyToString(self):
+    """Copies the checkpoint to a token string.
+
+    Returns:
+      str: token string.
+    """
+    json_string = json.dumps({
+        'file_identity': self.file_identity,
+        'offset': self.offset,
+        'sequence_number': self.sequence_number}, sort_keys=True)
+
+    return base64.urlsafe_b64encode(json_string.encode('utf-8')).decode(
+        'ascii')
 
 
 class BinaryDataFile(BinaryDataFormat):
-  """Binary data file."""
+  """Binary data file.
+
+  Attributes:
+    CARVING_OFFSET (int): offset of the carving signature or pattern relative
+        to the start of a record.
+    CARVING_PATTERN (re.Pattern): regular expression that matches candidate
+        records to carve, or None if not supported. The pattern should match
+        at most 1024 bytes.
+    CARVING_SIGNATURE (bytes): signature of candidate records to carve, which
+        is searched for instead of a pattern, or None if not supported.
+    SIGNATURES (list[tuple[int, bytes]]): offsets and signatures that identify
+        the format, where any one of the signatures identifies the format.
+        An empty list represents that the format has no signature.
+    SUPPORTS_CHECKPOINTS (bool): True if reading can be resumed from
+        a checkpoint, in which case ReadFileObject accepts a checkpoint.
+  """
+
+  CARVING_OFFSET = 0
+  CARVING_PATTERN = None
+  CARVING_SIGNATURE = None
+
+  SIGNATURES = []
+
+  SUPPORTS_CHECKPOINTS = False
 
   def __init__(self, debug=False, output_writer=None):
     """Initializes a binary data file.
@@ -756,11 +1773,44 @@ class BinaryDataFile(BinaryDataFormat):
     """
     super(BinaryDataFile, self).__init__(
         debug=debug, output_writer=output_writer)
+    self._checkpoint = None
     self._file_object = None
     self._file_object_opened_in_object = False
     self._file_size = 0
     self._path = None
 
+  def _GetFileIdentity(self, data):
+    """Retrieves the identity of a file.
+
+    Args:
+      data (bytes): data that identifies the file.
+
+    Returns:
+      str: file identity.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+  def CarveRecord(self, file_object, file_offset):
+    """Carves a record from raw data, such as unallocated space.
+
+    The record is validated and written to the record output writer, if any.
+    Data formats that support carving set CARVING_PATTERN or
+    CARVING_SIGNATURE and override this method.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the candidate record relative to the start
+          of the file-like object.
+
+    Returns:
+      int: size of the record.
+
+    Raises:
+      NotImplementedError: if the data format does not support carving.
+      ParseError: if no valid record was found at the offset.
+    """
+    raise NotImplementedError('Carving not supported.')
+
   def Close(self):
     """Closes a binary data file.
 
@@ -777,27 +1827,83 @@ class BinaryDataFile(BinaryDataFormat):
     self._file_object = None
     self._path = None
 
-  def Open(self, path):
+  def GetCheckpoint(self):
+    """Retrieves a checkpoint to resume reading after the last record read.
+
+    Only data formats of which SUPPORTS_CHECKPOINTS is True support
+    checkpoints.
+
+    Returns:
+      Checkpoint: checkpoint or None if no record was read.
+    """
+    return self._checkpoint
+
+  def Open(
+      self, path, page_cache_block_size=None, use_mmap=False,
+      checkpoint=None):
     """Opens a binary data file.
 
     Args:
       path (str): path to the file.
+      page_cache_block_size (Optional[int]): block size of the page cache,
+          where None represents the file should be read without a page cache.
+          The page cache serves many small reads from few large reads.
+      use_mmap (Optional[bool]): True if the file should be memory-mapped
+          instead of being read with seek and read calls. Empty files are
+          never memory-mapped.
+      checkpoint (Optional[Checkpoint]): checkpoint to resume reading from,
+          where None represents the file should be read from the start.
 
     Raises:
       IOError: if the file is already opened.
       OSError: if the file is already opened.
+      ValueError: if both a page cache and memory-mapping are requested or
+          if a checkpoint is passed and the format does not support
+          checkpoints.
     """
     if self._file_object:
       raise IOError('File already opened')
 
+    if page_cache_block_size and use_mmap:
+      raise ValueError('Page cache and memory-mapping are mutually exclusive.')
+
+    if checkpoint and not self.SUPPORTS_CHECKPOINTS:
+      raise ValueError('Unsupported checkpoint for format: {0:s}.'.format(
+          self.__class__.__name__))
+
     stat_object = os.stat(path)
 
     file_object = open(path, 'rb')  # pylint: disable=consider-using-with
 
+    if use_mmap and stat_object.st_size > 0:
+      try:
+        file_object = memory_mapped_file.MemoryMappedFile(file_object)
+      except (OSError, ValueError):
+        file_object.close()
+        raise
+
+    elif page_cache_block_size:
+      try:
+        file_object = page_cache.PageCachedFile(
+            file_object, block_size=page_cache_block_size)
+      except ValueError:
+        file_object.close()
+        raise
+
     self._file_size = stat_object.st_size
     self._path = path
 
-    self.ReadFileObject(file_object)
+    # The file is closed if it cannot be read or the read is stopped, for
+    # example by an asynchronous parse that is no longer consumed.
+    try:
+      if checkpoint:
+        self.ReadFileObject(file_object, checkpoint=checkpoint)
+      else:
+        self.ReadFileObject(file_object)
+
+    except Exception:
+      file_object.close()
+      raise
 
     self._file_object = file_object
     self._file_object_opened_in_object = True
@@ -1,12 +1,19 @@
 # -*- coding: utf-8 -*-
 """Data range file-like object."""
 
+import io
 import os
 
+from dtformats import memory_mapped_file
+
 
 class DataRange(object):
   """In-file data range file-like object.
 
+  A data range of another data range is read directly from the file-like
+  object of the outermost data range, instead of reading through every
+  nested data range.
+
   Attributes:
     data_offset (int): offset of the data.
     data_size (int): size of the data.
@@ -22,11 +29,136 @@ class DataRange(object):
     """
     super(DataRange, self).__init__()
     self._current_offset = 0
+
+    # Offset of the parent data range relative to the start of the file-like
+    # object and the end offset of the parent data range, where None
+    # represents the parent is not a data range.
+    self._parent_end_offset = None
+    self._parent_offset = 0
+
+    if isinstance(file_object, DataRange):
+      self._parent_offset = file_object._GetAbsoluteOffset(0)
+      self._parent_end_offset = file_object._GetAbsoluteEndOffset()
+      file_object = file_object._file_object
+
     self._file_object = file_object
 
     self.data_offset = data_offset
     self.data_size = data_size
 
+  def _CheckDataRange(self):
+    """Checks the data offset and size.
+
+    Raises:
+      IOError: if the data offset or size is out of bounds.
+      OSError: if the data offset or size is out of bounds.
+    """
+    if self.data_offset < 0:
+      raise IOError('Invalid data offset: {0:d} value out of bounds.'.format(
+          self.data_offset))
+
+    if self.data_size < 0:
+      raise IOError('Invalid data size: {0:d} value out of bounds.'.format(
+          self.data_size))
+
+  def _GetAbsoluteEndOffset(self):
+    """Retrieves the end offset of the data relative to the file-like object.
+
+    Returns:
+      int: end offset of the data relative to the start of the file-like
+          object, which is limited to the end of the parent data ranges.
+    """
+    end_offset = self._GetAbsoluteOffset(self.data_size)
+    if self._parent_end_offset is not None:
+      end_offset = min(end_offset, self._parent_end_offset)
+
+    return end_offset
+
+  def _GetAbsoluteOffset(self, offset):
+    """Retrieves an offset relative to the file-like object.
+
+    Args:
+      offset (int): offset relative to the start of the data.
+
+    Returns:
+      int: offset relative to the start of the file-like object.
+    """
+    return self._parent_offset + self.data_offset + offset
+
+  def _GetReadRange(self, size):
+    """Retrieves the range of the parent file-like object to read.
+
+    Args:
+      size (int): number of bytes to read, where None represents all remaining
+          data.
+
+    Returns:
+      tuple[int, int]: offset relative to the start of the file-like object
+          and number of bytes to read.
+
+    Raises:
+      IOError: if the data offset or size is out of bounds.
+      OSError: if the data offset or size is out of bounds.
+    """
+    self._CheckDataRange()
+
+    read_offset = self._GetAbsoluteOffset(self._current_offset)
+    remaining_size = self._GetAbsoluteEndOffset() - read_offset
+
+    if size is None or size < 0 or size > remaining_size:
+      size = remaining_size
+
+    return read_offset, max(size, 0)
+
+  def _GetView(self, offset, size):
+    """Retrieves a view of the data of the file-like object without copying.
+
+    Args:
+      offset (int): offset relative to the start of the file-like object.
+      size (int): size of the data.
+
+    Returns:
+      memoryview: view of the data or None if the file-like object does not
+          support views.
+    """
+    if isinstance(self._file_object, memory_mapped_file.MemoryMappedFile):
+      return self._file_object.GetView(offset, size)
+
+    if isinstance(self._file_object, io.BytesIO):
+      return self._file_object.getbuffer()[offset:offset + size]
+
+    return None
+
+  def read_view(self, size=None):
+    """Reads a view of the data at the current offset.
+
+    If the file-like object is memory-mapped or backed by bytes, the view
+    refers to the data of the file-like object without copying it.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None represents
+          all remaining data.
+
+    Returns:
+      memoryview: data read.
+
+    Raises:
+      IOError: if the read failed.
+      OSError: if the read failed.
+    """
+    read_offset, size = self._GetReadRange(size)
+    if size == 0:
+      return memoryview(b'')
+
+    view = self._GetView(read_offset, size)
+    if view is None:
+      self._file_object.seek(read_offset, os.SEEK_SET)
+      view = memoryview(self._file_object.read(size))
+
+    self._current_offset += len(view)
+
+    return view
+
   # The following methods are part of the file-like object interface.
   # pylint: disable=invalid-name
 
@@ -47,30 +179,58 @@ class DataRange(object):
       IOError: if the read failed.
       OSError: if the read failed.
     """
-    if self.data_offset < 0:
-      raise IOError('Invalid data offset: {0:d} value out of bounds.'.format(
-          self.data_offset))
+    read_offset, size = self._GetReadRange(size)
+    if size == 0:
+      return b''
 
-    if self.data_size < 0:
-      raise IOError('Invalid data size: {0:d} value out of bounds.'.format(
-          self.data_size))
+    if isinstance(self._file_object, memory_mapped_file.MemoryMappedFile):
+      data = self._file_object.ReadAt(read_offset, size)
+    else:
+      self._file_object.seek(read_offset, os.SEEK_SET)
+      data = self._file_object.read(size)
 
-    if self._current_offset >= self.data_size:
-      return b''
+    self._current_offset += len(data)
 
-    if size is None:
-      size = self.data_size
-    if self._current_offset + size > self.data_size:
-      size = self.data_size - self._current_offset
+    return data
 
-    self._file_object.seek(
-        self.data_offset + self._current_offset, os.SEEK_SET)
+  def readinto(self, buffer):
+    """Reads bytes into a pre-allocated writable bytes-like object.
 
-    data = self._file_object.read(size)
+    Args:
+      buffer (bytearray|memoryview): buffer to read into.
 
-    self._current_offset += len(data)
+    Returns:
+      int: number of bytes read.
 
-    return data
+    Raises:
+      IOError: if the read failed.
+      OSError: if the read failed.
+    """
+    read_offset, size = self._GetReadRange(len(buffer))
+    if size == 0:
+      return 0
+
+    buffer_view = memoryview(buffer).cast('B')[:size]
+
+    view = self._GetView(read_offset, size)
+    if view is not None:
+      read_count = len(view)
+      buffer_view[:read_count] = view
+      view.release()
+
+    else:
+      self._file_object.seek(read_offset, os.SEEK_SET)
+
+      if hasattr(self._file_object, 'readinto'):
+        read_count = self._file_object.readinto(buffer_view) or 0
+      else:
+        data = self._file_object.read(size)
+        read_count = len(data)
+        buffer_view[:read_count] = data
+
+    self._current_offset += read_count
+
+    return read_count
 
   def seek(self, offset, whence=os.SEEK_SET):
     """Seeks an offset within the file-like object.
@@ -11,8 +11,7 @@ class WindowsDefenderScanDetectionHistoryFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
-      'detection_history.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('detection_history.yaml')
 
   _DEBUG_INFO_THREAT_TRACKING_HEADER = [
       ('version', 'Version', '_FormatIntegerAsDecimal'),
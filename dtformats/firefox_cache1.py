@@ -12,7 +12,7 @@ class CacheMapFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('firefox_cache1.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('firefox_cache1.yaml')
 
   _DEBUG_INFO_FILE_HEADER = [
       ('major_format_version', 'Major format version',
@@ -64,6 +64,9 @@ class CacheMapFile(data_format.BinaryDataFile):
     Args:
       file_object (file): file-like object.
 
+    Returns:
+      int: size of the file header.
+
     Raises:
       ParseError: if the file header cannot be read.
     """
@@ -82,24 +85,32 @@ class CacheMapFile(data_format.BinaryDataFile):
     if file_header.data_size != (self._file_size - file_header_data_size):
       raise errors.ParseError('Data size does not correspond with file size.')
 
-  def _ReadRecord(self, file_object, file_offset):
-    """Reads a record.
+    return file_header_data_size
+
+  def _ReadRecords(self, file_object, file_offset):
+    """Reads the records.
 
     Args:
       file_object (file): file-like object.
-      file_offset (int): offset of the data relative to the start of
+      file_offset (int): offset of the first record relative to the start of
           the file-like object.
 
     Raises:
-      ParseError: if the record cannot be read.
+      ParseError: if the records cannot be read.
     """
     data_type_map = self._GetDataTypeMap('firefox_cache1_map_record')
 
-    record, _ = self._ReadStructureFromFileObject(
-        file_object, file_offset, data_type_map, 'record')
+    for record, record_offset in self._ReadStructuresFromFileObject(
+        file_object, file_offset, self._file_size - file_offset, data_type_map,
+        'record'):
+      if self._debug:
+        self._DebugPrintStructureObject(record, self._DEBUG_INFO_RECORD)
 
-    if self._debug:
-      self._DebugPrintStructureObject(record, self._DEBUG_INFO_RECORD)
+      if self._record_output_writer:
+        values = self._GetStructureObjectValues(
+            record, self._DEBUG_INFO_RECORD)
+        values['offset'] = record_offset
+        self._WriteRecord('firefox_cache1_map_record', values)
 
   def ReadFileObject(self, file_object):
     """Reads a Firefox cache map file-like object.
@@ -110,12 +121,9 @@ class CacheMapFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
-    self._ReadFileHeader(file_object)
+    file_offset = self._ReadFileHeader(file_object)
 
-    file_offset = file_object.tell()
-    while file_offset < self._file_size:
-      self._ReadRecord(file_object, file_offset)
-      file_offset = file_object.tell()
+    self._ReadRecords(file_object, file_offset)
 
 
 class CacheBlockFile(data_format.BinaryDataFile):
@@ -123,7 +131,7 @@ class CacheBlockFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('firefox_cache1.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('firefox_cache1.yaml')
 
   _DEBUG_INFO_CACHE_ENTRY = [
       ('major_format_version', 'Major format version',
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Signature-based format detection."""
+
+import os
+import time
+
+
+class FormatDetector(object):
+  """Detects the formats of files by their signatures.
+
+  The signatures of all registered formats are matched against a single
+  prefix buffer that is read once per file. Per offset the signatures are
+  stored in a dictionary keyed by the leading bytes of the signatures, with
+  as many bytes as the shortest signature at that offset, so that matching
+  costs one dictionary lookup per distinct offset, independent of the number
+  of registered formats.
+  """
+
+  def __init__(self, format_classes=None, profiler=None):
+    """Initializes a format detector.
+
+    Args:
+      format_classes (Optional[list[type]]): data format classes, subclasses
+          of BinaryDataFile, to register.
+      profiler (Optional[DataFormatProfiler]): profiler to record reading
+          and matching the prefixes of files, where None represents no
+          profiling.
+
+    Raises:
+      KeyError: if a data format is registered more than once.
+      ValueError: if a data format has no or unsupported signatures.
+    """
+    super(FormatDetector, self).__init__()
+    self._format_classes = []
+    self._key_size_per_offset = {}
+    self._prefix_size = 0
+    self._profiler = profiler
+    self._signatures_per_offset = {}
+
+    for format_class in format_classes or []:
+      self.RegisterFormat(format_class)
+
+  @property
+  def prefix_size(self):
+    """int: number of bytes needed to match all the signatures."""
+    return self._prefix_size
+
+  def _DetectFileObject(self, file_object):
+    """Detects the formats of a file-like object from its current offset.
+
+    Args:
+      file_object (file): file-like object.
+
+    Returns:
+      list[type]: data format classes whose signatures match, where the class
+          with the longest matching signature comes first.
+    """
+    profiler = self._profiler
+    if not profiler:
+      return self.DetectData(file_object.read(self._prefix_size))
+
+    start_time = time.perf_counter()
+
+    data = file_object.read(self._prefix_size)
+
+    profiler.AddReadData('signature prefix', len(data))
+    profiler.AddTime('signature prefix', time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+
+    format_classes = self.DetectData(data)
+
+    profiler.AddTime('signature matching', time.perf_counter() - start_time)
+
+    return format_classes
+
+  def _RebuildSignatures(self):
+    """Rebuilds the signatures lookup tables of the registered formats."""
+    signatures_per_offset = {}
+    for format_class in self._format_classes:
+      for offset, signature in format_class.SIGNATURES:
+        signatures_per_offset.setdefault(offset, []).append(
+            (signature, format_class))
+
+    self._key_size_per_offset = {}
+    self._prefix_size = 0
+    self._signatures_per_offset = {}
+
+    for offset, signatures in signatures_per_offset.items():
+      key_size = min(len(signature) for signature, _ in signatures)
+
+      signatures_per_key = {}
+      for signature, format_class in signatures:
+        signatures_per_key.setdefault(signature[:key_size], []).append(
+            (signature, format_class))
+
+      self._key_size_per_offset[offset] = key_size
+      self._prefix_size = max(self._prefix_size, max(
+          offset + len(signature) for signature, _ in signatures))
+      self._signatures_per_offset[offset] = signatures_per_key
+
+  def DeregisterFormat(self, format_class):
+    """Deregisters a data format.
+
+    Args:
+      format_class (type): data format class.
+
+    Raises:
+      KeyError: if the data format is not registered.
+    """
+    if format_class not in self._format_classes:
+      raise KeyError('Format class not registered: {0:s}'.format(
+          format_class.__name__))
+
+    self._format_classes.remove(format_class)
+    self._RebuildSignatures()
+
+  def DetectData(self, data):
+    """Detects the formats that match a prefix of a file.
+
+    Args:
+      data (bytes): prefix of the file, which should be at least prefix_size
+          bytes or the entire file if it is smaller.
+
+    Returns:
+      list[type]: data format classes whose signatures match, where the class
+          with the longest matching signature comes first.
+    """
+    matches = {}
+    for offset, signatures_per_key in self._signatures_per_offset.items():
+      key_size = self._key_size_per_offset[offset]
+      key = data[offset:offset + key_size]
+
+      for signature, format_class in signatures_per_key.get(key, []):
+        if data.startswith(signature, offset):
+          matches[format_class] = max(
+              matches.get(format_class, 0), len(signature))
+
+    return sorted(matches, key=lambda format_class: (
+        -matches[format_class], format_class.__name__))
+
+  def DetectFileObject(self, file_object):
+    """Detects the formats of a file-like object.
+
+    The current offset of the file-like object is not preserved.
+
+    Args:
+      file_object (file): file-like object.
+
+    Returns:
+      list[type]: data format classes whose signatures match, where the class
+          with the longest matching signature comes first.
+    """
+    file_object.seek(0, os.SEEK_SET)
+    return self._DetectFileObject(file_object)
+
+  def DetectPath(self, path):
+    """Detects the formats of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      list[type]: data format classes whose signatures match, where the class
+          with the longest matching signature comes first.
+    """
+    with open(path, 'rb') as file_object:
+      return self._DetectFileObject(file_object)
+
+  def RegisterFormat(self, format_class):
+    """Registers a data format.
+
+    Args:
+      format_class (type): data format class with SIGNATURES.
+
+    Raises:
+      KeyError: if the data format is already registered.
+      ValueError: if the data format has no signatures.
+    """
+    if format_class in self._format_classes:
+      raise KeyError('Format class already registered: {0:s}'.format(
+          format_class.__name__))
+
+    signatures = getattr(format_class, 'SIGNATURES', None)
+    if not signatures:
+      raise ValueError('Format class has no signatures: {0:s}'.format(
+          format_class.__name__))
+
+    for offset, signature in signatures:
+      if offset < 0 or not signature:
+        raise ValueError('Unsupported signature of format class: {0:s}'.format(
+            format_class.__name__))
+
+    self._format_classes.append(format_class)
+    self._RebuildSignatures()
+
@@ -17,7 +17,9 @@ class GZipFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('gzipfile.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('gzipfile.yaml')
+
+  SIGNATURES = [(0, b'\x1f\x8b')]
 
   _GZIP_SIGNATURE = 0x8b1f
 
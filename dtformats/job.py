@@ -38,7 +38,7 @@ class WindowsTaskSchedulerJobFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('job.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('job.yaml')
 
   # TODO: add job signature
   # https://msdn.microsoft.com/en-us/library/cc248299.aspx
@@ -247,3 +247,18 @@ class WindowsTaskSchedulerJobFile(data_format.BinaryDataFile):
         data_section.working_directory.string)
     self._task_configuration.author = data_section.author.string
     self._task_configuration.comment = data_section.comment.string
+
+    if self._record_output_writer:
+      task_configuration = self._task_configuration
+      self._WriteRecord('windows_task_configuration', {
+          'application_name': (
+              task_configuration.application_name.rstrip('\x00')),
+          'author': task_configuration.author.rstrip('\x00'),
+          'comment': task_configuration.comment.rstrip('\x00'),
+          'error_retry_count': task_configuration.error_retry_count,
+          'error_retry_interval': task_configuration.error_retry_interval,
+          'identifier': task_configuration.identifier,
+          'parameters': task_configuration.parameters.rstrip('\x00'),
+          'priority': task_configuration.priority,
+          'working_directory': (
+              task_configuration.working_directory.rstrip('\x00'))})
@@ -7,10 +7,6 @@
 import logging
 import os
 
-import pyfwsi
-import pylnk
-import pyolecf
-
 from dtformats import data_format
 from dtformats import data_range
 from dtformats import errors
@@ -30,6 +26,8 @@ class LNKFileEntry(object):
     Args:
       identifier (str): LNK file entry identifier.
     """
+    import pylnk  # pylint: disable=import-outside-toplevel
+
     super(LNKFileEntry, self).__init__()
     self._lnk_file = pylnk.file()
     self.identifier = identifier
@@ -46,6 +44,8 @@ class LNKFileEntry(object):
       pyfswi.item: shell item.
     """
     if self._lnk_file.link_target_identifier_data:  # pylint: disable=using-constant-test
+      import pyfwsi  # pylint: disable=import-outside-toplevel
+
       shell_item_list = pyfwsi.item_list()
       shell_item_list.copy_from_byte_stream(
           self._lnk_file.link_target_identifier_data)
@@ -78,7 +78,7 @@ class AutomaticDestinationsFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('jump_list.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('jump_list.yaml')
 
   # TODO: debug print pin status.
   _DEBUG_INFO_DEST_LIST_ENTRY = [
@@ -189,6 +189,13 @@ class AutomaticDestinationsFile(data_format.BinaryDataFile):
       self._DebugPrintStructureObject(
           dest_list_entry, self._DEBUG_INFO_DEST_LIST_ENTRY)
 
+    self._WriteRecord('jump_list_dest_list_entry', {
+        'entry_number': dest_list_entry.entry_number,
+        'hostname': dest_list_entry.hostname.rstrip('\x00'),
+        'last_modification_time': dest_list_entry.last_modification_time,
+        'path': dest_list_entry.path.rstrip('\x00'),
+        'pin_status': dest_list_entry.pin_status})
+
     return entry_data_size
 
   def _ReadDestListHeader(self, olecf_item):
@@ -260,6 +267,10 @@ class AutomaticDestinationsFile(data_format.BinaryDataFile):
       if lnk_file_entry:
         self.entries.append(lnk_file_entry)
 
+        self._WriteRecord('jump_list_lnk_entry', {
+            'data_size': lnk_file_entry.data_size,
+            'identifier': lnk_file_entry.identifier})
+
   def ReadFileObject(self, file_object):
     """Reads an Automatic Destinations Jump List file-like object.
 
@@ -269,6 +280,12 @@ class AutomaticDestinationsFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
+    import pyolecf  # pylint: disable=import-outside-toplevel
+
+    # The entries of a previously read file are not kept.
+    self.entries = []
+    self.recovered_entries = []
+
     olecf_file = pyolecf.file()
     olecf_file.open_file_object(file_object)
 
@@ -290,7 +307,7 @@ class CustomDestinationsFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('jump_list.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('jump_list.yaml')
 
   _FILE_FOOTER_SIGNATURE = 0xbabffbab
 
@@ -476,6 +493,12 @@ class CustomDestinationsFile(data_format.BinaryDataFile):
       if lnk_file_entry:
         self.entries.append(lnk_file_entry)
 
+        # The identifier of the LNK file entry is the offset relative to
+        # the start of the LNK data, hence the file offset is used instead.
+        self._WriteRecord('jump_list_lnk_entry', {
+            'data_size': lnk_file_entry.data_size,
+            'identifier': '0x{0:08x}'.format(file_offset)})
+
       file_offset += lnk_file_entry.data_size
       remaining_file_size -= lnk_file_entry.data_size
 
@@ -490,6 +513,10 @@ class CustomDestinationsFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
+    # The entries of a previously read file are not kept.
+    self.entries = []
+    self.recovered_entries = []
+
     self._ReadFileHeader(file_object)
     self._ReadLNKFiles(file_object)
 
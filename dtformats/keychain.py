@@ -50,7 +50,9 @@ class KeychainDatabaseFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('keychain.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('keychain.yaml')
+
+  SIGNATURES = [(0, b'kych')]
 
   _RECORD_TYPE_CSSM_DL_DB_SCHEMA_INFO = 0x00000000
   _RECORD_TYPE_CSSM_DL_DB_SCHEMA_INDEXES = 0x00000001
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""Memory-mapped file-like object."""
+
+import mmap
+import os
+
+
+class MemoryMappedFile(object):
+  """Memory-mapped file-like object.
+
+  The mapping is read-only and spans the entire file. Reads are served by
+  slicing the mapping, which does not require a seek and read system call
+  per read.
+  """
+
+  def __init__(self, file_object):
+    """Initializes a file-like object.
+
+    Args:
+      file_object (file): file-like object of the file to map, which must
+          support fileno().
+
+    Raises:
+      ValueError: if the file cannot be mapped, for example if it is empty.
+    """
+    super(MemoryMappedFile, self).__init__()
+    self._mapped_file = mmap.mmap(
+        file_object.fileno(), 0, access=mmap.ACCESS_READ)
+    self._current_offset = 0
+    self._file_object = file_object
+    self._size = len(self._mapped_file)
+
+  def Find(self, signature, start_offset, end_offset):
+    """Finds a signature in the data without copying it.
+
+    Args:
+      signature (bytes): signature.
+      start_offset (int): offset to start searching at.
+      end_offset (int): offset to stop searching at, where the signature must
+          end before this offset.
+
+    Returns:
+      int: offset of the signature or -1 if not found.
+    """
+    return self._mapped_file.find(signature, start_offset, end_offset)
+
+  def GetView(self, offset, size):
+    """Retrieves a view of the data without copying it.
+
+    Note that the mapping cannot be closed while views of it are in use.
+
+    Args:
+      offset (int): offset of the data.
+      size (int): size of the data.
+
+    Returns:
+      memoryview: view of the data, which can be smaller than the requested
+          size if the data extends beyond the end of the file.
+    """
+    return memoryview(self._mapped_file)[offset:offset + size]
+
+  def ReadAt(self, offset, size):
+    """Reads data at a specific offset.
+
+    The current offset is set to the end of the data read, which corresponds
+    to the behavior of a seek followed by a read.
+
+    Args:
+      offset (int): offset of the data.
+      size (int): size of the data.
+
+    Returns:
+      bytes: data read, which can be smaller than the requested size if
+          the data extends beyond the end of the file.
+    """
+    data = self._mapped_file[offset:offset + size]
+    self._current_offset = offset + len(data)
+    return data
+
+  def Search(self, pattern, start_offset, end_offset):
+    """Searches the data for a regular expression without copying it.
+
+    Args:
+      pattern (re.Pattern): compiled regular expression of bytes.
+      start_offset (int): offset to start searching at.
+      end_offset (int): offset to stop searching at, where the match must
+          end before this offset.
+
+    Returns:
+      re.Match: match or None if not found.
+    """
+    return pattern.search(self._mapped_file, start_offset, end_offset)
+
+  # The following methods are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the file-like object and the underlying file."""
+    if self._mapped_file:
+      try:
+        self._mapped_file.close()
+      except BufferError:
+        # A view of the mapping is still in use, in which case the mapping
+        # is released when the last view is released.
+        pass
+
+      self._mapped_file = None
+
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def fileno(self):
+    """Retrieves the file descriptor of the underlying file.
+
+    Returns:
+      int: file descriptor.
+    """
+    return self._file_object.fileno()
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    The function will read a byte string of the specified size or
+    all of the remaining data if no size was specified.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None represents
+          all remaining data.
+
+    Returns:
+      bytes: data read.
+    """
+    if self._current_offset >= self._size:
+      return b''
+
+    if size is None or size < 0:
+      size = self._size - self._current_offset
+
+    return self.ReadAt(self._current_offset, size)
+
+  def readinto(self, buffer):
+    """Reads bytes into a pre-allocated writable bytes-like object.
+
+    Args:
+      buffer (bytearray|memoryview): buffer to read into.
+
+    Returns:
+      int: number of bytes read.
+    """
+    view = self.GetView(self._current_offset, len(buffer))
+    read_count = len(view)
+    buffer[:read_count] = view
+    view.release()
+
+    self._current_offset += read_count
+    return read_count
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks an offset within the file-like object.
+
+    Args:
+      offset (int): offset to seek.
+      whence (Optional[int]): indicates whether offset is an absolute
+          or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+      OSError: if the seek failed.
+    """
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._size
+    elif whence != os.SEEK_SET:
+      raise IOError('Unsupported whence.')
+
+    if offset < 0:
+      raise IOError('Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def get_offset(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: offset.
+    """
+    return self._current_offset
+
+  # Pythonesque alias for get_offset().
+  def tell(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: offset.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the file-like object.
+
+    Returns:
+      int: size.
+    """
+    return self._size
+
+  def seekable(self):
+    """Determines if a file-like object is seekable.
+
+    Returns:
+      bool: True if seekable.
+    """
+    return True
@@ -2,6 +2,11 @@
 """Output writer."""
 
 import abc
+import csv
+import json
+import queue
+import sys
+import threading
 
 
 class OutputWriter(object):
@@ -35,6 +40,16 @@ class OutputWriter(object):
 class StdoutWriter(OutputWriter):
   """Stdout output writer."""
 
+  def __init__(self, output_stream=None):
+    """Initializes a stdout output writer.
+
+    Args:
+      output_stream (Optional[io.TextIOBase]): stream to write to, where None
+          represents stdout.
+    """
+    super(StdoutWriter, self).__init__()
+    self._output_stream = output_stream
+
   def Close(self):
     """Closes the output writer object."""
     return
@@ -49,4 +64,347 @@ class StdoutWriter(OutputWriter):
     Args:
       text (str): text to write.
     """
-    print(text, end='')
+    print(text, end='', file=self._output_stream or sys.stdout)
+
+
+class BufferedStdoutWriter(OutputWriter):
+  """Buffered stdout output writer.
+
+  Text is coalesced into chunks of at least the buffer size before it is
+  written, which avoids a write per text fragment.
+  """
+
+  def __init__(self, buffer_size=65536, output_stream=None):
+    """Initializes a buffered stdout output writer.
+
+    Args:
+      buffer_size (Optional[int]): number of characters that is buffered
+          before it is written.
+      output_stream (Optional[io.TextIOBase]): stream to write to, where None
+          represents stdout.
+    """
+    super(BufferedStdoutWriter, self).__init__()
+    self._buffer = []
+    self._buffer_size = buffer_size
+    self._buffered_size = 0
+    self._output_stream = output_stream
+
+  def Close(self):
+    """Closes the output writer object."""
+    self.Flush()
+
+  def Flush(self):
+    """Writes the buffered text to the output."""
+    if self._buffer:
+      text = ''.join(self._buffer)
+
+      self._buffer = []
+      self._buffered_size = 0
+
+      output_stream = self._output_stream or sys.stdout
+      output_stream.write(text)
+      output_stream.flush()
+
+  def Open(self):
+    """Opens the output writer object."""
+    return
+
+  def WriteText(self, text):
+    """Writes text to the output.
+
+    Args:
+      text (str): text to write.
+    """
+    self._buffer.append(text)
+    self._buffered_size += len(text)
+
+    if self._buffered_size >= self._buffer_size:
+      self.Flush()
+
+
+class ThreadedStdoutWriter(OutputWriter):
+  """Background thread stdout output writer.
+
+  Text is coalesced into chunks of at least the buffer size, which are passed
+  through a bounded queue to a background thread that writes them. Only
+  the writing is moved off the parsing thread, the text is still formatted
+  and coalesced by the parsing thread. Since the global interpreter lock is
+  released while a chunk is written, parsing continues while the output,
+  such as a pipe or terminal, is slower than the parsing. When the queue is
+  full WriteText blocks, which bounds the memory used.
+  """
+
+  def __init__(
+      self, buffer_size=65536, maximum_queue_size=16, output_stream=None):
+    """Initializes a background thread stdout output writer.
+
+    Args:
+      buffer_size (Optional[int]): number of characters that is coalesced
+          into a chunk before it is passed to the background thread.
+      maximum_queue_size (Optional[int]): maximum number of chunks in
+          the queue.
+      output_stream (Optional[io.TextIOBase]): stream to write to, where None
+          represents stdout.
+    """
+    super(ThreadedStdoutWriter, self).__init__()
+    self._buffer = []
+    self._buffer_size = buffer_size
+    self._buffered_size = 0
+    self._exception = None
+    self._output_stream = output_stream
+    self._queue = queue.Queue(maxsize=maximum_queue_size)
+    self._thread = None
+
+  def _PutBuffer(self):
+    """Passes the buffered text as a chunk to the background thread."""
+    if self._buffer:
+      self._queue.put(self._buffer)
+
+      self._buffer = []
+      self._buffered_size = 0
+
+  def _WriteTextFromQueue(self):
+    """Writes chunks of text from the queue until None is received."""
+    chunk = []
+    while chunk is not None:
+      chunk = self._queue.get()
+
+      try:
+        output_stream = self._output_stream or sys.stdout
+        if chunk is not None:
+          output_stream.write(''.join(chunk))
+
+        # Only flush when the queue runs empty to coalesce flushes.
+        if chunk is None or self._queue.empty():
+          output_stream.flush()
+
+      except (IOError, OSError, ValueError) as exception:
+        # Keep draining the queue to not block the parsing thread.
+        self._exception = exception
+
+      finally:
+        self._queue.task_done()
+
+  def Close(self):
+    """Closes the output writer object.
+
+    Raises:
+      IOError: if the output writer cannot be closed or text could not be
+          written.
+    """
+    if self._thread:
+      self._PutBuffer()
+      self._queue.put(None)
+      self._thread.join()
+      self._thread = None
+
+    if self._exception:
+      exception = self._exception
+      self._exception = None
+      raise IOError('Unable to write text with error: {0!s}'.format(
+          exception))
+
+  def Open(self):
+    """Opens the output writer object.
+
+    Raises:
+      IOError: if the output writer is already open.
+    """
+    if self._thread:
+      raise IOError('Output writer already open.')
+
+    self._thread = threading.Thread(
+        name='output_writer', target=self._WriteTextFromQueue)
+    self._thread.daemon = True
+    self._thread.start()
+
+  def WriteText(self, text):
+    """Writes text to the output.
+
+    Args:
+      text (str): text to write.
+
+    Raises:
+      IOError: if the output writer is not open.
+    """
+    if not self._thread:
+      raise IOError('Output writer not open.')
+
+    self._buffer.append(text)
+    self._buffered_size += len(text)
+
+    if self._buffered_size >= self._buffer_size:
+      self._PutBuffer()
+
+
+class RecordOutputWriter(OutputWriter):
+  """Structured record output writer.
+
+  Data formats write machine-readable records to a record output writer
+  instead of formatted text. Text written to a record output writer is
+  ignored, so that the records are not mixed with debug output.
+  """
+
+  def __init__(self, output_stream=None):
+    """Initializes a structured record output writer.
+
+    Args:
+      output_stream (Optional[io.TextIOBase]): stream to write to, where None
+          represents stdout.
+    """
+    super(RecordOutputWriter, self).__init__()
+    self._output_stream = output_stream
+
+  def _GetSerializableValue(self, value):
+    """Retrieves a serializable representation of a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: value or its string representation, where bytes are represented
+          as a hexadecimal string.
+    """
+    if isinstance(value, (bytes, bytearray)):
+      return value.hex()
+
+    return '{0!s}'.format(value)
+
+  def Close(self):
+    """Closes the output writer object."""
+    output_stream = self._output_stream or sys.stdout
+    output_stream.flush()
+
+  def Open(self):
+    """Opens the output writer object."""
+    return
+
+  @abc.abstractmethod
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+    """
+
+  def WriteText(self, text):
+    """Writes text to the output.
+
+    Args:
+      text (str): text to write, which is ignored.
+    """
+    return
+
+
+class CSVWriter(RecordOutputWriter):
+  """Comma separated values (CSV) output writer.
+
+  The first column of every row contains the record type. A header row is
+  written before the first record of a record type and when the names of
+  the values of the record type change.
+  """
+
+  def __init__(self, output_stream=None):
+    """Initializes a comma separated values (CSV) output writer.
+
+    Args:
+      output_stream (Optional[io.TextIOBase]): stream to write to, where None
+          represents stdout.
+    """
+    super(CSVWriter, self).__init__(output_stream=output_stream)
+    self._csv_writer = None
+    self._names_per_record_type = {}
+
+  def _GetCSVValue(self, value):
+    """Retrieves the comma separated values (CSV) representation of a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: value, where lists and dictionaries are represented as JSON.
+    """
+    if value is None or isinstance(value, (bool, float, int, str)):
+      return value
+
+    if isinstance(value, (dict, list, tuple)):
+      return json.dumps(value, default=self._GetSerializableValue)
+
+    return self._GetSerializableValue(value)
+
+  def Open(self):
+    """Opens the output writer object."""
+    self._csv_writer = csv.writer(
+        self._output_stream or sys.stdout, lineterminator='\n')
+    self._names_per_record_type = {}
+
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+    """
+    names = list(values.keys())
+    if names != self._names_per_record_type.get(record_type, None):
+      self._names_per_record_type[record_type] = names
+      self._csv_writer.writerow(['record_type'] + names)
+
+    self._csv_writer.writerow([record_type] + [
+        self._GetCSVValue(value) for value in values.values()])
+
+
+class JSONLinesWriter(RecordOutputWriter):
+  """JSON lines output writer.
+
+  Every record is written as a JSON object on a separate line, where the
+  record type is stored as "record_type".
+  """
+
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+    """
+    json_dict = {'record_type': record_type}
+    json_dict.update(values)
+
+    output_stream = self._output_stream or sys.stdout
+    output_stream.write(json.dumps(
+        json_dict, default=self._GetSerializableValue))
+    output_stream.write('\n')
+
+
+def CreateOutputWriter(name):
+  """Creates an output writer.
+
+  Args:
+    name (str): name of the output writer, which can be "buffered", "csv",
+        "jsonl", "stdout" or "threaded".
+
+  Returns:
+    OutputWriter: output writer.
+
+  Raises:
+    ValueError: if the name is not supported.
+  """
+  output_writer_class = OUTPUT_WRITER_CLASSES.get(name, None)
+  if not output_writer_class:
+    raise ValueError('Unsupported output writer: {0!s}'.format(name))
+
+  return output_writer_class()
+
+
+# Names of the output writers that write text instead of structured records,
+# for data formats that do not write structured records.
+TEXT_OUTPUT_WRITER_NAMES = ['buffered', 'stdout', 'threaded']
+
+OUTPUT_WRITER_CLASSES = {
+    'buffered': BufferedStdoutWriter,
+    'csv': CSVWriter,
+    'jsonl': JSONLinesWriter,
+    'stdout': StdoutWriter,
+    'threaded': ThreadedStdoutWriter}
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Page cached file-like object."""
+
+import collections
+import os
+
+
+class PageCachedFile(object):
+  """Page cached file-like object.
+
+  Reads are served from a least recently used (LRU) cache of blocks that are
+  aligned to the block size. On a cache miss the block is read from the parent
+  file-like object together with a number of subsequent blocks (read-ahead),
+  which turns many small mostly forward reads into few large reads.
+
+  Attributes:
+    block_size (int): size of a block.
+    cache_hits (int): number of blocks that were read from the cache.
+    cache_misses (int): number of blocks that were not in the cache.
+    maximum_number_of_blocks (int): maximum number of blocks in the cache.
+    read_ahead (int): number of blocks that are read after a missing block.
+  """
+
+  def __init__(
+      self, file_object, block_size=4096, maximum_number_of_blocks=64,
+      read_ahead=1):
+    """Initializes a file-like object.
+
+    Args:
+      file_object (file): parent file-like object.
+      block_size (Optional[int]): size of a block.
+      maximum_number_of_blocks (Optional[int]): maximum number of blocks in
+          the cache.
+      read_ahead (Optional[int]): number of blocks that are read after
+          a missing block.
+
+    Raises:
+      ValueError: if the block size, maximum number of blocks or read-ahead
+          is out of bounds.
+    """
+    if block_size <= 0:
+      raise ValueError('Invalid block size: {0:d} value out of bounds.'.format(
+          block_size))
+
+    if maximum_number_of_blocks <= 0:
+      raise ValueError((
+          'Invalid maximum number of blocks: {0:d} value out of '
+          'bounds.').format(maximum_number_of_blocks))
+
+    if read_ahead < 0 or read_ahead >= maximum_number_of_blocks:
+      raise ValueError('Invalid read-ahead: {0:d} value out of bounds.'.format(
+          read_ahead))
+
+    super(PageCachedFile, self).__init__()
+    self._blocks = collections.OrderedDict()
+    self._current_offset = 0
+    self._file_object = file_object
+
+    file_object.seek(0, os.SEEK_END)
+    self._size = file_object.tell()
+
+    self.block_size = block_size
+    self.cache_hits = 0
+    self.cache_misses = 0
+    self.maximum_number_of_blocks = maximum_number_of_blocks
+    self.read_ahead = read_ahead
+
+  def _GetBlock(self, block_number):
+    """Retrieves a block.
+
+    Args:
+      block_number (int): number of the block.
+
+    Returns:
+      bytes: block data, which is smaller than the block size for the last
+          block of the file-like object.
+    """
+    block_data = self._blocks.get(block_number, None)
+    if block_data is not None:
+      self._blocks.move_to_end(block_number)
+      self.cache_hits += 1
+      return block_data
+
+    self.cache_misses += 1
+
+    block_offset = block_number * self.block_size
+    self._file_object.seek(block_offset, os.SEEK_SET)
+    data = self._file_object.read((self.read_ahead + 1) * self.block_size)
+
+    for data_offset in range(0, len(data), self.block_size):
+      self._blocks[block_number] = data[
+          data_offset:data_offset + self.block_size]
+      self._blocks.move_to_end(block_number)
+      block_number += 1
+
+    while len(self._blocks) > self.maximum_number_of_blocks:
+      self._blocks.popitem(last=False)
+
+    return data[:self.block_size]
+
+  # The following methods are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the file-like object and the parent file-like object."""
+    self._blocks = collections.OrderedDict()
+
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    The function will read a byte string of the specified size or
+    all of the remaining data if no size was specified.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None represents
+          all remaining data.
+
+    Returns:
+      bytes: data read.
+
+    Raises:
+      IOError: if the read failed.
+      OSError: if the read failed.
+    """
+    if self._current_offset >= self._size:
+      return b''
+
+    if size is None or size < 0:
+      size = self._size - self._current_offset
+    elif self._current_offset + size > self._size:
+      size = self._size - self._current_offset
+
+    if size >= self.maximum_number_of_blocks * self.block_size:
+      # Reads that do not fit in the cache bypass the cache.
+      self._file_object.seek(self._current_offset, os.SEEK_SET)
+      data = self._file_object.read(size)
+
+    else:
+      block_number, block_offset = divmod(
+          self._current_offset, self.block_size)
+
+      segments = []
+      remaining_size = size
+      while remaining_size > 0:
+        block_data = self._GetBlock(block_number)
+        segment = block_data[block_offset:block_offset + remaining_size]
+        if not segment:
+          break
+
+        segments.append(segment)
+        remaining_size -= len(segment)
+
+        block_number += 1
+        block_offset = 0
+
+      data = b''.join(segments)
+
+    self._current_offset += len(data)
+
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks an offset within the file-like object.
+
+    Args:
+      offset (int): offset to seek.
+      whence (Optional[int]): indicates whether offset is an absolute
+          or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+      OSError: if the seek failed.
+    """
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._size
+    elif whence != os.SEEK_SET:
+      raise IOError('Unsupported whence.')
+
+    if offset < 0:
+      raise IOError('Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def get_offset(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: offset.
+    """
+    return self._current_offset
+
+  # Pythonesque alias for get_offset().
+  def tell(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: offset.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the file-like object.
+
+    Returns:
+      int: size.
+    """
+    return self._size
+
+  def seekable(self):
+    """Determines if a file-like object is seekable.
+
+    Returns:
+      bool: True if seekable.
+    """
+    return True
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Data format profiler."""
+
+import threading
+
+
+class DataFormatProfiler(object):
+  """Data format profiler.
+
+  The profiler records per data type map name how often and how much data is
+  read and mapped, which shows which structures dominate the parse time.
+  Data read without a data type map is recorded by its description.
+
+  The profiler can be shared by threads that read files concurrently and
+  the profiles of worker processes can be added to it.
+  """
+
+  # Names of the counters of a profile.
+  _COUNTER_NAMES = (
+      'read_data_calls', 'bytes_read', 'map_byte_stream_calls',
+      'byte_stream_too_small_retries', 'time')
+
+  def __init__(self):
+    """Initializes a data format profiler."""
+    super(DataFormatProfiler, self).__init__()
+    self._lock = threading.Lock()
+    self._profiles = {}
+
+  def _GetProfile(self, name):
+    """Retrieves the profile of a data type map.
+
+    Args:
+      name (str): name of the data type map.
+
+    Returns:
+      dict[str, object]: counters of the data type map.
+    """
+    profile = self._profiles.get(name, None)
+    if profile is None:
+      profile = dict.fromkeys(self._COUNTER_NAMES, 0)
+      profile['time'] = 0.0
+      self._profiles[name] = profile
+
+    return profile
+
+  def AddMapByteStream(self, name, number_of_calls=1, retry=False):
+    """Adds calls to MapByteStream.
+
+    Args:
+      name (str): name of the data type map.
+      number_of_calls (Optional[int]): number of calls to MapByteStream.
+      retry (Optional[bool]): True if the call failed because the byte stream
+          was too small and will be retried with more data.
+    """
+    with self._lock:
+      profile = self._GetProfile(name)
+      profile['map_byte_stream_calls'] += number_of_calls
+      if retry:
+        profile['byte_stream_too_small_retries'] += 1
+
+  def AddProfiles(self, profiles):
+    """Adds profiles, such as those of a worker process.
+
+    Args:
+      profiles (dict[str, dict[str, object]]): counters per data type map
+          name, as returned by GetProfiles.
+    """
+    with self._lock:
+      for name, other_profile in profiles.items():
+        profile = self._GetProfile(name)
+        for counter_name in self._COUNTER_NAMES:
+          profile[counter_name] += other_profile.get(counter_name, 0)
+
+  def AddReadData(self, name, bytes_read):
+    """Adds a call to _ReadData.
+
+    Args:
+      name (str): name of the data type map.
+      bytes_read (int): number of bytes read.
+    """
+    with self._lock:
+      profile = self._GetProfile(name)
+      profile['read_data_calls'] += 1
+      profile['bytes_read'] += bytes_read
+
+  def AddTime(self, name, time_elapsed):
+    """Adds elapsed time.
+
+    Args:
+      name (str): name of the data type map.
+      time_elapsed (float): elapsed time in seconds.
+    """
+    with self._lock:
+      profile = self._GetProfile(name)
+      profile['time'] += time_elapsed
+
+  def GetProfiles(self):
+    """Retrieves the profiles.
+
+    Returns:
+      dict[str, dict[str, object]]: counters per data type map name.
+    """
+    with self._lock:
+      return {
+          name: dict(profile) for name, profile in self._profiles.items()}
+
+  def WriteProfiles(self, output_writer):
+    """Writes the profiles, sorted by cumulative time, to an output writer.
+
+    Args:
+      output_writer (OutputWriter): output writer.
+    """
+    lines = [
+        'Profile:',
+        '{0:<40s} {1:>8s} {2:>12s} {3:>8s} {4:>8s} {5:>10s}'.format(
+            'Name', 'Reads', 'Bytes', 'Maps', 'Retries', 'Time (s)')]
+
+    for name, profile in sorted(
+        self._profiles.items(), key=lambda item: item[1]['time'],
+        reverse=True):
+      lines.append(
+          '{0:<40s} {1:>8d} {2:>12d} {3:>8d} {4:>8d} {5:>10.6f}'.format(
+              name, profile['read_data_calls'], profile['bytes_read'],
+              profile['map_byte_stream_calls'],
+              profile['byte_stream_too_small_retries'], profile['time']))
+
+    lines.extend(['', ''])
+    output_writer.WriteText('\n'.join(lines))
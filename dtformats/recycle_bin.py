@@ -18,7 +18,7 @@ class RecycleBinMetadataFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('recycle_bin.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('recycle_bin.yaml')
 
   _SUPPORTED_FORMAT_VERSION = (1, 2)
 
@@ -125,3 +125,9 @@ class RecycleBinMetadataFile(data_format.BinaryDataFile):
       self._DebugPrintValue('Original filename', self.original_filename)
 
       self._DebugPrintText('\n')
+
+    self._WriteRecord('recycle_bin_metadata', {
+        'deletion_time': self.deletion_time,
+        'format_version': self.format_version,
+        'original_file_size': self.original_file_size,
+        'original_filename': self.original_filename})
@@ -10,7 +10,7 @@ class RecyclerInfo2File(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('recycler.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('recycler.yaml')
 
   _DEBUG_INFO_FILE_ENTRY = [
       ('original_filename', 'Original filename (ANSI)', '_FormatANSIString'),
@@ -33,7 +33,9 @@ class RestorePointChangeLogFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('rp_change_log.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('rp_change_log.yaml')
+
+  SIGNATURES = [(8, b'\x12\xef\xcd\xab')]
 
   # TODO: refactor rp_change_log_volume_path_record in more generic
   # string record
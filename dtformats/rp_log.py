@@ -9,7 +9,7 @@ class RestorePointLogFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('rp_log.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('rp_log.yaml')
 
   # TODO: implement an item based lookup.
   _EVENT_TYPES = {
@@ -14,7 +14,9 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('safari_cookies.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('safari_cookies.yaml')
+
+  SIGNATURES = [(0, b'cook')]
 
   def __init__(self, debug=False, output_writer=None):
     """Initializes a Safari Cookies (Cookies.binarycookies) file.
@@ -284,41 +286,51 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintRecordHeader(record_header)
 
-    value_string = ''
+    url = ''
     if record_header.url_offset:
       data_offset = record_offset + record_header.url_offset
-      value_string = self._ReadCString(page_data, data_offset)
+      url = self._ReadCString(page_data, data_offset)
 
     if self._debug:
-      self._DebugPrintValue('URL', value_string)
+      self._DebugPrintValue('URL', url)
 
-    value_string = ''
+    name = ''
     if record_header.name_offset:
       data_offset = record_offset + record_header.name_offset
-      value_string = self._ReadCString(page_data, data_offset)
+      name = self._ReadCString(page_data, data_offset)
 
     if self._debug:
-      self._DebugPrintValue('Name', value_string)
+      self._DebugPrintValue('Name', name)
 
-    value_string = ''
+    path = ''
     if record_header.path_offset:
       data_offset = record_offset + record_header.path_offset
-      value_string = self._ReadCString(page_data, data_offset)
+      path = self._ReadCString(page_data, data_offset)
 
     if self._debug:
-      self._DebugPrintValue('Path', value_string)
+      self._DebugPrintValue('Path', path)
 
-    value_string = ''
+    value = ''
     if record_header.value_offset:
       data_offset = record_offset + record_header.value_offset
-      value_string = self._ReadCString(page_data, data_offset)
+      value = self._ReadCString(page_data, data_offset)
 
     if self._debug:
-      self._DebugPrintValue('Value', value_string)
+      self._DebugPrintValue('Value', value)
 
     if self._debug:
       self._DebugPrintText('\n')
 
+    if self._record_output_writer:
+      self._WriteRecord('binarycookies_record', {
+          'flags': record_header.flags,
+          'expiration_time': record_header.expiration_time,
+          'creation_time': record_header.creation_time,
+          'url': url,
+          'name': name,
+          'path': path,
+          'value': value})
+
   def ReadFileObject(self, file_object):
     """Reads a Safari Cookies (Cookies.binarycookies) file-like object.
 
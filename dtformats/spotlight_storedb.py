@@ -3,8 +3,6 @@
 
 import zlib
 
-import lz4.block
-
 from dfdatetime import cocoa_time as dfdatetime_cocoa_time
 from dfdatetime import posix_time as dfdatetime_posix_time
 from dtfabric import errors as dtfabric_errors
@@ -114,8 +112,9 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
-      'spotlight_storedb.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('spotlight_storedb.yaml')
+
+  SIGNATURES = [(0, b'8tsd')]
 
   _DEBUG_INFO_FILE_HEADER = [
       ('signature', 'Signature', '_FormatStreamAsSignature'),
@@ -361,6 +360,8 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     end_of_compressed_data_offset = (
         12 + lz4_block_header.compressed_data_size)
 
+    import lz4.block  # pylint: disable=import-outside-toplevel
+
     page_data = lz4.block.decompress(
         compressed_page_data[12:end_of_compressed_data_offset],
         uncompressed_size=lz4_block_header.uncompressed_data_size)
@@ -0,0 +1,1395 @@
+# -*- coding: utf-8 -*-
+"""Synthetic data generators for scale testing."""
+
+import abc
+import array
+import lzma
+import os
+import random
+import struct
+import sys
+import zlib
+
+from dtfabric import data_types as dtfabric_data_types
+from dtfabric import errors as dtfabric_errors
+
+from dtformats import chrome_cache
+from dtformats import data_format
+from dtformats import systemd
+
+
+class SyntheticDataGenerator(data_format.BinaryDataFormat):
+  """Synthetic data generator.
+
+  The structures are folded with the data type maps of the dtFabric definition
+  file of the data format, which keeps the generated data consistent with
+  what the data format reads. The data is generated from a pseudo random
+  number generator with a fixed seed, so that the same data is generated
+  every time.
+  """
+
+  # Maximum number of unique records, after which the records are repeated,
+  # which keeps the generation of large files fast.
+  _MAXIMUM_NUMBER_OF_UNIQUE_RECORDS = 1024
+
+  # Size of the data written at once.
+  _WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+  # POSIX timestamp of the first record, 2022-08-07 00:00:00 UTC.
+  _BASE_TIMESTAMP = 1659830400
+
+  _HOSTNAMES = ('localhost', 'server1.example.com', 'workstation')
+
+  _PROGRAMS = ('cron', 'kernel', 'login', 'sshd', 'sudo', 'systemd')
+
+  _USERNAMES = ('admin', 'daemon', 'nobody', 'operator', 'root', 'user')
+
+  def __init__(self, seed=0):
+    """Initializes a synthetic data generator.
+
+    Args:
+      seed (Optional[int]): seed of the pseudo random number generator.
+    """
+    super(SyntheticDataGenerator, self).__init__()
+    self._random = random.Random(seed)
+
+  def _FoldStructure(self, data_type_name, **values):
+    """Folds a structure into a byte stream.
+
+    Args:
+      data_type_name (str): name of the structure data type as defined by
+          the definition file.
+      values (dict[str, object]): values of the structure members, where
+          members without a value are zero or their supported value.
+
+    Returns:
+      bytes: byte stream.
+
+    Raises:
+      ValueError: if the structure cannot be folded.
+    """
+    data_type_map = self._GetDataTypeMap(data_type_name)
+    data_type_definition = self._FABRIC.GetDataTypeDefinition(data_type_name)
+
+    for member_definition in data_type_definition.members:
+      if member_definition.name not in values:
+        values[member_definition.name] = self._GetDefaultMemberValue(
+            member_definition)
+
+    structure_values = data_type_map.CreateStructureValues(**values)
+
+    try:
+      return data_type_map.FoldByteStream(structure_values)
+
+    except dtfabric_errors.FoldingError as exception:
+      raise ValueError('Unable to fold: {0:s} with error: {1!s}'.format(
+          data_type_name, exception))
+
+  def _GenerateLogText(self, size):
+    """Generates syslog-like text.
+
+    Args:
+      size (int): size of the text.
+
+    Returns:
+      bytes: text of the size.
+    """
+    lines = []
+    text_size = 0
+    while text_size < size:
+      line = '{0:d} {1:s} {2:s}[{3:d}]: message {4:d}\n'.format(
+          self._BASE_TIMESTAMP + self._random.randint(0, 86400),
+          self._random.choice(self._HOSTNAMES),
+          self._random.choice(self._PROGRAMS), self._random.randint(1, 65535),
+          self._random.getrandbits(32)).encode('ascii')
+      lines.append(line)
+      text_size += len(line)
+
+    return b''.join(lines)[:size]
+
+  @abc.abstractmethod
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data.
+    """
+
+  def _GetDefaultMemberValue(self, member_definition):
+    """Retrieves the default value of a structure member.
+
+    Args:
+      member_definition (dtfabric.DataTypeDefinition): data type definition
+          of the member.
+
+    Returns:
+      object: first supported value of the member or a zero value.
+    """
+    values = getattr(member_definition, 'values', None)
+    if values:
+      return values[0]
+
+    data_type_definition = getattr(
+        member_definition, 'member_data_type_definition', member_definition)
+    byte_size = data_type_definition.GetByteSize() or 0
+
+    if isinstance(data_type_definition, dtfabric_data_types.StringDefinition):
+      return ''
+
+    if isinstance(data_type_definition, dtfabric_data_types.StreamDefinition):
+      return bytes(byte_size)
+
+    if isinstance(
+        data_type_definition, dtfabric_data_types.SequenceDefinition):
+      element_byte_size = (
+          data_type_definition.element_data_type_definition.GetByteSize())
+      return (0, ) * (byte_size // element_byte_size)
+
+    return 0
+
+  def _WriteRecords(self, file_object, size):
+    """Writes records.
+
+    At most _MAXIMUM_NUMBER_OF_UNIQUE_RECORDS unique records are generated,
+    which are repeated until the size is reached.
+
+    Args:
+      file_object (file): file-like object to write to.
+      size (int): size of the records, which is rounded up to a whole number
+          of records.
+
+    Returns:
+      int: number of bytes written.
+    """
+    records_data = []
+    output_size = 0
+    while (output_size < size and
+           len(records_data) < self._MAXIMUM_NUMBER_OF_UNIQUE_RECORDS):
+      record_data = self._GenerateRecordData(len(records_data))
+      records_data.append(record_data)
+      output_size += len(record_data)
+
+    unique_records_data = b''.join(records_data)
+    file_object.write(unique_records_data)
+
+    if output_size < size:
+      number_of_repeats = max(
+          1, self._WRITE_BUFFER_SIZE // len(unique_records_data))
+      repeated_records_data = unique_records_data * number_of_repeats
+
+      while output_size + len(repeated_records_data) <= size:
+        file_object.write(repeated_records_data)
+        output_size += len(repeated_records_data)
+
+      while output_size + len(unique_records_data) <= size:
+        file_object.write(unique_records_data)
+        output_size += len(unique_records_data)
+
+      for record_data in records_data:
+        if output_size >= size:
+          break
+
+        file_object.write(record_data)
+        output_size += len(record_data)
+
+    return output_size
+
+  def Generate(self, path, size):
+    """Generates a synthetic file.
+
+    Args:
+      path (str): path of the file to create.
+      size (int): approximate size of the file.
+
+    Returns:
+      int: size of the file.
+    """
+    with open(path, 'wb') as file_object:
+      return self.WriteFileObject(file_object, size)
+
+  def WriteFileObject(self, file_object, size):
+    """Writes synthetic data to a file-like object.
+
+    Args:
+      file_object (file): file-like object to write to.
+      size (int): approximate size of the data.
+
+    Returns:
+      int: number of bytes written.
+    """
+    return self._WriteRecords(file_object, size)
+
+
+class BSMEventAuditingGenerator(SyntheticDataGenerator):
+  """Basic Security Module (BSM) event auditing file generator."""
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('bsm.yaml')
+
+  # Event types of execve(2), open(2) - read and login.
+  _EVENT_TYPES = (23, 72, 6152)
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data.
+    """
+    user_identifier = self._random.randint(0, 1000)
+    path = '/usr/bin/{0:s}\x00'.format(self._random.choice(self._PROGRAMS))
+    text = 'successful {0:d}\x00'.format(record_index)
+
+    tokens_data = [
+        self._FoldStructure(
+            'bsm_token_subject32', token_type=0x24,
+            audit_user_identifier=user_identifier,
+            effective_user_identifier=user_identifier,
+            effective_group_identifier=user_identifier,
+            real_user_identifier=user_identifier,
+            real_group_identifier=user_identifier,
+            process_identifier=self._random.randint(1, 65535),
+            session_identifier=self._random.randint(1, 65535),
+            ip_address=(127, 0, 0, 1)),
+        self._FoldStructure(
+            'bsm_token_path', path_size=len(path), path=path),
+        self._FoldStructure(
+            'bsm_token_text', text_size=len(text), text=text),
+        self._FoldStructure(
+            'bsm_token_return32', status=0, return_value=0)]
+
+    header_data_size = self._GetDataTypeMap(
+        'bsm_token_header32').GetSizeHint()
+    trailer_data_size = self._GetDataTypeMap('bsm_token_trailer').GetSizeHint()
+
+    record_size = (
+        header_data_size + sum(len(data) for data in tokens_data) +
+        trailer_data_size)
+
+    header_data = self._FoldStructure(
+        'bsm_token_header32', record_size=record_size, format_version=11,
+        event_type=self._random.choice(self._EVENT_TYPES),
+        timestamp=self._BASE_TIMESTAMP + record_index,
+        microseconds=self._random.randint(0, 999999))
+    trailer_data = self._FoldStructure(
+        'bsm_token_trailer', record_size=record_size)
+
+    return b''.join([header_data] + tokens_data + [trailer_data])
+
+
+class CPIOArchiveGenerator(SyntheticDataGenerator):
+  """CPIO archive file generator.
+
+  Every file entry has a unique path, while the file data of at most
+  _MAXIMUM_NUMBER_OF_UNIQUE_RECORDS file entries is unique.
+  """
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('cpio.yaml')
+
+  _SUPPORTED_FILE_FORMATS = frozenset(['newc', 'odc'])
+
+  _TRAILER_PATH = 'TRAILER!!!'
+
+  def __init__(self, file_format='newc', seed=0):
+    """Initializes a CPIO archive file generator.
+
+    Args:
+      file_format (Optional[str]): CPIO file format, either "newc" or "odc".
+      seed (Optional[int]): seed of the pseudo random number generator.
+
+    Raises:
+      ValueError: if the file format is not supported.
+    """
+    if file_format not in self._SUPPORTED_FILE_FORMATS:
+      raise ValueError('Unsupported file format: {0:s}'.format(file_format))
+
+    super(CPIOArchiveGenerator, self).__init__(seed=seed)
+    self._file_data_pool = []
+    self._file_format = file_format
+
+  def _GenerateFileEntryData(self, inode_number, path, file_data):
+    """Generates the data of a file entry.
+
+    Args:
+      inode_number (int): inode number.
+      path (str): path of the file entry.
+      file_data (bytes): data of the file entry.
+
+    Returns:
+      bytes: file entry data including the path, file data and alignment
+          padding.
+    """
+    path_data = '{0:s}\x00'.format(path).encode('ascii')
+    modification_time = self._BASE_TIMESTAMP + inode_number
+
+    mode = 0o100644
+    if path == self._TRAILER_PATH:
+      mode = 0
+
+    if self._file_format == 'odc':
+      file_entry_data = self._FoldStructure(
+          'cpio_portable_ascii_file_entry', signature=b'070707',
+          device_number=b'000000',
+          inode_number='{0:06o}'.format(inode_number & 0o777777).encode(
+              'ascii'),
+          mode='{0:06o}'.format(mode).encode('ascii'),
+          user_identifier=b'000000', group_identifier=b'000000',
+          number_of_links=b'000001', special_device_number=b'000000',
+          modification_time='{0:011o}'.format(modification_time).encode(
+              'ascii'),
+          path_size='{0:06o}'.format(len(path_data)).encode('ascii'),
+          file_size='{0:011o}'.format(len(file_data)).encode('ascii'))
+
+      return b''.join([file_entry_data, path_data, file_data])
+
+    file_entry_data = self._FoldStructure(
+        'cpio_new_ascii_file_entry', signature=b'070701',
+        inode_number='{0:08x}'.format(inode_number).encode('ascii'),
+        mode='{0:08x}'.format(mode).encode('ascii'),
+        user_identifier=b'00000000', group_identifier=b'00000000',
+        number_of_links=b'00000001',
+        modification_time='{0:08x}'.format(modification_time).encode('ascii'),
+        file_size='{0:08x}'.format(len(file_data)).encode('ascii'),
+        device_major_number=b'00000000', device_minor_number=b'00000000',
+        special_device_major_number=b'00000000',
+        special_device_minor_number=b'00000000',
+        path_size='{0:08x}'.format(len(path_data)).encode('ascii'),
+        checksum=b'00000000')
+
+    # The path and the file data are aligned to 4 bytes.
+    path_end_offset = len(file_entry_data) + len(path_data)
+    path_padding_data = bytes(-path_end_offset % 4)
+    file_padding_data = bytes(-len(file_data) % 4)
+
+    return b''.join([
+        file_entry_data, path_data, path_padding_data, file_data,
+        file_padding_data])
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data.
+    """
+    if record_index < self._MAXIMUM_NUMBER_OF_UNIQUE_RECORDS:
+      file_data = self._GenerateLogText(self._random.randint(512, 16384))
+      self._file_data_pool.append(file_data)
+    else:
+      file_data = self._file_data_pool[
+          record_index % self._MAXIMUM_NUMBER_OF_UNIQUE_RECORDS]
+
+    path = 'var/log/messages.{0:d}'.format(record_index)
+    return self._GenerateFileEntryData(record_index + 1, path, file_data)
+
+  def WriteFileObject(self, file_object, size):
+    """Writes synthetic data to a file-like object.
+
+    Args:
+      file_object (file): file-like object to write to.
+      size (int): approximate size of the data.
+
+    Returns:
+      int: number of bytes written.
+    """
+    self._file_data_pool = []
+
+    output_data = []
+    output_data_size = 0
+    output_size = 0
+    record_index = 0
+
+    # The paths of the file entries are unique hence the records are not
+    # repeated by _WriteRecords.
+    while output_size + output_data_size < size:
+      record_data = self._GenerateRecordData(record_index)
+      output_data.append(record_data)
+      output_data_size += len(record_data)
+      record_index += 1
+
+      if output_data_size >= self._WRITE_BUFFER_SIZE:
+        file_object.write(b''.join(output_data))
+        output_size += output_data_size
+        output_data = []
+        output_data_size = 0
+
+    trailer_data = self._GenerateFileEntryData(0, self._TRAILER_PATH, b'')
+    output_data.append(trailer_data)
+    output_data_size += len(trailer_data)
+
+    file_object.write(b''.join(output_data))
+
+    return output_size + output_data_size
+
+
+class ChromeCacheGenerator(SyntheticDataGenerator):
+  """Chrome cache directory generator.
+
+  The directory contains an index file and 256 byte data block files with
+  a cache entry per block. Additional data block files are created when
+  a data block file is full.
+  """
+
+  # pylint: disable=abstract-method
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('chrome_cache.yaml')
+
+  _BLOCK_SIZE = 256
+
+  # File number of the first data block file and the next ones.
+  _FIRST_FILE_NUMBER = 1
+  _FIRST_ADDITIONAL_FILE_NUMBER = 4
+
+  _FILE_TYPE_BLOCK_256 = 2
+
+  _DATA_BLOCK_FILE_HEADER_SIZE = 8192
+
+  # Maximum number of blocks in a data block file, which is the number of
+  # bits in the allocation bitmap.
+  _MAXIMUM_NUMBER_OF_BLOCKS = 2028 * 32
+
+  _MINIMUM_TABLE_SIZE = 0x10000
+
+  def _GenerateCacheEntryData(self, cache_entry_index, key, next_address):
+    """Generates the data of a cache entry.
+
+    Args:
+      cache_entry_index (int): index of the cache entry.
+      key (bytes): key of the cache entry.
+      next_address (int): cache address of the next cache entry with the same
+          hash in the index table.
+
+    Returns:
+      bytes: cache entry data.
+    """
+    # Chrome timestamps are in microseconds since January 1, 1601.
+    creation_time = (
+        (self._BASE_TIMESTAMP + 11644473600 + cache_entry_index) * 1000000)
+
+    return self._FoldStructure(
+        'chrome_cache_entry', hash=chrome_cache.SuperFastHash(key),
+        next_address=next_address, creation_time=creation_time,
+        key_size=len(key), key=tuple(key.ljust(160, b'\x00')))
+
+  def _GenerateDataBlockFileHeaderData(
+      self, file_number, next_file_number, number_of_entries):
+    """Generates the data of a data block file header.
+
+    Args:
+      file_number (int): number of the data block file.
+      next_file_number (int): number of the next data block file or 0 if
+          there is no next data block file.
+      number_of_entries (int): number of entries in the data block file.
+
+    Returns:
+      bytes: data block file header data.
+    """
+    allocation_bitmap = array.array('I', [0] * 2028)
+    number_of_values, number_of_bits = divmod(number_of_entries, 32)
+    for index in range(number_of_values):
+      allocation_bitmap[index] = 0xffffffff
+    if number_of_bits:
+      allocation_bitmap[number_of_values] = (1 << number_of_bits) - 1
+
+    return self._FoldStructure(
+        'chrome_cache_data_block_file_header', minor_version=0,
+        major_version=2, file_number=file_number,
+        next_file_number=next_file_number, block_size=self._BLOCK_SIZE,
+        number_of_entries=number_of_entries,
+        maximum_number_of_entries=self._MAXIMUM_NUMBER_OF_BLOCKS,
+        allocation_bitmap=tuple(allocation_bitmap))
+
+  def Generate(self, path, size):
+    """Generates a synthetic Chrome cache directory.
+
+    Args:
+      path (str): path of the directory to create.
+      size (int): approximate size of the files in the directory.
+
+    Returns:
+      int: size of the files in the directory.
+    """
+    number_of_entries = max(1, size // (self._BLOCK_SIZE + 4))
+
+    table_size = self._MINIMUM_TABLE_SIZE
+    while table_size < number_of_entries:
+      table_size *= 2
+
+    index_table = array.array('I', [0] * table_size)
+
+    file_numbers = [self._FIRST_FILE_NUMBER]
+    number_of_files = (
+        (number_of_entries + self._MAXIMUM_NUMBER_OF_BLOCKS - 1) //
+        self._MAXIMUM_NUMBER_OF_BLOCKS)
+    file_numbers.extend(range(
+        self._FIRST_ADDITIONAL_FILE_NUMBER,
+        self._FIRST_ADDITIONAL_FILE_NUMBER + number_of_files - 1))
+
+    os.mkdir(path)
+
+    output_size = 0
+    cache_entry_index = 0
+    for file_index, file_number in enumerate(file_numbers):
+      next_file_number = 0
+      if file_index + 1 < len(file_numbers):
+        next_file_number = file_numbers[file_index + 1]
+
+      number_of_blocks = min(
+          number_of_entries - cache_entry_index,
+          self._MAXIMUM_NUMBER_OF_BLOCKS)
+
+      data_block_file_path = os.path.join(
+          path, 'data_{0:d}'.format(file_number))
+      with open(data_block_file_path, 'wb') as file_object:
+        file_object.write(self._GenerateDataBlockFileHeaderData(
+            file_number, next_file_number, number_of_blocks))
+
+        output_data = []
+        for block_number in range(number_of_blocks):
+          cache_address = (
+              0x80000000 | (self._FILE_TYPE_BLOCK_256 << 28) |
+              (file_number << 16) | block_number)
+
+          key = 'https://{0:s}/{1:d}/{2:08x}'.format(
+              self._random.choice(self._HOSTNAMES), cache_entry_index,
+              self._random.getrandbits(32)).encode('ascii')
+
+          # Cache entries with the same hash are chained by their next
+          # address, with the most recent cache entry in the index table.
+          table_index = chrome_cache.SuperFastHash(key) & (table_size - 1)
+          next_address = index_table[table_index]
+
+          cache_entry_data = self._GenerateCacheEntryData(
+              cache_entry_index, key, next_address)
+
+          index_table[table_index] = cache_address
+          output_data.append(cache_entry_data)
+          cache_entry_index += 1
+
+        file_object.write(b''.join(output_data))
+
+      output_size += (
+          self._DATA_BLOCK_FILE_HEADER_SIZE +
+          (number_of_blocks * self._BLOCK_SIZE))
+
+    index_file_path = os.path.join(path, 'index')
+    with open(index_file_path, 'wb') as file_object:
+      file_object.write(self._FoldStructure(
+          'chrome_cache_index_file_header', minor_version=1, major_version=2,
+          number_of_entries=number_of_entries, table_size=table_size,
+          creation_time=(self._BASE_TIMESTAMP + 11644473600) * 1000000))
+      file_object.write(self._FoldStructure(
+          'chrome_cache_index_file_lru_data'))
+      if sys.byteorder != 'little':
+        index_table.byteswap()
+
+      file_object.write(index_table.tobytes())
+
+      output_size += file_object.tell()
+
+    return output_size
+
+
+class FirefoxCache1MapGenerator(SyntheticDataGenerator):
+  """Firefox cache version 1 map file generator."""
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('firefox_cache1.yaml')
+
+  _NUMBER_OF_BUCKETS = 32
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data.
+    """
+    # The cache locations refer to block files 1 to 3 with the location flag
+    # set.
+    data_location = (
+        0x80000000 | (self._random.randint(1, 3) << 28) |
+        self._random.randint(0, 0x3fff))
+    metadata_location = (
+        0x80000000 | (self._random.randint(1, 3) << 28) |
+        self._random.randint(0, 0x3fff))
+
+    return self._FoldStructure(
+        'firefox_cache1_map_record', hash_number=self._random.getrandbits(32),
+        eviction_rank=record_index, data_location=data_location,
+        metadata_location=metadata_location)
+
+  def WriteFileObject(self, file_object, size):
+    """Writes synthetic data to a file-like object.
+
+    Args:
+      file_object (file): file-like object to write to.
+      size (int): approximate size of the data.
+
+    Returns:
+      int: number of bytes written.
+    """
+    header_data_size = self._GetDataTypeMap(
+        'firefox_cache1_map_header').GetSizeHint()
+    record_data_size = self._GetDataTypeMap(
+        'firefox_cache1_map_record').GetSizeHint()
+
+    # The records are divided over buckets of the same size.
+    records_per_bucket = max(1, (
+        (size - header_data_size) // record_data_size +
+        self._NUMBER_OF_BUCKETS - 1) // self._NUMBER_OF_BUCKETS)
+    number_of_records = records_per_bucket * self._NUMBER_OF_BUCKETS
+    data_size = number_of_records * record_data_size
+
+    header_data = self._FoldStructure(
+        'firefox_cache1_map_header', major_format_version=1,
+        minor_format_version=19, data_size=data_size,
+        number_of_entries=number_of_records,
+        number_of_records=number_of_records,
+        bucket_usage=(records_per_bucket, ) * self._NUMBER_OF_BUCKETS)
+    file_object.write(header_data)
+
+    return len(header_data) + self._WriteRecords(file_object, data_size)
+
+
+class GZipGenerator(SyntheticDataGenerator):
+  """Multi-member GZip file generator."""
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('gzipfile.yaml')
+
+  _COMPRESSION_METHOD_DEFLATE = 8
+
+  # Operating system of the member header, where 3 represents Unix.
+  _OPERATING_SYSTEM_UNIX = 3
+
+  _MAXIMUM_MEMBER_DATA_SIZE = 64 * 1024
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data, which is a GZip member.
+    """
+    uncompressed_data = self._GenerateLogText(self._random.randint(
+        1024, self._MAXIMUM_MEMBER_DATA_SIZE))
+
+    zlib_compressor = zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed_data = b''.join([
+        zlib_compressor.compress(uncompressed_data), zlib_compressor.flush()])
+
+    member_header_data = self._FoldStructure(
+        'gzip_member_header', signature=0x8b1f,
+        compression_method=self._COMPRESSION_METHOD_DEFLATE,
+        modification_time=self._BASE_TIMESTAMP + record_index,
+        operating_system=self._OPERATING_SYSTEM_UNIX)
+    member_footer_data = self._FoldStructure(
+        'gzip_member_footer', checksum=zlib.crc32(uncompressed_data),
+        uncompressed_data_size=len(uncompressed_data) & 0xffffffff)
+
+    return b''.join([member_header_data, compressed_data, member_footer_data])
+
+
+class LinuxLibc6UtmpGenerator(SyntheticDataGenerator):
+  """Linux libc6 utmp file generator."""
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('utmp.yaml')
+
+  # Types of login of LOGIN_PROCESS, USER_PROCESS and DEAD_PROCESS.
+  _TYPES_OF_LOGIN = (6, 7, 8)
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data.
+    """
+    terminal_identifier = self._random.randint(0, 255)
+    terminal = 'pts/{0:d}'.format(terminal_identifier).encode('ascii')
+    username = self._random.choice(self._USERNAMES).encode('ascii')
+    hostname = self._random.choice(self._HOSTNAMES).encode('ascii')
+
+    return self._FoldStructure(
+        'linux_libc6_utmp_entry',
+        type=self._random.choice(self._TYPES_OF_LOGIN),
+        pid=self._random.randint(1, 65535), terminal=terminal.ljust(32, b'\0'),
+        terminal_identifier=terminal_identifier,
+        username=username.ljust(32, b'\0'), hostname=hostname.ljust(256, b'\0'),
+        session=self._random.randint(0, 65535),
+        timestamp=self._BASE_TIMESTAMP + record_index,
+        microseconds=self._random.randint(0, 999999),
+        ip_address=(127, 0, 0, 1) + (0, ) * 12)
+
+
+class MacOSXUtmpxGenerator(SyntheticDataGenerator):
+  """Mac OS X 10.5 utmpx file generator."""
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('utmp.yaml')
+
+  # Types of login of LOGIN_PROCESS, USER_PROCESS and DEAD_PROCESS.
+  _TYPES_OF_LOGIN = (6, 7, 8)
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record.
+
+    Returns:
+      bytes: record data.
+    """
+    terminal_identifier = self._random.randint(0, 255)
+    terminal = 'ttys{0:03d}'.format(terminal_identifier).encode('ascii')
+    username = self._random.choice(self._USERNAMES).encode('ascii')
+    hostname = self._random.choice(self._HOSTNAMES).encode('ascii')
+
+    return self._FoldStructure(
+        'macosx_utmpx_entry', username=username.ljust(256, b'\0'),
+        terminal_identifier=terminal_identifier,
+        terminal=terminal.ljust(32, b'\0'), pid=self._random.randint(1, 65535),
+        type=self._random.choice(self._TYPES_OF_LOGIN),
+        timestamp=self._BASE_TIMESTAMP + record_index,
+        microseconds=self._random.randint(0, 999999),
+        hostname=hostname.ljust(256, b'\0'))
+
+  def WriteFileObject(self, file_object, size):
+    """Writes synthetic data to a file-like object.
+
+    Args:
+      file_object (file): file-like object to write to.
+      size (int): approximate size of the data.
+
+    Returns:
+      int: number of bytes written.
+    """
+    # The first entry is the file header with type of login SIGNATURE.
+    header_data = self._FoldStructure(
+        'macosx_utmpx_entry', username=b'utmpx-1.00'.ljust(256, b'\0'),
+        type=10)
+    file_object.write(header_data)
+
+    return len(header_data) + self._WriteRecords(
+        file_object, size - len(header_data))
+
+
+class SystemdJournalGenerator(SyntheticDataGenerator):
+  """Systemd journal file generator.
+
+  The objects are written in the order journald appends them. The file header
+  is followed by the field and data hash tables. The data objects of an entry
+  that were not written before are followed by the field objects of fields
+  that were not written before and by the entry object. An entry array object
+  is allocated when the previous one is full, with room for twice as many
+  entries, and is filled as entries are added, both for the entry array chain
+  of the journal and the entry array chains of the data objects. Hence
+  a journal generated with the same seed and a larger size starts with
+  the same objects, as if the journal was appended to.
+  """
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('systemd.yaml')
+
+  # Object flags and incompatible file header flags per compression method.
+  _COMPRESSION_FLAGS = {
+      'lz4': (2, 2),
+      'xz': (1, 1),
+      'zstd': (4, 8)}
+
+  # Number of items of the hash tables, which is smaller than journald uses
+  # to keep small journals small.
+  _DATA_HASH_TABLE_SIZE = 64
+  _FIELD_HASH_TABLE_SIZE = 16
+
+  _FILE_HEADER_SIZE = 240
+
+  _HEADER_INCOMPATIBLE_KEYED_HASH = 4
+
+  _MINIMUM_NUMBER_OF_ENTRY_ARRAY_ITEMS = 4
+
+  _OBJECT_TYPE_DATA = 1
+  _OBJECT_TYPE_FIELD = 2
+  _OBJECT_TYPE_ENTRY = 3
+  _OBJECT_TYPE_DATA_HASH_TABLE = 4
+  _OBJECT_TYPE_FIELD_HASH_TABLE = 5
+  _OBJECT_TYPE_ENTRY_ARRAY = 6
+
+  _PRIORITIES = (3, 4, 5, 6, 6, 6, 7)
+
+  def __init__(self, compression=None, keyed_hash=False, seed=0):
+    """Initializes a systemd journal file generator.
+
+    Args:
+      compression (Optional[str]): compression method of the payloads of
+          the data objects, either "lz4", "xz" or "zstd", where None
+          represents no compression. Unlike journald, which only compresses
+          payloads larger than a threshold, every payload is compressed.
+      keyed_hash (Optional[bool]): True if the hashes of the data and field
+          objects should be SipHash-2-4 hashes keyed by the file identifier
+          instead of Jenkins hashes.
+      seed (Optional[int]): seed of the pseudo random number generator.
+
+    Raises:
+      ValueError: if the compression method is not supported.
+    """
+    if compression and compression not in self._COMPRESSION_FLAGS:
+      raise ValueError('Unsupported compression method: {0:s}'.format(
+          compression))
+
+    super(SystemdJournalGenerator, self).__init__(seed=seed)
+    self._compression = compression
+    self._keyed_hash = keyed_hash
+
+  def _AppendEntryArrayItem(
+      self, file_object, file_offset, entry_array_state, entry_object_offset):
+    """Appends an entry object offset to an entry array chain.
+
+    A new entry array object is written at the end of the file when the last
+    entry array object of the chain is full.
+
+    Args:
+      file_object (file): file-like object to write to.
+      file_offset (int): offset of the end of the file.
+      entry_array_state (list[int]): offset of the last entry array object of
+          the chain, its number of items and its number of used items, which
+          are updated.
+      entry_object_offset (int): offset of the entry object.
+
+    Returns:
+      tuple[int, int]: offset of the new entry array object or 0 if no entry
+          array object was written, and the offset of the end of the file.
+    """
+    entry_array_offset, number_of_items, number_of_used_items = (
+        entry_array_state)
+
+    new_entry_array_offset = 0
+    if number_of_used_items == number_of_items:
+      new_entry_array_offset = file_offset
+      number_of_items = max(
+          self._MINIMUM_NUMBER_OF_ENTRY_ARRAY_ITEMS, 2 * number_of_items)
+
+      object_data = self._GenerateEntryArrayObjectData(
+          0, [entry_object_offset], number_of_items)
+      file_object.write(object_data)
+      file_offset += len(object_data)
+
+      if entry_array_offset:
+        self._WriteAt(
+            file_object, entry_array_offset + 16,
+            struct.pack('<Q', new_entry_array_offset), file_offset)
+
+      entry_array_offset = new_entry_array_offset
+      number_of_used_items = 1
+
+    else:
+      self._WriteAt(
+          file_object, entry_array_offset + 24 + 8 * number_of_used_items,
+          struct.pack('<Q', entry_object_offset), file_offset)
+      number_of_used_items += 1
+
+    entry_array_state[:] = [
+        entry_array_offset, number_of_items, number_of_used_items]
+
+    return new_entry_array_offset, file_offset
+
+  def _CompressPayload(self, payload):
+    """Compresses the payload of a data object.
+
+    Args:
+      payload (bytes): payload.
+
+    Returns:
+      bytes: compressed payload.
+    """
+    if self._compression == 'xz':
+      return lzma.compress(
+          payload, format=lzma.FORMAT_XZ, check=lzma.CHECK_NONE)
+
+    if self._compression == 'lz4':
+      import lz4.block  # pylint: disable=import-outside-toplevel
+
+      return struct.pack('<Q', len(payload)) + lz4.block.compress(
+          payload, store_size=False)
+
+    import zstandard  # pylint: disable=import-outside-toplevel
+
+    return zstandard.ZstdCompressor().compress(payload)
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record, which is an entry.
+
+    Returns:
+      bytes: record data, which are the payloads of the data objects of
+          the entry separated by newlines.
+    """
+    hostname = self._random.choice(self._HOSTNAMES)
+    program = self._random.choice(self._PROGRAMS)
+
+    payloads = [
+        '_HOSTNAME={0:s}'.format(hostname),
+        'MESSAGE=message {0:d}'.format(record_index),
+        'PRIORITY={0:d}'.format(self._random.choice(self._PRIORITIES)),
+        'SYSLOG_IDENTIFIER={0:s}'.format(program),
+        '_SYSTEMD_UNIT={0:s}.service'.format(program)]
+
+    return '\n'.join(payloads).encode('utf-8')
+
+  def _GenerateObjectData(self, object_type, data, object_flags=0):
+    """Generates the data of an object.
+
+    Args:
+      object_type (int): object type.
+      data (bytes): data of the object after the object header.
+      object_flags (Optional[int]): object flags.
+
+    Returns:
+      bytes: object data, which is padded to a multiple of 8 bytes.
+    """
+    object_header_data = self._FoldStructure(
+        'systemd_journal_object_header', object_type=object_type,
+        object_flags=object_flags, data_size=16 + len(data))
+
+    padding_size = -len(data) % 8
+
+    return b''.join([object_header_data, data, bytes(padding_size)])
+
+  def _GenerateEntryArrayObjectData(
+      self, next_entry_array_offset, entry_object_offsets, number_of_items):
+    """Generates the data of an entry array object.
+
+    Args:
+      next_entry_array_offset (int): offset of the next entry array object.
+      entry_object_offsets (list[int]): offsets of the entry objects.
+      number_of_items (int): number of items of the entry array, where
+          the items without an entry object are 0.
+
+    Returns:
+      bytes: entry array object data.
+    """
+    items = entry_object_offsets + [0] * (
+        number_of_items - len(entry_object_offsets))
+
+    return self._GenerateObjectData(
+        self._OBJECT_TYPE_ENTRY_ARRAY, struct.pack(
+            '<Q{0:d}Q'.format(number_of_items), next_entry_array_offset,
+            *items))
+
+  def _GenerateHashTableObjectData(self, object_type, hash_table):
+    """Generates the data of a hash table object.
+
+    Args:
+      object_type (int): object type.
+      hash_table (list[list[int]]): head and tail hash offsets per item.
+
+    Returns:
+      bytes: hash table object data.
+    """
+    return self._GenerateObjectData(object_type, b''.join([
+        struct.pack('<QQ', head_hash_offset, tail_hash_offset)
+        for head_hash_offset, tail_hash_offset in hash_table]))
+
+  def _GetHash(self, file_identifier, data):
+    """Calculates the hash of the payload of a data or field object.
+
+    Args:
+      file_identifier (bytes): file identifier, which is the key of a keyed
+          hash.
+      data (bytes): payload.
+
+    Returns:
+      int: hash.
+    """
+    if self._keyed_hash:
+      return systemd.SipHash24(file_identifier, data)
+
+    return systemd.JenkinsHash64(data)
+
+  def _LinkHashTableItem(
+      self, file_object, file_offset, hash_table, hash_value, object_offset):
+    """Links an object to the tail of a hash table item.
+
+    Args:
+      file_object (file): file-like object to write to.
+      file_offset (int): offset of the end of the file.
+      hash_table (list[list[int]]): head and tail hash offsets per item.
+      hash_value (int): hash of the object.
+      object_offset (int): offset of the object.
+    """
+    hash_table_item = hash_table[hash_value % len(hash_table)]
+    if hash_table_item[1]:
+      # The next hash offset of a data or field object is stored after
+      # the object header and the hash.
+      self._WriteAt(
+          file_object, hash_table_item[1] + 24,
+          struct.pack('<Q', object_offset), file_offset)
+    else:
+      hash_table_item[0] = object_offset
+
+    hash_table_item[1] = object_offset
+
+  def _WriteAt(self, file_object, write_offset, data, file_offset):
+    """Overwrites data of an object that was written before.
+
+    Args:
+      file_object (file): file-like object to write to.
+      write_offset (int): offset to write the data at.
+      data (bytes): data.
+      file_offset (int): offset of the end of the file, which is the offset
+          of the file-like object after the write.
+    """
+    file_object.seek(write_offset, os.SEEK_SET)
+    file_object.write(data)
+    file_object.seek(file_offset, os.SEEK_SET)
+
+  def WriteFileObject(self, file_object, size):
+    """Writes synthetic data to a file-like object.
+
+    Args:
+      file_object (file): file-like object to write to.
+      size (int): approximate size of the data.
+
+    Returns:
+      int: number of bytes written.
+    """
+    file_identifier = bytes(self._random.getrandbits(8) for _ in range(16))
+    machine_identifier = bytes(
+        self._random.getrandbits(8) for _ in range(16))
+    boot_identifier = bytes(self._random.getrandbits(8) for _ in range(16))
+    sequence_number_identifier = bytes(
+        self._random.getrandbits(8) for _ in range(16))
+
+    object_flags, incompatible_flags = self._COMPRESSION_FLAGS.get(
+        self._compression, (0, 0))
+    if self._keyed_hash:
+      incompatible_flags |= self._HEADER_INCOMPATIBLE_KEYED_HASH
+
+    data_hash_table = [[0, 0] for _ in range(self._DATA_HASH_TABLE_SIZE)]
+    field_hash_table = [[0, 0] for _ in range(self._FIELD_HASH_TABLE_SIZE)]
+
+    file_object.write(bytes(self._FILE_HEADER_SIZE))
+    file_offset = self._FILE_HEADER_SIZE
+
+    # The hash tables are written after the last object, since their items
+    # change as objects are added.
+    field_hash_table_offset = file_offset
+    file_offset += len(self._GenerateHashTableObjectData(
+        self._OBJECT_TYPE_FIELD_HASH_TABLE, field_hash_table))
+
+    data_hash_table_offset = file_offset
+    file_offset += len(self._GenerateHashTableObjectData(
+        self._OBJECT_TYPE_DATA_HASH_TABLE, data_hash_table))
+
+    file_object.seek(file_offset, os.SEEK_SET)
+
+    # The offset and the entry array chain state of the data objects with
+    # a payload that is not unique to an entry, which are shared by
+    # the entries.
+    data_objects = {}
+
+    # The offset and the offset of the first data object of the field
+    # objects.
+    field_objects = {}
+
+    entry_array_offset = 0
+    entry_array_state = [0, 0, 0]
+
+    head_entry_real_time = 0
+    number_of_entries = 0
+    number_of_objects = 2
+    real_time = 0
+    tail_object_offset = data_hash_table_offset
+
+    while file_offset < size:
+      record_data = self._GenerateRecordData(number_of_entries)
+
+      # Like journald, the boot identifier is also stored as a field.
+      payloads = record_data.split(b'\n')
+      payloads.append(b'_BOOT_ID=' + boot_identifier.hex().encode('ascii'))
+
+      entry_items = []
+      linked_data_objects = []
+      xor_hash = 0
+      for payload in payloads:
+        data_hash = self._GetHash(file_identifier, payload)
+
+        # journald uses the Jenkins hash for the XOR hash of an entry, also
+        # when the data hashes are keyed.
+        if self._keyed_hash:
+          xor_hash ^= systemd.JenkinsHash64(payload)
+        else:
+          xor_hash ^= data_hash
+
+        data_object_state = data_objects.get(payload, None)
+        if data_object_state:
+          linked_data_objects.append(data_object_state)
+
+        else:
+          field_name = payload.split(b'=', 1)[0]
+          field_object = field_objects.get(field_name, None)
+
+          data_object_offset = file_offset
+          next_field_offset = field_object[1] if field_object else 0
+
+          data = payload
+          if self._compression:
+            data = self._CompressPayload(payload)
+
+          object_data = self._GenerateObjectData(
+              self._OBJECT_TYPE_DATA, struct.pack(
+                  '<QQQQQQ', data_hash, 0, next_field_offset, 0, 0, 0) + data,
+              object_flags=object_flags)
+          file_object.write(object_data)
+          file_offset += len(object_data)
+          number_of_objects += 1
+          tail_object_offset = data_object_offset
+
+          self._LinkHashTableItem(
+              file_object, file_offset, data_hash_table, data_hash,
+              data_object_offset)
+
+          if field_object:
+            # The data object is prepended to the data objects of the field.
+            self._WriteAt(
+                file_object, field_object[0] + 32,
+                struct.pack('<Q', data_object_offset), file_offset)
+            field_object[1] = data_object_offset
+
+          else:
+            field_hash = self._GetHash(file_identifier, field_name)
+
+            field_object_offset = file_offset
+            object_data = self._GenerateObjectData(
+                self._OBJECT_TYPE_FIELD, struct.pack(
+                    '<QQQ', field_hash, 0, data_object_offset) + field_name)
+            file_object.write(object_data)
+            file_offset += len(object_data)
+            number_of_objects += 1
+            tail_object_offset = field_object_offset
+
+            self._LinkHashTableItem(
+                file_object, file_offset, field_hash_table, field_hash,
+                field_object_offset)
+
+            field_objects[field_name] = [
+                field_object_offset, data_object_offset]
+
+          # The entry array chain state of a data object consists of
+          # the offset of the last entry array object, its number of items
+          # and its number of used items.
+          data_object_state = [data_object_offset, 0, [0, 0, 0]]
+          linked_data_objects.append(data_object_state)
+
+          if not payload.startswith(b'MESSAGE='):
+            data_objects[payload] = data_object_state
+
+        entry_items.extend([data_object_state[0], data_hash])
+
+      real_time = (
+          (self._BASE_TIMESTAMP + number_of_entries) * 1000000 +
+          self._random.randint(0, 999999))
+      monotonic = (number_of_entries + 1) * 1000000
+
+      if not head_entry_real_time:
+        head_entry_real_time = real_time
+
+      entry_object_offset = file_offset
+      object_data = self._GenerateObjectData(
+          self._OBJECT_TYPE_ENTRY, struct.pack(
+              '<QQQ16sQ{0:d}Q'.format(len(entry_items)),
+              number_of_entries + 1, real_time, monotonic, boot_identifier,
+              xor_hash, *entry_items))
+      file_object.write(object_data)
+      file_offset += len(object_data)
+      number_of_entries += 1
+      number_of_objects += 1
+      tail_object_offset = entry_object_offset
+
+      # The first entry of a data object is stored in the data object and
+      # the following entries in the entry array chain of the data object.
+      for data_object_state in linked_data_objects:
+        data_object_offset, number_of_data_entries, data_entry_array_state = (
+            data_object_state)
+
+        first_entry_array_offset = 0
+        if number_of_data_entries:
+          first_entry_array_offset, file_offset = self._AppendEntryArrayItem(
+              file_object, file_offset, data_entry_array_state,
+              entry_object_offset)
+
+          if first_entry_array_offset:
+            number_of_objects += 1
+            tail_object_offset = first_entry_array_offset
+
+            if number_of_data_entries > 1:
+              first_entry_array_offset = 0
+
+        number_of_data_entries += 1
+        data_object_state[1] = number_of_data_entries
+
+        if number_of_data_entries == 1:
+          self._WriteAt(
+              file_object, data_object_offset + 40,
+              struct.pack('<QQQ', entry_object_offset, 0, 1), file_offset)
+
+        elif first_entry_array_offset:
+          self._WriteAt(
+              file_object, data_object_offset + 48,
+              struct.pack('<QQ', first_entry_array_offset,
+                          number_of_data_entries), file_offset)
+
+        else:
+          self._WriteAt(
+              file_object, data_object_offset + 56,
+              struct.pack('<Q', number_of_data_entries), file_offset)
+
+      new_entry_array_offset, file_offset = self._AppendEntryArrayItem(
+          file_object, file_offset, entry_array_state, entry_object_offset)
+
+      if new_entry_array_offset:
+        number_of_objects += 1
+        tail_object_offset = new_entry_array_offset
+
+        if not entry_array_offset:
+          entry_array_offset = new_entry_array_offset
+
+    self._WriteAt(
+        file_object, field_hash_table_offset,
+        self._GenerateHashTableObjectData(
+            self._OBJECT_TYPE_FIELD_HASH_TABLE, field_hash_table),
+        file_offset)
+
+    self._WriteAt(
+        file_object, data_hash_table_offset,
+        self._GenerateHashTableObjectData(
+            self._OBJECT_TYPE_DATA_HASH_TABLE, data_hash_table),
+        file_offset)
+
+    file_header_data = self._FoldStructure(
+        'systemd_journal_file_header', incompatible_flags=incompatible_flags,
+        file_identifier=file_identifier,
+        machine_identifier=machine_identifier, boot_identifier=boot_identifier,
+        sequence_number_identifier=sequence_number_identifier,
+        header_size=self._FILE_HEADER_SIZE,
+        arena_size=file_offset - self._FILE_HEADER_SIZE,
+        data_hash_table_offset=data_hash_table_offset + 16,
+        data_hash_table_size=16 * len(data_hash_table),
+        field_hash_table_offset=field_hash_table_offset + 16,
+        field_hash_table_size=16 * len(field_hash_table),
+        tail_object_offset=tail_object_offset,
+        number_of_objects=number_of_objects,
+        number_of_entry_objects=number_of_entries,
+        tail_entry_sequence_number=number_of_entries,
+        head_entry_sequence_number=min(number_of_entries, 1),
+        entry_array_offset=entry_array_offset,
+        head_entry_real_time=head_entry_real_time,
+        tail_entry_real_time=real_time,
+        tail_entry_monotonic=number_of_entries * 1000000)
+
+    self._WriteAt(file_object, 0, file_header_data, file_offset)
+
+    return file_offset
+
+
+class USNRecordsGenerator(SyntheticDataGenerator):
+  """USN change journal version 2 records generator.
+
+  The records are stored in blocks of 4096 bytes, where the last record of
+  a block is padded to the end of the block, since a record does not span
+  blocks.
+  """
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.LazyDataTypeFabric('usn_journal.yaml')
+
+  _BLOCK_SIZE = 4096
+
+  # Size of a version 2 record without the name.
+  _RECORD_HEADER_SIZE = 60
+
+  # Update reason flags of USN_REASON_DATA_EXTEND, USN_REASON_FILE_CREATE and
+  # USN_REASON_CLOSE combined with USN_REASON_FILE_CREATE.
+  _UPDATE_REASON_FLAGS = (0x00000002, 0x00000100, 0x80000100)
+
+  def _GenerateRecordData(self, record_index):
+    """Generates the data of a record.
+
+    Args:
+      record_index (int): index of the record, which is a block of records.
+
+    Returns:
+      bytes: record data, which is a block of records.
+    """
+    records = []
+    block_offset = 0
+    while True:
+      name = '{0:s}{1:d}.log'.format(
+          self._random.choice(self._PROGRAMS), self._random.randint(0, 9999))
+      name_size = len(name) * 2
+      record_size = self._RECORD_HEADER_SIZE + name_size
+      record_size += -record_size % 8
+
+      if block_offset + record_size > self._BLOCK_SIZE:
+        break
+
+      records.append([name, name_size, record_size])
+      block_offset += record_size
+
+    # The last record is padded to the end of the block.
+    records[-1][2] += self._BLOCK_SIZE - block_offset
+
+    # FILETIME is in 100th nano seconds since January 1, 1601.
+    timestamp = (self._BASE_TIMESTAMP + 11644473600 + record_index) * 10000000
+
+    # The update sequence number (USN) is the offset of the record.
+    update_sequence_number = record_index * self._BLOCK_SIZE
+
+    records_data = []
+    for name, name_size, record_size in records:
+      file_reference = (
+          (self._random.randint(1, 16) << 48) |
+          self._random.randint(64, 0xffffff))
+
+      records_data.append(self._FoldStructure(
+          'usn_record_v2', size=record_size,
+          file_reference=file_reference, parent_file_reference=5,
+          sequence_number=update_sequence_number, timestamp=timestamp,
+          update_reason_flags=self._random.choice(
+              self._UPDATE_REASON_FLAGS),
+          file_attribute_flags=0x20, name_size=name_size,
+          name_offset=self._RECORD_HEADER_SIZE, name=name,
+          padding=bytes(record_size - self._RECORD_HEADER_SIZE - name_size)))
+
+      update_sequence_number += record_size
+
+    return b''.join(records_data)
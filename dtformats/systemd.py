@@ -1,23 +1,358 @@
 # -*- coding: utf-8 -*-
 """Systemd journal files."""
 
+import bisect
+import collections
+import heapq
+import logging
+import lzma
+import os
+import struct
+
 from dtformats import data_format
 from dtformats import errors
 
 
+def _RotateLeft32(value, number_of_bits):
+  """Rotates a 32-bit integer to the left.
+
+  Args:
+    value (int): 32-bit integer.
+    number_of_bits (int): number of bits to rotate.
+
+  Returns:
+    int: rotated 32-bit integer.
+  """
+  return ((value << number_of_bits) | (value >> (32 - number_of_bits))) & (
+      0xffffffff)
+
+
+def _RotateLeft64(value, number_of_bits):
+  """Rotates a 64-bit integer to the left.
+
+  Args:
+    value (int): 64-bit integer.
+    number_of_bits (int): number of bits to rotate.
+
+  Returns:
+    int: rotated 64-bit integer.
+  """
+  return ((value << number_of_bits) | (value >> (64 - number_of_bits))) & (
+      0xffffffffffffffff)
+
+
+def _SipRound(v0, v1, v2, v3):
+  """Calculates a SipHash round.
+
+  Args:
+    v0 (int): first 64-bit state value.
+    v1 (int): second 64-bit state value.
+    v2 (int): third 64-bit state value.
+    v3 (int): fourth 64-bit state value.
+
+  Returns:
+    tuple[int, int, int, int]: state values after the round.
+  """
+  v0 = (v0 + v1) & 0xffffffffffffffff
+  v1 = _RotateLeft64(v1, 13) ^ v0
+  v0 = _RotateLeft64(v0, 32)
+  v2 = (v2 + v3) & 0xffffffffffffffff
+  v3 = _RotateLeft64(v3, 16) ^ v2
+  v0 = (v0 + v3) & 0xffffffffffffffff
+  v3 = _RotateLeft64(v3, 21) ^ v0
+  v2 = (v2 + v1) & 0xffffffffffffffff
+  v1 = _RotateLeft64(v1, 17) ^ v2
+  v2 = _RotateLeft64(v2, 32)
+  return v0, v1, v2, v3
+
+
+def JenkinsHash64(data):
+  """Calculates the 64-bit Jenkins lookup3 hash used by journald.
+
+  The hash consists of the primary and secondary 32-bit hashes of
+  hashlittle2() with initial values of 0, where the primary hash is stored
+  in the upper 32 bits.
+
+  Args:
+    data (bytes): data to hash.
+
+  Returns:
+    int: 64-bit hash of the data.
+  """
+  data_size = len(data)
+
+  a = b = c = (0xdeadbeef + data_size) & 0xffffffff
+
+  data_offset = 0
+  while data_size - data_offset > 12:
+    a = (a + int.from_bytes(data[data_offset:data_offset + 4], 'little')) & (
+        0xffffffff)
+    b = (b + int.from_bytes(
+        data[data_offset + 4:data_offset + 8], 'little')) & 0xffffffff
+    c = (c + int.from_bytes(
+        data[data_offset + 8:data_offset + 12], 'little')) & 0xffffffff
+
+    a = ((a - c) & 0xffffffff) ^ _RotateLeft32(c, 4)
+    c = (c + b) & 0xffffffff
+    b = ((b - a) & 0xffffffff) ^ _RotateLeft32(a, 6)
+    a = (a + c) & 0xffffffff
+    c = ((c - b) & 0xffffffff) ^ _RotateLeft32(b, 8)
+    b = (b + a) & 0xffffffff
+    a = ((a - c) & 0xffffffff) ^ _RotateLeft32(c, 16)
+    c = (c + b) & 0xffffffff
+    b = ((b - a) & 0xffffffff) ^ _RotateLeft32(a, 19)
+    a = (a + c) & 0xffffffff
+    c = ((c - b) & 0xffffffff) ^ _RotateLeft32(b, 4)
+    b = (b + a) & 0xffffffff
+
+    data_offset += 12
+
+  if data_offset == data_size:
+    return (c << 32) | b
+
+  # The last 1 to 12 bytes are padded with 0-byte values.
+  last_block = data[data_offset:].ljust(12, b'\x00')
+
+  a = (a + int.from_bytes(last_block[0:4], 'little')) & 0xffffffff
+  b = (b + int.from_bytes(last_block[4:8], 'little')) & 0xffffffff
+  c = (c + int.from_bytes(last_block[8:12], 'little')) & 0xffffffff
+
+  c = ((c ^ b) - _RotateLeft32(b, 14)) & 0xffffffff
+  a = ((a ^ c) - _RotateLeft32(c, 11)) & 0xffffffff
+  b = ((b ^ a) - _RotateLeft32(a, 25)) & 0xffffffff
+  c = ((c ^ b) - _RotateLeft32(b, 16)) & 0xffffffff
+  a = ((a ^ c) - _RotateLeft32(c, 4)) & 0xffffffff
+  b = ((b ^ a) - _RotateLeft32(a, 14)) & 0xffffffff
+  c = ((c ^ b) - _RotateLeft32(b, 24)) & 0xffffffff
+
+  return (c << 32) | b
+
+
+def SipHash24(key, data):
+  """Calculates the SipHash-2-4 hash used by journald for keyed hashes.
+
+  Args:
+    key (bytes): 16-byte key, which journald sets to the file identifier.
+    data (bytes): data to hash.
+
+  Returns:
+    int: 64-bit hash of the data.
+  """
+  k0 = int.from_bytes(key[0:8], 'little')
+  k1 = int.from_bytes(key[8:16], 'little')
+
+  v0 = k0 ^ 0x736f6d6570736575
+  v1 = k1 ^ 0x646f72616e646f6d
+  v2 = k0 ^ 0x6c7967656e657261
+  v3 = k1 ^ 0x7465646279746573
+
+  data_size = len(data)
+  last_block_offset = data_size - (data_size % 8)
+
+  for data_offset in range(0, last_block_offset, 8):
+    message = int.from_bytes(data[data_offset:data_offset + 8], 'little')
+    v3 ^= message
+    v0, v1, v2, v3 = _SipRound(v0, v1, v2, v3)
+    v0, v1, v2, v3 = _SipRound(v0, v1, v2, v3)
+    v0 ^= message
+
+  # The last block contains the remaining bytes and the lower 8 bits of
+  # the data size in its most significant byte.
+  message = int.from_bytes(data[last_block_offset:], 'little') | (
+      (data_size & 0xff) << 56)
+  v3 ^= message
+  v0, v1, v2, v3 = _SipRound(v0, v1, v2, v3)
+  v0, v1, v2, v3 = _SipRound(v0, v1, v2, v3)
+  v0 ^= message
+
+  v2 ^= 0xff
+  for _ in range(4):
+    v0, v1, v2, v3 = _SipRound(v0, v1, v2, v3)
+
+  return v0 ^ v1 ^ v2 ^ v3
+
+
+class LZ4Decompressor(object):
+  """LZ4 decompressor of systemd journal data object payloads.
+
+  The payload consists of the size of the uncompressed data, stored as
+  a 64-bit little-endian integer, followed by a LZ4 block.
+  """
+
+  def __init__(self):
+    """Initializes a LZ4 decompressor."""
+    import lz4.block  # pylint: disable=import-outside-toplevel
+
+    super(LZ4Decompressor, self).__init__()
+    self._lz4_block = lz4.block
+    self._lz4_error = lz4.block.LZ4BlockError
+
+  def Decompress(self, compressed_data):
+    """Decompresses a payload.
+
+    Args:
+      compressed_data (bytes): compressed payload.
+
+    Returns:
+      bytes: uncompressed payload.
+
+    Raises:
+      ParseError: if the payload cannot be decompressed.
+    """
+    if len(compressed_data) < 8:
+      raise errors.ParseError('Invalid LZ4 compressed data size.')
+
+    uncompressed_data_size = int.from_bytes(compressed_data[:8], 'little')
+
+    try:
+      return self._lz4_block.decompress(
+          compressed_data[8:], uncompressed_size=uncompressed_data_size)
+
+    except (MemoryError, ValueError, self._lz4_error) as exception:
+      raise errors.ParseError(
+          'Unable to decompress LZ4 compressed data with error: {0!s}'.format(
+              exception))
+
+
+class XZDecompressor(object):
+  """XZ decompressor of systemd journal data object payloads."""
+
+  def Decompress(self, compressed_data):
+    """Decompresses a payload.
+
+    Args:
+      compressed_data (bytes): compressed payload.
+
+    Returns:
+      bytes: uncompressed payload.
+
+    Raises:
+      ParseError: if the payload cannot be decompressed.
+    """
+    # A LZMA decompressor object decompresses a single stream.
+    lzma_decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+
+    try:
+      uncompressed_data = lzma_decompressor.decompress(compressed_data)
+    except lzma.LZMAError as exception:
+      raise errors.ParseError(
+          'Unable to decompress XZ compressed data with error: {0!s}'.format(
+              exception))
+
+    if not lzma_decompressor.eof:
+      raise errors.ParseError('Truncated XZ compressed data.')
+
+    return uncompressed_data
+
+
+class ZSTDDecompressor(object):
+  """Zstandard (ZSTD) decompressor of systemd journal data object payloads.
+
+  ZSTD support requires the optional zstandard module.
+  """
+
+  def __init__(self):
+    """Initializes a ZSTD decompressor.
+
+    Raises:
+      ParseError: if the zstandard module is not available.
+    """
+    # The zstandard module is imported on first use, since it is an optional
+    # dependency.
+    try:
+      import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError:
+      raise errors.ParseError(
+          'Unsupported ZSTD compressed data: missing zstandard module.')
+
+    super(ZSTDDecompressor, self).__init__()
+    self._zstd_decompressor = zstandard.ZstdDecompressor()
+    self._zstd_error = zstandard.ZstdError
+
+  def Decompress(self, compressed_data):
+    """Decompresses a payload.
+
+    Args:
+      compressed_data (bytes): compressed payload.
+
+    Returns:
+      bytes: uncompressed payload.
+
+    Raises:
+      ParseError: if the payload cannot be decompressed.
+    """
+    # A decompression object also supports frames without the size of
+    # the uncompressed data.
+    zstd_decompression_object = self._zstd_decompressor.decompressobj()
+
+    try:
+      uncompressed_data = zstd_decompression_object.decompress(compressed_data)
+    except self._zstd_error as exception:
+      raise errors.ParseError(
+          'Unable to decompress ZSTD compressed data with error: {0!s}'.format(
+              exception))
+
+    if not zstd_decompression_object.eof:
+      raise errors.ParseError('Truncated ZSTD compressed data.')
+
+    return uncompressed_data
+
+
 class SystemdJournalFile(data_format.BinaryDataFile):
   """Systemd journal file."""
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('systemd.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('systemd.yaml')
+
+  # Entry objects are carved by an object header with type entry, no flags
+  # and reserved bytes of 0. Since the data objects of a carved entry object
+  # are stored at offsets relative to the start of the journal file, which is
+  # not known, the data of carved entries is not read.
+  CARVING_SIGNATURE = b'\x03\x00\x00\x00\x00\x00\x00\x00'
+
+  SIGNATURES = [(0, b'LPKSHHRH')]
+
+  SUPPORTS_CHECKPOINTS = True
+
+  _HEADER_INCOMPATIBLE_KEYED_HASH = 4
+
+  # Candidate entry objects are checked with struct before they are mapped,
+  # since mapping an entry object with dtFabric is slow and most candidates
+  # in raw data are not entry objects.
+  _CARVED_ENTRY_OBJECT_HEADER = struct.Struct('<BB6xQQQQ16sQ')
+
+  _CARVED_ENTRY_ITEM = struct.Struct('<QQ')
+
+  # Number of entry items of which the object offset is checked before
+  # a candidate entry object is mapped.
+  _MAXIMUM_NUMBER_OF_CHECKED_CARVED_ENTRY_ITEMS = 4
+
+  # journald limits the number of fields of an entry to 1024, hence an entry
+  # object contains at most 1024 entry items of 16 bytes.
+  _MAXIMUM_CARVED_ENTRY_OBJECT_SIZE = 64 + (1024 * 16)
+
+  # Real times of carved entry objects must be between 2000-01-01 and
+  # 2100-01-01 00:00:00 in number of microseconds since 1970-01-01.
+  _MINIMUM_CARVED_REAL_TIME = 946684800000000
+  _MAXIMUM_CARVED_REAL_TIME = 4102444800000000
 
   _OBJECT_COMPRESSED_XZ = 1
   _OBJECT_COMPRESSED_LZ4 = 2
+  _OBJECT_COMPRESSED_ZSTD = 4
 
   _OBJECT_FLAGS = {
       1: 'OBJECT_COMPRESSED_XZ',
-      2: 'OBJECT_COMPRESSED_LZ4'}
+      2: 'OBJECT_COMPRESSED_LZ4',
+      4: 'OBJECT_COMPRESSED_ZSTD'}
+
+  # Decompressor classes per object compression flag. A decompressor is
+  # created when the first data object with its compression is read and is
+  # reused for the following data objects.
+  _DECOMPRESSOR_CLASSES = {
+      _OBJECT_COMPRESSED_XZ: XZDecompressor,
+      _OBJECT_COMPRESSED_LZ4: LZ4Decompressor,
+      _OBJECT_COMPRESSED_ZSTD: ZSTDDecompressor}
 
   _OBJECT_TYPE_UNUSED = 0
   _OBJECT_TYPE_DATA = 1
@@ -74,6 +409,12 @@ class SystemdJournalFile(data_format.BinaryDataFile):
       ('xor_hash', 'XOR hash', '_FormatIntegerAsHexadecimal8'),
       ('entry_items', 'Entry items', '_FormatEntryItems')]
 
+  _DEBUG_INFO_FIELD_OBJECT_VALUES = [
+      ('hash', 'Hash', '_FormatIntegerAsHexadecimal8'),
+      ('next_hash_offset', 'Next hash offset', '_FormatIntegerAsHexadecimal8'),
+      ('head_data_offset', 'Head data offset', '_FormatIntegerAsHexadecimal8'),
+      ('data', 'Data', '_FormatDataInHexadecimal')]
+
   _DEBUG_INFO_FILE_HEADER = [
       ('signature', 'Signature', '_FormatStreamAsSignature'),
       ('compatible_flags', 'Compatible flags', '_FormatIntegerAsHexadecimal8'),
@@ -120,16 +461,167 @@ class SystemdJournalFile(data_format.BinaryDataFile):
       ('reserved1', 'Reserved', '_FormatDataInHexadecimal'),
       ('data_size', 'Data size', '_FormatIntegerAsDecimal')]
 
-  def __init__(self, debug=False, output_writer=None):
+  def __init__(
+      self, debug=False, maximum_number_of_cached_data_objects=4096,
+      output_writer=None):
     """Initializes a systemd journal file.
 
     Args:
       debug (Optional[bool]): True if debug information should be written.
+      maximum_number_of_cached_data_objects (Optional[int]): maximum number
+          of data objects in the least recently used (LRU) cache of data
+          objects. Since journald stores a payload, such as "_HOSTNAME=host",
+          once and every entry with that payload refers to the same data
+          object, most data objects of an entry are read from the cache.
+          Compressed payloads are cached compressed.
       output_writer (Optional[OutputWriter]): output writer.
+
+    Raises:
+      ValueError: if the maximum number of cached data objects is out of
+          bounds.
     """
+    if maximum_number_of_cached_data_objects <= 0:
+      raise ValueError((
+          'Invalid maximum number of cached data objects: {0:d} value out of '
+          'bounds.').format(maximum_number_of_cached_data_objects))
+
     super(SystemdJournalFile, self).__init__(
         debug=debug, output_writer=output_writer)
+    self._data_objects = collections.OrderedDict()
+    self._decompressors = {}
+    self._file_header = None
+    self._file_identity = None
     self._format_version = None
+    self._maximum_number_of_cached_data_objects = (
+        maximum_number_of_cached_data_objects)
+    self._resume_entry_array = None
+
+  def _CheckCarvedEntryObject(self, file_object, file_offset):
+    """Checks a candidate entry object before it is carved.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the candidate entry object relative to
+          the start of the file-like object.
+
+    Returns:
+      int: size of the entry object.
+
+    Raises:
+      ParseError: if the candidate is not a valid entry object.
+    """
+    data = self._ReadData(
+        file_object, file_offset, self._CARVED_ENTRY_OBJECT_HEADER.size,
+        'entry object header')
+
+    (object_type, object_flags, data_size, sequence_number, real_time, _,
+     boot_identifier, _) = self._CARVED_ENTRY_OBJECT_HEADER.unpack(data)
+
+    if object_type != self._OBJECT_TYPE_ENTRY or object_flags != 0:
+      raise errors.ParseError('Invalid entry object header.')
+
+    if (data_size <= 64 or
+        data_size > self._MAXIMUM_CARVED_ENTRY_OBJECT_SIZE or
+        (data_size - 64) % 16 != 0):
+      raise errors.ParseError('Invalid entry object size: {0:d}.'.format(
+          data_size))
+
+    if (not sequence_number or
+        real_time < self._MINIMUM_CARVED_REAL_TIME or
+        real_time >= self._MAXIMUM_CARVED_REAL_TIME or
+        boot_identifier == bytes(16)):
+      raise errors.ParseError('Invalid entry object values.')
+
+    number_of_entry_items = min(
+        (data_size - 64) // 16,
+        self._MAXIMUM_NUMBER_OF_CHECKED_CARVED_ENTRY_ITEMS)
+
+    data = self._ReadData(
+        file_object, file_offset + 64, number_of_entry_items * 16,
+        'entry items')
+
+    for object_offset, _ in self._CARVED_ENTRY_ITEM.iter_unpack(data):
+      if not object_offset or object_offset % 8 != 0:
+        raise errors.ParseError('Invalid entry item object offset.')
+
+    return data_size
+
+  def _FindDataObject(self, file_object, payload):
+    """Finds the data object of a payload in the data hash table.
+
+    Args:
+      file_object (file): file-like object.
+      payload (bytes): payload, such as b"_SYSTEMD_UNIT=cron.service".
+
+    Returns:
+      systemd_journal_data_object: data object or None if the journal does
+          not contain the payload.
+
+    Raises:
+      ParseError: if the data hash table or a data object cannot be read or
+          the hash chain contains a loop.
+    """
+    hash_value = self._GetHash(payload)
+
+    data_object_offset = self._GetHashTableHeadOffset(
+        file_object, self._file_header.data_hash_table_offset,
+        self._file_header.data_hash_table_size, hash_value)
+
+    data_object_offsets = set()
+    while data_object_offset:
+      if data_object_offset in data_object_offsets:
+        raise errors.ParseError(
+            'Loop in hash chain at offset: 0x{0:08x}.'.format(
+                data_object_offset))
+
+      data_object_offsets.add(data_object_offset)
+
+      data_object = self._GetDataObject(file_object, data_object_offset)
+      if (data_object.hash == hash_value and
+          self._GetDataObjectPayload(data_object) == payload):
+        return data_object
+
+      data_object_offset = data_object.next_hash_offset
+
+    return None
+
+  def _FindFieldObject(self, file_object, field_name):
+    """Finds the field object of a field name in the field hash table.
+
+    Args:
+      file_object (file): file-like object.
+      field_name (bytes): field name, such as b"_SYSTEMD_UNIT".
+
+    Returns:
+      systemd_journal_field_object: field object or None if the journal does
+          not contain the field.
+
+    Raises:
+      ParseError: if the field hash table or a field object cannot be read or
+          the hash chain contains a loop.
+    """
+    hash_value = self._GetHash(field_name)
+
+    field_object_offset = self._GetHashTableHeadOffset(
+        file_object, self._file_header.field_hash_table_offset,
+        self._file_header.field_hash_table_size, hash_value)
+
+    field_object_offsets = set()
+    while field_object_offset:
+      if field_object_offset in field_object_offsets:
+        raise errors.ParseError(
+            'Loop in hash chain at offset: 0x{0:08x}.'.format(
+                field_object_offset))
+
+      field_object_offsets.add(field_object_offset)
+
+      field_object = self._ReadFieldObject(file_object, field_object_offset)
+      if field_object.hash == hash_value and field_object.data == field_name:
+        return field_object
+
+      field_object_offset = field_object.next_hash_offset
+
+    return None
 
   def _FormatEntryItems(self, entry_items):
     """Formats the entry items.
@@ -210,6 +702,267 @@ class SystemdJournalFile(data_format.BinaryDataFile):
     """
     return stream.decode('ascii')
 
+  def _GetDataObject(self, file_object, file_offset):
+    """Retrieves a data object from the cache or reads it.
+
+    The cache is not used when debug information should be written.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the data object relative to the start
+          of the file-like object.
+
+    Returns:
+      systemd_journal_data_object: data object.
+
+    Raises:
+      ParseError: if the data object cannot be read.
+    """
+    # The cache is bypassed when debug information should be written, so that
+    # the data objects of every entry are written.
+    if self._debug:
+      return self._ReadDataObject(file_object, file_offset)
+
+    data_object = self._data_objects.get(file_offset, None)
+    if data_object is not None:
+      self._data_objects.move_to_end(file_offset)
+      return data_object
+
+    data_object = self._ReadDataObject(file_object, file_offset)
+
+    self._data_objects[file_offset] = data_object
+    if len(self._data_objects) > self._maximum_number_of_cached_data_objects:
+      self._data_objects.popitem(last=False)
+
+    return data_object
+
+  def _GetDataObjectPayload(self, data_object):
+    """Retrieves the payload of a data object.
+
+    Args:
+      data_object (systemd_journal_data_object): data object.
+
+    Returns:
+      bytes: payload, which is decompressed if the data object is compressed.
+
+    Raises:
+      ParseError: if the payload cannot be decompressed.
+    """
+    if not data_object.object_flags:
+      return data_object.data
+
+    decompressor = self._decompressors.get(data_object.object_flags, None)
+    if not decompressor:
+      decompressor_class = self._DECOMPRESSOR_CLASSES[data_object.object_flags]
+      decompressor = decompressor_class()
+      self._decompressors[data_object.object_flags] = decompressor
+
+    return decompressor.Decompress(data_object.data)
+
+  def _GetEntryFields(self, file_object, entry_object, field_names=None):
+    """Retrieves the fields of an entry.
+
+    Args:
+      file_object (file): file-like object.
+      entry_object (systemd_journal_entry_object): entry object.
+      field_names (Optional[set[bytes]]): names of the fields to retrieve,
+          where None represents all fields. The values of other fields are
+          not decoded.
+
+    Returns:
+      dict[str, object]: values of the fields of the entry per name, where
+          the value of a field that is not UTF-8 encoded is bytes and
+          the values of a field that occurs more than once are a list.
+          The entry object values are stored as the journal export fields
+          "__REALTIME_TIMESTAMP", "__MONOTONIC_TIMESTAMP", "__SEQNUM",
+          "__SEQNUM_ID" and "_BOOT_ID".
+
+    Raises:
+      ParseError: if a data object cannot be read or decompressed.
+    """
+    fields = {
+        '__REALTIME_TIMESTAMP': entry_object.real_time,
+        '__MONOTONIC_TIMESTAMP': entry_object.monotonic,
+        '__SEQNUM': entry_object.sequence_number,
+        '__SEQNUM_ID': self._file_header.sequence_number_identifier.hex(),
+        '_BOOT_ID': entry_object.boot_identifier.hex()}
+
+    for entry_item in entry_object.entry_items:
+      data_object = self._GetDataObject(file_object, entry_item.object_offset)
+
+      # The payload is decompressed on demand and not cached, to keep
+      # the memory usage of the cache low.
+      payload = self._GetDataObjectPayload(data_object)
+
+      separator_index = payload.find(b'=')
+      if separator_index < 0:
+        raise errors.ParseError(
+            'Invalid data object at offset: 0x{0:08x}.'.format(
+                entry_item.object_offset))
+
+      name = payload[:separator_index]
+
+      # The boot identifier of the entry object is also stored as a field,
+      # which is skipped like "journalctl -o export" does.
+      if name == b'_BOOT_ID':
+        continue
+
+      if field_names is not None and name not in field_names:
+        continue
+
+      name = name.decode('utf-8', errors='backslashreplace')
+      value = payload[separator_index + 1:]
+
+      try:
+        value = value.decode('utf-8')
+      except UnicodeDecodeError:
+        value = bytes(value)
+
+      existing_value = fields.get(name, None)
+      if existing_value is None:
+        fields[name] = value
+      elif isinstance(existing_value, list):
+        existing_value.append(value)
+      else:
+        fields[name] = [existing_value, value]
+
+    return fields
+
+  def _GetHash(self, data):
+    """Calculates the hash of the payload of a data or field object.
+
+    Args:
+      data (bytes): payload of a data object or field name.
+
+    Returns:
+      int: SipHash-2-4 hash keyed by the file identifier if the journal uses
+          keyed hashes or Jenkins hash otherwise.
+    """
+    if (self._file_header.incompatible_flags &
+        self._HEADER_INCOMPATIBLE_KEYED_HASH):
+      return SipHash24(self._file_header.file_identifier, data)
+
+    return JenkinsHash64(data)
+
+  def _GetHashTableHeadOffset(
+      self, file_object, hash_table_offset, hash_table_size, hash_value):
+    """Retrieves the offset of the first object of a hash table item.
+
+    Only the hash table item of the hash is read.
+
+    Args:
+      file_object (file): file-like object.
+      hash_table_offset (int): offset of the items of the hash table relative
+          to the start of the file-like object.
+      hash_table_size (int): size of the items of the hash table.
+      hash_value (int): hash.
+
+    Returns:
+      int: offset of the first object with a hash of the hash table item or
+          0 if the hash table item or hash table is empty.
+
+    Raises:
+      ParseError: if the hash table item cannot be read.
+    """
+    number_of_hash_table_items = hash_table_size // 16
+    if not hash_table_offset or not number_of_hash_table_items:
+      return 0
+
+    hash_table_item_offset = hash_table_offset + 16 * (
+        hash_value % number_of_hash_table_items)
+
+    data_type_map = self._GetDataTypeMap('systemd_journal_hash_item')
+
+    hash_table_item, _ = self._ReadStructureFromFileObject(
+        file_object, hash_table_item_offset, data_type_map, 'hash table item')
+
+    return hash_table_item.head_hash_offset
+
+  def _GetResumeEntryArray(self, file_object, entry_array_offset, checkpoint):
+    """Retrieves the entry array to resume reading entries from a checkpoint.
+
+    Since entry objects are appended to the journal, the entry object offsets
+    in the chain of entry arrays are in increasing order. Only the first entry
+    object offset of the entry arrays before the one that contains the entry
+    of the checkpoint is read.
+
+    Args:
+      file_object (file): file-like object.
+      entry_array_offset (int): offset of the first entry array object
+          relative to the start of the file-like object.
+      checkpoint (Checkpoint): checkpoint.
+
+    Returns:
+      tuple[int, int]: offset of the entry array object and index of the first
+          entry to read in the entry array or None if reading cannot be
+          resumed from the checkpoint.
+    """
+    if checkpoint.offset <= 0 or checkpoint.offset >= self._file_size:
+      return None
+
+    header_data_type_map = self._GetDataTypeMap(
+        'systemd_journal_entry_array_object_header')
+    uint64le_data_type_map = self._GetDataTypeMap('uint64le')
+
+    resume_entry_array_offset = None
+    entry_array_offsets = set()
+    try:
+      while entry_array_offset:
+        # Reading cannot be resumed from a chain of entry arrays with a loop.
+        if entry_array_offset in entry_array_offsets:
+          return None
+
+        entry_array_offsets.add(entry_array_offset)
+
+        entry_array_object_header, header_data_size = (
+            self._ReadStructureFromFileObject(
+                file_object, entry_array_offset, header_data_type_map,
+                'entry array object header'))
+
+        if (entry_array_object_header.object_type !=
+            self._OBJECT_TYPE_ENTRY_ARRAY):
+          return None
+
+        first_entry_object_offset, _ = self._ReadStructureFromFileObject(
+            file_object, entry_array_offset + header_data_size,
+            uint64le_data_type_map, 'first entry object offset')
+
+        if (first_entry_object_offset == 0 or
+            first_entry_object_offset > checkpoint.offset):
+          break
+
+        resume_entry_array_offset = entry_array_offset
+        entry_array_offset = entry_array_object_header.next_entry_array_offset
+
+      if not resume_entry_array_offset:
+        return None
+
+      entry_array_object = self._ReadEntryArrayObject(
+          file_object, resume_entry_array_offset)
+
+      # The items of an entry array object without an entry object are 0
+      # and are stored after the items with an entry object.
+      entry_object_offsets = entry_array_object.entry_object_offsets
+      number_of_entries = len(entry_object_offsets)
+      if 0 in entry_object_offsets:
+        number_of_entries = entry_object_offsets.index(0)
+
+      entry_index = bisect.bisect_left(
+          entry_object_offsets, checkpoint.offset, hi=number_of_entries)
+      if (entry_index >= number_of_entries or
+          entry_object_offsets[entry_index] != checkpoint.offset):
+        return None
+
+      entry_object = self._ReadEntryObject(file_object, checkpoint.offset)
+
+    except errors.ParseError:
+      return None
+
+    if entry_object.sequence_number != checkpoint.sequence_number:
+      return None
+
+    return resume_entry_array_offset, entry_index + 1
+
   def _ReadDataObject(self, file_object, file_offset):
     """Reads a data object.
 
@@ -237,8 +990,8 @@ class SystemdJournalFile(data_format.BinaryDataFile):
       raise errors.ParseError('Unsupported object type: {0:d}.'.format(
           data_object.object_type))
 
-    if data_object.object_flags not in (
-        0, self._OBJECT_COMPRESSED_XZ, self._OBJECT_COMPRESSED_LZ4):
+    if (data_object.object_flags and
+        data_object.object_flags not in self._DECOMPRESSOR_CLASSES):
       raise errors.ParseError('Unsupported object flags: 0x{0:02x}.'.format(
           data_object.object_flags))
 
@@ -248,6 +1001,114 @@ class SystemdJournalFile(data_format.BinaryDataFile):
 
     return data_object
 
+  def _ReadDataObjectEntryOffsets(self, file_object, data_object):
+    """Reads the offsets of the entry objects that refer to a data object.
+
+    The offset of the first entry object is stored in the data object and
+    the offsets of the following entry objects in the chain of entry array
+    objects of the data object, in increasing order.
+
+    Args:
+      file_object (file): file-like object.
+      data_object (systemd_journal_data_object): data object.
+
+    Yields:
+      int: offset of an entry object relative to the start of the file-like
+          object.
+
+    Raises:
+      ParseError: if an entry array object cannot be read.
+    """
+    if not data_object.number_of_entries or not data_object.entry_offset:
+      return
+
+    yield data_object.entry_offset
+
+    number_of_entries = data_object.number_of_entries - 1
+    entry_array_offset = data_object.entry_array_offset
+
+    while entry_array_offset and number_of_entries > 0:
+      entry_array_object = self._ReadEntryArrayObject(
+          file_object, entry_array_offset)
+
+      for entry_object_offset in entry_array_object.entry_object_offsets[
+          :number_of_entries]:
+        if entry_object_offset == 0:
+          return
+
+        yield entry_object_offset
+        number_of_entries -= 1
+
+      entry_array_offset = entry_array_object.next_entry_array_offset
+
+  def _ReadEntries(self, file_object, entry_array_offset, entry_index):
+    """Reads the entries of a chain of entry array objects.
+
+    The entry array objects are read one at a time as the entries are
+    consumed.
+
+    Args:
+      file_object (file): file-like object.
+      entry_array_offset (int): offset of the first entry array object
+          relative to the start of the file-like object.
+      entry_index (int): index of the first entry to read in the first entry
+          array object.
+
+    Yields:
+      tuple[int, systemd_journal_entry_object]: offset of the entry object
+          relative to the start of the file-like object and entry object.
+
+    Raises:
+      ParseError: if an entry array object or entry object cannot be read or
+          the chain of entry array objects contains a loop.
+    """
+    entry_array_offsets = set()
+    while entry_array_offset:
+      if entry_array_offset in entry_array_offsets:
+        raise errors.ParseError(
+            'Loop in entry array chain at offset: 0x{0:08x}.'.format(
+                entry_array_offset))
+
+      entry_array_offsets.add(entry_array_offset)
+
+      entry_array_object = self._ReadEntryArrayObject(
+          file_object, entry_array_offset)
+
+      for entry_object_offset in (
+          entry_array_object.entry_object_offsets[entry_index:]):
+        if entry_object_offset == 0:
+          continue
+
+        entry_object = self._ReadEntryObject(file_object, entry_object_offset)
+
+        yield entry_object_offset, entry_object
+
+      entry_array_offset = entry_array_object.next_entry_array_offset
+      entry_index = 0
+
+  def _ReadEntryArrayItem(self, file_object, entry_array_offset, item_index):
+    """Reads an item of an entry array object.
+
+    Args:
+      file_object (file): file-like object.
+      entry_array_offset (int): offset of the entry array object relative to
+          the start of the file-like object.
+      item_index (int): index of the item.
+
+    Returns:
+      int: offset of the entry object or 0 if the item has no entry object.
+
+    Raises:
+      ParseError: if the item cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('uint64le')
+
+    entry_object_offset, _ = self._ReadStructureFromFileObject(
+        file_object, entry_array_offset + 24 + 8 * item_index, data_type_map,
+        'entry array item')
+
+    return entry_object_offset
+
   def _ReadEntryArrayObject(self, file_object, file_offset):
     """Reads an entry array object.
 
@@ -322,6 +1183,68 @@ class SystemdJournalFile(data_format.BinaryDataFile):
 
     return entry_object
 
+  def _ReadEntryObjectHeader(self, file_object, file_offset):
+    """Reads the header and values of an entry object without its items.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the entry object relative to the start
+          of the file-like object.
+
+    Returns:
+      systemd_journal_entry_object_header: entry object header and values.
+
+    Raises:
+      ParseError: if the entry object cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('systemd_journal_entry_object_header')
+
+    entry_object_header, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'entry object header')
+
+    if entry_object_header.object_type != self._OBJECT_TYPE_ENTRY:
+      raise errors.ParseError('Unsupported object type: {0:d}.'.format(
+          entry_object_header.object_type))
+
+    return entry_object_header
+
+  def _ReadFieldObject(self, file_object, file_offset):
+    """Reads a field object.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the field object relative to the start
+          of the file-like object.
+
+    Returns:
+      systemd_journal_field_object: field object.
+
+    Raises:
+      ParseError: if the field object cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('systemd_journal_field_object')
+
+    field_object, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'field object')
+
+    if self._debug:
+      self._DebugPrintStructureObject(
+          field_object, self._DEBUG_INFO_OBJECT_HEADER)
+
+    if field_object.object_type != self._OBJECT_TYPE_FIELD:
+      raise errors.ParseError('Unsupported object type: {0:d}.'.format(
+          field_object.object_type))
+
+    if field_object.object_flags != 0:
+      raise errors.ParseError('Unsupported object flags: 0x{0:02x}.'.format(
+          field_object.object_flags))
+
+    if self._debug:
+      self._DebugPrintStructureObject(
+          field_object, self._DEBUG_INFO_FIELD_OBJECT_VALUES)
+
+    return field_object
+
   def _ReadFileHeader(self, file_object):
     """Reads the file header.
 
@@ -378,31 +1301,553 @@ class SystemdJournalFile(data_format.BinaryDataFile):
 
     return object_header
 
-  def ReadFileObject(self, file_object):
-    """Reads a Windows Task Scheduler job file-like object.
+  def _SeekRealtime(self, file_object, entry_array_offset, real_time):
+    """Seeks the first entry with a real time of at least the real time.
+
+    Entries are appended to the chain of entry array objects, hence their
+    real times are in increasing order, unless the system clock was set
+    backwards. The first entry of each entry array object is probed to find
+    the entry array object that contains the entry, after which the entry is
+    searched for with a binary search over the items of the entry array
+    object. Since journald doubles the number of items of every following
+    entry array object, only the headers of O(log n) entry objects are read.
+
+    Args:
+      file_object (file): file-like object.
+      entry_array_offset (int): offset of the first entry array object
+          relative to the start of the file-like object.
+      real_time (int): real time, as a POSIX timestamp in microseconds.
+
+    Returns:
+      tuple[int, int]: offset of the entry array object and index of the entry
+          in the entry array, which is the number of items of the entry
+          array if the entry is stored in the next entry array object.
+
+    Raises:
+      ParseError: if an entry array object or entry object cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap(
+        'systemd_journal_entry_array_object_header')
+
+    entry_arrays = []
+    entry_array_offsets = set()
+    while entry_array_offset:
+      if entry_array_offset in entry_array_offsets:
+        raise errors.ParseError(
+            'Loop in entry array chain at offset: 0x{0:08x}.'.format(
+                entry_array_offset))
+
+      entry_array_offsets.add(entry_array_offset)
+
+      entry_array_object_header, _ = self._ReadStructureFromFileObject(
+          file_object, entry_array_offset, data_type_map,
+          'entry array object header')
+
+      if (entry_array_object_header.object_type !=
+          self._OBJECT_TYPE_ENTRY_ARRAY):
+        raise errors.ParseError('Unsupported object type: {0:d}.'.format(
+            entry_array_object_header.object_type))
+
+      number_of_items = (entry_array_object_header.data_size - 24) // 8
+      entry_arrays.append((entry_array_offset, number_of_items))
+
+      entry_array_offset = entry_array_object_header.next_entry_array_offset
+
+    if not entry_arrays:
+      return 0, 0
+
+    # Find the last entry array object of which the first entry has a real
+    # time before the real time.
+    lower_index = 0
+    upper_index = len(entry_arrays)
+    while lower_index < upper_index:
+      middle_index = (lower_index + upper_index) // 2
+
+      entry_object_offset = self._ReadEntryArrayItem(
+          file_object, entry_arrays[middle_index][0], 0)
+      if entry_object_offset and self._ReadEntryObjectHeader(
+          file_object, entry_object_offset).real_time < real_time:
+        lower_index = middle_index + 1
+      else:
+        upper_index = middle_index
+
+    if lower_index == 0:
+      return entry_arrays[0][0], 0
+
+    entry_array_offset, number_of_items = entry_arrays[lower_index - 1]
+
+    # The first entry of the entry array object has a real time before
+    # the real time. The items without an entry object are stored after
+    # the items with an entry object.
+    lower_index = 1
+    upper_index = number_of_items
+    while lower_index < upper_index:
+      middle_index = (lower_index + upper_index) // 2
+
+      entry_object_offset = self._ReadEntryArrayItem(
+          file_object, entry_array_offset, middle_index)
+      if entry_object_offset and self._ReadEntryObjectHeader(
+          file_object, entry_object_offset).real_time < real_time:
+        lower_index = middle_index + 1
+      else:
+        upper_index = middle_index
+
+    return entry_array_offset, lower_index
+
+  def _SetCheckpoint(self, file_offset, entry_object):
+    """Sets the checkpoint to an entry that was read completely.
+
+    Args:
+      file_offset (int): offset of the entry object relative to the start of
+          the file-like object.
+      entry_object (systemd_journal_entry_object): entry object.
+    """
+    self._checkpoint = data_format.Checkpoint(
+        file_identity=self._file_identity, offset=file_offset,
+        sequence_number=entry_object.sequence_number)
+
+  def _WriteEntryRecord(self, file_offset, entry_object, data_objects):
+    """Writes an entry as a structured record.
+
+    Args:
+      file_offset (int): offset of the entry object relative to the start of
+          the file-like object.
+      entry_object (systemd_journal_entry_object): entry object.
+      data_objects (list[systemd_journal_data_object]): data objects of
+          the entry.
+
+    Raises:
+      ParseError: if the payload of a data object cannot be decompressed.
+    """
+    data = []
+    for data_object in data_objects:
+      payload = self._GetDataObjectPayload(data_object)
+      data.append(payload.decode('utf-8', errors='backslashreplace'))
+
+    self._WriteRecord('systemd_journal_entry', {
+        'offset': file_offset,
+        'sequence_number': entry_object.sequence_number,
+        'real_time': entry_object.real_time,
+        'monotonic': entry_object.monotonic,
+        'boot_identifier': entry_object.boot_identifier,
+        'data': data})
+
+  def CarveRecord(self, file_object, file_offset):
+    """Carves an entry object from raw data, such as unallocated space.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the candidate entry object relative to
+          the start of the file-like object.
+
+    Returns:
+      int: size of the entry object.
+
+    Raises:
+      ParseError: if no valid entry object was found at the offset.
+    """
+    data_size = self._CheckCarvedEntryObject(file_object, file_offset)
+
+    entry_object = self._ReadEntryObject(file_object, file_offset)
+
+    for entry_item in entry_object.entry_items:
+      if not entry_item.object_offset or entry_item.object_offset % 8 != 0:
+        raise errors.ParseError('Invalid entry item object offset.')
+
+    self._WriteEntryRecord(file_offset, entry_object, [])
+
+    return data_size
+
+  def Close(self):
+    """Closes the systemd journal file."""
+    super(SystemdJournalFile, self).Close()
+    self._data_objects = collections.OrderedDict()
+    self._file_header = None
+
+  def FindEntries(self, field, value=None, fields=None):
+    """Finds the entries with a field.
+
+    Instead of reading every entry, the data or field object is looked up in
+    the data or field hash table and only the entries that refer to its data
+    objects are read, like "journalctl FIELD=value" does.
+
+    Args:
+      field (str): name of the field, such as "_SYSTEMD_UNIT".
+      value (Optional[str|bytes]): value of the field, such as
+          "cron.service", where None represents any value.
+      fields (Optional[list[str]]): names of the fields to read, such as
+          "MESSAGE", where None represents all fields. The journal export
+          fields of the entry object, such as "__REALTIME_TIMESTAMP", are
+          always read.
+
+    Yields:
+      dict[str, object]: values of the fields of an entry per name, in
+          the order the entries were added to the journal.
+
+    Raises:
+      IOError: if the file is not opened.
+      OSError: if the file is not opened.
+      ParseError: if an entry cannot be read.
+    """
+    if not self._file_object:
+      raise IOError('File not opened')
+
+    field_names = None
+    if fields is not None:
+      field_names = set(name.encode('utf-8') for name in fields)
+
+    field_name = field.encode('utf-8')
+
+    data_objects = []
+    if value is not None:
+      if isinstance(value, str):
+        value = value.encode('utf-8')
+
+      data_object = self._FindDataObject(
+          self._file_object, b'='.join([field_name, value]))
+      if data_object:
+        data_objects.append(data_object)
+
+    else:
+      field_object = self._FindFieldObject(self._file_object, field_name)
+
+      data_object_offset = 0
+      if field_object:
+        data_object_offset = field_object.head_data_offset
+
+      data_object_offsets = set()
+      while data_object_offset:
+        if data_object_offset in data_object_offsets:
+          raise errors.ParseError(
+              'Loop in field chain at offset: 0x{0:08x}.'.format(
+                  data_object_offset))
+
+        data_object_offsets.add(data_object_offset)
+
+        data_object = self._GetDataObject(self._file_object, data_object_offset)
+        data_objects.append(data_object)
+
+        data_object_offset = data_object.next_field_offset
+
+    # The entry object offsets of every data object are in increasing order
+    # and an entry object can refer to multiple data objects of a field.
+    last_entry_object_offset = None
+    for entry_object_offset in heapq.merge(*[
+        self._ReadDataObjectEntryOffsets(self._file_object, data_object)
+        for data_object in data_objects]):
+      if entry_object_offset == last_entry_object_offset:
+        continue
+
+      last_entry_object_offset = entry_object_offset
+
+      entry_object = self._ReadEntryObject(
+          self._file_object, entry_object_offset)
+
+      yield self._GetEntryFields(
+          self._file_object, entry_object, field_names=field_names)
+
+  def ReadEntries(self, fields=None, since=None, until=None):
+    """Reads the entries.
+
+    The entries are read from the start of the journal or, if the journal
+    was opened with a checkpoint, after the entry of the checkpoint or, if
+    SeekRealtime was called, from the entry that was sought.
+
+    Args:
+      fields (Optional[list[str]]): names of the fields to read, such as
+          "MESSAGE", where None represents all fields. The journal export
+          fields of the entry object, such as "__REALTIME_TIMESTAMP", are
+          always read.
+      since (Optional[int]): real time, as a POSIX timestamp in microseconds,
+          of the first entry to read, where the entries before it are skipped
+          with a binary search. None represents the entry to read next.
+      until (Optional[int]): real time, as a POSIX timestamp in microseconds,
+          at which reading stops, where the entries at or after it are not
+          read. None represents no limit.
+
+    Yields:
+      dict[str, object]: values of the fields of an entry per name.
+
+    Raises:
+      IOError: if the file is not opened.
+      OSError: if the file is not opened.
+      ParseError: if an entry cannot be read.
+    """
+    if not self._file_object:
+      raise IOError('File not opened')
+
+    field_names = None
+    if fields is not None:
+      field_names = set(field.encode('utf-8') for field in fields)
+
+    if since is not None:
+      entry_array_offset, entry_index = self._SeekRealtime(
+          self._file_object, self._file_header.entry_array_offset, since)
+    else:
+      entry_array_offset, entry_index = self._resume_entry_array
+
+    for entry_object_offset, entry_object in self._ReadEntries(
+        self._file_object, entry_array_offset, entry_index):
+      if until is not None and entry_object.real_time >= until:
+        break
+
+      entry_fields = self._GetEntryFields(
+          self._file_object, entry_object, field_names=field_names)
+
+      self._SetCheckpoint(entry_object_offset, entry_object)
+
+      yield entry_fields
+
+  def ReadFileObject(self, file_object, checkpoint=None):
+    """Reads a systemd journal file-like object.
+
+    The entries are only read when debug information or structured records
+    should be written, otherwise they can be read with ReadEntries.
+
+    Since entries are appended to a journal file that is in use, reading can
+    be resumed after the last entry read by a previous read, where
+    the sequence number of the checkpoint is the sequence number of the entry.
 
     Args:
       file_object (file): file-like object.
+      checkpoint (Optional[Checkpoint]): checkpoint to resume reading from,
+          where None represents the file should be read from the start. If
+          the file was replaced it is read from the start.
 
     Raises:
       ParseError: if the file cannot be read.
     """
+    self._data_objects = collections.OrderedDict()
+
     file_header = self._ReadFileHeader(file_object)
 
-    entry_array_object = self._ReadEntryArrayObject(
-        file_object, file_header.entry_array_offset)
+    self._file_header = file_header
+    self._file_identity = self._GetFileIdentity(
+        file_header.file_identifier + file_header.sequence_number_identifier)
 
-    entry_object_offsets = list(entry_array_object.entry_object_offsets)
-    while entry_array_object.next_entry_array_offset != 0:
-      entry_array_object = self._ReadEntryArrayObject(
-          file_object, entry_array_object.next_entry_array_offset)
-      entry_object_offsets.extend(entry_array_object.entry_object_offsets)
+    resume_entry_array = None
+    if checkpoint and checkpoint.file_identity == self._file_identity:
+      resume_entry_array = self._GetResumeEntryArray(
+          file_object, file_header.entry_array_offset, checkpoint)
+
+    if resume_entry_array:
+      self._checkpoint = checkpoint
+      self._resume_entry_array = resume_entry_array
+    else:
+      self._checkpoint = None
+      self._resume_entry_array = (file_header.entry_array_offset, 0)
+
+    if not self._debug and not self._record_output_writer:
+      return
+
+    entry_array_offset, entry_index = self._resume_entry_array
+
+    for entry_object_offset, entry_object in self._ReadEntries(
+        file_object, entry_array_offset, entry_index):
+      data_objects = [
+          self._GetDataObject(file_object, entry_item.object_offset)
+          for entry_item in entry_object.entry_items]
 
-    for entry_object_offset in entry_object_offsets:
-      if entry_object_offset == 0:
+      if self._record_output_writer:
+        self._WriteEntryRecord(entry_object_offset, entry_object, data_objects)
+
+      self._SetCheckpoint(entry_object_offset, entry_object)
+
+  def SeekRealtime(self, real_time):
+    """Seeks the first entry with a real time of at least the real time.
+
+    The following ReadEntries reads from the entry that was sought, like
+    "journalctl --since" does, where only the headers of the entry objects
+    probed by a binary search are read.
+
+    Args:
+      real_time (int): real time, as a POSIX timestamp in microseconds.
+
+    Raises:
+      IOError: if the file is not opened.
+      OSError: if the file is not opened.
+      ParseError: if an entry array object or entry object cannot be read.
+    """
+    if not self._file_object:
+      raise IOError('File not opened')
+
+    self._resume_entry_array = self._SeekRealtime(
+        self._file_object, self._file_header.entry_array_offset, real_time)
+
+
+class SystemdJournalDirectory(object):
+  """Systemd journal directory.
+
+  journald rotates a journal, such as "system.journal", into archived journal
+  files, such as "system@{sequence number identifier}-{sequence number}-
+  {real time}.journal", and writes the entries of users to separate journals,
+  such as "user-1000.journal". The entries of the journal files are merged
+  into a single stream ordered by real time, sequence number identifier and
+  sequence number, where only one entry per journal file is kept in memory.
+  """
+
+  _JOURNAL_FILE_EXTENSIONS = ('.journal', '.journal~')
+
+  def __init__(self, maximum_number_of_cached_data_objects=4096):
+    """Initializes a systemd journal directory.
+
+    Args:
+      maximum_number_of_cached_data_objects (Optional[int]): maximum number
+          of data objects in the cache of data objects per journal file.
+
+    Raises:
+      ValueError: if the maximum number of cached data objects is out of
+          bounds.
+    """
+    if maximum_number_of_cached_data_objects <= 0:
+      raise ValueError((
+          'Invalid maximum number of cached data objects: {0:d} value out of '
+          'bounds.').format(maximum_number_of_cached_data_objects))
+
+    super(SystemdJournalDirectory, self).__init__()
+    self._journal_file_paths = []
+    self._journal_files = []
+    self._maximum_number_of_cached_data_objects = (
+        maximum_number_of_cached_data_objects)
+    self._path = None
+
+  @property
+  def journal_file_paths(self):
+    """list[str]: paths of the opened journal files."""
+    return list(self._journal_file_paths)
+
+  def _GetJournalFileEntries(
+      self, file_index, journal_file, fields, since, until):
+    """Retrieves the entries of a journal file with their sort key.
+
+    Args:
+      file_index (int): index of the journal file.
+      journal_file (SystemdJournalFile): journal file.
+      fields (list[str]): names of the fields to read, where None represents
+          all fields.
+      since (int): real time of the first entry to read, where None represents
+          the first entry.
+      until (int): real time at which reading stops, where None represents
+          no limit.
+
+    Yields:
+      tuple[int, str, int, int, int, dict[str, object]]: real time, sequence
+          number identifier, sequence number, monotonic time, index of
+          the journal file and values of the fields of an entry per name.
+    """
+    for entry in journal_file.ReadEntries(
+        fields=fields, since=since, until=until):
+      yield (
+          entry['__REALTIME_TIMESTAMP'], entry['__SEQNUM_ID'],
+          entry['__SEQNUM'], entry['__MONOTONIC_TIMESTAMP'], file_index,
+          entry)
+
+  def Close(self):
+    """Closes the systemd journal directory.
+
+    Raises:
+      IOError: if the directory is not opened.
+      OSError: if the directory is not opened.
+    """
+    if self._path is None:
+      raise IOError('Directory not opened')
+
+    for journal_file in self._journal_files:
+      journal_file.Close()
+
+    self._journal_file_paths = []
+    self._journal_files = []
+    self._path = None
+
+  def Open(self, path):
+    """Opens a systemd journal directory.
+
+    Every journal file in the directory is opened, where journal files that
+    cannot be read, such as journal files that are corrupted, are skipped
+    like journalctl does.
+
+    Args:
+      path (str): path of the directory.
+
+    Raises:
+      IOError: if the directory is already opened or cannot be read.
+      OSError: if the directory is already opened or cannot be read.
+    """
+    if self._path is not None:
+      raise IOError('Directory already opened')
+
+    journal_file_paths = []
+    journal_files = []
+    for filename in sorted(os.listdir(path)):
+      if not filename.endswith(self._JOURNAL_FILE_EXTENSIONS):
+        continue
+
+      journal_file_path = os.path.join(path, filename)
+      if not os.path.isfile(journal_file_path):
+        continue
+
+      journal_file = SystemdJournalFile(
+          maximum_number_of_cached_data_objects=(
+              self._maximum_number_of_cached_data_objects))
+
+      try:
+        journal_file.Open(journal_file_path)
+      except (IOError, OSError, errors.ParseError) as exception:
+        logging.warning((
+            'Unable to open journal file: {0:s} with error: {1!s}').format(
+                journal_file_path, exception))
+        continue
+
+      journal_file_paths.append(journal_file_path)
+      journal_files.append(journal_file)
+
+    self._journal_file_paths = journal_file_paths
+    self._journal_files = journal_files
+    self._path = path
+
+  def ReadEntries(self, fields=None, since=None, until=None):
+    """Reads the entries of the journal files.
+
+    The entries of the journal files are read lazily and merged, where
+    an entry that is stored in multiple journal files, such as an entry of
+    a journal that was copied before it was rotated, is read once.
+
+    Args:
+      fields (Optional[list[str]]): names of the fields to read, such as
+          "MESSAGE", where None represents all fields. The journal export
+          fields of the entry object, such as "__REALTIME_TIMESTAMP", are
+          always read.
+      since (Optional[int]): real time, as a POSIX timestamp in microseconds,
+          of the first entry to read, where None represents the first entry.
+      until (Optional[int]): real time, as a POSIX timestamp in microseconds,
+          at which reading stops, where None represents no limit.
+
+    Yields:
+      dict[str, object]: values of the fields of an entry per name, ordered
+          by real time, sequence number identifier and sequence number.
+
+    Raises:
+      IOError: if the directory is not opened.
+      OSError: if the directory is not opened.
+      ParseError: if an entry cannot be read.
+    """
+    if self._path is None:
+      raise IOError('Directory not opened')
+
+    journal_file_entries = [
+        self._GetJournalFileEntries(
+            file_index, journal_file, fields, since, until)
+        for file_index, journal_file in enumerate(self._journal_files)]
+
+    # The entries of all journal files with the same real time, sequence
+    # number identifier, sequence number and monotonic time are merged
+    # consecutively, hence a duplicate follows the entry it duplicates.
+    last_entry_key = None
+    for entry_key_and_values in heapq.merge(*journal_file_entries):
+      entry_key = entry_key_and_values[:4]
+      if entry_key == last_entry_key:
         continue
 
-      entry_object = self._ReadEntryObject(file_object, entry_object_offset)
+      last_entry_key = entry_key
 
-      for entry_item in entry_object.entry_items:
-        self._ReadDataObject(file_object, entry_item.object_offset)
+      yield entry_key_and_values[-1]
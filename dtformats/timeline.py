@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+"""Timeline of the records of multiple data formats."""
+
+import heapq
+import pickle
+import queue
+import tempfile
+import threading
+
+from dtformats import batch
+from dtformats import errors
+from dtformats import output_writers
+
+
+# Number of microseconds between 1601-01-01 and 1970-01-01.
+_FILETIME_TO_POSIX_BASE = 11644473600 * 1000000
+
+# Functions that retrieve the timestamp of a record, in number of microseconds
+# since 1970-01-01 00:00:00 UTC, per record type.
+TIMESTAMP_FUNCTIONS = {
+    'asl_record': lambda values: (
+        values['written_time'] * 1000000 +
+        values['written_time_nanoseconds'] // 1000),
+    'bsm_event': lambda values: (
+        values['tokens'][0]['timestamp'] * 1000000 +
+        values['tokens'][0]['microseconds']),
+    'chrome_cache_entry': lambda values: (
+        values['creation_time'] - _FILETIME_TO_POSIX_BASE),
+    'linux_libc6_utmp_entry': lambda values: (
+        values['timestamp'] * 1000000 + values['microseconds']),
+    'macosx_utmpx_entry': lambda values: (
+        values['timestamp'] * 1000000 + values['microseconds']),
+    'systemd_journal_entry': lambda values: values['real_time'],
+    'usn_record': lambda values: (
+        values['timestamp'] // 10 - _FILETIME_TO_POSIX_BASE)}
+
+
+# Item that marks the end of the records on a queue.
+_END_OF_RECORDS = object()
+
+
+def GetTimestamp(record_type, values):
+  """Retrieves the timestamp of a record.
+
+  Args:
+    record_type (str): record type.
+    values (dict[str, object]): values of the record per name.
+
+  Returns:
+    int: number of microseconds since 1970-01-01 00:00:00 UTC or None if
+        the record type is not supported or the record has no timestamp.
+  """
+  timestamp_function = TIMESTAMP_FUNCTIONS.get(record_type, None)
+  if not timestamp_function:
+    return None
+
+  try:
+    return timestamp_function(values)
+  except (IndexError, KeyError, TypeError):
+    return None
+
+
+class _ReadCancelledError(Exception):
+  """Error raised in a worker thread to stop a cancelled read."""
+
+
+class _QueueOutputWriter(output_writers.RecordOutputWriter):
+  """Record output writer that passes records to a queue.
+
+  The output writer is used from a worker thread. Writing a record blocks
+  the worker thread while the queue is full, which bounds the number of
+  records that are read ahead of the timeline.
+  """
+
+  def __init__(self, maximum_queue_size):
+    """Initializes a queue output writer.
+
+    Args:
+      maximum_queue_size (int): maximum number of records that are queued.
+    """
+    super(_QueueOutputWriter, self).__init__()
+    self.cancelled = threading.Event()
+    self.queue = queue.Queue(maxsize=maximum_queue_size)
+
+  def _PutItem(self, item):
+    """Puts an item on the queue and waits until there is room for it.
+
+    Args:
+      item (object): item.
+
+    Raises:
+      _ReadCancelledError: if the read was cancelled.
+    """
+    while not self.cancelled.is_set():
+      try:
+        self.queue.put(item, timeout=0.1)
+        return
+      except queue.Full:
+        pass
+
+    raise _ReadCancelledError()
+
+  def Close(self):
+    """Closes the output writer object."""
+    return
+
+  def WriteEndOfRecords(self):
+    """Writes the end of the records to the queue.
+
+    Raises:
+      _ReadCancelledError: if the read was cancelled.
+    """
+    self._PutItem(_END_OF_RECORDS)
+
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+
+    Raises:
+      _ReadCancelledError: if the read was cancelled.
+    """
+    self._PutItem((record_type, values))
+
+
+def GetRecords(read_function, maximum_queue_size=1024):
+  """Retrieves the records written by a data format as they are read.
+
+  The read function is run in a worker thread with an output writer that
+  passes the records to the caller, so that the records do not have to be
+  read in memory first.
+
+  Example:
+    def _ReadDirectory(output_writer):
+      parser = chrome_cache.ChromeCacheParser(output_writer=output_writer)
+      parser.ParseDirectory(path)
+
+    for record_type, values in GetRecords(_ReadDirectory):
+      ...
+
+  Args:
+    read_function (function): function that reads the records, which is
+        passed the record output writer to write the records to.
+    maximum_queue_size (Optional[int]): maximum number of records that are
+        read ahead before the read function waits for the records to be
+        consumed.
+
+  Yields:
+    tuple[str, dict[str, object]]: record type and values of a record.
+
+  Raises:
+    ValueError: if the maximum queue size is not supported.
+  """
+  if maximum_queue_size < 1:
+    raise ValueError('Unsupported maximum queue size: {0:d}'.format(
+        maximum_queue_size))
+
+  output_writer = _QueueOutputWriter(maximum_queue_size)
+  exceptions = []
+
+  def _Read():
+    """Reads the records in the worker thread."""
+    try:
+      read_function(output_writer)
+
+    except _ReadCancelledError:
+      pass
+
+    except Exception as exception:  # pylint: disable=broad-except
+      exceptions.append(exception)
+
+    finally:
+      try:
+        output_writer.WriteEndOfRecords()
+      except _ReadCancelledError:
+        pass
+
+  thread = threading.Thread(target=_Read)
+  thread.daemon = True
+  thread.start()
+
+  try:
+    while True:
+      record = output_writer.queue.get()
+      if record is _END_OF_RECORDS:
+        break
+
+      yield record
+
+  finally:
+    # Stop the worker thread on its next record if the records are no longer
+    # consumed.
+    output_writer.cancelled.set()
+    thread.join()
+
+  if exceptions:
+    raise exceptions[0]
+
+
+def GetFileRecords(
+    path, format_class=None, maximum_queue_size=1024, read_method_name=None):
+  """Retrieves the records of a file as they are read.
+
+  Args:
+    path (str): path of the file.
+    format_class (Optional[type]): data format class, where None represents
+        the format should be detected by signature or filename.
+    maximum_queue_size (Optional[int]): maximum number of records that are
+        read ahead before the data format waits for the records to be
+        consumed.
+    read_method_name (Optional[str]): name of a method of the data format that
+        reads the records after the file has been opened, such as
+        "ReadRecords", where None represents the records are read when
+        the file is opened.
+
+  Returns:
+    Generator[tuple[str, dict[str, object]]]: record types and values of
+        the records.
+
+  Raises:
+    ParseError: if the format is not supported.
+  """
+  if not format_class:
+    format_class = batch.GetFormatClass(path)
+
+  if not format_class:
+    raise errors.ParseError('Unsupported format.')
+
+  def _ReadFile(output_writer):
+    """Reads the file in the worker thread.
+
+    Args:
+      output_writer (RecordOutputWriter): output writer.
+    """
+    parser_object = format_class(output_writer=output_writer)
+    parser_object.Open(path)
+
+    try:
+      if read_method_name:
+        read_method = getattr(parser_object, read_method_name)
+        for _ in read_method():
+          pass
+
+    finally:
+      parser_object.Close()
+
+  return GetRecords(_ReadFile, maximum_queue_size=maximum_queue_size)
+
+
+class _TimelineSource(object):
+  """Source of the records of a timeline.
+
+  Attributes:
+    get_timestamp (function): function that retrieves the timestamp of
+        a record.
+    name (str): name of the source.
+    ordered (bool): True if the records are ordered by timestamp.
+    records (Iterable[tuple[str, dict[str, object]]]): record types and
+        values of the records.
+  """
+
+  def __init__(self, name, records, get_timestamp, ordered):
+    """Initializes a timeline source.
+
+    Args:
+      name (str): name of the source.
+      records (Iterable[tuple[str, dict[str, object]]]): record types and
+          values of the records.
+      get_timestamp (function): function that retrieves the timestamp of
+          a record.
+      ordered (bool): True if the records are ordered by timestamp.
+    """
+    super(_TimelineSource, self).__init__()
+    self.get_timestamp = get_timestamp
+    self.name = name
+    self.ordered = ordered
+    self.records = records
+
+
+class Timeline(object):
+  """Timeline of the records of multiple sources.
+
+  The records of the sources are merged by timestamp with a k-way merge,
+  which only keeps the next record of every source in memory. The records
+  of a source that is not ordered by timestamp are sorted in chunks first,
+  where the sorted chunks are stored in temporary files and merged, so that
+  a source does not have to fit in memory.
+
+  Records with the same timestamp are ordered by the order in which their
+  sources were added and by their order within the source. Records without
+  a timestamp are not part of the timeline.
+
+  Example:
+    timeline = Timeline()
+    timeline.AddSource('wtmp', GetFileRecords('/var/log/wtmp'), ordered=True)
+    timeline.AddSource('$J', GetFileRecords(
+        '$J', format_class=usn_journal.USNRecords,
+        read_method_name='ReadRecords'))
+
+    timeline.WriteRecords(output_writer)
+  """
+
+  def __init__(self, chunk_size=65536, temporary_directory=None):
+    """Initializes a timeline.
+
+    Args:
+      chunk_size (Optional[int]): maximum number of records of a source that
+          is not ordered, which are sorted in memory.
+      temporary_directory (Optional[str]): path of the directory to store
+          the sorted chunks in, where None represents the default temporary
+          directory.
+
+    Raises:
+      ValueError: if the chunk size is not supported.
+    """
+    if chunk_size < 1:
+      raise ValueError('Unsupported chunk size: {0:d}'.format(chunk_size))
+
+    super(Timeline, self).__init__()
+    self._chunk_size = chunk_size
+    self._sources = []
+    self._temporary_directory = temporary_directory
+
+  def _GetOrderedRecords(self, source_index, source):
+    """Retrieves the records of a source ordered by timestamp.
+
+    Args:
+      source_index (int): index of the source.
+      source (_TimelineSource): source.
+
+    Yields:
+      tuple[int, int, int, str, dict[str, object]]: timestamp, index of
+          the source, index of the record within the source, record type and
+          values of a record.
+    """
+    records = self._GetTimestampedRecords(source_index, source)
+    if source.ordered:
+      for record in records:
+        yield record
+
+      return
+
+    chunk = []
+    sorted_chunk_files = []
+
+    try:
+      for record in records:
+        chunk.append(record)
+        if len(chunk) >= self._chunk_size:
+          chunk.sort()
+          sorted_chunk_files.append(self._WriteSortedChunk(chunk))
+          chunk = []
+
+      chunk.sort()
+
+      sorted_chunks = [
+          self._ReadSortedChunk(file_object)
+          for file_object in sorted_chunk_files]
+      sorted_chunks.append(chunk)
+
+      for record in heapq.merge(*sorted_chunks):
+        yield record
+
+    finally:
+      for file_object in sorted_chunk_files:
+        file_object.close()
+
+  def _GetTimestampedRecords(self, source_index, source):
+    """Retrieves the records of a source that have a timestamp.
+
+    Args:
+      source_index (int): index of the source.
+      source (_TimelineSource): source.
+
+    Yields:
+      tuple[int, int, int, str, dict[str, object]]: timestamp, index of
+          the source, index of the record within the source, record type and
+          values of a record.
+    """
+    for record_index, (record_type, values) in enumerate(source.records):
+      timestamp = source.get_timestamp(record_type, values)
+      if timestamp is not None:
+        yield timestamp, source_index, record_index, record_type, values
+
+  def _ReadSortedChunk(self, file_object):
+    """Reads a sorted chunk of records from a temporary file.
+
+    Args:
+      file_object (file): file-like object of the temporary file.
+
+    Yields:
+      tuple[int, int, int, str, dict[str, object]]: timestamp, index of
+          the source, index of the record within the source, record type and
+          values of a record.
+    """
+    file_object.seek(0)
+
+    unpickler = pickle.Unpickler(file_object)
+    while True:
+      try:
+        record = unpickler.load()
+      except EOFError:
+        break
+
+      yield record
+
+  def _WriteSortedChunk(self, chunk):
+    """Writes a sorted chunk of records to a temporary file.
+
+    Args:
+      chunk (list[tuple[int, int, int, str, dict[str, object]]]): sorted
+          chunk of records.
+
+    Returns:
+      file: file-like object of the temporary file, which is removed when
+          closed.
+    """
+    file_object = tempfile.TemporaryFile(dir=self._temporary_directory)
+
+    pickler = pickle.Pickler(file_object, protocol=pickle.HIGHEST_PROTOCOL)
+    for record in chunk:
+      pickler.dump(record)
+      # Clear the memo, since the records do not share objects.
+      pickler.clear_memo()
+
+    return file_object
+
+  def AddSource(self, name, records, get_timestamp=None, ordered=False):
+    """Adds a source of records.
+
+    Args:
+      name (str): name of the source.
+      records (Iterable[tuple[str, dict[str, object]]]): record types and
+          values of the records, such as returned by GetFileRecords.
+      get_timestamp (Optional[function]): function that retrieves
+          the timestamp of a record, from the record type and values, where
+          None represents GetTimestamp. The timestamps of the sources must
+          be comparable.
+      ordered (Optional[bool]): True if the records are ordered by timestamp,
+          which means they are not sorted.
+    """
+    source = _TimelineSource(
+        name, records, get_timestamp or GetTimestamp, ordered)
+    self._sources.append(source)
+
+  def GetRecords(self):
+    """Retrieves the records of the timeline.
+
+    The values of the records of a source that is not ordered by timestamp
+    must be picklable, when the source has more records than the chunk size.
+
+    Yields:
+      tuple[int, str, str, dict[str, object]]: timestamp, name of the source,
+          record type and values of a record.
+    """
+    ordered_records = [
+        self._GetOrderedRecords(source_index, source)
+        for source_index, source in enumerate(self._sources)]
+
+    for timestamp, source_index, _, record_type, values in heapq.merge(
+        *ordered_records):
+      yield timestamp, self._sources[source_index].name, record_type, values
+
+  def WriteRecords(self, output_writer):
+    """Writes the records of the timeline to a record output writer.
+
+    The timestamp and the name of the source are stored in the values of
+    a record as "timeline_timestamp" and "timeline_source".
+
+    Args:
+      output_writer (RecordOutputWriter): output writer.
+
+    Returns:
+      int: number of records written.
+    """
+    number_of_records = 0
+    for timestamp, source_name, record_type, values in self.GetRecords():
+      timeline_values = {
+          'timeline_timestamp': timestamp,
+          'timeline_source': source_name}
+      timeline_values.update(values)
+
+      output_writer.WriteRecord(record_type, timeline_values)
+      number_of_records += 1
+
+    return number_of_records
@@ -16,12 +16,14 @@ class TimeZoneInformationFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('tzif.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('tzif.yaml')
 
   # TODO: move path into structure.
 
   _FILE_SIGNATURE = b'TZif'
 
+  SIGNATURES = [(0, _FILE_SIGNATURE)]
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a timezone information file.
 
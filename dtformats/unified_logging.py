@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 """Apple Unified Logging and Activity Tracing files."""
 
-import lz4.block
-
 from dtformats import data_format
 from dtformats import errors
 
@@ -57,8 +55,9 @@ class DSCFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
-      'unified_logging.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('unified_logging.yaml')
+
+  SIGNATURES = [(0, b'hcsd')]
 
   _DEBUG_INFO_FILE_HEADER = [
       ('signature', 'Signature', '_FormatStreamAsSignature'),
@@ -294,8 +293,9 @@ class TraceV3File(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
-      'unified_logging.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('unified_logging.yaml')
+
+  SIGNATURES = [(0, b'\x00\x10\x00\x00')]
 
   _CHUNK_TAG_FIREHOSE = 0x00006001
 
@@ -477,6 +477,8 @@ class TraceV3File(data_format.BinaryDataFile):
     end_of_compressed_data_offset = 12 + lz4_block_header.compressed_data_size
 
     if lz4_block_header.signature == b'bv41':
+      import lz4.block  # pylint: disable=import-outside-toplevel
+
       uncompressed_data = lz4.block.decompress(
           chunk_data[12:end_of_compressed_data_offset],
           uncompressed_size=lz4_block_header.uncompressed_data_size)
@@ -620,8 +622,9 @@ class UUIDTextFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
-      'unified_logging.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('unified_logging.yaml')
+
+  SIGNATURES = [(0, b'\x99\x88\x77\x66')]
 
   _DEBUG_INFO_FILE_FOOTER = [
       ('library_path', 'Library path', '_FormatString')]
@@ -4,6 +4,7 @@
 import os
 
 from dtformats import data_format
+from dtformats import errors
 
 
 class USNRecords(data_format.BinaryDataFile):
@@ -11,7 +12,9 @@ class USNRecords(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('usn_journal.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('usn_journal.yaml')
+
+  SUPPORTS_CHECKPOINTS = True
 
   _DEBUG_INFO_RECORD_V2 = [
       ('size', 'Size', '_FormatIntegerAsDecimal'),
@@ -33,8 +36,66 @@ class USNRecords(data_format.BinaryDataFile):
       ('name_offset', 'Name offset', '_FormatIntegerAsDecimal'),
       ('name', 'Name', '_FormatString')]
 
+  _BLOCK_SIZE = 4096
+
   _EMPTY_USN_RECORD_HEADER = bytes([0] * 60)
 
+  def __init__(self, debug=False, output_writer=None):
+    """Initializes USN change journal records.
+
+    Args:
+      debug (Optional[bool]): True if debug information should be written.
+      output_writer (Optional[OutputWriter]): output writer.
+    """
+    super(USNRecords, self).__init__(debug=debug, output_writer=output_writer)
+    self._last_record = None
+    self._resume_checkpoint = None
+
+  def _GetRecordIdentity(self, usn_record):
+    """Retrieves the identity of a record.
+
+    Args:
+      usn_record (usn_record_v2): USN record.
+
+    Returns:
+      str: record identity.
+    """
+    identity_string = '{0:d}:{1:d}:{2:d}:{3:d}:{4:s}'.format(
+        usn_record.file_reference, usn_record.parent_file_reference,
+        usn_record.sequence_number, usn_record.timestamp, usn_record.name)
+
+    return self._GetFileIdentity(identity_string.encode('utf-8'))
+
+  def _GetResumeOffset(self, checkpoint):
+    """Retrieves the offset to resume reading records from a checkpoint.
+
+    Args:
+      checkpoint (Checkpoint): checkpoint.
+
+    Returns:
+      int: offset of the first record to read or None if reading cannot be
+          resumed from the checkpoint.
+    """
+    if checkpoint.offset < 0 or checkpoint.offset >= self._file_size:
+      return None
+
+    data_type_map = self._GetDataTypeMap('usn_record_v2')
+
+    try:
+      usn_record, data_size = self._ReadStructureFromFileObject(
+          self._file_object, checkpoint.offset, data_type_map,
+          'USN record (version 2)')
+    except errors.ParseError:
+      return None
+
+    if usn_record.sequence_number != checkpoint.sequence_number:
+      return None
+
+    if self._GetRecordIdentity(usn_record) != checkpoint.file_identity:
+      return None
+
+    return checkpoint.offset + data_size
+
   def _ReadRecordV2(self, file_object):
     """Reads a version 2 USN record.
 
@@ -58,33 +119,76 @@ class USNRecords(data_format.BinaryDataFile):
 
     return usn_record, data_size
 
-  def ReadFileObject(self, file_object):
+  def GetCheckpoint(self):
+    """Retrieves a checkpoint to resume reading after the last record read.
+
+    Since the start of a USN change journal is deallocated over time, the file
+    identity of the checkpoint is the hash of the last record read and its
+    sequence number is the update sequence number (USN) of the record.
+
+    Returns:
+      Checkpoint: checkpoint or None if no record was read.
+    """
+    if not self._last_record:
+      return self._checkpoint
+
+    file_offset, usn_record = self._last_record
+
+    return data_format.Checkpoint(
+        file_identity=self._GetRecordIdentity(usn_record), offset=file_offset,
+        sequence_number=usn_record.sequence_number)
+
+  def ReadFileObject(self, file_object, checkpoint=None):
     """Reads a file-like object containing USN change journal records.
 
     Args:
       file_object (file): file-like object.
+      checkpoint (Optional[Checkpoint]): checkpoint to resume reading records
+          from, where None represents the records should be read from
+          the start.
 
     Raises:
       ParseError: if the file cannot be read.
     """
     self._file_object = file_object
+    self._resume_checkpoint = checkpoint
 
-  def ReadRecords(self):
+  def ReadRecords(self, checkpoint=None):
     """Reads USN change journal records.
 
+    Args:
+      checkpoint (Optional[Checkpoint]): checkpoint to resume reading records
+          from, where None represents the checkpoint passed to ReadFileObject,
+          if any. If the journal was replaced the records are read from
+          the start.
+
     Yields:
       usn_record_v2: USN record.
 
     Raises:
       ParseError: if a record cannot be read.
     """
-    self._file_object.seek(0, os.SEEK_SET)
+    if not checkpoint:
+      checkpoint = self._resume_checkpoint
+
+    file_offset = None
+    if checkpoint:
+      file_offset = self._GetResumeOffset(checkpoint)
+
+    if file_offset is None:
+      self._checkpoint = None
+      file_offset = 0
+    else:
+      self._checkpoint = checkpoint
+
+    self._last_record = None
 
-    file_offset = 0
     while file_offset < self._file_size:
-      block_size = 4096
-      if block_size > self._file_size:
-        block_size = self._file_size
+      block_size = self._BLOCK_SIZE - (file_offset % self._BLOCK_SIZE)
+      if block_size > self._file_size - file_offset:
+        block_size = self._file_size - file_offset
+
+      self._file_object.seek(file_offset, os.SEEK_SET)
 
       while block_size > 60:
         usn_record_header = self._file_object.read(60)
@@ -93,6 +197,19 @@ class USNRecords(data_format.BinaryDataFile):
 
         self._file_object.seek(-60, os.SEEK_CUR)
         usn_record, data_size = self._ReadRecordV2(self._file_object)
+
+        self._WriteRecord('usn_record', {
+            'file_attribute_flags': usn_record.file_attribute_flags,
+            'file_reference': usn_record.file_reference,
+            'name': usn_record.name,
+            'offset': file_offset,
+            'parent_file_reference': usn_record.parent_file_reference,
+            'timestamp': usn_record.timestamp,
+            'update_reason_flags': usn_record.update_reason_flags,
+            'update_sequence_number': usn_record.sequence_number,
+            'update_source_flags': usn_record.update_source_flags})
+
+        self._last_record = (file_offset, usn_record)
         yield usn_record
 
         file_offset += data_size
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Utmp files."""
 
+import re
+
 from dtformats import data_format
 from dtformats import errors
 
@@ -10,10 +12,24 @@ class LinuxLibc6UtmpFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('utmp.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('utmp.yaml')
+
+  # Entries are carved by a type of login other than EMPTY and ACCOUNTING,
+  # followed by a PID and a terminal, terminal identifier and username that
+  # consist of printable ASCII characters or NUL-byte padding. The pattern
+  # starts with the upper bytes of the type, which are searched for fastest.
+  CARVING_OFFSET = 1
+
+  CARVING_PATTERN = re.compile((
+      rb'\x00\x00\x00(?<=[\x01-\x08]\x00\x00\x00).{4}[\x00\x20-\x7e]{32}.{4}'
+      rb'[\x00\x20-\x7e]{32}'), re.DOTALL)
+
+  SUPPORTS_CHECKPOINTS = True
 
   _EMPTY_IP_ADDRESS = (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
+  _ENTRY_SIZE = 384
+
   _TYPES_OF_LOGIN = {
       0: 'EMPTY',
       1: 'RUN_LVL',
@@ -94,31 +110,171 @@ class LinuxLibc6UtmpFile(data_format.BinaryDataFile):
 
     return string.rstrip('\x00')
 
-  def _ReadEntries(self, file_object):
+  def _GetResumeOffset(self, checkpoint, file_identity):
+    """Retrieves the offset to resume reading entries from a checkpoint.
+
+    Args:
+      checkpoint (Checkpoint): checkpoint.
+      file_identity (str): identity of the file.
+
+    Returns:
+      int: offset of the first entry to read or None if reading cannot be
+          resumed from the checkpoint.
+    """
+    if checkpoint.file_identity != file_identity or checkpoint.offset < 0:
+      return None
+
+    if checkpoint.offset % self._ENTRY_SIZE != 0:
+      return None
+
+    file_offset = checkpoint.offset + self._ENTRY_SIZE
+    if file_offset > self._file_size:
+      return None
+
+    return file_offset
+
+  def _IsPaddedString(self, byte_stream):
+    """Determines if a string is padded with NUL-bytes.
+
+    Args:
+      byte_stream (bytes): byte stream that contains the string.
+
+    Returns:
+      bool: True if all the bytes after the first NUL-byte are NUL-bytes.
+    """
+    _, _, padding = bytes(byte_stream).partition(b'\x00')
+    return not padding.strip(b'\x00')
+
+  def _ReadEntries(
+      self, file_object, file_offset, number_of_entries, file_identity):
     """Reads entries.
 
     Args:
       file_object (file): file-like object.
+      file_offset (int): offset of the first entry to read.
+      number_of_entries (int): number of entries read before the first entry.
+      file_identity (str): identity of the file.
     """
-    file_offset = 0
     data_type_map = self._GetDataTypeMap('linux_libc6_utmp_entry')
 
-    while file_offset < self._file_size:
-      entry, entry_data_size = self._ReadStructureFromFileObject(
-          file_object, file_offset, data_type_map, 'entry')
+    last_entry_offset = None
+    try:
+      for entry, entry_offset in self._ReadStructuresFromFileObject(
+          file_object, file_offset, self._file_size - file_offset,
+          data_type_map, 'entry'):
+        if self._debug:
+          self._DebugPrintEntry(entry)
 
-      if self._debug:
-        self._DebugPrintEntry(entry)
+        if self._record_output_writer:
+          self._WriteEntryRecord(entry_offset, entry)
 
-      file_offset += entry_data_size
+        last_entry_offset = entry_offset
+        number_of_entries += 1
 
-  def ReadFileObject(self, file_object):
+    finally:
+      # The checkpoint is set to the last entry that was read completely.
+      if last_entry_offset is not None:
+        self._checkpoint = data_format.Checkpoint(
+            file_identity=file_identity, offset=last_entry_offset,
+            sequence_number=number_of_entries)
+
+  def _ReadFileIdentity(self, file_object):
+    """Reads the identity of the file, which is the hash of the first entry.
+
+    Args:
+      file_object (file): file-like object.
+
+    Returns:
+      str: file identity or None if the file does not contain an entry.
+    """
+    if self._file_size < self._ENTRY_SIZE:
+      return None
+
+    data = self._ReadData(file_object, 0, self._ENTRY_SIZE, 'first entry')
+    return self._GetFileIdentity(data)
+
+  def _WriteEntryRecord(self, entry_offset, entry):
+    """Writes an entry as a structured record.
+
+    Args:
+      entry_offset (int): offset of the entry relative to the start of
+          the file-like object.
+      entry (linux_libc6_utmp_entry): entry.
+    """
+    self._WriteRecord('linux_libc6_utmp_entry', {
+        'hostname': self._DecodeString(entry.hostname),
+        'ip_address': bytes(entry.ip_address),
+        'microseconds': entry.microseconds,
+        'offset': entry_offset,
+        'pid': entry.pid,
+        'session': entry.session,
+        'terminal': self._DecodeString(entry.terminal),
+        'terminal_identifier': entry.terminal_identifier,
+        'timestamp': entry.timestamp,
+        'type': entry.type,
+        'username': self._DecodeString(entry.username)})
+
+  def CarveRecord(self, file_object, file_offset):
+    """Carves an entry from raw data, such as unallocated space.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the candidate entry relative to the start
+          of the file-like object.
+
+    Returns:
+      int: size of the entry.
+
+    Raises:
+      ParseError: if no valid entry was found at the offset.
+    """
+    data_type_map = self._GetDataTypeMap('linux_libc6_utmp_entry')
+
+    entry, entry_size = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'entry')
+
+    if entry.type not in range(1, 9):
+      raise errors.ParseError('Unsupported type of login: {0:d}.'.format(
+          entry.type))
+
+    if entry.timestamp <= 0 or not 0 <= entry.microseconds < 1000000:
+      raise errors.ParseError('Invalid timestamp.')
+
+    for byte_stream in (entry.terminal, entry.username, entry.hostname):
+      if not self._IsPaddedString(byte_stream):
+        raise errors.ParseError('Invalid string padding.')
+
+    if self._record_output_writer:
+      self._WriteEntryRecord(file_offset, entry)
+
+    return entry_size
+
+  def ReadFileObject(self, file_object, checkpoint=None):
     """Reads an utmp file-like object.
 
+    Since wtmp and btmp files are appended to, reading can be resumed after
+    the last entry read by a previous read. Note that the entries of an utmp
+    file are overwritten, which is not detected when resuming.
+
     Args:
       file_object (file): file-like object.
+      checkpoint (Optional[Checkpoint]): checkpoint to resume reading from,
+          where None represents the file should be read from the start. If
+          the file was replaced it is read from the start.
     """
-    self._ReadEntries(file_object)
+    file_identity = self._ReadFileIdentity(file_object)
+
+    file_offset = None
+    if checkpoint:
+      file_offset = self._GetResumeOffset(checkpoint, file_identity)
+
+    if file_offset is None:
+      self._checkpoint = None
+      self._ReadEntries(file_object, 0, 0, file_identity)
+    else:
+      self._checkpoint = checkpoint
+      self._ReadEntries(
+          file_object, file_offset, checkpoint.sequence_number, file_identity)
 
     # TODO: print trailing data
 
@@ -128,7 +284,9 @@ class MacOSXUtmpxFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('utmp.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('utmp.yaml')
+
+  SIGNATURES = [(0, b'utmpx-1.00\x00')]
 
   _TYPES_OF_LOGIN = {
       0: 'EMPTY',
@@ -225,14 +383,23 @@ class MacOSXUtmpxFile(data_format.BinaryDataFile):
 
     file_offset += entry_data_size
 
-    while file_offset < self._file_size:
-      entry, entry_data_size = self._ReadStructureFromFileObject(
-          file_object, file_offset, data_type_map, 'entry')
-
+    for entry, entry_offset in self._ReadStructuresFromFileObject(
+        file_object, file_offset, self._file_size - file_offset, data_type_map,
+        'entry'):
       if self._debug:
         self._DebugPrintEntry(entry)
 
-      file_offset += entry_data_size
+      if self._record_output_writer:
+        self._WriteRecord('macosx_utmpx_entry', {
+            'hostname': self._DecodeString(entry.hostname),
+            'microseconds': entry.microseconds,
+            'offset': entry_offset,
+            'pid': entry.pid,
+            'terminal': self._DecodeString(entry.terminal),
+            'terminal_identifier': entry.terminal_identifier,
+            'timestamp': entry.timestamp,
+            'type': entry.type,
+            'username': self._DecodeString(entry.username)})
 
   def ReadFileObject(self, file_object):
     """Reads an utmp file-like object.
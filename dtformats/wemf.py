@@ -42,26 +42,16 @@ class EMFFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('emf.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('emf.yaml')
 
-  _RECORD_TYPE = _FABRIC.CreateDataTypeMap('emf_record_type')
-
-  _FILE_HEADER = _FABRIC.CreateDataTypeMap('emf_file_header')
-
-  _FILE_HEADER_SIZE = _FILE_HEADER.GetByteSize()
-
-  _RECORD_HEADER = _FABRIC.CreateDataTypeMap('emf_record_header')
-
-  _RECORD_HEADER_SIZE = _RECORD_HEADER.GetByteSize()
+  SIGNATURES = [(40, b' EMF')]
 
   _EMF_SIGNATURE = b'FME\x20'
 
   # Here None represents that the record has no additional data.
   _EMF_RECORD_DATA_STRUCT_TYPES = {
-      0x0018: _FABRIC.CreateDataTypeMap('emf_settextcolor'),
-      0x0025: _FABRIC.CreateDataTypeMap('emf_selectobject')}
-
-  _EMF_STOCK_OBJECT = _FABRIC.CreateDataTypeMap('emf_stock_object')
+      0x0018: 'emf_settextcolor',
+      0x0025: 'emf_selectobject'}
 
   def _DebugPrintFileHeader(self, file_header):
     """Prints file header debug information.
@@ -69,7 +59,8 @@ class EMFFile(data_format.BinaryDataFile):
     Args:
       file_header (emf_file_header): file header.
     """
-    record_type_string = self._RECORD_TYPE.GetName(file_header.record_type)
+    data_type_map = self._GetDataTypeMap('emf_record_type')
+    record_type_string = data_type_map.GetName(file_header.record_type)
     value_string = '0x{0:04x} ({1:s})'.format(
         file_header.record_type, record_type_string or 'UNKNOWN')
     self._DebugPrintValue('Record type', value_string)
@@ -109,7 +100,8 @@ class EMFFile(data_format.BinaryDataFile):
     Args:
       record_header (emf_record_header): record header.
     """
-    record_type_string = self._RECORD_TYPE.GetName(record_header.record_type)
+    data_type_map = self._GetDataTypeMap('emf_record_type')
+    record_type_string = data_type_map.GetName(record_header.record_type)
     value_string = '0x{0:04x} ({1:s})'.format(
         record_header.record_type, record_type_string or 'UNKNOWN')
     self._DebugPrintValue('Record type', value_string)
@@ -129,9 +121,10 @@ class EMFFile(data_format.BinaryDataFile):
       ParseError: if the file header cannot be read.
     """
     file_offset = file_object.tell()
-    file_header = self._ReadStructure(
-        file_object, file_offset, self._FILE_HEADER_SIZE, self._FILE_HEADER,
-        'file header')
+    data_type_map = self._GetDataTypeMap('emf_file_header')
+
+    file_header, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'file header')
 
     if self._debug:
       self._DebugPrintFileHeader(file_header)
@@ -154,15 +147,16 @@ class EMFFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the record cannot be read.
     """
-    record_header = self._ReadStructure(
-        file_object, file_offset, self._RECORD_HEADER_SIZE, self._RECORD_HEADER,
-        'record header')
+    data_type_map = self._GetDataTypeMap('emf_record_header')
+
+    record_header, record_header_size = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'record header')
 
     if self._debug:
       self._DebugPrintRecordHeader(record_header)
 
-    data_offset = file_offset + self._RECORD_HEADER_SIZE
-    data_size = record_header.record_size - self._RECORD_HEADER_SIZE
+    data_offset = file_offset + record_header_size
+    data_size = record_header.record_size - record_header_size
 
     if self._debug:
       self._ReadRecordData(
@@ -189,10 +183,13 @@ class EMFFile(data_format.BinaryDataFile):
       self._DebugPrintData('Record data', record_data)
 
     # TODO: use lookup dict with callback.
-    data_type_map = self._EMF_RECORD_DATA_STRUCT_TYPES.get(record_type, None)
-    if not data_type_map:
+    data_type_map_name = self._EMF_RECORD_DATA_STRUCT_TYPES.get(
+        record_type, None)
+    if not data_type_map_name:
       return
 
+    data_type_map = self._GetDataTypeMap(data_type_map_name)
+
     try:
       record = data_type_map.MapByteStream(record_data)
     except dtfabric_errors.MappingError as exception:
@@ -205,8 +202,8 @@ class EMFFile(data_format.BinaryDataFile):
         self._DebugPrintValue('Color', value_string)
 
       elif record_type == 0x0025:
-        stock_object_string = self._EMF_STOCK_OBJECT.GetName(
-            record.object_identifier)
+        data_type_map = self._GetDataTypeMap('emf_stock_object')
+        stock_object_string = data_type_map.GetName(record.object_identifier)
 
         if stock_object_string:
           value_string = '0x{0:08x} ({1:s})'.format(
@@ -241,7 +238,12 @@ class WMFFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('wmf.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('wmf.yaml')
+
+  SIGNATURES = [
+      (0, b'\xd7\xcd\xc6\x9a'),
+      (0, b'\x01\x00\x09\x00'),
+      (0, b'\x02\x00\x09\x00')]
 
   # https://msdn.microsoft.com/en-us/library/cc250370.aspx
 
@@ -303,26 +305,8 @@ class WMFFile(data_format.BinaryDataFile):
       # TODO: map to wmf_map_mode
   ])
 
-  _HEADER = _FABRIC.CreateDataTypeMap('wmf_header')
-
-  _HEADER_SIZE = _HEADER.GetByteSize()
-
-  _PLACEABLE = _FABRIC.CreateDataTypeMap('wmf_placeable')
-
-  _PLACEABLE_SIZE = _PLACEABLE.GetByteSize()
-
-  _RECORD_TYPE = _FABRIC.CreateDataTypeMap('wmf_record_type')
-
-  _RECORD_HEADER = _FABRIC.CreateDataTypeMap('wmf_record_header')
-
-  _RECORD_HEADER_SIZE = _RECORD_HEADER.GetByteSize()
-
   _WMF_PLACEABLE_SIGNATURE = b'\xd7\xcd\xc6\x9a'
 
-  _MAP_MODE = _FABRIC.CreateDataTypeMap('wmf_map_mode')
-
-  _STRETCH_MODE = _FABRIC.CreateDataTypeMap('wmf_stretch_mode')
-
   # record_size == ((record_type >> 8) + 3)
   # DIB: https://msdn.microsoft.com/en-us/library/cc250593.aspx
 
@@ -330,12 +314,12 @@ class WMFFile(data_format.BinaryDataFile):
   _WMF_RECORD_DATA_STRUCT_TYPES = {
       0x0000: None,
       0x001e: None,
-      0x0103: _FABRIC.CreateDataTypeMap('wmf_setmapmode'),
-      0x0107: _FABRIC.CreateDataTypeMap('wmf_setstretchbltmode'),
-      0x0127: _FABRIC.CreateDataTypeMap('wmf_restoredc'),
-      0x020b: _FABRIC.CreateDataTypeMap('wmf_setwindoworg'),
-      0x020c: _FABRIC.CreateDataTypeMap('wmf_setwindowext'),
-      0x0b41: _FABRIC.CreateDataTypeMap('wmf_dibstretchblt')}
+      0x0103: 'wmf_setmapmode',
+      0x0107: 'wmf_setstretchbltmode',
+      0x0127: 'wmf_restoredc',
+      0x020b: 'wmf_setwindoworg',
+      0x020c: 'wmf_setwindowext',
+      0x0b41: 'wmf_dibstretchblt'}
 
   # Reverse Polish wmf_raster_operation_code
   _WMF_RASTER_OPERATIONS = {
@@ -663,7 +647,8 @@ class WMFFile(data_format.BinaryDataFile):
         record_header.record_size, record_header.record_size * 2)
     self._DebugPrintValue('Record size', value_string)
 
-    record_type_string = self._RECORD_TYPE.GetName(record_header.record_type)
+    data_type_map = self._GetDataTypeMap('wmf_record_type')
+    record_type_string = data_type_map.GetName(record_header.record_type)
     value_string = '0x{0:04x} ({1:s})'.format(
         record_header.record_type, record_type_string or 'UNKNOWN')
     self._DebugPrintValue('Record type', value_string)
@@ -680,8 +665,10 @@ class WMFFile(data_format.BinaryDataFile):
       ParseError: if the header cannot be read.
     """
     file_offset = file_object.tell()
-    file_header = self._ReadStructure(
-        file_object, file_offset, self._HEADER_SIZE, self._HEADER, 'header')
+    data_type_map = self._GetDataTypeMap('wmf_header')
+
+    file_header, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'header')
 
     if self._debug:
       self._DebugPrintHeader(file_header)
@@ -704,9 +691,10 @@ class WMFFile(data_format.BinaryDataFile):
       ParseError: if the placeable cannot be read.
     """
     file_offset = file_object.tell()
-    placeable = self._ReadStructure(
-        file_object, file_offset, self._PLACEABLE_SIZE, self._PLACEABLE,
-        'placeable')
+    data_type_map = self._GetDataTypeMap('wmf_placeable')
+
+    placeable, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'placeable')
 
     if self._debug:
       self._DebugPrintPlaceable(placeable)
@@ -725,17 +713,18 @@ class WMFFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the record cannot be read.
     """
-    record_header = self._ReadStructure(
-        file_object, file_offset, self._RECORD_HEADER_SIZE, self._RECORD_HEADER,
-        'record header')
+    data_type_map = self._GetDataTypeMap('wmf_record_header')
+
+    record_header, record_header_size = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'record header')
 
     if self._debug:
       self._DebugPrintRecordHeader(record_header)
 
     record_size = record_header.record_size * 2
 
-    data_offset = file_offset + self._RECORD_HEADER_SIZE
-    data_size = record_size - self._RECORD_HEADER_SIZE
+    data_offset = file_offset + record_header_size
+    data_size = record_size - record_header_size
 
     if self._debug:
       self._ReadRecordData(
@@ -761,10 +750,13 @@ class WMFFile(data_format.BinaryDataFile):
       self._DebugPrintData('Record data', record_data)
 
     # TODO: use lookup dict with callback.
-    data_type_map = self._WMF_RECORD_DATA_STRUCT_TYPES.get(record_type, None)
-    if not data_type_map:
+    data_type_map_name = self._WMF_RECORD_DATA_STRUCT_TYPES.get(
+        record_type, None)
+    if not data_type_map_name:
       return
 
+    data_type_map = self._GetDataTypeMap(data_type_map_name)
+
     try:
       record = data_type_map.MapByteStream(record_data)
     except dtfabric_errors.MappingError as exception:
@@ -773,14 +765,15 @@ class WMFFile(data_format.BinaryDataFile):
 
     if self._debug:
       if record_type == 0x0103:
-        map_mode_string = self._MAP_MODE.GetName(record.map_mode)
+        data_type_map = self._GetDataTypeMap('wmf_map_mode')
+        map_mode_string = data_type_map.GetName(record.map_mode)
         value_string = '0x{0:04x} ({1:s})'.format(
             record.map_mode, map_mode_string or 'UNKNOWN')
         self._DebugPrintValue('Map mode', value_string)
 
       elif record_type == 0x0107:
-        stretch_mode_string = self._MAP_MODE.GetName(
-            record.stretch_mode)
+        data_type_map = self._GetDataTypeMap('wmf_map_mode')
+        stretch_mode_string = data_type_map.GetName(record.stretch_mode)
         value_string = '0x{0:04x} ({1:s})'.format(
             record.stretch_mode, stretch_mode_string or 'UNKNOWN')
         self._DebugPrintValue('Stretch mode', value_string)
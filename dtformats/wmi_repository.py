@@ -294,12 +294,10 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('wmi_repository.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('wmi_repository.yaml')
 
   _PAGE_SIZE = 8192
 
-  _STRING = _FABRIC.CreateDataTypeMap('string')
-
   _PAGE_TYPES = {
       0xaccc: 'Is active',
       0xaddd: 'Is administrative',
@@ -564,12 +562,14 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     """
     value_data = page_body.value_data
 
+    data_type_map = self._GetDataTypeMap('string')
+
     for index, page_value_offset in enumerate(
         index_binary_tree_page.page_value_offsets):
       # TODO: determine size
 
       try:
-        value_string = self._STRING.MapByteStream(
+        value_string = data_type_map.MapByteStream(
             value_data[page_value_offset:])
       except dtfabric_errors.MappingError as exception:
         raise errors.ParseError((
@@ -627,7 +627,7 @@ class MappingFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('wmi_repository.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('wmi_repository.yaml')
 
   _DEBUG_INFO_FILE_FOOTER = [
       ('signature', 'Signature', '_FormatIntegerAsHexadecimal8')]
@@ -896,7 +896,7 @@ class ObjectsDataFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('wmi_repository.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('wmi_repository.yaml')
 
   _DEBUG_INFO_OBJECT_DESCRIPTOR = [
       ('identifier', 'Identifier', '_FormatIntegerAsHexadecimal8'),
@@ -1064,7 +1064,7 @@ class RepositoryFile(data_format.BinaryDataFile):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('wmi_repository.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('wmi_repository.yaml')
 
   _DEBUG_INFO_CHILD_OBJECTS_LIST_NODE = [
       ('list_element_node_offset1', 'List element node offset 1',
@@ -2197,9 +2197,7 @@ class CIMObject(data_format.BinaryDataFormat):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('wmi_repository.yaml')
-
-  _CIM_DATA_TYPES = _FABRIC.CreateDataTypeMap('cim_data_types')
+  _FABRIC = data_format.LazyDataTypeFabric('wmi_repository.yaml')
 
   def _DebugPrintCIMString(self, cim_string, description):
     """Prints CIM string information.
@@ -2225,7 +2223,8 @@ class CIMObject(data_format.BinaryDataFormat):
     Returns:
       str: integer formatted as a data type.
     """
-    data_type_string = self._CIM_DATA_TYPES.GetName(integer & 0x3fff)
+    data_type_map = self._GetDataTypeMap('cim_data_types')
+    data_type_string = data_type_map.GetName(integer & 0x3fff)
     # TODO: format flag 0x4000
     return '0x{0:08x} ({1:s})'.format(integer, data_type_string or 'UNKNOWN')
 
@@ -2608,7 +2607,8 @@ class ClassDefinition(CIMObject):
           qualifier_index, qualifier_descriptor.name_offset, values_data,
           values_data_offset)
 
-      cim_data_type = self._CIM_DATA_TYPES.GetName(
+      data_type_map = self._GetDataTypeMap('cim_data_types')
+      cim_data_type = data_type_map.GetName(
           qualifier_descriptor.value_data_type)
       if cim_data_type == 'CIM-TYPE-BOOLEAN':
         qualifier_value = qualifier_descriptor.value_boolean
@@ -3232,7 +3232,7 @@ class CIMRepository(data_format.BinaryDataFormat):
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile('wmi_repository.yaml')
+  _FABRIC = data_format.LazyDataTypeFabric('wmi_repository.yaml')
 
   _KEY_SEGMENT_SEPARATOR = '\\'
   _KEY_VALUE_SEPARATOR = '.'
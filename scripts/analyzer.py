@@ -9,6 +9,7 @@ import sys
 from dtfabric import definitions
 from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
 
 
 class BinaryDataFormatAnalyzer(data_format.BinaryDataFormat):
@@ -170,6 +171,17 @@ def Main():
   argument_parser = argparse.ArgumentParser(description=(
       'Analyzes a data format using a dtFabric definition.'))
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   argument_parser.add_argument(
       'definition', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the dtFabric definition file.')
@@ -203,7 +215,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -212,6 +224,10 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   analyzer = BinaryDataFormatAnalyzer(debug=True, output_writer=output_writer)
 
   analyzer.ReadDefinition(options.definition)
@@ -223,6 +239,11 @@ def Main():
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
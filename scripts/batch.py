@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to parse many files in parallel with a pool of worker processes."""
+
+import argparse
+import logging
+import sys
+
+from dtformats import batch
+from dtformats import output_writers
+from dtformats import profiler
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Parses files and directories of files in parallel, where the format '
+      'of every file is detected by signature or filename, and writes the '
+      'structured records.'))
+
+  argument_parser.add_argument(
+      '--files_per_task', '--files-per-task', dest='files_per_task',
+      type=int, action='store', metavar='NUMBER', default=16, help=(
+          'number of files parsed per task of a worker process.'))
+
+  argument_parser.add_argument(
+      '--maximum_file_size', '--maximum-file-size', dest='maximum_file_size',
+      type=int, action='store', metavar='SIZE', default=64 * 1024 * 1024,
+      help=(
+          'maximum size of a file that is parsed by a worker process, where '
+          'the records of a larger file are streamed as it is read, like '
+          'a single file is parsed.'))
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=['csv', 'jsonl'], default='jsonl', help=(
+          'structured record output writer.'))
+
+  argument_parser.add_argument(
+      '--paths_from', '--paths-from', dest='paths_from', action='store',
+      metavar='PATH', default=None, help=(
+          'path of a file that contains the paths of files and directories '
+          'to parse, one per line, where "-" represents stdin.'))
+
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--unordered', dest='unordered', action='store_true', default=False,
+      help=(
+          'write the results in the order they are completed instead of '
+          'in the order of the paths.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', type=int, action='store', metavar='NUMBER',
+      default=None, help=(
+          'number of worker processes, where the default is the number of '
+          'CPUs.'))
+
+  argument_parser.add_argument(
+      'sources', nargs='*', action='store', metavar='PATH', default=None,
+      help='paths of the files or directories to parse.')
+
+  options = argument_parser.parse_args()
+
+  sources = list(options.sources or [])
+  if options.paths_from == '-':
+    sources.extend(line.rstrip('\n') for line in sys.stdin if line.strip())
+
+  elif options.paths_from:
+    with open(options.paths_from, 'r', encoding='utf-8') as file_object:
+      sources.extend(
+          line.rstrip('\n') for line in file_object if line.strip())
+
+  if not sources:
+    print('Source files missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  data_format_profiler = None
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+
+  try:
+    batch_parser = batch.BatchParser(
+        data_format_profiler=data_format_profiler,
+        maximum_file_size=options.maximum_file_size,
+        maximum_number_of_workers=options.workers,
+        number_of_files_per_task=options.files_per_task,
+        ordered=not options.unordered)
+  except ValueError as exception:
+    print('{0!s}'.format(exception))
+    print('')
+    return False
+
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
+
+  try:
+    output_writer.Open()
+  except IOError as exception:
+    print('Unable to open output writer with error: {0!s}'.format(exception))
+    print('')
+    return False
+
+  results = batch_parser.ParsePaths(batch.GetFilePaths(sources))
+  number_of_errors = batch.WriteResults(results, output_writer)
+
+  output_writer.Close()
+
+  if number_of_errors:
+    logging.warning('Unable to parse: {0:d} files.'.format(number_of_errors))
+
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to carve records from raw data with a pool of worker processes."""
+
+import argparse
+import sys
+
+from dtformats import carver
+from dtformats import output_writers
+from dtformats import profiler
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Carves records of fixed-signature data formats from raw data, such '
+      'as unallocated space or a memory image, and writes the structured '
+      'records.'))
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=['csv', 'jsonl'], default='jsonl', help=(
+          'structured record output writer.'))
+
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--window_size', '--window-size', dest='window_size', type=int,
+      action='store', metavar='SIZE', default=64 * 1024 * 1024, help=(
+          'size of the window of raw data carved per task of a worker '
+          'process.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', type=int, action='store', metavar='NUMBER',
+      default=None, help=(
+          'number of worker processes, where the default is the number of '
+          'CPUs.'))
+
+  argument_parser.add_argument(
+      'sources', nargs='*', action='store', metavar='PATH', default=None,
+      help='paths of the files that contain the raw data.')
+
+  options = argument_parser.parse_args()
+
+  if not options.sources:
+    print('Source files missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  data_format_profiler = None
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+
+  try:
+    records_carver = carver.Carver(
+        data_format_profiler=data_format_profiler,
+        maximum_number_of_workers=options.workers,
+        window_size=options.window_size)
+  except ValueError as exception:
+    print('{0!s}'.format(exception))
+    print('')
+    return False
+
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
+
+  try:
+    output_writer.Open()
+  except IOError as exception:
+    print('Unable to open output writer with error: {0!s}'.format(exception))
+    print('')
+    return False
+
+  try:
+    for path in options.sources:
+      for record_type, values in records_carver.CarvePath(path):
+        values['path'] = path
+        output_writer.WriteRecord(record_type, values)
+
+  except (IOError, OSError) as exception:
+    print('Unable to carve with error: {0!s}'.format(exception))
+    print('')
+    return False
+
+  finally:
+    output_writer.Close()
+
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
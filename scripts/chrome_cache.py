@@ -8,7 +8,9 @@ import os
 import sys
 
 from dtformats import chrome_cache
+from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
 
 
 def Main():
@@ -24,6 +26,18 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=sorted(output_writers.OUTPUT_WRITER_CLASSES),
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes, "threaded" '
+          'writes from a background thread and "csv" and "jsonl" write '
+          'structured records instead of text.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Chrome Cache file(s).')
@@ -40,7 +54,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -49,6 +63,10 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   parser = chrome_cache.ChromeCacheParser(
       debug=options.debug, output_writer=output_writer)
 
@@ -60,6 +78,11 @@ def Main():
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
@@ -19,8 +19,10 @@ except ImportError:
     lzma = None
 
 from dtformats import cpio
+from dtformats import data_format
 from dtformats import data_range
 from dtformats import output_writers
+from dtformats import profiler
 
 
 class CPIOArchiveFileHasher(object):
@@ -141,6 +143,17 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   argument_parser.add_argument(
       '--hash', dest='hash', action='store_true', default=False,
       help='calculate the SHA-256 sum of the file entries.')
@@ -161,7 +174,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -170,6 +183,10 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   if options.hash:
     cpio_archive_file_hasher = CPIOArchiveFileHasher(
         options.source, debug=options.debug, output_writer=output_writer)
@@ -191,8 +208,14 @@ def Main():
     cpio_archive_file.Close()
 
   output_writer.WriteText('\n')
+
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
@@ -7,7 +7,9 @@ import logging
 import sys
 
 from dtformats import cups_ipp
+from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
 
 
 def Main():
@@ -23,6 +25,17 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the CUPS IPP file.')
@@ -39,7 +52,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -48,19 +61,30 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   cups_ipp_file = cups_ipp.CupsIppFile(
       debug=options.debug, output_writer=output_writer)
 
   cups_ipp_file.Open(options.source)
 
-  print('CUPS Internet Printing Protocol (IPP) information:')
-  print('')
+  output_writer.WriteText(
+      'CUPS Internet Printing Protocol (IPP) information:\n')
+  output_writer.WriteText('\n')
 
   cups_ipp_file.Close()
 
   output_writer.WriteText('\n')
+
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
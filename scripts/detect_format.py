@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to detect the data formats of files by their signatures."""
+
+import argparse
+import logging
+import sys
+
+from dtformats import batch
+from dtformats import format_detector
+from dtformats import output_writers
+from dtformats import profiler
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Detects the data formats of files by their signatures.'))
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=sorted(output_writers.OUTPUT_WRITER_CLASSES),
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes, "threaded" '
+          'writes from a background thread and "csv" and "jsonl" write '
+          'structured records instead of text.'))
+
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and matching the signatures.')
+
+  argument_parser.add_argument(
+      'sources', nargs='*', action='store', metavar='PATH', default=None,
+      help='paths of the files or directories to detect the formats of.')
+
+  options = argument_parser.parse_args()
+
+  if not options.sources:
+    print('Source files missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
+
+  try:
+    output_writer.Open()
+  except IOError as exception:
+    print('Unable to open output writer with error: {0!s}'.format(exception))
+    print('')
+    return False
+
+  data_format_profiler = None
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+
+  detector = format_detector.FormatDetector(
+      format_classes=batch.FORMAT_CLASSES, profiler=data_format_profiler)
+
+  for path in batch.GetFilePaths(options.sources):
+    try:
+      format_classes = detector.DetectPath(path)
+    except (IOError, OSError) as exception:
+      logging.warning('Unable to read file: {0:s} with error: {1!s}'.format(
+          path, exception))
+      continue
+
+    format_names = ', '.join([
+        format_class.__name__ for format_class in format_classes]) or 'unknown'
+
+    if isinstance(output_writer, output_writers.RecordOutputWriter):
+      output_writer.WriteRecord('format', {
+          'formats': format_names, 'path': path})
+    else:
+      output_writer.WriteText('{0:s}\t{1:s}\n'.format(path, format_names))
+
+  output_writer.Close()
+
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
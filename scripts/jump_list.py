@@ -11,8 +11,10 @@ import sys
 
 import pyolecf
 
+from dtformats import data_format
 from dtformats import jump_list
 from dtformats import output_writers
+from dtformats import profiler
 
 
 def Main():
@@ -28,6 +30,18 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=sorted(output_writers.OUTPUT_WRITER_CLASSES),
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes, "threaded" '
+          'writes from a background thread and "csv" and "jsonl" write '
+          'structured records instead of text.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Windows Jump List file.')
@@ -44,7 +58,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -53,6 +67,10 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   if pyolecf.check_file_signature(options.source):
     jump_list_file = jump_list.AutomaticDestinationsFile(
         debug=options.debug, output_writer=output_writer)
@@ -62,24 +80,32 @@ def Main():
 
   jump_list_file.Open(options.source)
 
-  print('Windows Jump List information:')
-  print('Number of entries:\t\t{0:d}'.format(len(jump_list_file.entries)))
-  print('Number of recovered entries:\t{0:d}'.format(
+  output_writer.WriteText('Windows Jump List information:\n')
+  output_writer.WriteText('Number of entries:\t\t{0:d}\n'.format(
+      len(jump_list_file.entries)))
+  output_writer.WriteText('Number of recovered entries:\t{0:d}\n'.format(
       len(jump_list_file.recovered_entries)))
-  print('')
+  output_writer.WriteText('\n')
 
   for lnk_file_entry in jump_list_file.entries:
-    print('LNK file entry: {0:s}'.format(lnk_file_entry.identifier))
+    output_writer.WriteText('LNK file entry: {0:s}\n'.format(
+        lnk_file_entry.identifier))
 
     for shell_item in lnk_file_entry.GetShellItems():
-      print('Shell item: 0x{0:02x}'.format(shell_item.class_type))
+      output_writer.WriteText('Shell item: 0x{0:02x}\n'.format(
+          shell_item.class_type))
 
-    print('')
+    output_writer.WriteText('\n')
 
   jump_list_file.Close()
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
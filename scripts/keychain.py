@@ -6,8 +6,10 @@ import argparse
 import logging
 import sys
 
+from dtformats import data_format
 from dtformats import keychain
 from dtformats import output_writers
+from dtformats import profiler
 
 
 ATTRIBUTE_DATA_TYPES = {
@@ -39,6 +41,17 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the keychain database file.')
@@ -55,7 +68,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -64,21 +77,26 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   keychain_file = keychain.KeychainDatabaseFile(
       debug=options.debug, output_writer=output_writer)
 
   keychain_file.Open(options.source)
 
   if not options.content:
-    print('Keychain database file schema:')
+    output_writer.WriteText('Keychain database file schema:\n')
 
     for table in keychain_file.tables:
-      print('Table: {0:s} (0x{1:08x})'.format(
+      output_writer.WriteText('Table: {0:s} (0x{1:08x})\n'.format(
           table.relation_name, table.relation_identifier))
 
       number_of_columns = len(table.columns)
-      print('\tNumber of columns:\t{0:d}'.format(number_of_columns))
-      print('\tColumn\tIdentifier\tName\tType')
+      output_writer.WriteText('\tNumber of columns:\t{0:d}\n'.format(
+          number_of_columns))
+      output_writer.WriteText('\tColumn\tIdentifier\tName\tType\n')
 
       for index, column in enumerate(table.columns):
         if column.attribute_identifier >= number_of_columns:
@@ -90,20 +108,21 @@ def Main():
             column.attribute_data_type,
             '0x{0:08x}'.format(column.attribute_data_type))
 
-        print('\t{0:d}\t{1:s}\t{2:s}\t{3:s}'.format(
+        output_writer.WriteText('\t{0:d}\t{1:s}\t{2:s}\t{3:s}\n'.format(
             index, attribute_identifier, column.attribute_name or 'NULL',
             attribute_data_type))
 
-      print('')
+      output_writer.WriteText('\n')
 
-    print('')
+    output_writer.WriteText('\n')
 
   else:
     for table in keychain_file.tables:
-      print('Table: {0:s} (0x{1:08x})'.format(
+      output_writer.WriteText('Table: {0:s} (0x{1:08x})\n'.format(
           table.relation_name, table.relation_identifier))
 
-      print('\t'.join([column.attribute_name for column in table.columns]))
+      output_writer.WriteText('{0:s}\n'.format('\t'.join([
+          column.attribute_name for column in table.columns])))
 
       for record in table.records:
         record_values = []
@@ -113,14 +132,19 @@ def Main():
           else:
             record_values.append('{0!s}'.format(value))
 
-        print('\t'.join(record_values))
+        output_writer.WriteText('{0:s}\n'.format('\t'.join(record_values)))
 
-      print('')
+      output_writer.WriteText('\n')
 
   keychain_file.Close()
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
@@ -8,7 +8,9 @@ import sys
 
 from dfdatetime import filetime as dfdatetime_filetime
 
+from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
 from dtformats import recycle_bin
 
 
@@ -25,6 +27,18 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=sorted(output_writers.OUTPUT_WRITER_CLASSES),
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes, "threaded" '
+          'writes from a background thread and "csv" and "jsonl" write '
+          'structured records instead of text.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Recycle.Bin metadata ($I) file.')
@@ -41,7 +55,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -50,14 +64,19 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   metadata_file = recycle_bin.RecycleBinMetadataFile(
       debug=options.debug, output_writer=output_writer)
 
   metadata_file.Open(options.source)
 
-  print('Recycle.Bin metadata ($I) file information:')
+  output_writer.WriteText('Recycle.Bin metadata ($I) file information:\n')
 
-  print('\tFormat version\t\t: {0:d}'.format(metadata_file.format_version))
+  output_writer.WriteText('\tFormat version\t\t: {0:d}\n'.format(
+      metadata_file.format_version))
 
   if metadata_file.deletion_time == 0:
     date_time_string = 'Not set'
@@ -72,16 +91,23 @@ def Main():
     else:
       date_time_string = '0x{08:x}'.format(metadata_file.deletion_time)
 
-  print('\tDeletion time\t\t: {0:s}'.format(date_time_string))
-  print('\tOriginal filename\t: {0:s}'.format(metadata_file.original_filename))
-  print('\tOriginal file size\t: {0:d}'.format(
+  output_writer.WriteText('\tDeletion time\t\t: {0:s}\n'.format(
+      date_time_string))
+  output_writer.WriteText('\tOriginal filename\t: {0:s}\n'.format(
+      metadata_file.original_filename))
+  output_writer.WriteText('\tOriginal file size\t: {0:d}\n'.format(
       metadata_file.original_file_size))
-  print('')
+  output_writer.WriteText('\n')
 
   metadata_file.Close()
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
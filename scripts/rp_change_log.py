@@ -6,7 +6,9 @@ import argparse
 import logging
 import sys
 
+from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
 from dtformats import rp_change_log
 
 
@@ -23,6 +25,17 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Windows Restore Point change.log file.')
@@ -39,7 +52,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -48,14 +61,19 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   change_log_file = rp_change_log.RestorePointChangeLogFile(
       debug=options.debug, output_writer=output_writer)
 
   change_log_file.Open(options.source)
 
-  print('Windows Restore Point change.log information:')
-  print('Volume path:\t{0:s}'.format(change_log_file.volume_path))
-  print('')
+  output_writer.WriteText('Windows Restore Point change.log information:\n')
+  output_writer.WriteText('Volume path:\t{0:s}\n'.format(
+      change_log_file.volume_path))
+  output_writer.WriteText('\n')
 
   for change_log_entry in change_log_file.entries:
     flags = []
@@ -63,24 +81,31 @@ def Main():
       if change_log_entry.entry_type & flag:
         flags.append(description)
 
-    print('Entry type:\t\t{0:s}'.format(', '.join(flags)))
+    output_writer.WriteText('Entry type:\t\t{0:s}\n'.format(', '.join(flags)))
 
     flags = []
     for flag, description in change_log_file.LOG_ENTRY_FLAGS.items():
       if change_log_entry.entry_flags & flag:
         flags.append(description)
 
-    print('Entry flags:\t\t{0:s}'.format(', '.join(flags)))
+    output_writer.WriteText('Entry flags:\t\t{0:s}\n'.format(', '.join(flags)))
 
-    print('Sequence number:\t{0:d}'.format(change_log_entry.sequence_number))
-    print('Process name:\t\t{0:s}'.format(change_log_entry.process_name))
+    output_writer.WriteText('Sequence number:\t{0:d}\n'.format(
+        change_log_entry.sequence_number))
+    output_writer.WriteText('Process name:\t\t{0:s}\n'.format(
+        change_log_entry.process_name))
 
-    print('')
+    output_writer.WriteText('\n')
 
   change_log_file.Close()
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
@@ -8,8 +8,10 @@ import sys
 
 from dfdatetime import cocoa_time as dfdatetime_cocoa_time
 
-from dtformats import spotlight_storedb
+from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
+from dtformats import spotlight_storedb
 
 
 class TableView(object):
@@ -100,6 +102,17 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   argument_parser.add_argument(
       '-i', '--item', dest='item', type=int, action='store', default=None,
       metavar='FSID', help='file system identifier (FSID) of the item to show.')
@@ -120,7 +133,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -129,6 +142,10 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   spotlight_store_database = spotlight_storedb.AppleSpotlightStoreDatabaseFile(
       debug=options.debug, output_writer=output_writer)
   spotlight_store_database.Open(options.source)
@@ -193,6 +210,11 @@ def Main():
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
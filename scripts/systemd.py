@@ -6,8 +6,10 @@ import argparse
 import logging
 import sys
 
-from dtformats import systemd
+from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
+from dtformats import systemd
 
 
 def Main():
@@ -23,6 +25,18 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=sorted(output_writers.OUTPUT_WRITER_CLASSES),
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes, "threaded" '
+          'writes from a background thread and "csv" and "jsonl" write '
+          'structured records instead of text.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the systemd journal file.')
@@ -39,7 +53,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -48,18 +62,35 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   log_file = systemd.SystemdJournalFile(
       debug=options.debug, output_writer=output_writer)
 
   log_file.Open(options.source)
 
-  print('Systemd journal information:')
-  print('')
+  # The entries are only read when the file is opened if debug information
+  # or structured records are written. Otherwise they are read here, so that
+  # corrupt entry arrays, entries and data objects are still reported.
+  if not options.debug and not isinstance(
+      output_writer, output_writers.RecordOutputWriter):
+    for _ in log_file.ReadEntries():
+      pass
+
+  output_writer.WriteText('Systemd journal information:\n')
+  output_writer.WriteText('\n')
 
   log_file.Close()
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
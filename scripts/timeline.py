@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to write a timeline of the records of multiple files."""
+
+import argparse
+import os
+import re
+import sys
+
+from dtformats import asl
+from dtformats import batch
+from dtformats import bsm
+from dtformats import chrome_cache
+from dtformats import data_format
+from dtformats import errors
+from dtformats import output_writers
+from dtformats import profiler
+from dtformats import systemd
+from dtformats import timeline
+from dtformats import usn_journal
+from dtformats import utmp
+
+
+# Data format classes, the names of the methods that read their records and
+# whether the records are written in time order, per name of a format that
+# can be specified for a source. The records of a format that is not written
+# in time order are sorted in chunks. Note that the entries of an utmp file
+# of the current sessions are stored in reused slots, whereas a wtmp or btmp
+# file of past logins is appended to.
+_FORMATS_PER_NAME = {
+    'asl': (asl.AppleSystemLogFile, None, True),
+    'bsm': (bsm.BSMEventAuditingFile, None, True),
+    'systemd': (systemd.SystemdJournalFile, None, True),
+    'usn': (usn_journal.USNRecords, 'ReadRecords', False),
+    'utmp': (utmp.LinuxLibc6UtmpFile, None, False),
+    'utmpx': (utmp.MacOSXUtmpxFile, None, False),
+    'wtmp': (utmp.LinuxLibc6UtmpFile, None, True)}
+
+# Data format classes of which the records are written in time order, when
+# the format of a source is detected.
+_ORDERED_FORMAT_CLASSES = frozenset([
+    asl.AppleSystemLogFile, bsm.BSMEventAuditingFile,
+    systemd.SystemdJournalFile])
+
+# Names of wtmp and btmp files, including rotated ones, such as "wtmp.1".
+_WTMP_FILENAME_RE = re.compile(r'^[bw]tmp([.-]|$)')
+
+
+def _GetSourceRecords(path, format_name=None):
+  """Retrieves the records of a source.
+
+  Args:
+    path (str): path of a file or a Chrome Cache directory.
+    format_name (Optional[str]): name of the format of the file, where None
+        represents the format should be detected by signature or filename.
+
+  Returns:
+    tuple[Generator[tuple[str, dict[str, object]]], bool]: record types and
+        values of the records and True if the records are ordered by
+        timestamp.
+
+  Raises:
+    ParseError: if the format is not supported.
+  """
+  if format_name:
+    format_class, read_method_name, ordered = _FORMATS_PER_NAME[format_name]
+    records = timeline.GetFileRecords(
+        path, format_class=format_class, read_method_name=read_method_name)
+    return records, ordered
+
+  if os.path.isdir(path):
+    def _ReadDirectory(output_writer):
+      """Reads the Chrome Cache directory.
+
+      Args:
+        output_writer (RecordOutputWriter): output writer.
+      """
+      parser = chrome_cache.ChromeCacheParser(output_writer=output_writer)
+      parser.ParseDirectory(path)
+
+    return timeline.GetRecords(_ReadDirectory), False
+
+  if os.path.basename(path).lower() == '$j':
+    records = timeline.GetFileRecords(
+        path, format_class=usn_journal.USNRecords,
+        read_method_name='ReadRecords')
+    return records, False
+
+  format_class = batch.GetFormatClass(path)
+  if not format_class:
+    raise errors.ParseError('Unsupported format.')
+
+  ordered = format_class in _ORDERED_FORMAT_CLASSES
+  if format_class == utmp.LinuxLibc6UtmpFile:
+    ordered = bool(_WTMP_FILENAME_RE.match(os.path.basename(path)))
+
+  records = timeline.GetFileRecords(path, format_class=format_class)
+  return records, ordered
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Writes a timeline of the records of multiple files, ordered by '
+      'timestamp, where the format of a file is detected by signature or '
+      'filename, unless it is specified with --format.'))
+
+  argument_parser.add_argument(
+      '--chunk_size', '--chunk-size', dest='chunk_size', type=int,
+      action='store', metavar='NUMBER', default=65536, help=(
+          'maximum number of records of a file that are sorted in memory.'))
+
+  argument_parser.add_argument(
+      '--format', dest='formatted_sources', action='append',
+      metavar='FORMAT:PATH', default=[], help=(
+          'path of a file of which the format cannot be detected, such as '
+          'a BSM file or an utmp file with another name, prefixed by the name '
+          'of its format: {0:s}. This option can be specified multiple '
+          'times.').format(', '.join(sorted(_FORMATS_PER_NAME))))
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=['csv', 'jsonl'], default='jsonl', help=(
+          'structured record output writer.'))
+
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--temporary_directory', '--temporary-directory',
+      dest='temporary_directory', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the directory to store the sorted chunks of records in.'))
+
+  argument_parser.add_argument(
+      'sources', nargs='*', action='store', metavar='PATH', default=None,
+      help=(
+          'paths of the files or Chrome Cache directories, where a USN '
+          'change journal file must be named $J.'))
+
+  options = argument_parser.parse_args()
+
+  sources = [(path, None) for path in options.sources or []]
+  for formatted_source in options.formatted_sources:
+    format_name, _, path = formatted_source.partition(':')
+    if format_name not in _FORMATS_PER_NAME or not path:
+      print('Unsupported format source: {0:s}'.format(formatted_source))
+      print('')
+      return False
+
+    sources.append((path, format_name))
+
+  if not sources:
+    print('Source files missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  try:
+    records_timeline = timeline.Timeline(
+        chunk_size=options.chunk_size,
+        temporary_directory=options.temporary_directory)
+  except ValueError as exception:
+    print('{0!s}'.format(exception))
+    print('')
+    return False
+
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
+  for path, format_name in sources:
+    try:
+      records, ordered = _GetSourceRecords(path, format_name=format_name)
+    except (IOError, OSError, errors.ParseError) as exception:
+      print('Unable to read: {0:s} with error: {1!s}'.format(
+          path, exception), file=sys.stderr)
+      print('', file=sys.stderr)
+      return False
+
+    records_timeline.AddSource(path, records, ordered=ordered)
+
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
+
+  try:
+    output_writer.Open()
+  except IOError as exception:
+    print('Unable to open output writer with error: {0!s}'.format(exception))
+    print('')
+    return False
+
+  try:
+    records_timeline.WriteRecords(output_writer)
+  except (IOError, OSError, errors.ParseError) as exception:
+    print('Unable to write timeline with error: {0!s}'.format(exception),
+          file=sys.stderr)
+    print('', file=sys.stderr)
+    return False
+
+  finally:
+    output_writer.Close()
+
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -6,7 +6,10 @@ import argparse
 import logging
 import sys
 
+from dtformats import data_format
+from dtformats import format_detector
 from dtformats import output_writers
+from dtformats import profiler
 from dtformats import unified_logging
 
 
@@ -24,6 +27,17 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None, help=(
           'path of the Apple Unified Logging and Activity Tracing file.'))
@@ -40,7 +54,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -49,27 +63,29 @@ def Main():
     print('')
     return False
 
-  with open(options.source, 'rb') as file_object:
-    file_signature = file_object.read(4)
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
 
-  if file_signature == b'hcsd':
-    unified_logging_file = unified_logging.DSCFile(
-        debug=options.debug, output_writer=output_writer)
-
-  elif file_signature == b'\x99\x88\x77\x66':
-    unified_logging_file = unified_logging.UUIDTextFile(
-        debug=options.debug, output_writer=output_writer)
+  detector = format_detector.FormatDetector(format_classes=[
+      unified_logging.DSCFile, unified_logging.TraceV3File,
+      unified_logging.UUIDTextFile])
 
+  format_classes = detector.DetectPath(options.source)
+  if format_classes:
+    format_class = format_classes[0]
   else:
-    unified_logging_file = unified_logging.TraceV3File(
-        debug=options.debug, output_writer=output_writer)
+    format_class = unified_logging.TraceV3File
+
+  unified_logging_file = format_class(
+      debug=options.debug, output_writer=output_writer)
 
   unified_logging_file.Open(options.source)
 
   output_writer.WriteText(
       'Apple Unified Logging and Activity Tracing information:\n')
 
-  if file_signature == b'hcsd':
+  if format_class == unified_logging.DSCFile:
     for index, dsc_uuid in enumerate(unified_logging_file.uuids):
       output_writer.WriteText('uuid {0:d}:\n'.format(index))
       output_writer.WriteText('    uuid {0:d}:\t{1!s}\n'.format(
@@ -97,6 +113,11 @@ def Main():
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
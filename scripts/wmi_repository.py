@@ -7,14 +7,17 @@ import logging
 import os
 import sys
 
+from dtformats import data_format
 from dtformats import output_writers
+from dtformats import profiler
 from dtformats import wmi_repository
 
 
-def PrintInstance(instance):
-  """Writes an instance to stdout.
+def PrintInstance(output_writer, instance):
+  """Writes an instance to the output.
 
   Args:
+    output_writer (OutputWriter): output writer.
     instance (Instance): instance.
   """
   name_property = instance.properties.get('Name', None)
@@ -58,18 +61,20 @@ def PrintInstance(instance):
 
   for name, value in name_value_pairs:
     alignment_length = largest_name - len(name)
-    print('{0:s}{1:s} : {2:s}'.format(name, ' ' * alignment_length, value))
+    output_writer.WriteText('{0:s}{1:s} : {2:s}\n'.format(
+        name, ' ' * alignment_length, value))
 
-  print('')
+  output_writer.WriteText('\n')
 
 
-def PrintNamespace(instance):
-  """Writes a namespace to stdout.
+def PrintNamespace(output_writer, instance):
+  """Writes a namespace to the output.
 
   Args:
+    output_writer (OutputWriter): output writer.
     instance (Instance): instance.
   """
-  print(instance.namespace or '')
+  output_writer.WriteText('{0:s}\n'.format(instance.namespace or ''))
 
 
 def Main():
@@ -86,6 +91,17 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help='enable profiling of reading and mapping the data format.')
+
+  argument_parser.add_argument(
+      '--output_writer', '--output-writer', dest='output_writer',
+      action='store', choices=output_writers.TEXT_OUTPUT_WRITER_NAMES,
+      default='stdout', help=(
+          'output writer, where "buffered" coalesces writes and "threaded" '
+          'writes from a background thread.'))
+
   # TODO: make this more descriptive.
   argument_parser.add_argument(
       '--output_mode', '--output-mode', dest='output_mode', action='store',
@@ -109,7 +125,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutWriter()
+  output_writer = output_writers.CreateOutputWriter(options.output_writer)
 
   try:
     output_writer.Open()
@@ -118,6 +134,10 @@ def Main():
     print('')
     return False
 
+  if options.profile:
+    data_format_profiler = profiler.DataFormatProfiler()
+    data_format.BinaryDataFormat.SetProfiler(data_format_profiler)
+
   source_basename = os.path.basename(options.source).lower()
   if source_basename == 'index.btr':
     options.output_mode = 'index'
@@ -129,17 +149,17 @@ def Main():
 
   if options.output_mode == 'index':
     for key_path in cim_repository.GetIndexKeys():
-      print(key_path)
+      output_writer.WriteText('{0:s}\n'.format(key_path))
 
   elif options.output_mode == 'instances':
     for instance in cim_repository.GetInstances():
-      PrintInstance(instance)
+      PrintInstance(output_writer, instance)
 
   elif options.output_mode == 'namespaces':
     for instance in sorted(
         cim_repository.GetNamespaces(),
         key=lambda instance: instance.namespace):
-      PrintNamespace(instance)
+      PrintNamespace(output_writer, instance)
 
   elif options.output_mode == 'debug':
     for key in cim_repository.GetIndexKeys():
@@ -158,6 +178,11 @@ def Main():
 
   output_writer.Close()
 
+  if options.profile:
+    profile_output_writer = output_writers.StdoutWriter(
+        output_stream=sys.stderr)
+    data_format_profiler.WriteProfiles(profile_output_writer)
+
   return True
 
 
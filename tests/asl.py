@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 """Tests for Apple System Log (ASL) files."""
 
+import os
+import tempfile
 import unittest
 
 from dtformats import asl
+from dtformats import errors
 
 from tests import test_lib
 
@@ -36,6 +39,28 @@ class AppleSystemLogFileTest(test_lib.BaseTestCase):
     formatted_string = test_file._FormatString('string\x00')
     self.assertEqual(formatted_string, 'string')
 
+  def testCarveRecord(self):
+    """Tests the CarveRecord function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = asl.AppleSystemLogFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['applesystemlog.asl'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      record_size = test_file.CarveRecord(file_object, 442)
+      self.assertGreater(record_size, 0)
+
+      with self.assertRaises(errors.ParseError):
+        test_file.CarveRecord(file_object, 0)
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'asl_record')
+    self.assertEqual(values['offset'], 442)
+    self.assertEqual(values['written_time'], 1385372735)
+
   def testReadFileHeader(self):
     """Tests the _ReadFileHeader function."""
     output_writer = test_lib.TestOutputWriter()
@@ -62,6 +87,89 @@ class AppleSystemLogFileTest(test_lib.BaseTestCase):
 
     test_file.Open(test_file_path)
 
+  def testReadFileObjectWithCheckpoint(self):
+    """Tests the ReadFileObject function with a checkpoint."""
+    test_file_path = self._GetTestFilePath(['applesystemlog.asl'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = asl.AppleSystemLogFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'test.asl')
+
+      # The file without the last record, where the first record has no
+      # next record.
+      with open(path, 'wb') as file_object:
+        file_object.write(b''.join([data[:448], bytes(8), data[456:974]]))
+
+      test_file.Open(path)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 1)
+
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.offset, 442)
+      self.assertEqual(checkpoint.sequence_number, 101406)
+
+      # The file is appended to.
+      with open(path, 'wb') as file_object:
+        file_object.write(data)
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 1)
+
+      record_type, values = output_writer.records[0]
+      self.assertEqual(record_type, 'asl_record')
+      self.assertEqual(values['offset'], 974)
+      self.assertEqual(values['message_identifier'], 102643)
+      self.assertEqual(values['sender'], 'locationd')
+
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.offset, 974)
+      self.assertEqual(checkpoint.sequence_number, 102643)
+
+      # Nothing was appended to the file.
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 0)
+      self.assertEqual(test_file.GetCheckpoint(), checkpoint)
+
+      # The file is replaced by a file with another creation time.
+      with open(path, 'wb') as file_object:
+        file_object.write(b''.join([data[:24], bytes(8), data[32:]]))
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 2)
+
+  def testReadFileObjectWithRecordOutputWriter(self):
+    """Tests the ReadFileObject function with a record output writer."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = asl.AppleSystemLogFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['applesystemlog.asl'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    self.assertEqual(len(output_writer.records), 2)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'asl_record')
+    self.assertEqual(values['offset'], 442)
+    self.assertEqual(values['message_identifier'], 101406)
+
 
 if __name__ == '__main__':
   unittest.main()
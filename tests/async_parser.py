@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""Tests for asynchronous (asyncio) parsing of files."""
+
+import asyncio
+import concurrent.futures
+import gc
+import unittest
+
+import dtformats
+
+from dtformats import async_parser
+from dtformats import errors
+from dtformats import utmp
+
+from tests import test_lib
+
+
+class AsyncParserTest(test_lib.BaseTestCase):
+  """Asynchronous parser tests."""
+
+  # pylint: disable=protected-access
+
+  def _RunCoroutine(self, coroutine):
+    """Runs a coroutine in a new event loop.
+
+    Args:
+      coroutine (coroutine): coroutine.
+
+    Returns:
+      object: result of the coroutine.
+    """
+    event_loop = asyncio.new_event_loop()
+    try:
+      return event_loop.run_until_complete(coroutine)
+    finally:
+      event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+      event_loop.close()
+
+  async def _GetRecords(self, records):
+    """Retrieves all records of an asynchronous iteration.
+
+    Args:
+      records (AsyncGenerator[tuple[str, dict[str, object]]]): records.
+
+    Returns:
+      list[tuple[str, dict[str, object]]]: records.
+    """
+    return [record async for record in records]
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    with self.assertRaises(ValueError):
+      async_parser.AsyncParser(maximum_number_of_concurrent_parses=0)
+
+    with self.assertRaises(ValueError):
+      async_parser.AsyncParser(maximum_queue_size=0)
+
+  def testParse(self):
+    """Tests the Parse function."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_parser = async_parser.AsyncParser(maximum_queue_size=2)
+
+    records = self._RunCoroutine(self._GetRecords(
+        test_parser.Parse(test_file_path)))
+    self.assertEqual(len(records), 14)
+
+    record_type, values = records[0]
+    self.assertEqual(record_type, 'linux_libc6_utmp_entry')
+    self.assertEqual(values['username'], 'reboot')
+
+    with self.assertRaises(errors.ParseError):
+      self._RunCoroutine(self._GetRecords(test_parser.Parse(
+          test_file_path, format_class=utmp.MacOSXUtmpxFile)))
+
+    test_file_path = self._GetTestFilePath(['cups_ipp_2.0'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with self.assertRaises(errors.ParseError):
+      self._RunCoroutine(self._GetRecords(test_parser.Parse(test_file_path)))
+
+  def testParseCancelled(self):
+    """Tests the Parse function with a cancelled consumer."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_parser = async_parser.AsyncParser(maximum_queue_size=1)
+
+    async def _ConsumeRecords():
+      records = test_parser.Parse(test_file_path)
+      try:
+        async for _ in records:
+          await asyncio.sleep(60)
+      finally:
+        await records.aclose()
+
+    async def _CancelConsumer():
+      task = asyncio.ensure_future(_ConsumeRecords())
+      await asyncio.sleep(0.1)
+      task.cancel()
+
+      with self.assertRaises(asyncio.CancelledError):
+        await task
+
+      # The concurrent parse slot is released.
+      semaphore = test_parser._GetSemaphore(asyncio.get_running_loop())
+      self.assertFalse(semaphore.locked())
+
+    self._RunCoroutine(_CancelConsumer())
+
+  def testParseConcurrently(self):
+    """Tests the Parse function with concurrent parses."""
+    test_file_paths = []
+    for filename in ('utmp-linux_libc6', 'utmpx-macosx10.5', 'wintask.job'):
+      test_file_path = self._GetTestFilePath([filename])
+      self._SkipIfPathNotExists(test_file_path)
+      test_file_paths.append(test_file_path)
+
+    test_parser = async_parser.AsyncParser(
+        maximum_number_of_concurrent_parses=2)
+
+    async def _ParseConcurrently():
+      return await asyncio.gather(*[
+          self._GetRecords(test_parser.Parse(test_file_path))
+          for test_file_path in test_file_paths])
+
+    results = self._RunCoroutine(_ParseConcurrently())
+    self.assertEqual([len(records) for records in results], [14, 6, 1])
+
+  def testParseInProcess(self):
+    """Tests the Parse function with a process pool executor."""
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+      test_parser = async_parser.AsyncParser(executor=executor)
+
+      records = self._RunCoroutine(self._GetRecords(
+          test_parser.Parse(test_file_path)))
+
+    self.assertEqual(len(records), 6)
+
+  def testParseStoppedWithBreak(self):
+    """Tests the Parse function with an iteration stopped with break."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_parser = async_parser.AsyncParser(maximum_queue_size=1)
+
+    exception_contexts = []
+
+    async def _GetFirstRecord():
+      asyncio.get_running_loop().set_exception_handler(
+          lambda _, context: exception_contexts.append(context))
+
+      async for record in test_parser.Parse(test_file_path):
+        return record
+
+      return None
+
+    # asyncio.run() cancels the task that closes the iteration.
+    record_type, _ = asyncio.run(_GetFirstRecord())
+    gc.collect()
+
+    self.assertEqual(record_type, 'linux_libc6_utmp_entry')
+    self.assertEqual(exception_contexts, [])
+
+    # The semaphore of the closed event loop is not kept.
+    self.assertEqual(len(test_parser._semaphores_per_event_loop), 0)
+
+  def testParseStoppedEarly(self):
+    """Tests the Parse function with an iteration that is stopped early."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_parser = async_parser.AsyncParser(maximum_queue_size=1)
+
+    async def _GetFirstRecord():
+      records = test_parser.Parse(test_file_path)
+      record = await records.__anext__()
+      await records.aclose()
+      return record
+
+    record_type, _ = self._RunCoroutine(_GetFirstRecord())
+    self.assertEqual(record_type, 'linux_libc6_utmp_entry')
+
+
+class AParseTest(test_lib.BaseTestCase):
+  """Tests for the aparse function."""
+
+  # pylint: disable=protected-access
+
+  def testAParse(self):
+    """Tests the aparse function."""
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    async def _GetRecordTypes():
+      return [
+          record_type
+          async for record_type, _ in dtformats.aparse(test_file_path)]
+
+    event_loop = asyncio.new_event_loop()
+    try:
+      record_types = event_loop.run_until_complete(_GetRecordTypes())
+    finally:
+      event_loop.close()
+
+    self.assertEqual(record_types, ['macosx_utmpx_entry'] * 6)
+
+  def testAParseConcurrencyLimit(self):
+    """Tests that the aparse function limits the concurrent parses."""
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    records = async_parser.aparse(test_file_path)
+    records.aclose().close()
+
+    shared_async_parser = async_parser._aparse_async_parser
+    self.assertIsNotNone(shared_async_parser)
+
+    records = async_parser.aparse(test_file_path)
+    records.aclose().close()
+    self.assertIs(async_parser._aparse_async_parser, shared_async_parser)
+
+    test_parser = async_parser.AsyncParser(maximum_queue_size=1)
+    test_parser.ShareConcurrencyLimit(shared_async_parser)
+    self.assertIs(
+        test_parser._semaphores_per_event_loop,
+        shared_async_parser._semaphores_per_event_loop)
+
+
+if __name__ == '__main__':
+  unittest.main()
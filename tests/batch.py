@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""Tests for batch parsing of many files."""
+
+import os
+import tempfile
+import unittest
+
+from dtformats import batch
+from dtformats import profiler
+from dtformats import recycle_bin
+from dtformats import tzif
+from dtformats import utmp
+
+from tests import test_lib
+
+
+class RecordCollectorTest(test_lib.BaseTestCase):
+  """Record collector tests."""
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord function."""
+    record_collector = batch.RecordCollector()
+
+    record_collector.WriteRecord('test', {
+        'data': bytearray(b'\x01'), 'list': (1, object), 'value': None})
+
+    self.assertEqual(record_collector.records, [('test', {
+        'data': b'\x01', 'list': [1, "<class 'object'>"], 'value': None})])
+
+
+class BatchParserTest(test_lib.BaseTestCase):
+  """Batch parser tests."""
+
+  # pylint: disable=protected-access
+
+  def _GetTestFilePaths(self):
+    """Retrieves the paths of the test files.
+
+    Returns:
+      list[str]: paths of the test files.
+    """
+    test_file_paths = []
+    for filename in (
+        '$I103S5F.jpg', '$II3DF3L.zip', 'localtime.tzif', 'utmp-linux_libc6',
+        'utmpx-macosx10.5', 'wintask.job'):
+      test_file_path = self._GetTestFilePath([filename])
+      self._SkipIfPathNotExists(test_file_path)
+      test_file_paths.append(test_file_path)
+
+    return test_file_paths
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    batch_parser = batch.BatchParser(maximum_number_of_workers=2)
+    self.assertEqual(batch_parser._maximum_number_of_tasks, 8)
+
+    with self.assertRaises(ValueError):
+      batch.BatchParser(maximum_file_size=0)
+
+    with self.assertRaises(ValueError):
+      batch.BatchParser(maximum_number_of_workers=0)
+
+    with self.assertRaises(ValueError):
+      batch.BatchParser(maximum_number_of_tasks=0)
+
+    with self.assertRaises(ValueError):
+      batch.BatchParser(number_of_files_per_task=0)
+
+  def testGetTasks(self):
+    """Tests the _GetTasks function."""
+    batch_parser = batch.BatchParser(number_of_files_per_task=2)
+
+    tasks = list(batch_parser._GetTasks(['a', 'b', 'c', 'd', 'e']))
+    self.assertEqual(tasks, [
+        (['a', 'b'], False), (['c', 'd'], False), (['e'], False)])
+
+    test_file_paths = self._GetTestFilePaths()
+
+    batch_parser = batch.BatchParser(
+        maximum_file_size=4096, number_of_files_per_task=2)
+
+    tasks = list(batch_parser._GetTasks(test_file_paths))
+    self.assertEqual(tasks, [
+        (test_file_paths[0:2], False), (test_file_paths[2:3], False),
+        (test_file_paths[3:4], True), (test_file_paths[4:5], True),
+        (test_file_paths[5:6], False)])
+
+  def testParsePaths(self):
+    """Tests the ParsePaths function."""
+    test_file_paths = self._GetTestFilePaths()
+
+    batch_parser = batch.BatchParser(
+        maximum_number_of_tasks=2, maximum_number_of_workers=2,
+        number_of_files_per_task=1)
+
+    results = list(batch_parser.ParsePaths(iter(test_file_paths)))
+    self.assertEqual([result.path for result in results], test_file_paths)
+    self.assertEqual([result.format_name for result in results], [
+        'RecycleBinMetadataFile', 'RecycleBinMetadataFile',
+        'TimeZoneInformationFile', 'LinuxLibc6UtmpFile', 'MacOSXUtmpxFile',
+        'WindowsTaskSchedulerJobFile'])
+    self.assertEqual([len(result.records) for result in results], [
+        1, 1, 0, 14, 6, 1])
+
+    batch_parser = batch.BatchParser(
+        maximum_number_of_workers=2, number_of_files_per_task=4,
+        ordered=False)
+
+    results = list(batch_parser.ParsePaths(test_file_paths))
+    self.assertEqual(
+        sorted(result.path for result in results), sorted(test_file_paths))
+
+  def testParsePathsWithLargeFiles(self):
+    """Tests the ParsePaths function with large files."""
+    test_file_paths = self._GetTestFilePaths()
+
+    batch_parser = batch.BatchParser(
+        maximum_file_size=4096, maximum_number_of_workers=2,
+        number_of_files_per_task=2)
+
+    results = []
+    for result in batch_parser.ParsePaths(test_file_paths):
+      results.append((result.path, result.format_name, len(list(
+          result.records))))
+
+    self.assertEqual(results, [
+        (test_file_paths[0], 'RecycleBinMetadataFile', 1),
+        (test_file_paths[1], 'RecycleBinMetadataFile', 1),
+        (test_file_paths[2], 'TimeZoneInformationFile', 0),
+        (test_file_paths[3], 'LinuxLibc6UtmpFile', 14),
+        (test_file_paths[4], 'MacOSXUtmpxFile', 6),
+        (test_file_paths[5], 'WindowsTaskSchedulerJobFile', 1)])
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+
+    batch_parser = batch.BatchParser(
+        format_class=tzif.TimeZoneInformationFile, maximum_file_size=4096,
+        maximum_number_of_workers=1)
+
+    result = list(batch_parser.ParsePaths([test_file_path]))[0]
+    self.assertEqual(list(result.records), [])
+    self.assertIsNotNone(result.error)
+
+  def testParsePathsWithProfiler(self):
+    """Tests the ParsePaths function with a profiler."""
+    test_file_paths = self._GetTestFilePaths()
+
+    data_format_profiler = profiler.DataFormatProfiler()
+    batch_parser = batch.BatchParser(
+        data_format_profiler=data_format_profiler,
+        maximum_number_of_workers=2, number_of_files_per_task=2)
+
+    results = list(batch_parser.ParsePaths(test_file_paths))
+    self.assertEqual([result.path for result in results], test_file_paths)
+
+    profiles = data_format_profiler.GetProfiles()
+    self.assertNotEqual(profiles, {})
+
+    number_of_bytes = sum(
+        profile['bytes_read'] for profile in profiles.values())
+    self.assertGreater(number_of_bytes, 0)
+
+
+class BatchFunctionsTest(test_lib.BaseTestCase):
+  """Batch functions tests."""
+
+  def testGetFilePaths(self):
+    """Tests the GetFilePaths function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      os.mkdir(os.path.join(temporary_directory, 'b'))
+      for path_segments in (['a'], ['b', 'c'], ['d']):
+        path = os.path.join(temporary_directory, *path_segments)
+        with open(path, 'wb') as file_object:
+          file_object.write(b'test')
+
+      file_paths = list(batch.GetFilePaths([temporary_directory, 'e']))
+
+    self.assertEqual(file_paths, [
+        os.path.join(temporary_directory, 'a'),
+        os.path.join(temporary_directory, 'd'),
+        os.path.join(temporary_directory, 'b', 'c'),
+        'e'])
+
+  def testGetFormatClass(self):
+    """Tests the GetFormatClass function."""
+    test_file_path = self._GetTestFilePath(['localtime.tzif'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    format_class = batch.GetFormatClass(test_file_path)
+    self.assertEqual(format_class, tzif.TimeZoneInformationFile)
+
+    test_file_path = self._GetTestFilePath(['$II3DF3L.zip'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    format_class = batch.GetFormatClass(test_file_path)
+    self.assertEqual(format_class, recycle_bin.RecycleBinMetadataFile)
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    format_class = batch.GetFormatClass(test_file_path)
+    self.assertEqual(format_class, utmp.LinuxLibc6UtmpFile)
+
+    test_file_path = self._GetTestFilePath(['cups_ipp_2.0'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    format_class = batch.GetFormatClass(test_file_path)
+    self.assertIsNone(format_class)
+
+  def testParseFile(self):
+    """Tests the ParseFile function."""
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    result = batch.ParseFile(test_file_path)
+    self.assertIsNone(result.error)
+    self.assertEqual(result.format_name, 'MacOSXUtmpxFile')
+    self.assertEqual(len(result.records), 6)
+
+    # A file that is parsed again results in the same records.
+    result = batch.ParseFile(test_file_path)
+    self.assertEqual(len(result.records), 6)
+
+    result = batch.ParseFile(
+        test_file_path, format_class=recycle_bin.RecycleBinMetadataFile)
+    self.assertIsNotNone(result.error)
+    self.assertEqual(result.format_name, 'RecycleBinMetadataFile')
+    self.assertEqual(result.records, [])
+
+    test_file_path = self._GetTestFilePath(['cups_ipp_2.0'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    result = batch.ParseFile(test_file_path)
+    self.assertEqual(result.error, 'Unsupported format.')
+    self.assertIsNone(result.format_name)
+
+  def testParseFileTwice(self):
+    """Tests the ParseFile function on the same file twice."""
+    test_file_path = self._GetTestFilePath([
+        '5afe4de1b92fc382.customDestinations-ms'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    result = batch.ParseFile(test_file_path)
+    self.assertIsNone(result.error)
+    self.assertEqual(result.format_name, 'CustomDestinationsFile')
+    self.assertEqual(len(result.records), 9)
+
+    # The entries of the previously parsed file are not kept.
+    result = batch.ParseFile(test_file_path)
+    self.assertEqual(len(result.records), 9)
+
+    record_type, values = result.records[0]
+    self.assertEqual(record_type, 'jump_list_lnk_entry')
+    self.assertEqual(values['identifier'], '0x00000024')
+
+  def testWriteResults(self):
+    """Tests the WriteResults function."""
+    result = batch.BatchResult('test1')
+    result.format_name = 'TestFile'
+    result.records = [('test', {'value': 1})]
+
+    error_result = batch.BatchResult('test2')
+    error_result.error = 'Unsupported format.'
+
+    streamed_result = batch.BatchResult('test3')
+    streamed_result.format_name = 'TestFile'
+    streamed_result.records = iter([('test', {'value': 2})])
+
+    output_writer = test_lib.TestRecordOutputWriter()
+    number_of_errors = batch.WriteResults(
+        [result, error_result, streamed_result], output_writer)
+
+    self.assertEqual(number_of_errors, 1)
+    self.assertEqual(output_writer.records, [
+        ('test', {'path': 'test1', 'value': 1}),
+        ('batch_file', {
+            'path': 'test1', 'format': 'TestFile', 'number_of_records': 1,
+            'error': None}),
+        ('batch_file', {
+            'path': 'test2', 'format': None, 'number_of_records': 0,
+            'error': 'Unsupported format.'}),
+        ('test', {'path': 'test3', 'value': 2}),
+        ('batch_file', {
+            'path': 'test3', 'format': 'TestFile', 'number_of_records': 1,
+            'error': None})])
+
+
+if __name__ == '__main__':
+  unittest.main()
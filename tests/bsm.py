@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Tests for BSM event auditing files."""
 
+import os
+import tempfile
 import unittest
 
 from dtformats import bsm
@@ -58,6 +60,27 @@ class BSMEventAuditingFileTest(test_lib.BaseTestCase):
     formatted_string = test_file._FormatString('string\x00')
     self.assertEqual(formatted_string, 'string')
 
+  def testCarveRecord(self):
+    """Tests the CarveRecord function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = bsm.BSMEventAuditingFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['openbsm.bsm'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      record_size = test_file.CarveRecord(file_object, 0)
+      self.assertGreater(record_size, 0)
+
+      with self.assertRaises(errors.ParseError):
+        test_file.CarveRecord(file_object, 1)
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'bsm_event')
+    self.assertEqual(values['offset'], 0)
+
   def testReadRecord(self):
     """Tests the _ReadRecord function."""
     output_writer = test_lib.TestOutputWriter()
@@ -94,6 +117,84 @@ class BSMEventAuditingFileTest(test_lib.BaseTestCase):
 
     test_file.Open(test_file_path)
 
+  def testReadFileObjectWithRecordOutputWriter(self):
+    """Tests the ReadFileObject function with a record output writer."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = bsm.BSMEventAuditingFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['openbsm.bsm'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    self.assertEqual(len(output_writer.records), 50)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'bsm_event')
+    self.assertEqual(values['offset'], 0)
+
+    token_types = [token['token_type'] for token in values['tokens']]
+    self.assertEqual(token_types, [0x14, 0x2d, 0x13])
+    self.assertEqual(values['tokens'][1]['argument_index'], 3)
+
+  def testReadFileObjectWithCheckpoint(self):
+    """Tests the ReadFileObject function with a checkpoint."""
+    test_file_path = self._GetTestFilePath(['openbsm.bsm'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = bsm.BSMEventAuditingFile(output_writer=output_writer)
+
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    record_offsets = [values['offset'] for _, values in output_writer.records]
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'audit')
+      with open(path, 'wb') as file_object:
+        file_object.write(data[:record_offsets[30]])
+
+      output_writer.records = []
+      test_file.Open(path)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 30)
+
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.offset, record_offsets[29])
+      self.assertEqual(checkpoint.sequence_number, 30)
+
+      # The file is appended to.
+      with open(path, 'wb') as file_object:
+        file_object.write(data)
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 20)
+
+      _, values = output_writer.records[0]
+      self.assertEqual(values['offset'], record_offsets[30])
+
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.offset, record_offsets[49])
+      self.assertEqual(checkpoint.sequence_number, 50)
+
+      # The file is replaced by a file with other records.
+      with open(path, 'wb') as file_object:
+        file_object.write(data[record_offsets[1]:])
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 49)
+
   def testReadFileObjectWithAppleBSM(self):
     """Tests the ReadFileObject function with an Apple BSM file."""
     output_writer = test_lib.TestOutputWriter()
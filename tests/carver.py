@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Tests for carving of records from raw data."""
+
+import os
+import tempfile
+import unittest
+
+from dtformats import carver
+from dtformats import data_format
+from dtformats import memory_mapped_file
+from dtformats import profiler
+from dtformats import utmp
+
+from tests import test_lib
+
+
+class CarverFunctionsTest(test_lib.BaseTestCase):
+  """Carver functions tests."""
+
+  # pylint: disable=protected-access
+
+  def _CreateRawData(self, path):
+    """Creates raw data that contains the records of test files.
+
+    Args:
+      path (str): path of the raw data file to create.
+    """
+    data = []
+    for filename in ('utmp-linux_libc6', 'openbsm.bsm'):
+      test_file_path = self._GetTestFilePath([filename])
+      self._SkipIfPathNotExists(test_file_path)
+
+      with open(test_file_path, 'rb') as file_object:
+        data.extend([b'\xff' * 333, file_object.read(), bytes(8192)])
+
+    with open(path, 'wb') as file_object:
+      file_object.write(b''.join(data))
+
+  def testCarveWindow(self):
+    """Tests the CarveWindow function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'raw')
+      self._CreateRawData(path)
+
+      records = carver.CarveWindow(path, 0, os.path.getsize(path))
+
+      self.assertEqual(len(records), 64)
+
+      record_type, values = records[0]
+      self.assertEqual(record_type, 'linux_libc6_utmp_entry')
+      self.assertEqual(values['offset'], 333)
+
+      record_type, values = records[14]
+      self.assertEqual(record_type, 'bsm_event')
+      self.assertEqual(values['offset'], 333 + 5376 + 8192 + 333)
+
+      # A record is carved by the window in which it starts.
+      records = carver.CarveWindow(path, 334, 5375, format_classes=[
+          utmp.LinuxLibc6UtmpFile])
+      offsets = [values['offset'] for _, values in records]
+      self.assertEqual(offsets, list(range(333 + 384, 333 + 5376, 384)))
+
+  def testGetSearchRanges(self):
+    """Tests the _GetSearchRanges function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'raw')
+      with open(path, 'wb') as file_object:
+        file_object.write(b''.join([
+            bytes(8192), b'\x01' * 4096, bytes(16384), b'\x01']))
+
+      with open(path, 'rb') as file_object:
+        mapped_file = memory_mapped_file.MemoryMappedFile(file_object)
+        try:
+          search_ranges = carver._GetSearchRanges(mapped_file, 0, 32768)
+          self.assertEqual(search_ranges, [
+              (8192 - 1024, 12288 + 1024), (28672 - 1024, 28673)])
+
+          search_ranges = carver._GetSearchRanges(mapped_file, 12288, 4096)
+          self.assertEqual(search_ranges, [])
+
+        finally:
+          mapped_file.close()
+
+
+class CarverTest(test_lib.BaseTestCase):
+  """Carver tests."""
+
+  # pylint: disable=protected-access
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    test_carver = carver.Carver(maximum_number_of_workers=2)
+    self.assertEqual(test_carver._maximum_number_of_tasks, 4)
+
+    with self.assertRaises(ValueError):
+      carver.Carver(format_classes=[data_format.BinaryDataFile])
+
+    with self.assertRaises(ValueError):
+      carver.Carver(maximum_number_of_workers=0)
+
+    with self.assertRaises(ValueError):
+      carver.Carver(maximum_number_of_tasks=0)
+
+    with self.assertRaises(ValueError):
+      carver.Carver(window_size=0)
+
+  def testCarvePath(self):
+    """Tests the CarvePath function."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_carver = carver.Carver(
+        format_classes=[utmp.LinuxLibc6UtmpFile], maximum_number_of_tasks=2,
+        maximum_number_of_workers=2, window_size=1000)
+
+    records = list(test_carver.CarvePath(test_file_path))
+
+    offsets = [values['offset'] for _, values in records]
+    self.assertEqual(offsets, list(range(0, 5376, 384)))
+
+  def testCarvePathWithProfiler(self):
+    """Tests the CarvePath function with a profiler."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    data_format_profiler = profiler.DataFormatProfiler()
+    test_carver = carver.Carver(
+        data_format_profiler=data_format_profiler,
+        format_classes=[utmp.LinuxLibc6UtmpFile], maximum_number_of_tasks=2,
+        maximum_number_of_workers=2, window_size=1000)
+
+    records = list(test_carver.CarvePath(test_file_path))
+    self.assertEqual(len(records), 14)
+
+    profiles = data_format_profiler.GetProfiles()
+    self.assertNotEqual(profiles, {})
+
+    number_of_calls = sum(
+        profile['map_byte_stream_calls'] for profile in profiles.values())
+    self.assertGreaterEqual(number_of_calls, 14)
+
+
+if __name__ == '__main__':
+  unittest.main()
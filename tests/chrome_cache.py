@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 """Tests for Chrome Cache files."""
 
+import io
+import os
 import unittest
 
 from dtformats import chrome_cache
+from dtformats import errors
 
 from tests import test_lib
 
@@ -92,6 +95,32 @@ class DataBlockFileTest(test_lib.BaseTestCase):
   # TODO: add tests for _ReadFileHeader.
   # TODO: add tests for ReadCacheEntry.
 
+  def testCarveRecord(self):
+    """Tests the CarveRecord function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = chrome_cache.DataBlockFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['chrome_cache', 'data_1'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      record_size = test_file.CarveRecord(file_object, 8704)
+      self.assertEqual(record_size, 256)
+
+      with self.assertRaises(errors.ParseError):
+        test_file.CarveRecord(file_object, 8705)
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'chrome_cache_entry')
+    self.assertEqual(sorted(values.keys()), [
+        'cache_address', 'creation_time', 'hash', 'key', 'offset'])
+    self.assertIsNone(values['cache_address'])
+    self.assertEqual(
+        values['key'], 'http://tools.google.com/chrome/intl/en/welcome.html')
+    self.assertEqual(values['offset'], 8704)
+
   def testReadFileObject(self):
     """Tests the ReadFileObject function."""
     output_writer = test_lib.TestOutputWriter()
@@ -103,6 +132,28 @@ class DataBlockFileTest(test_lib.BaseTestCase):
     test_file.Open(test_file_path)
 
 
+class ErrorBytesIO(io.BytesIO):
+  """Bytes IO that errors on reading."""
+
+  # The following methods are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def read(self, size=None):  # pylint: disable=redundant-returns-doc,unused-argument
+    """Reads bytes.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None represents
+          all remaining bytes.
+
+    Returns:
+      bytes: bytes read.
+
+    Raises:
+      IOError: for testing.
+    """
+    raise IOError('Unable to read for testing purposes.')
+
+
 class IndexFileTest(test_lib.BaseTestCase):
   """Chrome Cache index file tests."""
 
@@ -112,7 +163,30 @@ class IndexFileTest(test_lib.BaseTestCase):
   # TODO: add tests for _DebugPrintLRUData.
   # TODO: add tests for _ReadFileHeader.
   # TODO: add tests for _ReadLRUData.
-  # TODO: add tests for _ReadIndexTable.
+
+  def testReadIndexTable(self):
+    """Tests the _ReadIndexTable function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = chrome_cache.IndexFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['chrome_cache', 'index'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      file_object.seek(368, os.SEEK_SET)
+      test_file._ReadIndexTable(file_object)
+
+    self.assertEqual(len(test_file.index_table), 217)
+
+    cache_address = test_file.index_table[210]
+    self.assertEqual(cache_address.value, 0xa0010038)
+
+    test_file = chrome_cache.IndexFile(output_writer=output_writer)
+
+    file_object = ErrorBytesIO(b'\x00' * 32)
+    with self.assertRaisesRegex(
+        errors.ParseError, 'Unable to parse index table entry: 0 '):
+      test_file._ReadIndexTable(file_object)
 
   def testReadFileObject(self):
     """Tests the ReadFileObject function."""
@@ -124,13 +198,33 @@ class IndexFileTest(test_lib.BaseTestCase):
 
     test_file.Open(test_file_path)
 
+    self.assertEqual(len(test_file.index_table), 217)
+
 
 class ChromeCacheParserTest(test_lib.BaseTestCase):
   """Chrome Cache parser tests."""
 
-  # TODO: add tests for ParseDirectory.
   # TODO: add tests for ParseFile.
 
+  def testParseDirectory(self):
+    """Tests the ParseDirectory function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    parser = chrome_cache.ChromeCacheParser(output_writer=output_writer)
+
+    test_path = self._GetTestFilePath(['chrome_cache'])
+    self._SkipIfPathNotExists(test_path)
+
+    parser.ParseDirectory(test_path)
+
+    self.assertGreater(len(output_writer.records), 0)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'chrome_cache_entry')
+    self.assertEqual(sorted(values.keys()), [
+        'cache_address', 'creation_time', 'hash', 'key', 'offset'])
+    self.assertIsNotNone(values['cache_address'])
+    self.assertIsNotNone(values['offset'])
+
 
 if __name__ == '__main__':
   unittest.main()
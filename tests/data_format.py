@@ -2,6 +2,8 @@
 """Tests for binary data format and file."""
 
 import io
+import os
+import tempfile
 import unittest
 
 from dtfabric import errors as dtfabric_errors
@@ -10,6 +12,8 @@ from dtfabric.runtime import fabric as dtfabric_fabric
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import memory_mapped_file
+from dtformats import profiler
 
 from tests import test_lib
 
@@ -112,6 +116,190 @@ class ErrorDataTypeMap(dtfabric_data_maps.DataTypeMap):
         'Unable to map byte stream for testing purposes.')
 
 
+class FixedLayoutStructureMapTest(test_lib.BaseTestCase):
+  """Fixed-layout structure data type map tests."""
+
+  # pylint: disable=protected-access
+
+  _DEFINITION = b"""\
+name: byte
+type: integer
+attributes:
+  format: unsigned
+  size: 1
+  units: bytes
+---
+name: int16
+type: integer
+attributes:
+  format: signed
+  size: 2
+  units: bytes
+---
+name: uint32
+type: integer
+attributes:
+  format: unsigned
+  size: 4
+  units: bytes
+---
+name: uint32be
+type: integer
+attributes:
+  byte_order: big-endian
+  format: unsigned
+  size: 4
+  units: bytes
+---
+name: float32
+type: floating-point
+attributes:
+  size: 4
+  units: bytes
+---
+name: point2d
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: x
+  data_type: int16
+- name: y
+  data_type: int16
+---
+name: record
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: signature
+  type: stream
+  element_data_type: byte
+  elements_data_size: 4
+  value: "REC1"
+- name: size
+  data_type: uint32
+- name: origin
+  data_type: point2d
+- name: scale
+  data_type: float32
+- name: name
+  type: string
+  encoding: ascii
+  element_data_type: byte
+  elements_data_size: 8
+  elements_terminator: "\\x00"
+- name: values
+  type: sequence
+  element_data_type: int16
+  number_of_elements: 2
+---
+name: mixed_byte_order
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: value1
+  data_type: uint32
+- name: value2
+  data_type: uint32be
+"""
+
+  _FABRIC = dtfabric_fabric.DataTypeFabric(yaml_definition=_DEFINITION)
+
+  _RECORD_DATA = (
+      b'REC1\x20\x00\x00\x00\xff\xff\x02\x00\x00\x00\x00\x3f'
+      b'test\x00abc\x01\x00\xfe\xff')
+
+  def _CreateDataTypeMap(self, name):
+    """Creates a fixed-layout structure data type map.
+
+    Args:
+      name (str): name of the data type.
+
+    Returns:
+      FixedLayoutStructureMap: data type map.
+    """
+    return data_format.FixedLayoutStructureMap(
+        self._FABRIC.CreateDataTypeMap(name),
+        self._FABRIC.GetDataTypeDefinition(name))
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    data_type_map = self._CreateDataTypeMap('record')
+    self.assertIsNotNone(data_type_map)
+    self.assertEqual(data_type_map.name, 'record')
+    self.assertEqual(data_type_map.GetSizeHint(), 28)
+    self.assertEqual(data_type_map.GetStructFormatString(), '<4sIhhf8s2h')
+
+    with self.assertRaises(ValueError):
+      self._CreateDataTypeMap('mixed_byte_order')
+
+    with self.assertRaises(ValueError):
+      self._CreateDataTypeMap('uint32')
+
+  def testMapByteStream(self):
+    """Tests the MapByteStream function."""
+    data_type_map = self._CreateDataTypeMap('record')
+    dtfabric_data_type_map = self._FABRIC.CreateDataTypeMap('record')
+
+    context = dtfabric_data_maps.DataTypeMapContext()
+    record = data_type_map.MapByteStream(
+        b''.join([b'\x00\x00', self._RECORD_DATA]), byte_offset=2,
+        context=context)
+    self.assertEqual(context.byte_size, 28)
+
+    expected_record = dtfabric_data_type_map.MapByteStream(self._RECORD_DATA)
+    self.assertEqual(type(record).__name__, type(expected_record).__name__)
+
+    self.assertEqual(record.signature, b'REC1')
+    self.assertEqual(record.size, 32)
+    self.assertEqual(record.origin.x, -1)
+    self.assertEqual(record.origin.y, 2)
+    self.assertEqual(record.scale, 0.5)
+    self.assertEqual(record.name, 'test')
+    self.assertEqual(record.values, (1, -2))
+
+    for name in ('signature', 'size', 'scale', 'name', 'values'):
+      self.assertEqual(
+          getattr(record, name), getattr(expected_record, name, None))
+
+    # Test with unsupported value.
+    with self.assertRaises(dtfabric_errors.MappingError):
+      data_type_map.MapByteStream(b''.join([b'REC2', self._RECORD_DATA[4:]]))
+
+    # Test with byte stream too small.
+    with self.assertRaises(dtfabric_errors.ByteStreamTooSmallError):
+      data_type_map.MapByteStream(self._RECORD_DATA[:-1])
+
+
+class LazyDataTypeFabricTest(test_lib.BaseTestCase):
+  """Lazily read data type fabric tests."""
+
+  # pylint: disable=protected-access
+
+  def testGet(self):
+    """Tests the __get__ function."""
+
+    class TestLazyBinaryDataFormat(data_format.BinaryDataFormat):
+      """Binary data format with a lazily read fabric for testing."""
+
+      _FABRIC = data_format.LazyDataTypeFabric('utmp.yaml')
+
+    descriptor = TestLazyBinaryDataFormat.__dict__['_FABRIC']
+    self.assertIsNone(descriptor._fabric)
+
+    fabric = TestLazyBinaryDataFormat._FABRIC
+    self.assertIsInstance(fabric, dtfabric_fabric.DataTypeFabric)
+    self.assertIs(descriptor._fabric, fabric)
+
+    test_format = TestLazyBinaryDataFormat()
+    self.assertIs(test_format._FABRIC, fabric)
+
+    data_type_map = test_format._GetDataTypeMap('linux_libc6_utmp_entry')
+    self.assertIsNotNone(data_type_map)
+
+
 class BinaryDataFormatTest(test_lib.BaseTestCase):
   """Binary data format tests."""
 
@@ -131,6 +319,25 @@ class BinaryDataFormatTest(test_lib.BaseTestCase):
          '.......\n\n')]
     self.assertEqual(output_writer.output, expected_output)
 
+    # Test with data that is written in multiple parts.
+    output_writer = test_lib.TestOutputWriter()
+    test_format = TestBinaryDataFormat(output_writer=output_writer)
+    test_format._HEXDUMP_LINES_PER_WRITE = 1
+
+    data = (
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x41\x42\x43')
+    test_format._DebugPrintData('Description', data)
+
+    expected_output = [
+        'Description:\n',
+        ('0x00000000  00 01 02 03 04 05 06 07  08 09 0a 0b 0c 0d 0e 0f  '
+         '................\n'),
+        ('0x00000010  41 42 43                                          '
+         'ABC\n'),
+        '\n']
+    self.assertEqual(output_writer.output, expected_output)
+
   def testDebugPrintDecimalValue(self):
     """Tests the _DebugPrintDecimalValue function."""
     output_writer = test_lib.TestOutputWriter()
@@ -206,6 +413,34 @@ class BinaryDataFormatTest(test_lib.BaseTestCase):
     formatted_data = test_format._FormatDataInHexadecimal(data)
     self.assertEqual(formatted_data, expected_formatted_data)
 
+  def testFormatDataInHexadecimalLines(self):
+    """Tests the _FormatDataInHexadecimalLines function."""
+    test_format = TestBinaryDataFormat()
+
+    lines = list(test_format._FormatDataInHexadecimalLines(b''))
+    self.assertEqual(lines, [])
+
+    data = (
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x7e\x7f\x80')
+    expected_lines = [
+        ('0x00000000  00 01 02 03 04 05 06 07  08 09 0a 0b 0c 0d 0e 0f  '
+         '................\n'),
+        '...\n',
+        ('0x00000030  7e 7f 80                                          '
+         '~..\n')]
+    lines = list(test_format._FormatDataInHexadecimalLines(data))
+    self.assertEqual(lines, expected_lines)
+
+    # Test with a sequence of byte values.
+    lines = list(test_format._FormatDataInHexadecimalLines([0x41, 0x42]))
+    expected_lines = [
+        ('0x00000000  41 42                                             '
+         'AB\n')]
+    self.assertEqual(lines, expected_lines)
+
   def testFormatPackedIPv4Address(self):
     """Tests the _FormatPackedIPv4Address function."""
     test_format = TestBinaryDataFormat()
@@ -222,7 +457,42 @@ class BinaryDataFormatTest(test_lib.BaseTestCase):
         0x00, 0x42, 0x83, 0x29])
     self.assertEqual(ip_address, '2001:0db8:0000:0000:0000:ff00:0042:8329')
 
-  # TODO: add tests for _GetDataTypeMap
+  def testGetDataTypeMap(self):
+    """Tests the _GetDataTypeMap function."""
+    test_format = TestBinaryDataFormat()
+
+    data_type_map = test_format._GetDataTypeMap('point3d')
+    self.assertIsNotNone(data_type_map)
+    self.assertEqual(
+        test_format._fixed_data_type_map_sizes.get(data_type_map, None), 12)
+
+    self.assertIsInstance(
+        data_type_map, data_format.FixedLayoutStructureMap)
+
+    cached_data_type_map = test_format._GetDataTypeMap('point3d')
+    self.assertIs(cached_data_type_map, data_type_map)
+
+    data_type_map = test_format._GetDataTypeMap('shape3d')
+    self.assertIsNotNone(data_type_map)
+    self.assertNotIsInstance(
+        data_type_map, data_format.FixedLayoutStructureMap)
+    self.assertIsNone(
+        test_format._fixed_data_type_map_sizes.get(data_type_map, None))
+
+  def testGetStructureObjectValues(self):
+    """Tests the _GetStructureObjectValues function."""
+    test_format = TestBinaryDataFormat()
+
+    data_type_map = test_format._GetDataTypeMap('point3d')
+    point3d = data_type_map.CreateStructureValues(x=1, y=2, z=3)
+
+    debug_info = [
+        ('x', 'X', '_FormatIntegerAsDecimal'),
+        ('z', 'Z', '_FormatIntegerAsHexadecimal8'),
+        ('bogus', 'Bogus', '_FormatIntegerAsDecimal')]
+
+    values = test_format._GetStructureObjectValues(point3d, debug_info)
+    self.assertEqual(values, {'x': 1, 'z': 3})
 
   def testReadData(self):
     """Tests the _ReadData function."""
@@ -256,7 +526,81 @@ class BinaryDataFormatTest(test_lib.BaseTestCase):
     with self.assertRaises(errors.ParseError):
       test_format._ReadData(file_object, 0, data_size, 'point3d')
 
-  # TODO: add tests for _ReadDefinitionFile
+  def testReadDataWithMemoryMappedFile(self):
+    """Tests the _ReadData function with a memory-mapped file."""
+    test_format = TestBinaryDataFormat()
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    file_object = memory_mapped_file.MemoryMappedFile(
+        open(test_file_path, 'rb'))  # pylint: disable=consider-using-with
+
+    try:
+      data = test_format._ReadData(file_object, 384, 4, 'uint32')
+      self.assertEqual(data, b'\x01\x00\x00\x00')
+      self.assertEqual(file_object.tell(), 388)
+
+      # Test with file-like object with insufficient data.
+      with self.assertRaises(errors.ParseError):
+        test_format._ReadData(file_object, 5374, 4, 'uint32')
+
+    finally:
+      file_object.close()
+
+  def testReadDefinitionFile(self):
+    """Tests the ReadDefinitionFile function."""
+    fabric = data_format.BinaryDataFormat.ReadDefinitionFile('utmp.yaml')
+    self.assertIsNotNone(fabric)
+
+    cached_fabric = data_format.BinaryDataFormat.ReadDefinitionFile(
+        'utmp.yaml')
+    self.assertIs(cached_fabric, fabric)
+
+    fabric = data_format.BinaryDataFormat.ReadDefinitionFile(None)
+    self.assertIsNone(fabric)
+
+  def testReadDefinitionFileWithCache(self):
+    """Tests the ReadDefinitionFile function with a definitions cache."""
+    test_format = data_format.BinaryDataFormat
+    path = os.path.join(test_format._DEFINITION_FILES_PATH, 'utmp.yaml')
+
+    environment_variable = test_format._DEFINITIONS_CACHE_ENVIRONMENT_VARIABLE
+    original_value = os.environ.get(environment_variable, None)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      os.environ[environment_variable] = temporary_directory
+      try:
+        test_format._FABRICS_PER_PATH.pop(path, None)
+        fabric = test_format.ReadDefinitionFile('utmp.yaml')
+        self.assertIsNotNone(fabric)
+
+        cache_file_path = test_format._GetDefinitionsCacheFilePath(path)
+        self.assertTrue(os.path.isfile(cache_file_path))
+        self.assertEqual(os.listdir(temporary_directory), [
+            os.path.basename(cache_file_path)])
+
+        test_format._FABRICS_PER_PATH.pop(path, None)
+        cached_fabric = test_format.ReadDefinitionFile('utmp.yaml')
+        self.assertIsNot(cached_fabric, fabric)
+
+        data_type_map = cached_fabric.CreateDataTypeMap(
+            'linux_libc6_utmp_entry')
+        self.assertIsNotNone(data_type_map)
+
+        # Test with a corrupt cache file.
+        with open(cache_file_path, 'wb') as file_object:
+          file_object.write(b'corrupt')
+
+        test_format._FABRICS_PER_PATH.pop(path, None)
+        fabric = test_format.ReadDefinitionFile('utmp.yaml')
+        self.assertIsNotNone(fabric)
+
+      finally:
+        if original_value is None:
+          del os.environ[environment_variable]
+        else:
+          os.environ[environment_variable] = original_value
 
   def testReadStructure(self):
     """Tests the _ReadStructure function."""
@@ -313,8 +657,18 @@ class BinaryDataFormatTest(test_lib.BaseTestCase):
         b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00')
 
     data_type_map = test_format._GetDataTypeMap('point3d')
-    test_format._ReadStructureFromFileObject(
+    point3d, data_size = test_format._ReadStructureFromFileObject(
         file_object, 0, data_type_map, 'point3d')
+    self.assertEqual(data_size, 12)
+    self.assertEqual(point3d.z, 3)
+
+    # Test with file-like object with insufficient data.
+    file_object = io.BytesIO(
+        b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00')
+
+    with self.assertRaises(errors.ParseError):
+      test_format._ReadStructureFromFileObject(
+          file_object, 0, data_type_map, 'point3d')
 
     file_object = io.BytesIO(
         b'\x03\x00\x00\x00'
@@ -323,8 +677,153 @@ class BinaryDataFormatTest(test_lib.BaseTestCase):
         b'\x06\x00\x00\x00\x07\x00\x00\x00\x08\x00\x00\x00')
 
     data_type_map = test_format._GetDataTypeMap('shape3d')
-    test_format._ReadStructureFromFileObject(
+    shape3d, data_size = test_format._ReadStructureFromFileObject(
         file_object, 0, data_type_map, 'shape3d')
+    self.assertEqual(data_size, 40)
+    self.assertEqual(len(shape3d.points), 3)
+
+  def testReadStructureFromFileObjectWithProfiler(self):
+    """Tests the _ReadStructureFromFileObject function with a profiler."""
+    test_profiler = profiler.DataFormatProfiler()
+    test_format = TestBinaryDataFormat()
+
+    file_object = io.BytesIO(
+        b'\x03\x00\x00\x00'
+        b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00'
+        b'\x04\x00\x00\x00\x05\x00\x00\x00\x06\x00\x00\x00'
+        b'\x06\x00\x00\x00\x07\x00\x00\x00\x08\x00\x00\x00')
+
+    data_format.BinaryDataFormat.SetProfiler(test_profiler)
+    try:
+      data_type_map = test_format._GetDataTypeMap('point3d')
+      test_format._ReadStructureFromFileObject(
+          file_object, 4, data_type_map, 'point3d')
+
+      data_type_map = test_format._GetDataTypeMap('shape3d')
+      test_format._ReadStructureFromFileObject(
+          file_object, 0, data_type_map, 'shape3d')
+
+      test_format._ReadData(file_object, 0, 4, 'number of points')
+
+    finally:
+      data_format.BinaryDataFormat.SetProfiler(None)
+
+    profiles = test_profiler.GetProfiles()
+    self.assertEqual(
+        sorted(profiles.keys()), ['number of points', 'point3d', 'shape3d'])
+
+    profile = profiles['point3d']
+    self.assertEqual(profile['read_data_calls'], 1)
+    self.assertEqual(profile['bytes_read'], 12)
+    self.assertEqual(profile['map_byte_stream_calls'], 1)
+    self.assertEqual(profile['byte_stream_too_small_retries'], 0)
+
+    profile = profiles['shape3d']
+    self.assertEqual(profile['read_data_calls'], 2)
+    self.assertEqual(profile['bytes_read'], 40)
+    self.assertEqual(profile['map_byte_stream_calls'], 2)
+    self.assertEqual(profile['byte_stream_too_small_retries'], 1)
+    self.assertGreater(profile['time'], 0.0)
+
+    profile = profiles['number of points']
+    self.assertEqual(profile['read_data_calls'], 1)
+    self.assertEqual(profile['bytes_read'], 4)
+    self.assertEqual(profile['map_byte_stream_calls'], 0)
+
+  def testReadStructuresFromFileObject(self):
+    """Tests the _ReadStructuresFromFileObject function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_format = TestBinaryDataFormat(
+        debug=True, output_writer=output_writer)
+
+    file_object = io.BytesIO(
+        b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00'
+        b'\x04\x00\x00\x00\x05\x00\x00\x00\x06\x00\x00\x00'
+        b'\x06\x00\x00\x00\x07\x00\x00\x00\x08\x00\x00\x00')
+
+    data_type_map = test_format._GetDataTypeMap('point3d')
+
+    # Use a read buffer smaller than the data to test multiple reads.
+    test_format._MAXIMUM_READ_BUFFER_SIZE = 16
+
+    points = list(test_format._ReadStructuresFromFileObject(
+        file_object, 0, 36, data_type_map, 'point3d'))
+    self.assertEqual(len(points), 3)
+
+    point3d, file_offset = points[1]
+    self.assertEqual(file_offset, 12)
+    self.assertEqual(point3d.x, 4)
+
+    points = list(test_format._ReadStructuresFromFileObject(
+        file_object, 12, 24, data_type_map, 'point3d'))
+    self.assertEqual(len(points), 2)
+
+    # Test with data size that is not a multiple of the structure size.
+    points = test_format._ReadStructuresFromFileObject(
+        file_object, 0, 30, data_type_map, 'point3d')
+
+    with self.assertRaises(errors.ParseError):
+      list(points)
+
+    # Test with data type map that does not have a fixed size.
+    data_type_map = test_format._GetDataTypeMap('shape3d')
+
+    with self.assertRaises(ValueError):
+      list(test_format._ReadStructuresFromFileObject(
+          file_object, 0, 36, data_type_map, 'shape3d'))
+
+
+  def testWriteRecord(self):
+    """Tests the _WriteRecord function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_format = TestBinaryDataFormat(output_writer=output_writer)
+
+    test_format._WriteRecord('point3d', {'x': 1})
+    self.assertEqual(output_writer.records, [('point3d', {'x': 1})])
+
+    # Test with an output writer that does not support records.
+    output_writer = test_lib.TestOutputWriter()
+    test_format = TestBinaryDataFormat(output_writer=output_writer)
+
+    test_format._WriteRecord('point3d', {'x': 1})
+    self.assertEqual(output_writer.output, [])
+
+class CheckpointTest(test_lib.BaseTestCase):
+  """Checkpoint tests."""
+
+  def testCopyFromString(self):
+    """Tests the CopyFromString function."""
+    checkpoint = data_format.Checkpoint()
+
+    checkpoint.CopyFromString(
+        'eyJmaWxlX2lkZW50aXR5IjogImFiY2QiLCAib2Zmc2V0IjogMzg0LCAic2VxdWVuY2'
+        'VfbnVtYmVyIjogMn0=')
+    self.assertEqual(checkpoint.file_identity, 'abcd')
+    self.assertEqual(checkpoint.offset, 384)
+    self.assertEqual(checkpoint.sequence_number, 2)
+
+    with self.assertRaises(ValueError):
+      checkpoint.CopyFromString('bogus')
+
+    with self.assertRaises(ValueError):
+      checkpoint.CopyFromString('WzFd')
+
+    with self.assertRaises(ValueError):
+      checkpoint.CopyFromString('eyJvZmZzZXQiOiAzODR9')
+
+  def testCopyToString(self):
+    """Tests the CopyToString function."""
+    checkpoint = data_format.Checkpoint(
+        file_identity='abcd', offset=384, sequence_number=2)
+
+    token = checkpoint.CopyToString()
+    self.assertEqual(token, (
+        'eyJmaWxlX2lkZW50aXR5IjogImFiY2QiLCAib2Zmc2V0IjogMzg0LCAic2VxdWVuY2'
+        'VfbnVtYmVyIjogMn0='))
+
+    copied_checkpoint = data_format.Checkpoint()
+    copied_checkpoint.CopyFromString(token)
+    self.assertEqual(copied_checkpoint, checkpoint)
 
 
 class BinaryDataFileTest(test_lib.BaseTestCase):
@@ -347,6 +846,45 @@ class BinaryDataFileTest(test_lib.BaseTestCase):
     with self.assertRaises(IOError):
       test_file.Close()
 
+    # The format does not support checkpoints.
+    checkpoint = data_format.Checkpoint(
+        file_identity='abcd', offset=384, sequence_number=2)
+
+    with self.assertRaises(ValueError):
+      test_file.Open(test_file_path, checkpoint=checkpoint)
+
+  def testOpenCloseWithMmap(self):
+    """Tests the Open and Close functions with a memory-mapped file."""
+    test_file = data_format.BinaryDataFile()
+
+    test_file_path = self._GetTestFilePath(['cpio', 'syslog.bin.cpio'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path, use_mmap=True)
+
+    with self.assertRaises(IOError):
+      test_file.Open(test_file_path)
+
+    test_file.Close()
+
+  def testOpenCloseWithPageCache(self):
+    """Tests the Open and Close functions with a page cache."""
+    test_file = data_format.BinaryDataFile()
+
+    test_file_path = self._GetTestFilePath(['cpio', 'syslog.bin.cpio'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path, page_cache_block_size=4096)
+
+    with self.assertRaises(IOError):
+      test_file.Open(test_file_path)
+
+    test_file.Close()
+
+    with self.assertRaises(ValueError):
+      test_file.Open(
+          test_file_path, page_cache_block_size=4096, use_mmap=True)
+
 
 if __name__ == '__main__':
   unittest.main()
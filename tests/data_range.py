@@ -3,9 +3,11 @@
 
 import io
 import os
+import tempfile
 import unittest
 
 from dtformats import data_range
+from dtformats import memory_mapped_file
 
 from tests import test_lib
 
@@ -44,6 +46,96 @@ class DataRangeTest(test_lib.BaseTestCase):
 
     test_range.data_offset = 64
 
+  def testReadWithNestedDataRange(self):
+    """Tests the read function with a nested data range."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    parent_range = data_range.DataRange(
+        file_object, data_offset=32, data_size=64)
+    test_range = data_range.DataRange(
+        parent_range, data_offset=16, data_size=64)
+
+    byte_stream = test_range.read(size=1)
+    self.assertEqual(byte_stream, b'\x30')
+
+    # The nested data range is limited to the end of the parent data range.
+    byte_stream = test_range.read()
+    self.assertEqual(byte_stream, self._FILE_DATA[49:96])
+
+    byte_stream = test_range.read()
+    self.assertEqual(byte_stream, b'')
+
+  def testReadinto(self):
+    """Tests the readinto function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_range = data_range.DataRange(
+        file_object, data_offset=32, data_size=64)
+
+    buffer = bytearray(48)
+    read_count = test_range.readinto(buffer)
+    self.assertEqual(read_count, 48)
+    self.assertEqual(bytes(buffer), self._FILE_DATA[32:80])
+
+    read_count = test_range.readinto(buffer)
+    self.assertEqual(read_count, 16)
+    self.assertEqual(bytes(buffer[:16]), self._FILE_DATA[80:96])
+
+    read_count = test_range.readinto(buffer)
+    self.assertEqual(read_count, 0)
+
+  def testReadintoWithFileWithoutViews(self):
+    """Tests the readinto function with a file that does not support views."""
+    with tempfile.TemporaryFile() as file_object:
+      file_object.write(self._FILE_DATA)
+
+      test_range = data_range.DataRange(
+          file_object, data_offset=32, data_size=64)
+
+      buffer = bytearray(16)
+      read_count = test_range.readinto(buffer)
+      self.assertEqual(read_count, 16)
+      self.assertEqual(bytes(buffer), self._FILE_DATA[32:48])
+      self.assertEqual(test_range.get_offset(), 16)
+
+  def testReadView(self):
+    """Tests the read_view function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_range = data_range.DataRange(
+        file_object, data_offset=32, data_size=64)
+
+    view = test_range.read_view(size=16)
+    self.assertIsInstance(view, memoryview)
+    self.assertEqual(view.tobytes(), self._FILE_DATA[32:48])
+    view.release()
+
+    view = test_range.read_view()
+    self.assertEqual(view.tobytes(), self._FILE_DATA[48:96])
+    view.release()
+
+    view = test_range.read_view()
+    self.assertEqual(len(view), 0)
+
+  def testReadViewWithMemoryMappedFile(self):
+    """Tests the read_view function with a memory-mapped file."""
+    with tempfile.TemporaryFile() as file_object:
+      file_object.write(self._FILE_DATA)
+      file_object.flush()
+
+      mapped_file = memory_mapped_file.MemoryMappedFile(file_object)
+      parent_range = data_range.DataRange(
+          mapped_file, data_offset=32, data_size=64)
+      test_range = data_range.DataRange(
+          parent_range, data_offset=8, data_size=16)
+
+      view = test_range.read_view()
+      self.assertEqual(view.tobytes(), self._FILE_DATA[40:56])
+      view.release()
+
+      test_range.seek(0, os.SEEK_SET)
+      byte_stream = test_range.read()
+      self.assertEqual(byte_stream, self._FILE_DATA[40:56])
+
+      mapped_file.close()
+
   def testSeek(self):
     """Tests the seek function."""
     file_object = io.BytesIO(self._FILE_DATA)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Tests for signature-based format detection."""
+
+import io
+import unittest
+
+from dtformats import asl
+from dtformats import chrome_cache
+from dtformats import cpio
+from dtformats import data_format
+from dtformats import format_detector
+from dtformats import gzipfile
+from dtformats import profiler
+from dtformats import tzif
+from dtformats import unified_logging
+from dtformats import wemf
+
+from tests import test_lib
+
+
+class FormatDetectorTest(test_lib.BaseTestCase):
+  """Signature-based format detector tests."""
+
+  _FORMAT_CLASSES = [
+      asl.AppleSystemLogFile,
+      chrome_cache.DataBlockFile,
+      chrome_cache.IndexFile,
+      cpio.CPIOArchiveFile,
+      gzipfile.GZipFile,
+      tzif.TimeZoneInformationFile,
+      unified_logging.DSCFile,
+      unified_logging.TraceV3File,
+      unified_logging.UUIDTextFile,
+      wemf.EMFFile,
+      wemf.WMFFile]
+
+  # pylint: disable=protected-access
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    detector = format_detector.FormatDetector(
+        format_classes=self._FORMAT_CLASSES)
+    self.assertEqual(detector.prefix_size, 44)
+    self.assertEqual(detector._key_size_per_offset, {0: 2, 40: 4})
+
+    detector = format_detector.FormatDetector()
+    self.assertEqual(detector.prefix_size, 0)
+    self.assertEqual(detector.DetectData(b'TZif'), [])
+
+  def testDeregisterFormat(self):
+    """Tests the DeregisterFormat function."""
+    detector = format_detector.FormatDetector(
+        format_classes=[tzif.TimeZoneInformationFile, wemf.EMFFile])
+    self.assertEqual(detector.prefix_size, 44)
+
+    detector.DeregisterFormat(wemf.EMFFile)
+    self.assertEqual(detector.prefix_size, 4)
+
+    with self.assertRaises(KeyError):
+      detector.DeregisterFormat(wemf.EMFFile)
+
+  def testDetectData(self):
+    """Tests the DetectData function."""
+    detector = format_detector.FormatDetector(
+        format_classes=self._FORMAT_CLASSES)
+
+    format_classes = detector.DetectData(b'070701' + bytes(64))
+    self.assertEqual(format_classes, [cpio.CPIOArchiveFile])
+
+    format_classes = detector.DetectData(b'\x71\xc7' + bytes(64))
+    self.assertEqual(format_classes, [cpio.CPIOArchiveFile])
+
+    format_classes = detector.DetectData(b'0707')
+    self.assertEqual(format_classes, [])
+
+    format_classes = detector.DetectData(b'\x01\x00\x00\x00' + bytes(40))
+    self.assertEqual(format_classes, [])
+
+    format_classes = detector.DetectData(b'\x01\x00\x09\x00' + bytes(36) + (
+        b' EMF'))
+    self.assertEqual(format_classes, [wemf.EMFFile, wemf.WMFFile])
+
+    format_classes = detector.DetectData(b'')
+    self.assertEqual(format_classes, [])
+
+  def testDetectFileObject(self):
+    """Tests the DetectFileObject function."""
+    detector = format_detector.FormatDetector(
+        format_classes=self._FORMAT_CLASSES)
+
+    file_object = io.BytesIO(b'hcsd\x02\x00\x00\x00')
+    file_object.seek(4)
+
+    format_classes = detector.DetectFileObject(file_object)
+    self.assertEqual(format_classes, [unified_logging.DSCFile])
+
+    # The read and the matching of the prefix are profiled.
+    data_format_profiler = profiler.DataFormatProfiler()
+    detector = format_detector.FormatDetector(
+        format_classes=self._FORMAT_CLASSES, profiler=data_format_profiler)
+
+    format_classes = detector.DetectFileObject(file_object)
+    self.assertEqual(format_classes, [unified_logging.DSCFile])
+
+    profiles = data_format_profiler.GetProfiles()
+    self.assertEqual(sorted(profiles), [
+        'signature matching', 'signature prefix'])
+    self.assertEqual(profiles['signature prefix']['bytes_read'], 8)
+
+  def testDetectPath(self):
+    """Tests the DetectPath function."""
+    detector = format_detector.FormatDetector(
+        format_classes=self._FORMAT_CLASSES)
+
+    expected_format_classes_per_path = [
+        (('0000000000000030.tracev3', ), unified_logging.TraceV3File),
+        (('Memo.emf', ), wemf.EMFFile),
+        (('applesystemlog.asl', ), asl.AppleSystemLogFile),
+        (('chrome_cache', 'data_1'), chrome_cache.DataBlockFile),
+        (('chrome_cache', 'index'), chrome_cache.IndexFile),
+        (('cpio', 'syslog.bin.cpio'), cpio.CPIOArchiveFile),
+        (('cpio', 'syslog.newc.cpio'), cpio.CPIOArchiveFile),
+        (('grid.wmf', ), wemf.WMFFile),
+        (('localtime.tzif', ), tzif.TimeZoneInformationFile),
+        (('syslog.gz', ), gzipfile.GZipFile),
+        (('uuidtext', 'dsc', 'dsc-version1'), unified_logging.DSCFile),
+        (('uuidtext', '22', '0D3C2953A33917B333DD8366AC25F2'),
+         unified_logging.UUIDTextFile)]
+
+    for path_segments, expected_format_class in (
+        expected_format_classes_per_path):
+      test_file_path = self._GetTestFilePath(list(path_segments))
+      self._SkipIfPathNotExists(test_file_path)
+
+      format_classes = detector.DetectPath(test_file_path)
+      self.assertEqual(format_classes, [expected_format_class])
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    format_classes = detector.DetectPath(test_file_path)
+    self.assertEqual(format_classes, [])
+
+  def testRegisterFormat(self):
+    """Tests the RegisterFormat function."""
+    detector = format_detector.FormatDetector()
+
+    detector.RegisterFormat(tzif.TimeZoneInformationFile)
+    self.assertEqual(detector.prefix_size, 4)
+
+    with self.assertRaises(KeyError):
+      detector.RegisterFormat(tzif.TimeZoneInformationFile)
+
+    with self.assertRaises(ValueError):
+      detector.RegisterFormat(data_format.BinaryDataFile)
+
+
+if __name__ == '__main__':
+  unittest.main()
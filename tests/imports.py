@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Tests for the import time of the dtformats modules."""
+
+import glob
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from tests import test_lib
+
+
+class ImportTimeTest(test_lib.BaseTestCase):
+  """Import time tests."""
+
+  # Environment variable that contains the maximum time in seconds that
+  # importing a single module is allowed to take, including importing its
+  # dependencies, such as dfdatetime and dtFabric. The import time is only
+  # tested if it is set, such as to 0.5, since the time depends on the load
+  # of the system. Importing the slowest module, async_parser, takes about
+  # 0.25 seconds.
+  _IMPORT_TIME_BUDGET_ENVIRONMENT_VARIABLE = 'DTFORMATS_IMPORT_TIME_BUDGET'
+
+  # Modules that should only be imported when a format needs them.
+  _DEFERRED_MODULES = frozenset([
+      'lz4', 'lz4.block', 'pyfwsi', 'pylnk', 'pyolecf', 'pyregf'])
+
+  # The script records the files opened and the deferred modules of which
+  # an import is attempted, which also covers native bindings that are not
+  # installed.
+  _IMPORT_SCRIPT = '\n'.join([
+      'import builtins',
+      'import json',
+      'import sys',
+      'import time',
+      'deferred_modules = set({1!r})',
+      'imported_deferred_modules = []',
+      'opened_paths = []',
+      'open_function = builtins.open',
+      'def _Open(file, *args, **kwargs):',
+      '  opened_paths.append(str(file))',
+      '  return open_function(file, *args, **kwargs)',
+      'class _DeferredModulesFinder(object):',
+      '  def find_spec(self, name, path, target=None):',
+      '    if name in deferred_modules:',
+      '      imported_deferred_modules.append(name)',
+      '    return None',
+      'builtins.open = _Open',
+      'sys.meta_path.insert(0, _DeferredModulesFinder())',
+      'start_time = time.time()',
+      'import dtformats.{0:s}',
+      'import_time = time.time() - start_time',
+      'builtins.open = open_function',
+      'from dtformats import data_format',
+      'print(json.dumps({{',
+      '    "deferred_modules": sorted(imported_deferred_modules),',
+      '    "fabrics": len(data_format.BinaryDataFormat._FABRICS_PER_PATH),',
+      '    "import_time": import_time,',
+      '    "opened_paths": opened_paths}}))'])
+
+  def _GetModuleNames(self):
+    """Retrieves the names of the dtformats modules.
+
+    Returns:
+      list[str]: names of the dtformats modules.
+    """
+    path = os.path.join(os.path.dirname(self._TEST_DATA_PATH), 'dtformats')
+    return sorted([
+        os.path.splitext(os.path.basename(module_path))[0]
+        for module_path in glob.glob(os.path.join(path, '*.py'))
+        if not module_path.endswith('__init__.py')])
+
+  def _ImportModule(self, module_name):
+    """Imports a module in a separate Python process.
+
+    Args:
+      module_name (str): name of the dtformats module.
+
+    Returns:
+      dict[str, object]: names of the deferred modules of which an import was
+          attempted, number of data type fabrics read, import time in seconds
+          and paths of the files opened.
+    """
+    script = self._IMPORT_SCRIPT.format(
+        module_name, sorted(self._DEFERRED_MODULES))
+    process = subprocess.Popen(
+        [sys.executable, '-c', script],
+        cwd=os.path.dirname(self._TEST_DATA_PATH), stderr=subprocess.PIPE,
+        stdout=subprocess.PIPE)
+    output_data, error_data = process.communicate()
+
+    self.assertEqual(process.returncode, 0, msg=error_data.decode('utf-8'))
+
+    return json.loads(output_data.decode('utf-8'))
+
+  def testImportModules(self):
+    """Tests importing the dtformats modules."""
+    for module_name in self._GetModuleNames():
+      results = self._ImportModule(module_name)
+
+      self.assertEqual(results['deferred_modules'], [], msg=module_name)
+      self.assertEqual(results['fabrics'], 0, msg=module_name)
+      self.assertEqual(results['opened_paths'], [], msg=module_name)
+
+  def testImportTime(self):
+    """Tests the import time of the dtformats modules."""
+    import_time_budget = os.environ.get(
+        self._IMPORT_TIME_BUDGET_ENVIRONMENT_VARIABLE, None)
+    if not import_time_budget:
+      raise unittest.SkipTest('missing import time budget')
+
+    for module_name in self._GetModuleNames():
+      results = self._ImportModule(module_name)
+
+      self.assertLess(
+          results['import_time'], float(import_time_budget), msg=module_name)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -33,6 +33,23 @@ class WindowsTaskSchedulerJobFileTest(test_lib.BaseTestCase):
 
     test_file.Open(test_file_path)
 
+  def testReadFileObjectWithRecordOutputWriter(self):
+    """Tests the ReadFileObject with a record output writer."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = job.WindowsTaskSchedulerJobFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['wintask.job'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'windows_task_configuration')
+    self.assertEqual(values['author'], 'Brian')
+
 
 if __name__ == '__main__':
   unittest.main()
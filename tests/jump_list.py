@@ -68,6 +68,39 @@ class AutomaticDestinationsFileTest(test_lib.BaseTestCase):
     self._SkipIfPathNotExists(test_file_path)
 
     test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(test_file.entries), 11)
+
+    # The entries of the previously read file are not kept.
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(test_file.entries), 11)
+
+  def testReadFileObjectWithRecordOutputWriter(self):
+    """Tests the ReadFileObject function with a record output writer."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = jump_list.AutomaticDestinationsFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath([
+        '1b4dd67f29cb1962.automaticDestinations-ms'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(output_writer.records), 22)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'jump_list_dest_list_entry')
+    self.assertEqual(values['entry_number'], 11)
+    self.assertEqual(values['hostname'], 'wks-win764bitb')
+    self.assertEqual(values['path'], 'C:\\Users\\nfury\\Pictures\\The SHIELD')
+
+    record_type, values = output_writer.records[-1]
+    self.assertEqual(record_type, 'jump_list_lnk_entry')
+    self.assertEqual(values['identifier'], 'b')
 
   def testReadFileObjectOnV3File(self):
     """Tests the ReadFileObject function on a format version 3 file."""
@@ -103,6 +136,15 @@ class CustomDestinationsFileTest(test_lib.BaseTestCase):
     self._SkipIfPathNotExists(test_file_path)
 
     test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(test_file.entries), 9)
+
+    # The entries of the previously read file are not kept.
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(test_file.entries), 9)
 
 
 if __name__ == '__main__':
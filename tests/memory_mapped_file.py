@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Tests for the memory-mapped file-like object."""
+
+import os
+import re
+import unittest
+
+from dtformats import memory_mapped_file
+
+from tests import test_lib
+
+
+class MemoryMappedFileTest(test_lib.BaseTestCase):
+  """Memory-mapped file-like object tests."""
+
+  def _OpenTestFile(self):
+    """Opens the test file.
+
+    Returns:
+      MemoryMappedFile: memory-mapped file-like object.
+    """
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    file_object = open(test_file_path, 'rb')  # pylint: disable=consider-using-with
+    return memory_mapped_file.MemoryMappedFile(file_object)
+
+  def testFind(self):
+    """Tests the Find function."""
+    test_file = self._OpenTestFile()
+
+    offset = test_file.Find(b'\x01\x00\x00\x00', 0, 5376)
+    self.assertEqual(offset, 384)
+
+    offset = test_file.Find(b'\x01\x00\x00\x00', 0, 384)
+    self.assertEqual(offset, -1)
+
+    test_file.close()
+
+  def testGetView(self):
+    """Tests the GetView function."""
+    test_file = self._OpenTestFile()
+
+    view = test_file.GetView(0, 4)
+    self.assertIsInstance(view, memoryview)
+    self.assertEqual(view.tobytes(), b'\x02\x00\x00\x00')
+    view.release()
+
+    view = test_file.GetView(5374, 16)
+    self.assertEqual(len(view), 2)
+    view.release()
+
+    test_file.close()
+
+  def testReadAt(self):
+    """Tests the ReadAt function."""
+    test_file = self._OpenTestFile()
+
+    data = test_file.ReadAt(384, 4)
+    self.assertEqual(data, b'\x01\x00\x00\x00')
+    self.assertEqual(test_file.tell(), 388)
+
+    data = test_file.ReadAt(5374, 16)
+    self.assertEqual(len(data), 2)
+    self.assertEqual(test_file.tell(), 5376)
+
+    test_file.close()
+
+  def testSearch(self):
+    """Tests the Search function."""
+    test_file = self._OpenTestFile()
+
+    pattern = re.compile(b'[\x01-\x08]\x00\x00\x00')
+
+    match = test_file.Search(pattern, 1, 5376)
+    self.assertIsNotNone(match)
+    self.assertEqual(match.start(), 384)
+
+    match = test_file.Search(pattern, 1, 384)
+    self.assertIsNone(match)
+
+    test_file.close()
+
+  def testRead(self):
+    """Tests the read function."""
+    test_file = self._OpenTestFile()
+
+    data = test_file.read(4)
+    self.assertEqual(data, b'\x02\x00\x00\x00')
+
+    data = test_file.read()
+    self.assertEqual(len(data), 5372)
+
+    data = test_file.read()
+    self.assertEqual(data, b'')
+
+    test_file.close()
+
+  def testReadinto(self):
+    """Tests the readinto function."""
+    test_file = self._OpenTestFile()
+
+    buffer = bytearray(4)
+    read_count = test_file.readinto(buffer)
+    self.assertEqual(read_count, 4)
+    self.assertEqual(buffer, b'\x02\x00\x00\x00')
+
+    test_file.close()
+
+  def testSeek(self):
+    """Tests the seek function."""
+    test_file = self._OpenTestFile()
+
+    test_file.seek(0, os.SEEK_END)
+    self.assertEqual(test_file.get_offset(), 5376)
+
+    test_file.seek(-16, os.SEEK_CUR)
+    self.assertEqual(test_file.get_offset(), 5360)
+
+    test_file.seek(8192, os.SEEK_SET)
+    self.assertEqual(test_file.get_offset(), 8192)
+    self.assertEqual(test_file.read(4), b'')
+
+    with self.assertRaises(IOError):
+      test_file.seek(0, -1)
+
+    with self.assertRaises(IOError):
+      test_file.seek(-16384, os.SEEK_CUR)
+
+    test_file.close()
+
+  def testGetSize(self):
+    """Tests the get_size function."""
+    test_file = self._OpenTestFile()
+
+    self.assertEqual(test_file.get_size(), 5376)
+
+    test_file.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Tests for output writers."""
 
+import io
 import unittest
 
 from dtformats import output_writers
@@ -8,6 +9,31 @@ from dtformats import output_writers
 from tests import test_lib
 
 
+class CountingStringIO(io.StringIO):
+  """String IO that counts the number of writes.
+
+  Attributes:
+    number_of_writes (int): number of writes.
+  """
+
+  def __init__(self):
+    """Initializes a string IO that counts the number of writes."""
+    super(CountingStringIO, self).__init__()
+    self.number_of_writes = 0
+
+  def write(self, text):
+    """Writes text.
+
+    Args:
+      text (str): text to write.
+
+    Returns:
+      int: number of characters written.
+    """
+    self.number_of_writes += 1
+    return super(CountingStringIO, self).write(text)
+
+
 class StdoutWriterTest(test_lib.BaseTestCase):
   """Stdout output writer tests."""
 
@@ -29,6 +55,196 @@ class StdoutWriterTest(test_lib.BaseTestCase):
 
     test_writer.WriteText('')
 
+    output_stream = io.StringIO()
+    test_writer = output_writers.StdoutWriter(output_stream=output_stream)
+
+    test_writer.WriteText('Text')
+    self.assertEqual(output_stream.getvalue(), 'Text')
+
+
+class BufferedStdoutWriterTest(test_lib.BaseTestCase):
+  """Buffered stdout output writer tests."""
+
+  def testClose(self):
+    """Tests the Close function."""
+    output_stream = io.StringIO()
+    test_writer = output_writers.BufferedStdoutWriter(
+        output_stream=output_stream)
+
+    test_writer.Open()
+    test_writer.WriteText('Text')
+    self.assertEqual(output_stream.getvalue(), '')
+
+    test_writer.Close()
+    self.assertEqual(output_stream.getvalue(), 'Text')
+
+  def testOpen(self):
+    """Tests the Open function."""
+    test_writer = output_writers.BufferedStdoutWriter()
+
+    test_writer.Open()
+
+  def testWriteText(self):
+    """Tests the WriteText function."""
+    output_stream = io.StringIO()
+    test_writer = output_writers.BufferedStdoutWriter(
+        buffer_size=8, output_stream=output_stream)
+
+    test_writer.Open()
+
+    test_writer.WriteText('Text')
+    self.assertEqual(output_stream.getvalue(), '')
+
+    test_writer.WriteText('More')
+    self.assertEqual(output_stream.getvalue(), 'TextMore')
+
+    test_writer.WriteText('')
+    test_writer.Close()
+    self.assertEqual(output_stream.getvalue(), 'TextMore')
+
+
+class ThreadedStdoutWriterTest(test_lib.BaseTestCase):
+  """Background thread stdout output writer tests."""
+
+  def testClose(self):
+    """Tests the Close function."""
+    output_stream = io.StringIO()
+    test_writer = output_writers.ThreadedStdoutWriter(
+        output_stream=output_stream)
+
+    test_writer.Open()
+    test_writer.Close()
+
+    # Test closing an output writer that is not open.
+    test_writer.Close()
+
+  def testOpen(self):
+    """Tests the Open function."""
+    test_writer = output_writers.ThreadedStdoutWriter()
+
+    test_writer.Open()
+
+    with self.assertRaises(IOError):
+      test_writer.Open()
+
+    test_writer.Close()
+
+  def testWriteText(self):
+    """Tests the WriteText function."""
+    output_stream = io.StringIO()
+    test_writer = output_writers.ThreadedStdoutWriter(
+        buffer_size=16, maximum_queue_size=2, output_stream=output_stream)
+
+    with self.assertRaises(IOError):
+      test_writer.WriteText('Text')
+
+    test_writer.Open()
+
+    for index in range(100):
+      test_writer.WriteText('{0:d}\n'.format(index))
+
+    test_writer.Close()
+
+    expected_output = ''.join(['{0:d}\n'.format(index) for index in range(100)])
+    self.assertEqual(output_stream.getvalue(), expected_output)
+
+    # The text is written in chunks of at least the buffer size.
+    output_stream = CountingStringIO()
+    test_writer = output_writers.ThreadedStdoutWriter(
+        buffer_size=16, output_stream=output_stream)
+
+    test_writer.Open()
+
+    for index in range(100):
+      test_writer.WriteText('{0:d}\n'.format(index))
+
+    test_writer.Close()
+
+    self.assertEqual(output_stream.getvalue(), expected_output)
+    self.assertLessEqual(
+        output_stream.number_of_writes, len(expected_output) // 16 + 1)
+
+  def testWriteTextWithError(self):
+    """Tests the WriteText function with an output stream that errors."""
+    output_stream = io.StringIO()
+    output_stream.close()
+
+    test_writer = output_writers.ThreadedStdoutWriter(
+        output_stream=output_stream)
+
+    test_writer.Open()
+    test_writer.WriteText('Text')
+
+    with self.assertRaises(IOError):
+      test_writer.Close()
+
+
+class CSVWriterTest(test_lib.BaseTestCase):
+  """Comma separated values (CSV) output writer tests."""
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord function."""
+    output_stream = io.StringIO()
+    test_writer = output_writers.CSVWriter(output_stream=output_stream)
+
+    test_writer.Open()
+    test_writer.WriteRecord('point', {'x': 1, 'y': b'\x02', 'z': [3, 4]})
+    test_writer.WriteRecord('point', {'x': 5, 'y': b'\x06', 'z': None})
+    test_writer.WriteRecord('name', {'name': 'a,b'})
+    test_writer.WriteText('Text')
+    test_writer.Close()
+
+    expected_output = '\n'.join([
+        'record_type,x,y,z',
+        'point,1,02,"[3, 4]"',
+        'point,5,06,',
+        'record_type,name',
+        'name,"a,b"',
+        ''])
+    self.assertEqual(output_stream.getvalue(), expected_output)
+
+
+class JSONLinesWriterTest(test_lib.BaseTestCase):
+  """JSON lines output writer tests."""
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord function."""
+    output_stream = io.StringIO()
+    test_writer = output_writers.JSONLinesWriter(output_stream=output_stream)
+
+    test_writer.Open()
+    test_writer.WriteRecord('point', {'x': 1, 'y': b'\x02', 'z': [b'\x03']})
+    test_writer.WriteText('Text')
+    test_writer.Close()
+
+    expected_output = (
+        '{"record_type": "point", "x": 1, "y": "02", "z": ["03"]}\n')
+    self.assertEqual(output_stream.getvalue(), expected_output)
+
+
+class CreateOutputWriterTest(test_lib.BaseTestCase):
+  """Tests for the CreateOutputWriter function."""
+
+  def testCreateOutputWriter(self):
+    """Tests the CreateOutputWriter function."""
+    test_writer = output_writers.CreateOutputWriter('buffered')
+    self.assertIsInstance(test_writer, output_writers.BufferedStdoutWriter)
+
+    test_writer = output_writers.CreateOutputWriter('csv')
+    self.assertIsInstance(test_writer, output_writers.CSVWriter)
+
+    test_writer = output_writers.CreateOutputWriter('jsonl')
+    self.assertIsInstance(test_writer, output_writers.JSONLinesWriter)
+
+    test_writer = output_writers.CreateOutputWriter('stdout')
+    self.assertIsInstance(test_writer, output_writers.StdoutWriter)
+
+    test_writer = output_writers.CreateOutputWriter('threaded')
+    self.assertIsInstance(test_writer, output_writers.ThreadedStdoutWriter)
+
+    with self.assertRaises(ValueError):
+      output_writers.CreateOutputWriter('bogus')
+
 
 if __name__ == '__main__':
   unittest.main()
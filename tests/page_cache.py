@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Tests for the page cached file-like object."""
+
+import io
+import os
+import unittest
+
+from dtformats import page_cache
+
+from tests import test_lib
+
+
+class PageCachedFileTest(test_lib.BaseTestCase):
+  """Page cached file-like object tests."""
+
+  _FILE_DATA = bytes(bytearray(range(256))) * 4
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(file_object, block_size=64)
+    self.assertIsNotNone(test_file)
+
+    with self.assertRaises(ValueError):
+      page_cache.PageCachedFile(file_object, block_size=0)
+
+    with self.assertRaises(ValueError):
+      page_cache.PageCachedFile(file_object, maximum_number_of_blocks=0)
+
+    with self.assertRaises(ValueError):
+      page_cache.PageCachedFile(
+          file_object, maximum_number_of_blocks=2, read_ahead=2)
+
+  def testClose(self):
+    """Tests the close function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(file_object)
+
+    test_file.close()
+    self.assertTrue(file_object.closed)
+
+  def testRead(self):
+    """Tests the read function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(
+        file_object, block_size=64, maximum_number_of_blocks=4, read_ahead=1)
+
+    byte_stream = test_file.read(size=4)
+    self.assertEqual(byte_stream, b'\x00\x01\x02\x03')
+    self.assertEqual(test_file.cache_hits, 0)
+    self.assertEqual(test_file.cache_misses, 1)
+
+    # Test a read that spans the block and the read-ahead block.
+    test_file.seek(60, os.SEEK_SET)
+    byte_stream = test_file.read(size=8)
+    self.assertEqual(byte_stream, self._FILE_DATA[60:68])
+    self.assertEqual(test_file.cache_hits, 2)
+    self.assertEqual(test_file.cache_misses, 1)
+
+    # Test a read that evicts the least recently used blocks.
+    test_file.seek(512, os.SEEK_SET)
+    byte_stream = test_file.read(size=192)
+    self.assertEqual(byte_stream, self._FILE_DATA[512:704])
+    self.assertEqual(test_file.cache_hits, 3)
+    self.assertEqual(test_file.cache_misses, 3)
+
+    test_file.seek(0, os.SEEK_SET)
+    byte_stream = test_file.read(size=4)
+    self.assertEqual(byte_stream, b'\x00\x01\x02\x03')
+    self.assertEqual(test_file.cache_misses, 4)
+
+    # Test a read that bypasses the cache.
+    test_file.seek(1, os.SEEK_SET)
+    byte_stream = test_file.read(size=512)
+    self.assertEqual(byte_stream, self._FILE_DATA[1:513])
+    self.assertEqual(test_file.cache_hits, 3)
+    self.assertEqual(test_file.cache_misses, 4)
+
+    # Test a read beyond the end of the data.
+    test_file.seek(1020, os.SEEK_SET)
+    byte_stream = test_file.read(size=8)
+    self.assertEqual(byte_stream, b'\xfc\xfd\xfe\xff')
+
+    byte_stream = test_file.read()
+    self.assertEqual(byte_stream, b'')
+
+    test_file.seek(0, os.SEEK_SET)
+    byte_stream = test_file.read()
+    self.assertEqual(byte_stream, self._FILE_DATA)
+
+  def testSeek(self):
+    """Tests the seek function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(file_object)
+
+    test_file.seek(0, os.SEEK_SET)
+    offset = test_file.get_offset()
+    self.assertEqual(offset, 0)
+
+    test_file.seek(0, os.SEEK_END)
+    offset = test_file.get_offset()
+    self.assertEqual(offset, 1024)
+
+    test_file.seek(-32, os.SEEK_CUR)
+    offset = test_file.get_offset()
+    self.assertEqual(offset, 992)
+
+    test_file.seek(2048, os.SEEK_SET)
+    offset = test_file.get_offset()
+    self.assertEqual(offset, 2048)
+
+    with self.assertRaises(IOError):
+      test_file.seek(0, -1)
+
+    with self.assertRaises(IOError):
+      test_file.seek(-4096, os.SEEK_CUR)
+
+  def testGetOffset(self):
+    """Tests the get_offset function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(file_object)
+
+    offset = test_file.get_offset()
+    self.assertEqual(offset, 0)
+
+  def testTell(self):
+    """Tests the tell function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(file_object)
+
+    offset = test_file.tell()
+    self.assertEqual(offset, 0)
+
+  def testGetSize(self):
+    """Tests the get_size function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(file_object)
+
+    size = test_file.get_size()
+    self.assertEqual(size, 1024)
+
+  def testSeekable(self):
+    """Tests the seekable function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_file = page_cache.PageCachedFile(file_object)
+
+    result = test_file.seekable()
+    self.assertTrue(result)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Tests for the data format profiler."""
+
+import unittest
+
+from dtformats import profiler
+
+from tests import test_lib
+
+
+class DataFormatProfilerTest(test_lib.BaseTestCase):
+  """Data format profiler tests."""
+
+  def testAddMapByteStream(self):
+    """Tests the AddMapByteStream function."""
+    test_profiler = profiler.DataFormatProfiler()
+
+    test_profiler.AddMapByteStream('point3d')
+    test_profiler.AddMapByteStream('point3d', number_of_calls=2)
+    test_profiler.AddMapByteStream('point3d', retry=True)
+
+    profile = test_profiler.GetProfiles()['point3d']
+    self.assertEqual(profile['map_byte_stream_calls'], 4)
+    self.assertEqual(profile['byte_stream_too_small_retries'], 1)
+
+  def testAddProfiles(self):
+    """Tests the AddProfiles function."""
+    test_profiler = profiler.DataFormatProfiler()
+    test_profiler.AddReadData('point3d', 12)
+    test_profiler.AddTime('point3d', 0.5)
+
+    other_profiler = profiler.DataFormatProfiler()
+    other_profiler.AddReadData('point3d', 24)
+    other_profiler.AddTime('point3d', 0.25)
+    other_profiler.AddMapByteStream('shape3d')
+
+    test_profiler.AddProfiles(other_profiler.GetProfiles())
+
+    profiles = test_profiler.GetProfiles()
+    self.assertEqual(profiles['point3d']['read_data_calls'], 2)
+    self.assertEqual(profiles['point3d']['bytes_read'], 36)
+    self.assertEqual(profiles['point3d']['time'], 0.75)
+    self.assertEqual(profiles['shape3d']['map_byte_stream_calls'], 1)
+
+  def testAddReadData(self):
+    """Tests the AddReadData function."""
+    test_profiler = profiler.DataFormatProfiler()
+
+    test_profiler.AddReadData('point3d', 12)
+    test_profiler.AddReadData('point3d', 24)
+
+    profile = test_profiler.GetProfiles()['point3d']
+    self.assertEqual(profile['read_data_calls'], 2)
+    self.assertEqual(profile['bytes_read'], 36)
+
+  def testAddTime(self):
+    """Tests the AddTime function."""
+    test_profiler = profiler.DataFormatProfiler()
+
+    test_profiler.AddTime('point3d', 0.5)
+    test_profiler.AddTime('point3d', 0.25)
+
+    profile = test_profiler.GetProfiles()['point3d']
+    self.assertEqual(profile['time'], 0.75)
+
+  def testGetProfiles(self):
+    """Tests the GetProfiles function."""
+    test_profiler = profiler.DataFormatProfiler()
+
+    profiles = test_profiler.GetProfiles()
+    self.assertEqual(profiles, {})
+
+    test_profiler.AddReadData('point3d', 12)
+
+    profiles = test_profiler.GetProfiles()
+    self.assertEqual(profiles, {'point3d': {
+        'byte_stream_too_small_retries': 0,
+        'bytes_read': 12,
+        'map_byte_stream_calls': 0,
+        'read_data_calls': 1,
+        'time': 0.0}})
+
+    # Changing the returned profiles should not change the profiler.
+    profiles['point3d']['bytes_read'] = 0
+
+    profiles = test_profiler.GetProfiles()
+    self.assertEqual(profiles['point3d']['bytes_read'], 12)
+
+  def testWriteProfiles(self):
+    """Tests the WriteProfiles function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_profiler = profiler.DataFormatProfiler()
+
+    test_profiler.AddReadData('point3d', 12)
+    test_profiler.AddMapByteStream('point3d')
+    test_profiler.AddTime('point3d', 0.5)
+    test_profiler.AddReadData('shape3d', 40)
+    test_profiler.AddTime('shape3d', 1.0)
+
+    test_profiler.WriteProfiles(output_writer)
+
+    lines = ''.join(output_writer.output).split('\n')
+    self.assertEqual(lines[0], 'Profile:')
+    self.assertTrue(lines[2].startswith('shape3d '))
+    self.assertTrue(lines[3].startswith('point3d '))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -67,6 +67,27 @@ class RecycleBinMetadataFileTest(test_lib.BaseTestCase):
 
     test_file.Open(test_file_path)
 
+  def testReadFileObjectWithRecordOutputWriter(self):
+    """Tests the ReadFileObject function with a record output writer."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = recycle_bin.RecycleBinMetadataFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['$I103S5F.jpg'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'recycle_bin_metadata')
+    self.assertEqual(values['format_version'], 2)
+    self.assertEqual(values['original_file_size'], 222255)
+    self.assertEqual(
+        values['original_filename'],
+        'C:\\Users\\random\\Downloads\\bunnies.jpg')
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -166,6 +166,20 @@ class BinaryCookiesFileTest(test_lib.BaseTestCase):
 
     test_file._ReadRecord(self._PAGE_DATA, 0)
 
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = safari_cookies.BinaryCookiesFile(output_writer=output_writer)
+
+    test_file._ReadRecord(self._PAGE_DATA, 0)
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'binarycookies_record')
+    self.assertEqual(values['name'], 'SWID')
+    self.assertEqual(values['path'], '/')
+    self.assertEqual(values['url'], '.go.com')
+    self.assertEqual(values['value'], 'CBEC7F0B-C64E-4290-873E-1B183031395D')
+
     with self.assertRaises(errors.ParseError):
       test_file._ReadRecord(self._PAGE_DATA[:-1], 0)
 
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""Tests for synthetic data generators."""
+
+import io
+import os
+import tempfile
+import unittest
+
+from dtformats import bsm
+from dtformats import chrome_cache
+from dtformats import cpio
+from dtformats import firefox_cache1
+from dtformats import gzipfile
+from dtformats import synthetic
+from dtformats import systemd
+from dtformats import usn_journal
+from dtformats import utmp
+
+from tests import test_lib
+
+
+class SyntheticDataGeneratorTest(test_lib.BaseTestCase):
+  """Synthetic data generator tests."""
+
+  # pylint: disable=protected-access
+
+  def testFoldStructure(self):
+    """Tests the _FoldStructure function."""
+    test_generator = synthetic.LinuxLibc6UtmpGenerator()
+
+    data = test_generator._FoldStructure('linux_libc6_utmp_entry', pid=2)
+    self.assertEqual(len(data), 384)
+    self.assertEqual(data[4:8], b'\x02\x00\x00\x00')
+    self.assertEqual(data[8:], bytes(376))
+
+    with self.assertRaises(ValueError):
+      test_generator._FoldStructure('linux_libc6_utmp_entry', pid=-1)
+
+  def testGenerateLogText(self):
+    """Tests the _GenerateLogText function."""
+    test_generator = synthetic.LinuxLibc6UtmpGenerator()
+
+    text = test_generator._GenerateLogText(1000)
+    self.assertEqual(len(text), 1000)
+
+  def testWriteRecords(self):
+    """Tests the _WriteRecords function."""
+    test_generator = synthetic.LinuxLibc6UtmpGenerator()
+    test_generator._MAXIMUM_NUMBER_OF_UNIQUE_RECORDS = 4
+    test_generator._WRITE_BUFFER_SIZE = 3 * 384
+
+    file_object = io.BytesIO()
+    output_size = test_generator._WriteRecords(file_object, 20 * 384 + 1)
+    self.assertEqual(output_size, 21 * 384)
+
+    data = file_object.getvalue()
+    self.assertEqual(len(data), output_size)
+    self.assertEqual(data[:4 * 384], data[4 * 384:8 * 384])
+
+  def testGenerate(self):
+    """Tests the Generate function."""
+    test_generator = synthetic.LinuxLibc6UtmpGenerator()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'utmp')
+      output_size = test_generator.Generate(path, 4096)
+
+      self.assertEqual(output_size, 11 * 384)
+      self.assertEqual(os.path.getsize(path), output_size)
+
+      test_generator = synthetic.LinuxLibc6UtmpGenerator()
+      test_generator.Generate(path + '.2', 4096)
+
+      with open(path, 'rb') as file_object:
+        data = file_object.read()
+
+      with open(path + '.2', 'rb') as file_object:
+        self.assertEqual(file_object.read(), data)
+
+
+class GeneratorsTest(test_lib.BaseTestCase):
+  """Tests that the data formats read the generated synthetic data."""
+
+  _SIZE = 256 * 1024
+
+  def _GenerateFile(self, temporary_directory, test_generator):
+    """Generates a synthetic file.
+
+    Args:
+      temporary_directory (str): path of the directory to generate the file in.
+      test_generator (SyntheticDataGenerator): synthetic data generator.
+
+    Returns:
+      tuple[str, int]: path and size of the generated file.
+    """
+    path = os.path.join(temporary_directory, 'synthetic')
+    output_size = test_generator.Generate(path, self._SIZE)
+
+    self.assertEqual(os.path.getsize(path), output_size)
+
+    return path, output_size
+
+  def testBSMEventAuditingGenerator(self):
+    """Tests the BSMEventAuditingGenerator."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = bsm.BSMEventAuditingFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, output_size = self._GenerateFile(
+          temporary_directory, synthetic.BSMEventAuditingGenerator())
+
+      test_file.Open(path)
+      test_file.Close()
+
+    self.assertGreaterEqual(output_size, self._SIZE)
+    self.assertGreater(len(output_writer.records), 1024)
+
+    _, values = output_writer.records[0]
+    token_types = [token['token_type'] for token in values['tokens']]
+    self.assertEqual(token_types, [0x14, 0x24, 0x23, 0x28, 0x27, 0x13])
+
+  def testChromeCacheGenerator(self):
+    """Tests the ChromeCacheGenerator."""
+    test_generator = synthetic.ChromeCacheGenerator()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'synthetic')
+      test_generator.Generate(path, self._SIZE)
+
+      index_file = chrome_cache.IndexFile()
+      index_file.Open(os.path.join(path, 'index'))
+
+      data_block_file = chrome_cache.DataBlockFile()
+      data_block_file.Open(os.path.join(path, 'data_1'))
+
+      number_of_cache_entries = 0
+      for cache_address in index_file.index_table.values():
+        while cache_address.value:
+          self.assertEqual(cache_address.filename, 'data_1')
+          cache_entry = data_block_file.ReadCacheEntry(
+              cache_address.block_offset)
+          self.assertTrue(cache_entry.key.startswith('https://'))
+
+          cache_address = cache_entry.next
+          number_of_cache_entries += 1
+
+      data_block_file.Close()
+      index_file.Close()
+
+    self.assertEqual(number_of_cache_entries, self._SIZE // 260)
+    self.assertEqual(data_block_file.number_of_entries, self._SIZE // 260)
+
+  def testCPIOArchiveGenerator(self):
+    """Tests the CPIOArchiveGenerator."""
+    for file_format in ('newc', 'odc'):
+      test_generator = synthetic.CPIOArchiveGenerator(file_format=file_format)
+      test_file = cpio.CPIOArchiveFile()
+
+      with tempfile.TemporaryDirectory() as temporary_directory:
+        path, output_size = self._GenerateFile(
+            temporary_directory, test_generator)
+
+        test_file.Open(path)
+
+        self.assertEqual(test_file.file_format, file_format)
+        self.assertEqual(test_file.size, output_size)
+
+        file_entries = list(test_file.GetFileEntries())
+        self.assertGreater(len(file_entries), 1)
+
+        file_entry = test_file.GetFileEntryByPath('var/log/messages.0')
+        self.assertIsNotNone(file_entry)
+        self.assertTrue(file_entry.read(10).isdigit())
+
+        test_file.Close()
+
+    with self.assertRaises(ValueError):
+      synthetic.CPIOArchiveGenerator(file_format='bogus')
+
+  def testFirefoxCache1MapGenerator(self):
+    """Tests the FirefoxCache1MapGenerator."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = firefox_cache1.CacheMapFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, output_size = self._GenerateFile(
+          temporary_directory, synthetic.FirefoxCache1MapGenerator())
+
+      test_file.Open(path)
+      test_file.Close()
+
+    self.assertEqual(len(output_writer.records), (output_size - 276) // 16)
+    self.assertEqual(len(output_writer.records) % 32, 0)
+
+  def testGZipGenerator(self):
+    """Tests the GZipGenerator."""
+    test_file = gzipfile.GZipFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, output_size = self._GenerateFile(
+          temporary_directory, synthetic.GZipGenerator())
+
+      test_file.Open(path)
+      test_file.Close()
+
+    self.assertGreaterEqual(output_size, self._SIZE)
+
+  def testLinuxLibc6UtmpGenerator(self):
+    """Tests the LinuxLibc6UtmpGenerator."""
+    test_file = utmp.LinuxLibc6UtmpFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, output_size = self._GenerateFile(
+          temporary_directory, synthetic.LinuxLibc6UtmpGenerator())
+
+      test_file.Open(path)
+      test_file.Close()
+
+    self.assertEqual(output_size % 384, 0)
+
+  def testMacOSXUtmpxGenerator(self):
+    """Tests the MacOSXUtmpxGenerator."""
+    test_file = utmp.MacOSXUtmpxFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, output_size = self._GenerateFile(
+          temporary_directory, synthetic.MacOSXUtmpxGenerator())
+
+      test_file.Open(path)
+      test_file.Close()
+
+    self.assertEqual(output_size % 628, 0)
+
+  def testSystemdJournalGenerator(self):
+    """Tests the SystemdJournalGenerator."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = systemd.SystemdJournalFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, output_size = self._GenerateFile(
+          temporary_directory, synthetic.SystemdJournalGenerator())
+
+      test_file.Open(path)
+      test_file.Close()
+
+    self.assertGreaterEqual(output_size, self._SIZE)
+
+    sequence_numbers = [
+        values['sequence_number'] for _, values in output_writer.records]
+    self.assertEqual(
+        sequence_numbers, list(range(1, len(output_writer.records) + 1)))
+
+    _, values = output_writer.records[0]
+    self.assertEqual(values['data'][1], 'MESSAGE=message 0')
+
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, _ = self._GenerateFile(
+          temporary_directory, synthetic.SystemdJournalGenerator(
+              keyed_hash=True))
+
+      with open(path, 'rb') as file_object:
+        file_header = test_file._ReadFileHeader(file_object)
+
+    self.assertEqual(file_header.incompatible_flags, 4)
+    self.assertEqual(file_header.data_hash_table_size, 64 * 16)
+    self.assertEqual(file_header.field_hash_table_size, 16 * 16)
+
+    with self.assertRaises(ValueError):
+      synthetic.SystemdJournalGenerator(compression='bogus')
+
+  def testUSNRecordsGenerator(self):
+    """Tests the USNRecordsGenerator."""
+    test_file = usn_journal.USNRecords()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path, output_size = self._GenerateFile(
+          temporary_directory, synthetic.USNRecordsGenerator())
+
+      test_file.Open(path)
+      usn_records = list(test_file.ReadRecords())
+      test_file.Close()
+
+    self.assertEqual(output_size, self._SIZE)
+    self.assertEqual(sum(usn_record.size for usn_record in usn_records), (
+        self._SIZE))
+    self.assertEqual(usn_records[0].major_version, 2)
+    self.assertTrue(usn_records[0].name.endswith('.log'))
+
+
+if __name__ == '__main__':
+  unittest.main()
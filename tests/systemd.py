@@ -0,0 +1,753 @@
+# -*- coding: utf-8 -*-
+"""Tests for systemd journal files."""
+
+import lzma
+import os
+import struct
+import tempfile
+import unittest
+
+import lz4.block
+
+try:
+  import zstandard
+except ImportError:
+  zstandard = None
+
+from dtformats import data_format
+from dtformats import errors
+from dtformats import synthetic
+from dtformats import systemd
+
+from tests import test_lib
+
+
+class HashFunctionsTest(test_lib.BaseTestCase):
+  """Hash functions tests."""
+
+  def testJenkinsHash64(self):
+    """Tests the JenkinsHash64 function."""
+    self.assertEqual(systemd.JenkinsHash64(b''), 0xdeadbeefdeadbeef)
+
+    hash_value = systemd.JenkinsHash64(b'Four score and seven years ago')
+    self.assertEqual(hash_value, 0x17770551ce7226e6)
+
+  def testSipHash24(self):
+    """Tests the SipHash24 function."""
+    key = bytes(range(16))
+
+    self.assertEqual(systemd.SipHash24(key, b''), 0x726fdb47dd0e0e31)
+    self.assertEqual(
+        systemd.SipHash24(key, bytes(range(8))), 0x93f5f5799a932462)
+    self.assertEqual(
+        systemd.SipHash24(key, bytes(range(15))), 0xa129ca6149be45e5)
+
+
+class LZ4DecompressorTest(test_lib.BaseTestCase):
+  """LZ4 decompressor tests."""
+
+  def testDecompress(self):
+    """Tests the Decompress function."""
+    decompressor = systemd.LZ4Decompressor()
+
+    compressed_data = struct.pack('<Q', 12) + lz4.block.compress(
+        b'MESSAGE=test', store_size=False)
+
+    uncompressed_data = decompressor.Decompress(compressed_data)
+    self.assertEqual(uncompressed_data, b'MESSAGE=test')
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(b'\x0c\x00\x00')
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(compressed_data[:-4])
+
+
+class XZDecompressorTest(test_lib.BaseTestCase):
+  """XZ decompressor tests."""
+
+  def testDecompress(self):
+    """Tests the Decompress function."""
+    decompressor = systemd.XZDecompressor()
+
+    compressed_data = lzma.compress(b'MESSAGE=test', format=lzma.FORMAT_XZ)
+
+    uncompressed_data = decompressor.Decompress(compressed_data)
+    self.assertEqual(uncompressed_data, b'MESSAGE=test')
+
+    # The decompressor is reusable.
+    uncompressed_data = decompressor.Decompress(compressed_data)
+    self.assertEqual(uncompressed_data, b'MESSAGE=test')
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(b'MESSAGE=test')
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(compressed_data[:-4])
+
+
+@unittest.skipIf(zstandard is None, 'missing zstandard support')
+class ZSTDDecompressorTest(test_lib.BaseTestCase):
+  """ZSTD decompressor tests."""
+
+  def testDecompress(self):
+    """Tests the Decompress function."""
+    decompressor = systemd.ZSTDDecompressor()
+
+    compressed_data = zstandard.ZstdCompressor().compress(b'MESSAGE=test')
+
+    uncompressed_data = decompressor.Decompress(compressed_data)
+    self.assertEqual(uncompressed_data, b'MESSAGE=test')
+
+    uncompressed_data = decompressor.Decompress(compressed_data)
+    self.assertEqual(uncompressed_data, b'MESSAGE=test')
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(b'MESSAGE=test')
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(compressed_data[:-4])
+
+
+class SystemdJournalFileTest(test_lib.BaseTestCase):
+  """Systemd journal file tests."""
+
+  # pylint: disable=protected-access
+
+  def testCarveRecord(self):
+    """Tests the CarveRecord function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = systemd.SystemdJournalFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 4096)
+
+      with open(path, 'rb') as file_object:
+        record_size = test_file.CarveRecord(file_object, 2432)
+        self.assertGreater(record_size, 0)
+
+        with self.assertRaises(errors.ParseError):
+          test_file.CarveRecord(file_object, 0)
+
+      # A candidate with an entry object signature and random values.
+      path = os.path.join(temporary_directory, 'raw')
+      with open(path, 'wb') as file_object:
+        file_object.write(b''.join([
+            systemd.SystemdJournalFile.CARVING_SIGNATURE,
+            struct.pack('<Q', 1024 * 1024), os.urandom(1024 * 1024)]))
+
+      with open(path, 'rb') as file_object:
+        with self.assertRaises(errors.ParseError):
+          test_file.CarveRecord(file_object, 0)
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'systemd_journal_entry')
+    self.assertEqual(values['offset'], 2432)
+    self.assertEqual(values['sequence_number'], 1)
+
+  def testFindDataObject(self):
+    """Tests the _FindDataObject function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 8192)
+
+      with open(path, 'rb') as file_object:
+        test_file._file_header = test_file._ReadFileHeader(file_object)
+
+        data_object = test_file._FindDataObject(
+            file_object, b'MESSAGE=message 1')
+        self.assertIsNotNone(data_object)
+        self.assertEqual(data_object.data, b'MESSAGE=message 1')
+        self.assertEqual(data_object.number_of_entries, 1)
+
+        data_object = test_file._FindDataObject(
+            file_object, b'MESSAGE=bogus')
+        self.assertIsNone(data_object)
+
+  def testFindEntries(self):
+    """Tests the FindEntries function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 65536)
+
+      test_file.Open(path)
+      entries = list(test_file.ReadEntries())
+
+      expected_sequence_numbers = [
+          entry['__SEQNUM'] for entry in entries
+          if entry['_SYSTEMD_UNIT'] == 'cron.service']
+      self.assertGreater(len(expected_sequence_numbers), 4)
+
+      found_entries = list(test_file.FindEntries(
+          '_SYSTEMD_UNIT', value='cron.service', fields=['MESSAGE']))
+      self.assertEqual(
+          [entry['__SEQNUM'] for entry in found_entries],
+          expected_sequence_numbers)
+      self.assertNotIn('_HOSTNAME', found_entries[0])
+
+      found_entries = list(test_file.FindEntries(
+          'MESSAGE', value='message 7'))
+      self.assertEqual(len(found_entries), 1)
+      self.assertEqual(found_entries[0], entries[7])
+
+      found_entries = list(test_file.FindEntries('PRIORITY'))
+      self.assertEqual(found_entries, entries)
+
+      found_entries = list(test_file.FindEntries('PRIORITY', value='99'))
+      self.assertEqual(found_entries, [])
+
+      found_entries = list(test_file.FindEntries('BOGUS'))
+      self.assertEqual(found_entries, [])
+
+      test_file.Close()
+
+      with self.assertRaises(IOError):
+        list(test_file.FindEntries('MESSAGE'))
+
+  def testFindEntriesWithKeyedHash(self):
+    """Tests the FindEntries function with keyed hashes."""
+    compression_methods = [None, 'lz4', 'xz']
+    if zstandard:
+      compression_methods.append('zstd')
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+
+      for compression_method in compression_methods:
+        generator = synthetic.SystemdJournalGenerator(
+            compression=compression_method, keyed_hash=True)
+        generator.Generate(path, 16384)
+
+        test_file = systemd.SystemdJournalFile()
+        test_file.Open(path)
+
+        expected_sequence_numbers = [
+            entry['__SEQNUM'] for entry in test_file.ReadEntries()
+            if entry['SYSLOG_IDENTIFIER'] == 'sshd']
+
+        found_entries = list(test_file.FindEntries(
+            'SYSLOG_IDENTIFIER', value='sshd'))
+        test_file.Close()
+
+        self.assertEqual(
+            [entry['__SEQNUM'] for entry in found_entries],
+            expected_sequence_numbers)
+
+  def testFindFieldObject(self):
+    """Tests the _FindFieldObject function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 8192)
+
+      with open(path, 'rb') as file_object:
+        test_file._file_header = test_file._ReadFileHeader(file_object)
+
+        field_object = test_file._FindFieldObject(file_object, b'PRIORITY')
+        self.assertIsNotNone(field_object)
+        self.assertEqual(field_object.data, b'PRIORITY')
+        self.assertNotEqual(field_object.head_data_offset, 0)
+
+        field_object = test_file._FindFieldObject(file_object, b'BOGUS')
+        self.assertIsNone(field_object)
+
+  def testGetDataObject(self):
+    """Tests the _GetDataObject function."""
+    test_file = systemd.SystemdJournalFile(
+        maximum_number_of_cached_data_objects=2)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 4096)
+
+      with open(path, 'rb') as file_object:
+        test_file._ReadFileHeader(file_object)
+
+        data_object = test_file._GetDataObject(file_object, 1552)
+        self.assertTrue(data_object.data.startswith(b'_HOSTNAME='))
+
+        # The data object is read from the cache.
+        self.assertIs(test_file._GetDataObject(file_object, 1552), data_object)
+
+        entry_object = test_file._ReadEntryObject(file_object, 2432)
+        for entry_item in entry_object.entry_items:
+          test_file._GetDataObject(file_object, entry_item.object_offset)
+
+    self.assertEqual(len(test_file._data_objects), 2)
+
+  def testGetDataObjectWithDebug(self):
+    """Tests the _GetDataObject function with debug enabled."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = systemd.SystemdJournalFile(
+        debug=True, output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 4096)
+
+      with open(path, 'rb') as file_object:
+        test_file._file_header = test_file._ReadFileHeader(file_object)
+
+        data_object = test_file._GetDataObject(file_object, 1552)
+        self.assertIsNot(
+            test_file._GetDataObject(file_object, 1552), data_object)
+
+    self.assertEqual(len(test_file._data_objects), 0)
+
+  def testGetDataObjectPayload(self):
+    """Tests the _GetDataObjectPayload function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator(compression='xz').Generate(path, 4096)
+
+      with open(path, 'rb') as file_object:
+        data_object = test_file._ReadDataObject(file_object, 1552)
+
+    self.assertEqual(data_object.object_flags, 1)
+
+    payload = test_file._GetDataObjectPayload(data_object)
+    self.assertTrue(payload.startswith(b'_HOSTNAME='))
+
+    # The decompressor is reused.
+    decompressor = test_file._decompressors[1]
+    test_file._GetDataObjectPayload(data_object)
+    self.assertIs(test_file._decompressors[1], decompressor)
+
+  def testGetEntryFields(self):
+    """Tests the _GetEntryFields function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 4096)
+
+      with open(path, 'rb') as file_object:
+        test_file._file_header = test_file._ReadFileHeader(file_object)
+
+        entry_object = test_file._ReadEntryObject(file_object, 2432)
+        fields = test_file._GetEntryFields(file_object, entry_object)
+
+    self.assertEqual(fields['__SEQNUM'], 1)
+    self.assertEqual(fields['__MONOTONIC_TIMESTAMP'], 1000000)
+    self.assertEqual(fields['MESSAGE'], 'message 0')
+    self.assertEqual(len(fields['__SEQNUM_ID']), 32)
+
+    # The _BOOT_ID data object is skipped in favor of the entry object value.
+    self.assertEqual(fields['_BOOT_ID'], entry_object.boot_identifier.hex())
+    self.assertEqual(sorted(fields), [
+        'MESSAGE', 'PRIORITY', 'SYSLOG_IDENTIFIER', '_BOOT_ID', '_HOSTNAME',
+        '_SYSTEMD_UNIT', '__MONOTONIC_TIMESTAMP', '__REALTIME_TIMESTAMP',
+        '__SEQNUM', '__SEQNUM_ID'])
+
+    fields = test_file._GetEntryFields(
+        file_object, entry_object, field_names=set([b'MESSAGE']))
+    self.assertEqual(sorted(fields), [
+        'MESSAGE', '_BOOT_ID', '__MONOTONIC_TIMESTAMP', '__REALTIME_TIMESTAMP',
+        '__SEQNUM', '__SEQNUM_ID'])
+
+  def testGetResumeEntryArrayWithLoop(self):
+    """Tests the _GetResumeEntryArray function with a loop."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = systemd.SystemdJournalFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 65536)
+
+      test_file.Open(path)
+      test_file.Close()
+
+      checkpoint = test_file.GetCheckpoint()
+
+      # The first entry array object refers to itself as the next one.
+      with open(path, 'r+b') as file_object:
+        file_header = test_file._ReadFileHeader(file_object)
+        entry_array_offset = file_header.entry_array_offset
+
+        file_object.seek(entry_array_offset + 16, os.SEEK_SET)
+        file_object.write(struct.pack('<Q', entry_array_offset))
+
+      with open(path, 'rb') as file_object:
+        resume_entry_array = test_file._GetResumeEntryArray(
+            file_object, entry_array_offset, checkpoint)
+        self.assertIsNone(resume_entry_array)
+
+        with self.assertRaises(errors.ParseError):
+          list(test_file._ReadEntries(file_object, entry_array_offset, 0))
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    with self.assertRaises(ValueError):
+      systemd.SystemdJournalFile(maximum_number_of_cached_data_objects=0)
+
+  def testReadFileHeader(self):
+    """Tests the _ReadFileHeader function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 4096)
+
+      with open(path, 'rb') as file_object:
+        file_header = test_file._ReadFileHeader(file_object)
+
+    self.assertEqual(file_header.signature, b'LPKSHHRH')
+    self.assertEqual(file_header.header_size, 240)
+    self.assertEqual(test_file._format_version, 189)
+
+  def testReadDataObjectEntryOffsets(self):
+    """Tests the _ReadDataObjectEntryOffsets function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 65536)
+
+      with open(path, 'rb') as file_object:
+        test_file._file_header = test_file._ReadFileHeader(file_object)
+
+        data_object = test_file._FindDataObject(
+            file_object, b'_HOSTNAME=server1.example.com')
+
+        entry_object_offsets = list(test_file._ReadDataObjectEntryOffsets(
+            file_object, data_object))
+
+    # The entry object offsets are stored in the data object and multiple
+    # entry array objects.
+    self.assertGreater(data_object.number_of_entries, 12)
+    self.assertEqual(
+        len(entry_object_offsets), data_object.number_of_entries)
+    self.assertEqual(entry_object_offsets, sorted(entry_object_offsets))
+
+  def testReadEntries(self):
+    """Tests the ReadEntries function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = systemd.SystemdJournalFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 8192)
+
+      test_file.Open(path)
+      entries = list(test_file.ReadEntries())
+      test_file.Close()
+
+      with self.assertRaises(IOError):
+        list(test_file.ReadEntries())
+
+      self.assertEqual(len(entries), len(output_writer.records))
+      self.assertEqual(
+          [entry['__SEQNUM'] for entry in entries],
+          list(range(1, len(entries) + 1)))
+
+      for entry, (_, values) in zip(entries, output_writer.records):
+        self.assertEqual(entry['__REALTIME_TIMESTAMP'], values['real_time'])
+        self.assertIn('MESSAGE={0:s}'.format(entry['MESSAGE']), values['data'])
+
+      # The entries are read without writing records.
+      test_file = systemd.SystemdJournalFile()
+      test_file.Open(path)
+
+      self.assertIsNone(test_file.GetCheckpoint())
+
+      entries = test_file.ReadEntries()
+      entry = next(entries)
+      self.assertEqual(entry['__SEQNUM'], 1)
+      self.assertEqual(test_file.GetCheckpoint().sequence_number, 1)
+
+      checkpoint = test_file.GetCheckpoint()
+      entries.close()
+      test_file.Close()
+
+      # The entries are read after the entry of the checkpoint.
+      test_file.Open(path, checkpoint=checkpoint)
+      entry = next(test_file.ReadEntries())
+      test_file.Close()
+
+    self.assertEqual(entry['__SEQNUM'], 2)
+
+  def testReadEntriesWithCompression(self):
+    """Tests the ReadEntries function with compressed data objects."""
+    compression_methods = ['lz4', 'xz']
+    if zstandard:
+      compression_methods.append('zstd')
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 8192)
+
+      test_file = systemd.SystemdJournalFile()
+      test_file.Open(path)
+      expected_entries = list(test_file.ReadEntries())
+      test_file.Close()
+
+      for compression_method in compression_methods:
+        generator = synthetic.SystemdJournalGenerator(
+            compression=compression_method)
+        generator.Generate(path, 8192)
+
+        output_writer = test_lib.TestRecordOutputWriter()
+        test_file = systemd.SystemdJournalFile(output_writer=output_writer)
+        test_file.Open(path)
+        entries = list(test_file.ReadEntries(
+            fields=['MESSAGE', '_SYSTEMD_UNIT']))
+        test_file.Close()
+
+        self.assertEqual(len(entries), len(output_writer.records))
+        for entry, expected_entry in zip(entries, expected_entries):
+          self.assertEqual(entry['MESSAGE'], expected_entry['MESSAGE'])
+          self.assertEqual(
+              entry['_SYSTEMD_UNIT'], expected_entry['_SYSTEMD_UNIT'])
+          self.assertNotIn('_HOSTNAME', entry)
+
+        _, values = output_writer.records[0]
+        self.assertEqual(values['data'][1], 'MESSAGE=message 0')
+
+  def testReadEntriesWithRealTimeRange(self):
+    """Tests the ReadEntries function with a real time range."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 65536)
+
+      test_file.Open(path)
+      real_times = [
+          entry['__REALTIME_TIMESTAMP'] for entry in test_file.ReadEntries()]
+
+      entries = list(test_file.ReadEntries(
+          since=real_times[10], until=real_times[20]))
+      self.assertEqual(
+          [entry['__SEQNUM'] for entry in entries], list(range(11, 21)))
+
+      entries = list(test_file.ReadEntries(since=real_times[10] + 1))
+      self.assertEqual(entries[0]['__SEQNUM'], 12)
+      self.assertEqual(len(entries), len(real_times) - 11)
+
+      entries = list(test_file.ReadEntries(since=0, until=real_times[0]))
+      self.assertEqual(entries, [])
+
+      entries = list(test_file.ReadEntries(since=real_times[-1] + 1))
+      self.assertEqual(entries, [])
+
+      test_file.Close()
+
+  def testReadFileObject(self):
+    """Tests the ReadFileObject function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = systemd.SystemdJournalFile(
+        debug=True, output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 4096)
+
+      test_file.Open(path)
+      test_file.Close()
+
+  def testReadFileObjectWithCheckpoint(self):
+    """Tests the ReadFileObject function with a checkpoint."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = systemd.SystemdJournalFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 8192)
+
+      test_file.Open(path)
+      test_file.Close()
+
+      number_of_entries = len(output_writer.records)
+
+      _, values = output_writer.records[-1]
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.offset, values['offset'])
+      self.assertEqual(checkpoint.sequence_number, number_of_entries)
+
+      token = checkpoint.CopyToString()
+
+      # The journal is appended to.
+      synthetic.SystemdJournalGenerator().Generate(path, 65536)
+
+      checkpoint = data_format.Checkpoint()
+      checkpoint.CopyFromString(token)
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      sequence_numbers = [
+          values['sequence_number'] for _, values in output_writer.records]
+      self.assertEqual(sequence_numbers[0], number_of_entries + 1)
+      self.assertEqual(sequence_numbers, list(range(
+          number_of_entries + 1, number_of_entries + 1 + len(
+              sequence_numbers))))
+
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.sequence_number, sequence_numbers[-1])
+
+      # Nothing was appended to the journal.
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 0)
+      self.assertEqual(test_file.GetCheckpoint(), checkpoint)
+
+      # The journal is replaced by a journal with another file identifier.
+      synthetic.SystemdJournalGenerator(seed=1).Generate(path, 8192)
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      _, values = output_writer.records[0]
+      self.assertEqual(values['sequence_number'], 1)
+
+  def testSeekRealtime(self):
+    """Tests the SeekRealtime function."""
+    test_file = systemd.SystemdJournalFile()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'system.journal')
+      synthetic.SystemdJournalGenerator().Generate(path, 262144)
+
+      test_file.Open(path)
+      real_times = [
+          entry['__REALTIME_TIMESTAMP'] for entry in test_file.ReadEntries()]
+
+      read_entry_object_header = test_file._ReadEntryObjectHeader
+      entry_object_offsets = []
+
+      def _ReadEntryObjectHeader(file_object, file_offset):
+        entry_object_offsets.append(file_offset)
+        return read_entry_object_header(file_object, file_offset)
+
+      test_file._ReadEntryObjectHeader = _ReadEntryObjectHeader
+
+      test_file.SeekRealtime(real_times[500])
+      entry = next(test_file.ReadEntries(fields=[]))
+      self.assertEqual(entry['__SEQNUM'], 501)
+
+      # Only the headers of the entry objects probed by the binary search are
+      # read.
+      self.assertLess(len(entry_object_offsets), 16)
+
+      test_file.SeekRealtime(real_times[500] - 1)
+      entry = next(test_file.ReadEntries(fields=[]))
+      self.assertEqual(entry['__SEQNUM'], 501)
+
+      test_file.SeekRealtime(0)
+      entry = next(test_file.ReadEntries(fields=[]))
+      self.assertEqual(entry['__SEQNUM'], 1)
+
+      test_file.Close()
+
+      with self.assertRaises(IOError):
+        test_file.SeekRealtime(0)
+
+
+class SystemdJournalDirectoryTest(test_lib.BaseTestCase):
+  """Systemd journal directory tests."""
+
+  def _GenerateJournalDirectory(self, path):
+    """Generates a directory with synthetic journal files.
+
+    The archived system journal contains the first entries of the system
+    journal and the user journal has another sequence number identifier.
+
+    Args:
+      path (str): path of the directory.
+    """
+    synthetic.SystemdJournalGenerator().Generate(
+        os.path.join(path, 'system@0001.journal'), 8192)
+    synthetic.SystemdJournalGenerator().Generate(
+        os.path.join(path, 'system.journal'), 16384)
+    synthetic.SystemdJournalGenerator(seed=1).Generate(
+        os.path.join(path, 'user-1000.journal'), 16384)
+
+    with open(os.path.join(path, 'corrupted.journal~'), 'wb') as file_object:
+      file_object.write(b'LPKSHHRH')
+
+    with open(os.path.join(path, 'README'), 'wb') as file_object:
+      file_object.write(b'test')
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    with self.assertRaises(ValueError):
+      systemd.SystemdJournalDirectory(maximum_number_of_cached_data_objects=0)
+
+  def testOpenClose(self):
+    """Tests the Open and Close functions."""
+    test_directory = systemd.SystemdJournalDirectory()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._GenerateJournalDirectory(temporary_directory)
+
+      test_directory.Open(temporary_directory)
+
+      with self.assertRaises(IOError):
+        test_directory.Open(temporary_directory)
+
+      self.assertEqual(test_directory.journal_file_paths, [
+          os.path.join(temporary_directory, 'system.journal'),
+          os.path.join(temporary_directory, 'system@0001.journal'),
+          os.path.join(temporary_directory, 'user-1000.journal')])
+
+      test_directory.Close()
+
+    self.assertEqual(test_directory.journal_file_paths, [])
+
+    with self.assertRaises(IOError):
+      test_directory.Close()
+
+  def testReadEntries(self):
+    """Tests the ReadEntries function."""
+    test_directory = systemd.SystemdJournalDirectory()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._GenerateJournalDirectory(temporary_directory)
+
+      expected_entries = []
+      for filename in ('system.journal', 'user-1000.journal'):
+        test_file = systemd.SystemdJournalFile()
+        test_file.Open(os.path.join(temporary_directory, filename))
+        expected_entries.extend(test_file.ReadEntries(fields=['MESSAGE']))
+        test_file.Close()
+
+      test_directory.Open(temporary_directory)
+      entries = list(test_directory.ReadEntries(fields=['MESSAGE']))
+
+      # The entries of the archived system journal are duplicates.
+      self.assertEqual(len(entries), len(expected_entries))
+
+      expected_entries.sort(key=lambda entry: (
+          entry['__REALTIME_TIMESTAMP'], entry['__SEQNUM_ID'],
+          entry['__SEQNUM']))
+      self.assertEqual(entries, expected_entries)
+
+      since = entries[10]['__REALTIME_TIMESTAMP']
+      until = entries[20]['__REALTIME_TIMESTAMP']
+
+      entries = list(test_directory.ReadEntries(
+          fields=['MESSAGE'], since=since, until=until))
+      self.assertEqual(entries, expected_entries[10:20])
+
+      test_directory.Close()
+
+      with self.assertRaises(IOError):
+        list(test_directory.ReadEntries())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -70,3 +70,26 @@ class TestOutputWriter(output_writers.OutputWriter):
       text (str): text to write.
     """
     self.output.append(text)
+
+
+class TestRecordOutputWriter(output_writers.RecordOutputWriter):
+  """Test structured record output writer.
+
+  Attributes:
+    records (list[tuple[str, dict[str, object]]]): record types and values
+        of the records written.
+  """
+
+  def __init__(self):
+    """Initializes a test structured record output writer."""
+    super(TestRecordOutputWriter, self).__init__()
+    self.records = []
+
+  def WriteRecord(self, record_type, values):
+    """Writes a record to the output.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+    """
+    self.records.append((record_type, values))
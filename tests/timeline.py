@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Tests for timelines of the records of multiple data formats."""
+
+import os
+import tempfile
+import unittest
+
+from dtformats import chrome_cache
+from dtformats import errors
+from dtformats import synthetic
+from dtformats import timeline
+from dtformats import usn_journal
+from dtformats import utmp
+
+from tests import test_lib
+
+
+class TimelineFunctionsTest(test_lib.BaseTestCase):
+  """Timeline functions tests."""
+
+  def testGetFileRecords(self):
+    """Tests the GetFileRecords function."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    records = list(timeline.GetFileRecords(
+        test_file_path, maximum_queue_size=1))
+    self.assertEqual(len(records), 14)
+
+    record_type, values = records[0]
+    self.assertEqual(record_type, 'linux_libc6_utmp_entry')
+    self.assertEqual(values['username'], 'reboot')
+
+    # The read is stopped when the records are no longer consumed.
+    records = timeline.GetFileRecords(test_file_path, maximum_queue_size=1)
+    next(records)
+    records.close()
+
+    with self.assertRaises(errors.ParseError):
+      list(timeline.GetFileRecords(
+          test_file_path, format_class=utmp.MacOSXUtmpxFile))
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, '$J')
+      synthetic.USNRecordsGenerator().Generate(path, 4096)
+
+      records = list(timeline.GetFileRecords(
+          path, format_class=usn_journal.USNRecords,
+          read_method_name='ReadRecords'))
+
+    record_type, values = records[0]
+    self.assertEqual(record_type, 'usn_record')
+    self.assertEqual(values['update_sequence_number'], 0)
+
+  def testGetRecords(self):
+    """Tests the GetRecords function."""
+    test_path = self._GetTestFilePath(['chrome_cache'])
+    self._SkipIfPathNotExists(test_path)
+
+    def _ReadDirectory(output_writer):
+      parser = chrome_cache.ChromeCacheParser(output_writer=output_writer)
+      parser.ParseDirectory(test_path)
+
+    records = list(timeline.GetRecords(_ReadDirectory))
+    self.assertGreater(len(records), 0)
+
+    record_type, values = records[0]
+    self.assertEqual(record_type, 'chrome_cache_entry')
+    self.assertIsNotNone(timeline.GetTimestamp(record_type, values))
+
+    with self.assertRaises(ValueError):
+      list(timeline.GetRecords(_ReadDirectory, maximum_queue_size=0))
+
+  def testGetTimestamp(self):
+    """Tests the GetTimestamp function."""
+    timestamp = timeline.GetTimestamp('linux_libc6_utmp_entry', {
+        'microseconds': 5, 'timestamp': 1})
+    self.assertEqual(timestamp, 1000005)
+
+    timestamp = timeline.GetTimestamp('asl_record', {
+        'written_time': 1, 'written_time_nanoseconds': 5000})
+    self.assertEqual(timestamp, 1000005)
+
+    timestamp = timeline.GetTimestamp('usn_record', {
+        'timestamp': 116444736000000000 + 10000050})
+    self.assertEqual(timestamp, 1000005)
+
+    timestamp = timeline.GetTimestamp('chrome_cache_entry', {
+        'creation_time': 11644473600000000 + 1000005})
+    self.assertEqual(timestamp, 1000005)
+
+    timestamp = timeline.GetTimestamp('bsm_event', {'tokens': []})
+    self.assertIsNone(timestamp)
+
+    timestamp = timeline.GetTimestamp('test', {'timestamp': 1})
+    self.assertIsNone(timestamp)
+
+
+class TimelineTest(test_lib.BaseTestCase):
+  """Timeline tests."""
+
+  # pylint: disable=protected-access
+
+  def _GetTimestamp(self, record_type, values):
+    """Retrieves the timestamp of a test record.
+
+    Args:
+      record_type (str): record type.
+      values (dict[str, object]): values of the record per name.
+
+    Returns:
+      int: timestamp or None if the record has no timestamp.
+    """
+    return values.get('timestamp', None)
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    with self.assertRaises(ValueError):
+      timeline.Timeline(chunk_size=0)
+
+  def testGetRecords(self):
+    """Tests the GetRecords function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      test_timeline = timeline.Timeline(
+          chunk_size=2, temporary_directory=temporary_directory)
+
+      test_timeline.AddSource('ordered', iter([
+          ('test', {'timestamp': 1}), ('test', {'timestamp': 4}),
+          ('test', {'timestamp': 7})]), get_timestamp=self._GetTimestamp,
+          ordered=True)
+
+      test_timeline.AddSource('unordered', iter([
+          ('test', {'timestamp': 6}), ('test', {'timestamp': None}),
+          ('test', {'timestamp': 2}), ('test', {'timestamp': 4}),
+          ('test', {'timestamp': 9}), ('test', {'timestamp': 0})]),
+          get_timestamp=self._GetTimestamp)
+
+      records = list(test_timeline.GetRecords())
+
+      # The sorted chunks are removed.
+      self.assertEqual(os.listdir(temporary_directory), [])
+
+    self.assertEqual(
+        [(timestamp, source_name) for timestamp, source_name, _, _ in records],
+        [(0, 'unordered'), (1, 'ordered'), (2, 'unordered'), (4, 'ordered'),
+         (4, 'unordered'), (6, 'unordered'), (7, 'ordered'),
+         (9, 'unordered')])
+
+  def testWriteRecords(self):
+    """Tests the WriteRecords function."""
+    test_file_paths = []
+    for filename in ('utmp-linux_libc6', 'utmpx-macosx10.5'):
+      test_file_path = self._GetTestFilePath([filename])
+      self._SkipIfPathNotExists(test_file_path)
+      test_file_paths.append(test_file_path)
+
+    test_timeline = timeline.Timeline(chunk_size=4)
+    test_timeline.AddSource('wtmp', timeline.GetFileRecords(
+        test_file_paths[0]))
+    test_timeline.AddSource('utmpx', timeline.GetFileRecords(
+        test_file_paths[1]))
+
+    output_writer = test_lib.TestRecordOutputWriter()
+    number_of_records = test_timeline.WriteRecords(output_writer)
+    self.assertEqual(number_of_records, 20)
+    self.assertEqual(len(output_writer.records), 20)
+
+    timestamps = [
+        values['timeline_timestamp'] for _, values in output_writer.records]
+    self.assertEqual(timestamps, sorted(timestamps))
+
+    source_names = set(
+        values['timeline_source'] for _, values in output_writer.records)
+    self.assertEqual(source_names, set(['utmpx', 'wtmp']))
+
+
+if __name__ == '__main__':
+  unittest.main()
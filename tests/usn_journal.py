@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Tests for USN change journal records."""
+
+import os
+import tempfile
+import unittest
+
+from dtformats import data_format
+from dtformats import synthetic
+from dtformats import usn_journal
+
+from tests import test_lib
+
+
+class USNRecordsTest(test_lib.BaseTestCase):
+  """USN change journal records tests."""
+
+  # pylint: disable=protected-access
+
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = usn_journal.USNRecords()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, '$J')
+      synthetic.USNRecordsGenerator().Generate(path, 3 * 4096)
+
+      # Data of a block that was deallocated is read as zeros.
+      with open(path, 'r+b') as file_object:
+        file_object.write(bytes(4096))
+
+      test_file.Open(path)
+      usn_records = list(test_file.ReadRecords())
+      test_file.Close()
+
+    self.assertEqual(sum(usn_record.size for usn_record in usn_records), (
+        2 * 4096))
+    self.assertEqual(usn_records[0].sequence_number, 4096)
+
+  def testReadRecordsWithCheckpoint(self):
+    """Tests the ReadRecords function with a checkpoint."""
+    test_file = usn_journal.USNRecords()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, '$J')
+      synthetic.USNRecordsGenerator().Generate(path, 2 * 4096)
+
+      test_file.Open(path)
+      usn_records = list(test_file.ReadRecords())
+      checkpoint = test_file.GetCheckpoint()
+      test_file.Close()
+
+      self.assertEqual(checkpoint.offset, usn_records[-1].sequence_number)
+      self.assertEqual(
+          checkpoint.sequence_number, usn_records[-1].sequence_number)
+
+      token = checkpoint.CopyToString()
+
+      # The journal is appended to.
+      synthetic.USNRecordsGenerator().Generate(path, 4 * 4096)
+
+      checkpoint = data_format.Checkpoint()
+      checkpoint.CopyFromString(token)
+
+      test_file.Open(path, checkpoint=checkpoint)
+      appended_usn_records = list(test_file.ReadRecords())
+      test_file.Close()
+
+      self.assertEqual(appended_usn_records[0].sequence_number, 2 * 4096)
+      self.assertEqual(
+          sum(usn_record.size for usn_record in appended_usn_records),
+          2 * 4096)
+
+      # Reading is resumed after the last record consumed.
+      test_file.Open(path)
+      usn_records = list(test_file.ReadRecords())
+
+      usn_records_generator = test_file.ReadRecords()
+      for _ in range(3):
+        next(usn_records_generator)
+
+      checkpoint = test_file.GetCheckpoint()
+      remaining_usn_records = list(test_file.ReadRecords(checkpoint=checkpoint))
+      test_file.Close()
+
+    self.assertEqual(checkpoint.offset, usn_records[2].sequence_number)
+    self.assertEqual(
+        [usn_record.sequence_number for usn_record in remaining_usn_records],
+        [usn_record.sequence_number for usn_record in usn_records[3:]])
+
+
+if __name__ == '__main__':
+  unittest.main()
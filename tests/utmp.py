@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 """Tests for utmp files."""
 
+import os
+import tempfile
 import unittest
 
+from dtformats import data_format
+from dtformats import errors
 from dtformats import utmp
 
 from tests import test_lib
@@ -13,6 +17,27 @@ class LinuxLibc6UtmpFileTest(test_lib.BaseTestCase):
 
   # pylint: disable=protected-access
 
+  def testCarveRecord(self):
+    """Tests the CarveRecord function."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = utmp.LinuxLibc6UtmpFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      record_size = test_file.CarveRecord(file_object, 384)
+      self.assertEqual(record_size, 384)
+
+      with self.assertRaises(errors.ParseError):
+        test_file.CarveRecord(file_object, 383)
+
+    self.assertEqual(len(output_writer.records), 1)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'linux_libc6_utmp_entry')
+    self.assertEqual(values['offset'], 384)
+
   def testDebugPrintEntry(self):
     """Tests the _DebugPrintEntry function."""
     output_writer = test_lib.TestOutputWriter()
@@ -53,7 +78,7 @@ class LinuxLibc6UtmpFileTest(test_lib.BaseTestCase):
     self._SkipIfPathNotExists(test_file_path)
 
     with open(test_file_path, 'rb') as file_object:
-      test_file._ReadEntries(file_object)
+      test_file._ReadEntries(file_object, 0, 0, None)
 
   def testReadFileObject(self):
     """Tests the ReadFileObject."""
@@ -65,6 +90,109 @@ class LinuxLibc6UtmpFileTest(test_lib.BaseTestCase):
 
     test_file.Open(test_file_path)
 
+  def testReadFileObjectWithRecordOutputWriter(self):
+    """Tests the ReadFileObject with a record output writer."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = utmp.LinuxLibc6UtmpFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(output_writer.records), 14)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'linux_libc6_utmp_entry')
+
+  def testReadFileObjectWithCheckpoint(self):
+    """Tests the ReadFileObject with a checkpoint."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = utmp.LinuxLibc6UtmpFile(output_writer=output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'wtmp')
+      with open(path, 'wb') as file_object:
+        file_object.write(data[:10 * 384])
+
+      test_file.Open(path)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 10)
+
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.offset, 9 * 384)
+      self.assertEqual(checkpoint.sequence_number, 10)
+
+      token = checkpoint.CopyToString()
+
+      # The file is appended to.
+      with open(path, 'wb') as file_object:
+        file_object.write(data)
+
+      checkpoint = data_format.Checkpoint()
+      checkpoint.CopyFromString(token)
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 4)
+
+      _, values = output_writer.records[0]
+      self.assertEqual(values['offset'], 10 * 384)
+
+      checkpoint = test_file.GetCheckpoint()
+      self.assertEqual(checkpoint.offset, 13 * 384)
+      self.assertEqual(checkpoint.sequence_number, 14)
+
+      # Nothing was appended to the file.
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 0)
+      self.assertEqual(test_file.GetCheckpoint(), checkpoint)
+
+      # The file is replaced by a file with other entries.
+      with open(path, 'wb') as file_object:
+        file_object.write(data[384:])
+
+      output_writer.records = []
+      test_file.Open(path, checkpoint=checkpoint)
+      test_file.Close()
+
+      self.assertEqual(len(output_writer.records), 13)
+
+  def testReadFileObjectWithMmap(self):
+    """Tests the ReadFileObject with a memory-mapped file."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = utmp.LinuxLibc6UtmpFile(debug=True, output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path, use_mmap=True)
+    test_file.Close()
+
+  def testReadFileObjectWithPageCache(self):
+    """Tests the ReadFileObject with a page cache."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = utmp.LinuxLibc6UtmpFile(debug=True, output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path, page_cache_block_size=512)
+    test_file.Close()
+
 
 class MacOSXUtmpxFileTest(test_lib.BaseTestCase):
   """Mac OS X 10.5 utmpx file tests."""
@@ -120,6 +248,22 @@ class MacOSXUtmpxFileTest(test_lib.BaseTestCase):
 
     test_file.Open(test_file_path)
 
+  def testReadFileObjectWithRecordOutputWriter(self):
+    """Tests the ReadFileObject with a record output writer."""
+    output_writer = test_lib.TestRecordOutputWriter()
+    test_file = utmp.MacOSXUtmpxFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+    test_file.Close()
+
+    self.assertEqual(len(output_writer.records), 6)
+
+    record_type, values = output_writer.records[0]
+    self.assertEqual(record_type, 'macosx_utmpx_entry')
+
 
 if __name__ == '__main__':
   unittest.main()